@@ -0,0 +1,37 @@
+"""Benchmark the automated annotation tools."""
+
+from nimare.annotate.gclda import GCLDAModel
+
+from .utils import N_STUDIES, create_coordinates, create_counts
+
+N_ITERS = 5
+
+
+class TimeGCLDA:
+    """Time and measure peak memory of GCLDA sampling iterations."""
+
+    params = N_STUDIES
+    param_names = ["n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Generate one annotated coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in N_STUDIES}
+
+    def setup(self, datasets, n_studies):
+        """Initialize the GCLDA model."""
+        dataset = datasets[n_studies]
+        self.model = GCLDAModel(
+            create_counts(dataset),
+            dataset.coordinates,
+            mask=dataset.masker.mask_img,
+            n_topics=20,
+        )
+
+    def time_fit(self, datasets, n_studies):
+        """Time a few sampling iterations."""
+        self.model.fit(n_iters=N_ITERS, loglikely_freq=N_ITERS)
+
+    def peakmem_fit(self, datasets, n_studies):
+        """Measure peak memory of a few sampling iterations."""
+        self.model.fit(n_iters=N_ITERS, loglikely_freq=N_ITERS)
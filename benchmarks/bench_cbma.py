@@ -3,9 +3,19 @@
 import os
 
 import nimare
-from nimare.meta.cbma import ALE, KDA, MKDAChi2, MKDADensity
+from nimare.correct import FWECorrector
+from nimare.meta import cbma, kernel
+from nimare.meta.cbma import ALE, KDA, SCALE, ALESubtraction, MKDAChi2, MKDADensity
 from nimare.tests.utils import get_test_data_path
 
+from .utils import N_STUDIES, create_coordinates
+
+# Number of Monte Carlo iterations, kept low since only the cost per iteration matters here
+N_ITERS = 10
+
+# Monte Carlo methods refit every experiment in each iteration, so they skip the largest size
+MONTECARLO_N_STUDIES = N_STUDIES[:-1]
+
 
 class TimeCBMA:
     """Time CBMA estimators."""
@@ -55,3 +65,135 @@ class TimeCBMA:
         """
         meta = MKDAChi2()
         meta.fit(self.dataset, self.dataset)
+
+
+class TimeKernelTransformers:
+    """Time and measure peak memory of kernel transformers on synthetic datasets."""
+
+    params = (["ALEKernel", "MKDAKernel", "KDAKernel"], N_STUDIES)
+    param_names = ["kernel_transformer", "n_studies"]
+    timeout = 600
+
+    def setup_cache(self):
+        """Generate one coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in N_STUDIES}
+
+    def setup(self, datasets, kernel_transformer, n_studies):
+        """Select the dataset and initialize the kernel transformer."""
+        self.dataset = datasets[n_studies]
+        self.kernel = getattr(kernel, kernel_transformer)()
+
+    def time_transform(self, datasets, kernel_transformer, n_studies):
+        """Time the creation of sparse modeled activation maps."""
+        self.kernel.transform(self.dataset, return_type="sparse")
+
+    def peakmem_transform(self, datasets, kernel_transformer, n_studies):
+        """Measure peak memory of the creation of sparse modeled activation maps."""
+        self.kernel.transform(self.dataset, return_type="sparse")
+
+
+class TimeCBMAEstimators:
+    """Time and measure peak memory of one-sample CBMA estimators with each null method."""
+
+    params = (["ALE", "MKDADensity", "KDA"], ["approximate", "montecarlo"], N_STUDIES)
+    param_names = ["estimator", "null_method", "n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Generate one coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in N_STUDIES}
+
+    def setup(self, datasets, estimator, null_method, n_studies):
+        """Select the dataset and initialize the estimator."""
+        if (null_method == "montecarlo") and (n_studies not in MONTECARLO_N_STUDIES):
+            raise NotImplementedError("Monte Carlo nulls are too slow for the largest dataset.")
+
+        self.dataset = datasets[n_studies]
+        self.meta = getattr(cbma, estimator)(null_method=null_method, n_iters=N_ITERS)
+
+    def time_fit(self, datasets, estimator, null_method, n_studies):
+        """Time the estimator fit."""
+        self.meta.fit(self.dataset)
+
+    def peakmem_fit(self, datasets, estimator, null_method, n_studies):
+        """Measure peak memory of the estimator fit."""
+        self.meta.fit(self.dataset)
+
+
+class TimeFWECorrector:
+    """Time Monte Carlo FWE correction of ALE results, at the voxel level and cluster level."""
+
+    params = ([True, False], MONTECARLO_N_STUDIES)
+    param_names = ["vfwe_only", "n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Fit ALE on one coordinate dataset for each size."""
+        return {
+            n_studies: ALE().fit(create_coordinates(n_studies))
+            for n_studies in MONTECARLO_N_STUDIES
+        }
+
+    def setup(self, results, vfwe_only, n_studies):
+        """Select the ALE result and initialize the corrector."""
+        self.result = results[n_studies]
+        self.corrector = FWECorrector(method="montecarlo", n_iters=N_ITERS, vfwe_only=vfwe_only)
+
+    def time_montecarlo(self, results, vfwe_only, n_studies):
+        """Time the Monte Carlo FWE correction."""
+        self.corrector.transform(self.result)
+
+    def peakmem_montecarlo(self, results, vfwe_only, n_studies):
+        """Measure peak memory of the Monte Carlo FWE correction."""
+        self.corrector.transform(self.result)
+
+
+class TimeALESubtraction:
+    """Time the ALE subtraction analysis of two halves of a synthetic dataset."""
+
+    params = MONTECARLO_N_STUDIES
+    param_names = ["n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Generate one coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in MONTECARLO_N_STUDIES}
+
+    def setup(self, datasets, n_studies):
+        """Split the dataset into two groups."""
+        ids = datasets[n_studies].ids
+        self.dataset1 = datasets[n_studies].slice(ids[: n_studies // 2])
+        self.dataset2 = datasets[n_studies].slice(ids[n_studies // 2 :])
+
+    def time_fit(self, datasets, n_studies):
+        """Time the subtraction analysis."""
+        ALESubtraction(n_iters=N_ITERS).fit(self.dataset1, self.dataset2)
+
+    def peakmem_fit(self, datasets, n_studies):
+        """Measure peak memory of the subtraction analysis."""
+        ALESubtraction(n_iters=N_ITERS).fit(self.dataset1, self.dataset2)
+
+
+class TimeSCALE:
+    """Time SCALE, using the dataset's own coordinates as the base-rate population."""
+
+    params = MONTECARLO_N_STUDIES
+    param_names = ["n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Generate one coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in MONTECARLO_N_STUDIES}
+
+    def setup(self, datasets, n_studies):
+        """Select the dataset and its coordinates."""
+        self.dataset = datasets[n_studies]
+        self.xyz = self.dataset.coordinates[["x", "y", "z"]].values
+
+    def time_fit(self, datasets, n_studies):
+        """Time the SCALE fit."""
+        SCALE(self.xyz, n_iters=N_ITERS).fit(self.dataset)
+
+    def peakmem_fit(self, datasets, n_studies):
+        """Measure peak memory of the SCALE fit."""
+        SCALE(self.xyz, n_iters=N_ITERS).fit(self.dataset)
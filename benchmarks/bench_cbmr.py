@@ -0,0 +1,58 @@
+"""Benchmark the CBMR estimator."""
+
+from .utils import N_STUDIES, create_coordinates
+
+N_ITERS = 5
+
+
+class TimeCBMR:
+    """Time and measure peak memory of CBMR fits with two groups and one moderator.
+
+    The optimizer is run for a fixed number of iterations, so that timings reflect the cost
+    per iteration rather than the speed of convergence.
+    """
+
+    params = (
+        ["PoissonEstimator", "NegativeBinomialEstimator", "ClusteredNegativeBinomialEstimator"],
+        N_STUDIES,
+    )
+    param_names = ["model", "n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Generate one coordinate dataset with groups and a moderator for each size."""
+        datasets = {}
+        for n_studies in N_STUDIES:
+            dataset = create_coordinates(n_studies)
+            dataset.annotations["group"] = ["A", "B"] * (n_studies // 2)
+            dataset.annotations["sample_sizes"] = [
+                sample_sizes[0] for sample_sizes in dataset.metadata["sample_sizes"]
+            ]
+            datasets[n_studies] = dataset
+
+        return datasets
+
+    def setup(self, datasets, model, n_studies):
+        """Select the dataset and initialize the estimator."""
+        try:
+            from nimare.meta import cbmr, models
+        except ImportError:
+            raise NotImplementedError("CBMR benchmarks require torch.")
+
+        self.dataset = datasets[n_studies]
+        self.cbmr = cbmr.CBMREstimator(
+            group_categories=["group"],
+            moderators=["sample_sizes"],
+            spline_spacing=20,
+            model=getattr(models, model),
+            n_iter=N_ITERS,
+            tol=0,
+        )
+
+    def time_fit(self, datasets, model, n_studies):
+        """Time the estimator fit."""
+        self.cbmr.fit(self.dataset)
+
+    def peakmem_fit(self, datasets, model, n_studies):
+        """Measure peak memory of the estimator fit."""
+        self.cbmr.fit(self.dataset)
@@ -0,0 +1,73 @@
+"""Benchmark the Dataset class."""
+
+import json
+import os
+
+from nimare.dataset import Dataset
+
+from .utils import N_STUDIES, create_coordinates
+
+
+def _dataset_to_source(dataset):
+    """Convert a coordinate Dataset into the dictionary format read by Dataset."""
+    sample_sizes = dataset.metadata.set_index("id")["sample_sizes"]
+    source = {}
+    for id_, coordinates in dataset.coordinates.groupby("id"):
+        study_id, contrast_id = id_.rsplit("-", 1)
+        contrast = {
+            "coords": {
+                "space": "MNI",
+                "x": coordinates["x"].tolist(),
+                "y": coordinates["y"].tolist(),
+                "z": coordinates["z"].tolist(),
+            },
+            "metadata": {"sample_sizes": [int(n) for n in sample_sizes[id_]]},
+        }
+        source.setdefault(study_id, {"contrasts": {}})["contrasts"][contrast_id] = contrast
+
+    return source
+
+
+class TimeDataset:
+    """Time and measure peak memory of loading, slicing, and merging Datasets."""
+
+    params = N_STUDIES
+    param_names = ["n_studies"]
+    timeout = 600
+
+    def setup_cache(self):
+        """Write one coordinate dataset for each size to the working directory, as JSON."""
+        datasets = {}
+        for n_studies in N_STUDIES:
+            dataset = create_coordinates(n_studies)
+            json_file = os.path.abspath(f"dataset-{n_studies}.json")
+            with open(json_file, "w") as f_obj:
+                json.dump(_dataset_to_source(dataset), f_obj)
+
+            datasets[n_studies] = (json_file, dataset)
+
+        return datasets
+
+    def setup(self, datasets, n_studies):
+        """Select the dataset and split it into two halves."""
+        self.json_file, self.dataset = datasets[n_studies]
+        self.ids1 = self.dataset.ids[: n_studies // 2]
+        self.ids2 = self.dataset.ids[n_studies // 2 :]
+        self.dataset1 = self.dataset.slice(self.ids1)
+        self.dataset2 = self.dataset.slice(self.ids2)
+
+    def time_load(self, datasets, n_studies):
+        """Time creating a Dataset from a JSON file."""
+        Dataset(self.json_file)
+
+    def peakmem_load(self, datasets, n_studies):
+        """Measure peak memory of creating a Dataset from a JSON file."""
+        Dataset(self.json_file)
+
+    def time_slice(self, datasets, n_studies):
+        """Time slicing half of the experiments from the Dataset."""
+        self.dataset.slice(self.ids1)
+
+    def time_merge(self, datasets, n_studies):
+        """Time merging two halves of the Dataset."""
+        self.dataset1.merge(self.dataset2)
@@ -0,0 +1,97 @@
+"""Benchmark the decoders."""
+
+import nibabel as nib
+import numpy as np
+
+from nimare.decode import continuous, discrete
+from nimare.meta.cbma import MKDAChi2
+
+from .utils import N_STUDIES, create_coordinates
+
+N_SELECTED = 10
+
+
+class TimeDiscreteDecoders:
+    """Time fitting discrete decoders and decoding a selection of experiments."""
+
+    params = (["NeurosynthDecoder", "BrainMapDecoder"], N_STUDIES)
+    param_names = ["decoder", "n_studies"]
+    timeout = 600
+
+    def setup_cache(self):
+        """Generate one annotated coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in N_STUDIES}
+
+    def setup(self, datasets, decoder, n_studies):
+        """Select the dataset and fit the decoder."""
+        self.dataset = datasets[n_studies]
+        self.decoder = getattr(discrete, decoder)(correction=None)
+        self.decoder.fit(self.dataset)
+
+    def time_fit(self, datasets, decoder, n_studies):
+        """Time the decoder fit."""
+        getattr(discrete, decoder)(correction=None).fit(self.dataset)
+
+    def time_transform(self, datasets, decoder, n_studies):
+        """Time decoding a selection of experiments."""
+        self.decoder.transform(ids=self.dataset.ids[:N_SELECTED])
+
+
+class TimeROIAssociationDecoder:
+    """Time decoding a region of interest with the ROI association decoder."""
+
+    params = N_STUDIES
+    param_names = ["n_studies"]
+    timeout = 600
+
+    def setup_cache(self):
+        """Generate one annotated coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in N_STUDIES}
+
+    def setup(self, datasets, n_studies):
+        """Select the dataset and build a box-shaped ROI in the center of the mask."""
+        self.dataset = datasets[n_studies]
+        mask_img = self.dataset.masker.mask_img
+        roi = np.zeros(mask_img.shape, dtype=np.int8)
+        center = np.array(mask_img.shape) // 2
+        roi[tuple(slice(c - 5, c + 5) for c in center)] = 1
+        self.roi_img = nib.Nifti1Image(roi, mask_img.affine)
+
+    def time_fit_transform(self, datasets, n_studies):
+        """Time fitting the decoder and decoding the ROI."""
+        decoder = discrete.ROIAssociationDecoder(self.roi_img)
+        decoder.fit(self.dataset)
+        decoder.transform()
+
+
+class TimeCorrelationDecoder:
+    """Time fitting the correlation decoder, which runs one meta-analysis per feature.
+
+    Only the smallest dataset is used, since a fit already takes about a minute.
+    """
+
+    params = N_STUDIES[:1]
+    param_names = ["n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Generate one annotated coordinate dataset for each size."""
+        return {n_studies: create_coordinates(n_studies) for n_studies in N_STUDIES[:1]}
+
+    def setup(self, datasets, n_studies):
+        """Select the dataset."""
+        self.dataset = datasets[n_studies]
+
+    def time_fit(self, datasets, n_studies):
+        """Time the decoder fit."""
+        decoder = continuous.CorrelationDecoder(
+            meta_estimator=MKDAChi2(), target_image="z_desc-association"
+        )
+        decoder.fit(self.dataset)
+
+    def peakmem_fit(self, datasets, n_studies):
+        """Measure peak memory of the decoder fit."""
+        decoder = continuous.CorrelationDecoder(
+            meta_estimator=MKDAChi2(), target_image="z_desc-association"
+        )
+        decoder.fit(self.dataset)
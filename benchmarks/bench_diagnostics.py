@@ -0,0 +1,39 @@
+"""Benchmark the diagnostic tools."""
+
+from nimare.diagnostics import FocusCounter, Jackknife
+from nimare.meta.cbma import ALE
+
+from .utils import N_STUDIES, create_coordinates
+
+
+class TimeDiagnostics:
+    """Time the Jackknife and FocusCounter on ALE results.
+
+    The Jackknife refits the meta-analysis once per experiment, so it is only run on the
+    smallest dataset.
+    """
+
+    params = (["Jackknife", "FocusCounter"], N_STUDIES)
+    param_names = ["diagnostic", "n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Fit ALE on one coordinate dataset for each size."""
+        return {n_studies: ALE().fit(create_coordinates(n_studies)) for n_studies in N_STUDIES}
+
+    def setup(self, results, diagnostic, n_studies):
+        """Select the ALE result and initialize the diagnostic."""
+        if (diagnostic == "Jackknife") and (n_studies > N_STUDIES[0]):
+            raise NotImplementedError("Jackknife is too slow for the larger datasets.")
+
+        self.result = results[n_studies]
+        diagnostic = {"Jackknife": Jackknife, "FocusCounter": FocusCounter}[diagnostic]
+        self.diagnostic = diagnostic(target_image="z", voxel_thresh=3.1)
+
+    def time_transform(self, results, diagnostic, n_studies):
+        """Time the diagnostic."""
+        self.diagnostic.transform(self.result)
+
+    def peakmem_transform(self, results, diagnostic, n_studies):
+        """Measure peak memory of the diagnostic."""
+        self.diagnostic.transform(self.result)
@@ -0,0 +1,50 @@
+"""Benchmark the IBMA estimators."""
+
+import os
+
+from nimare.meta import ibma
+
+from .utils import MAX_IMAGE_STUDIES, N_STUDIES, create_images
+
+ESTIMATORS = [
+    "Fishers",
+    "Stouffers",
+    "WeightedLeastSquares",
+    "DerSimonianLaird",
+    "Hedges",
+    "SampleSizeBasedLikelihood",
+    "VarianceBasedLikelihood",
+    "PermutedOLS",
+]
+IMAGE_N_STUDIES = [n_studies for n_studies in N_STUDIES if n_studies <= MAX_IMAGE_STUDIES]
+
+
+class TimeIBMA:
+    """Time and measure peak memory of IBMA estimators with both masking modes."""
+
+    params = (ESTIMATORS, [True, False], IMAGE_N_STUDIES)
+    param_names = ["estimator", "aggressive_mask", "n_studies"]
+    timeout = 1200
+
+    def setup_cache(self):
+        """Write one synthetic image dataset for each size to the working directory."""
+        datasets = {}
+        for n_studies in IMAGE_N_STUDIES:
+            out_dir = os.path.abspath(f"images-{n_studies}")
+            os.makedirs(out_dir)
+            datasets[n_studies] = create_images(n_studies, out_dir)
+
+        return datasets
+
+    def setup(self, datasets, estimator, aggressive_mask, n_studies):
+        """Select the dataset and initialize the estimator."""
+        self.dataset = datasets[n_studies]
+        self.meta = getattr(ibma, estimator)(aggressive_mask=aggressive_mask)
+
+    def time_fit(self, datasets, estimator, aggressive_mask, n_studies):
+        """Time the estimator fit."""
+        self.meta.fit(self.dataset)
+
+    def peakmem_fit(self, datasets, estimator, aggressive_mask, n_studies):
+        """Measure peak memory of the estimator fit."""
+        self.meta.fit(self.dataset)
@@ -0,0 +1,13 @@
+"""Benchmark the time it takes to import NiMARE."""
+
+
+class TimeImport:
+    """Time imports in a fresh interpreter, so that cached modules are not counted."""
+
+    def timeraw_import_nimare(self):
+        """Time ``import nimare``, which should not import any subpackage."""
+        return "import nimare"
+
+    def timeraw_import_cbma(self):
+        """Time importing a CBMA estimator, which is what most scripts and workers need."""
+        return "from nimare.meta.cbma import ALE"
@@ -0,0 +1,111 @@
+"""Synthetic datasets shared by the benchmarks."""
+
+import os
+
+import nibabel as nib
+import numpy as np
+import pandas as pd
+from nilearn.image import resample_img
+
+from nimare.dataset import Dataset
+from nimare.generate import create_coordinate_dataset
+from nimare.transforms import t_to_z
+from nimare.utils import get_template
+
+# Numbers of experiments at which scalable benchmarks are run
+N_STUDIES = [50, 500, 5000]
+
+# Maximum number of experiments for image-based benchmarks, which hold every map in memory
+MAX_IMAGE_STUDIES = 500
+
+N_LABELS = 50
+
+
+def create_coordinates(n_studies, seed=0):
+    """Generate a coordinate Dataset with ``n_studies`` experiments and term annotations.
+
+    Each experiment has three true foci and three noise foci, and every experiment has a
+    random TF-IDF-like weight for each of ``N_LABELS`` terms in the ``"Neurosynth_TFIDF"``
+    feature group, so that the decoders and topic models can use the same Dataset.
+    """
+    _, dset = create_coordinate_dataset(
+        foci=3,
+        fwhm=10,
+        sample_size=[20, 40],
+        n_studies=n_studies,
+        n_noise_foci=3,
+        seed=seed,
+    )
+
+    rng = np.random.default_rng(seed)
+    weights = rng.random((n_studies, N_LABELS))
+    weights[weights < 0.8] = 0
+    labels = [f"Neurosynth_TFIDF__term{i_label:02d}" for i_label in range(N_LABELS)]
+    annotations = pd.DataFrame(weights, columns=labels)
+    annotations.insert(0, "contrast_id", "1")
+    annotations.insert(0, "study_id", [id_.rsplit("-", 1)[0] for id_ in dset.ids])
+    annotations.insert(0, "id", dset.ids)
+    dset.annotations = annotations
+    return dset
+
+
+def create_counts(dset, seed=0):
+    """Generate a sparse term-count DataFrame for the experiments in a Dataset."""
+    rng = np.random.default_rng(seed)
+    counts = rng.poisson(0.2, size=(len(dset.ids), N_LABELS))
+    return pd.DataFrame(
+        counts,
+        index=pd.Index(dset.ids, name="id"),
+        columns=[f"term{i_label:02d}" for i_label in range(N_LABELS)],
+    )
+
+
+def create_images(n_studies, out_dir, seed=0):
+    """Generate an image Dataset with ``n_studies`` experiments in ``out_dir``.
+
+    Maps are written at 4mm resolution to keep memory use manageable at larger sizes.
+    Each experiment has a beta, varcope, t, and z map, with a shared effect in a central
+    block of voxels and Gaussian noise elsewhere. To mimic partial brain coverage, each
+    experiment is missing a random number of voxels (up to 5%) at the end of the mask, which
+    makes aggressive and liberal masking select different voxels.
+    """
+    mask_img = get_template("mni152_2mm", mask="brain")
+    mask_img = resample_img(mask_img, target_affine=np.diag([4, 4, 4]), interpolation="nearest")
+    mask_img = nib.Nifti1Image(
+        (mask_img.get_fdata() > 0).astype(np.int8), mask_img.affine, mask_img.header
+    )
+    mask_file = os.path.join(out_dir, "mask.nii")
+    mask_img.to_filename(mask_file)
+
+    mask = mask_img.get_fdata() > 0
+    n_voxels = mask.sum()
+    effect = np.zeros(n_voxels)
+    effect[n_voxels // 2 : n_voxels // 2 + 500] = 0.5
+
+    rng = np.random.default_rng(seed)
+    source = {}
+    for i_study in range(n_studies):
+        sample_size = int(rng.integers(20, 40))
+        beta = effect + rng.normal(size=n_voxels)
+        varcope = rng.uniform(0.5, 1.5, size=n_voxels)
+        t = beta / np.sqrt(varcope)
+        maps = {
+            "beta": beta,
+            "varcope": varcope,
+            "t": t,
+            "z": t_to_z(t, sample_size - 1),
+        }
+
+        dropped = np.arange(n_voxels) >= n_voxels - rng.integers(0, n_voxels // 20)
+        images = {}
+        for map_type, map_ in maps.items():
+            data = np.zeros(mask.shape, dtype=np.float32)
+            data[mask] = np.where(dropped, 0, map_)
+            images[map_type] = os.path.join(out_dir, f"study-{i_study}_{map_type}.nii")
+            nib.Nifti1Image(data, mask_img.affine).to_filename(images[map_type])
+
+        source[f"study-{i_study}"] = {
+            "contrasts": {"1": {"images": images, "metadata": {"sample_sizes": [sample_size]}}}
+        }
+
+    return Dataset(source, mask=mask_file)
@@ -1,5 +1,6 @@
 """NiMARE: Neuroimaging Meta-Analysis Research Environment."""
 
+import importlib
 import logging
 import warnings
 
@@ -7,39 +8,41 @@ from ._version import get_versions
 
 logging.basicConfig(level=logging.INFO)
 
-with warnings.catch_warnings(record=True) as w:
-    warnings.simplefilter("ignore")
-    from . import (
-        annotate,
-        base,
-        correct,
-        dataset,
-        decode,
-        io,
-        meta,
-        reports,
-        resources,
-        stats,
-        utils,
-        workflows,
-    )
-
-    __version__ = get_versions()["version"]
-
-    __all__ = [
-        "base",
-        "dataset",
-        "meta",
-        "correct",
-        "annotate",
-        "decode",
-        "resources",
-        "io",
-        "stats",
-        "utils",
-        "reports",
-        "workflows",
-        "__version__",
-    ]
+__version__ = get_versions()["version"]
+
+__all__ = [
+    "base",
+    "dataset",
+    "meta",
+    "correct",
+    "annotate",
+    "decode",
+    "resources",
+    "io",
+    "stats",
+    "utils",
+    "profiling",
+    "reports",
+    "workflows",
+    "__version__",
+]
 
 del get_versions
+
+
+def __getattr__(name):
+    """Import subpackages on first access, to keep ``import nimare`` fast.
+
+    .. versionadded:: 0.5.1
+    """
+    if name in __all__:
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("ignore")
+            return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List the public subpackages, including those that have not been imported yet."""
+    return sorted(set(globals()) | set(__all__))
@@ -5,14 +5,122 @@ import re
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
 from nimare.annotate import utils
 from nimare.extract import download_cognitive_atlas
-from nimare.utils import _uk_to_us
+from nimare.utils import _check_ncores, _uk_to_us
 
 LGR = logging.getLogger(__name__)
 
 
+def _compile_alias_pattern(alias):
+    """Compile a case-insensitive, whole-word regular expression for a literal alias."""
+    return re.compile("\\b" + re.escape(alias) + "\\b", re.MULTILINE | re.IGNORECASE)
+
+
+def _trie_to_regex(node):
+    """Convert a character trie into a regular expression that prefers the longest match."""
+    branches = [
+        re.escape(char) + _trie_to_regex(child) for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+
+    regex = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # The prefix so far is a complete alias, so the rest of the branch is optional
+        regex = "(?:" + regex + ")?"
+
+    return regex
+
+
+class _AliasMatcher(object):
+    """Count and replace many aliases with their identifiers in one scan of each text.
+
+    .. versionadded:: 0.5.1
+
+    A single trie-structured regular expression locates, at every position in the text, the
+    longest alias starting there. The aliases found this way, along with any shorter aliases
+    they contain as prefixes, are the only ones that can match the text, so only they are
+    replaced, in order of precedence (i.e., in the order of the ontology).
+
+    Parameters
+    ----------
+    aliases : :obj:`list` of :obj:`str`
+        Aliases, in order of precedence.
+    ids : :obj:`list` of :obj:`str`
+        Identifier with which to replace each alias.
+    """
+
+    def __init__(self, aliases, ids):
+        self.aliases = list(aliases)
+        self.ids = list(ids)
+        self.patterns = [_compile_alias_pattern(alias) for alias in self.aliases]
+
+        # Indices of the aliases with each (lowercase) text
+        alias_idx = {}
+        for i_alias, alias in enumerate(self.aliases):
+            alias_idx.setdefault(alias.lower(), []).append(i_alias)
+
+        trie = {}
+        for text in alias_idx:
+            node = trie
+            for char in text:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        self.scanner = re.compile(
+            "(?=\\b(" + _trie_to_regex(trie) + ")\\b)",
+            re.MULTILINE | re.IGNORECASE,
+        )
+
+        # For each alias text, the indices of all aliases that also match where it matches
+        word_char = re.compile("\\w")
+        self.candidates = {}
+        for text in alias_idx:
+            idx = []
+            for i_char in range(1, len(text) + 1):
+                prefix = text[:i_char]
+                boundary = (i_char == len(text)) or (
+                    bool(word_char.match(text[i_char - 1])) != bool(word_char.match(text[i_char]))
+                )
+                if boundary and prefix in alias_idx:
+                    idx += alias_idx[prefix]
+            self.candidates[text] = idx
+
+    def transform(self, text):
+        """Replace aliases in a text with their identifiers and count the replacements.
+
+        Parameters
+        ----------
+        text : :obj:`str`
+            Text to convert.
+
+        Returns
+        -------
+        text : :obj:`str`
+            Text with aliases replaced with their identifiers.
+        counts : :obj:`dict`
+            Number of replacements for each identifier found in the text.
+        """
+        idx = set()
+        for match in self.scanner.finditer(text):
+            idx.update(self.candidates[match.group(1).lower()])
+
+        counts = {}
+        for i_alias in sorted(idx):
+            text, n_matches = self.patterns[i_alias].subn(self.ids[i_alias], text)
+            if n_matches:
+                counts[self.ids[i_alias]] = counts.get(self.ids[i_alias], 0) + n_matches
+
+        return text, counts
+
+    def transform_texts(self, texts):
+        """Apply :meth:`transform` to each of a list of texts."""
+        return [self.transform(text) for text in texts]
+
+
 class CogAtLemmatizer(object):
     """Replace synonyms and abbreviations with Cognitive Atlas identifiers in text.
 
@@ -56,14 +164,8 @@ class CogAtLemmatizer(object):
         assert "name" in self.ontology_.columns
         assert "alias" in self.ontology_.columns
 
-        # Create regex dictionary
-        regex_dict = {}
-        for term in ontology_df["alias"].values:
-            term_for_regex = term.replace("(", r"\(").replace(")", r"\)")
-            regex = "\\b" + term_for_regex + "\\b"
-            pattern = re.compile(regex, re.MULTILINE | re.IGNORECASE)
-            regex_dict[term] = pattern
-        self.regex_ = regex_dict
+        self._matcher = _AliasMatcher(self.ontology_["alias"].values, self.ontology_["id"].values)
+        self.regex_ = dict(zip(self._matcher.aliases, self._matcher.patterns))
 
     def transform(self, text, convert_uk=True):
         """Replace terms in text with unique Cognitive Atlas identifiers.
@@ -85,16 +187,19 @@ class CogAtLemmatizer(object):
         if convert_uk:
             text = _uk_to_us(text)
 
-        for term_idx in self.ontology_.index:
-            term = self.ontology_["alias"].loc[term_idx]
-            term_id = self.ontology_["id"].loc[term_idx]
-            text = re.sub(self.regex_[term], term_id, text)
+        text, _ = self._matcher.transform(text)
         return text
 
 
-def extract_cogat(text_df, id_df=None, text_column="abstract"):
+def extract_cogat(text_df, id_df=None, text_column="abstract", n_cores=1):
     """Extract Cognitive Atlas terms and count instances using regular expressions.
 
+    .. versionchanged:: 0.5.1
+
+        * Count and replace all terms in each document in a single pass, instead of scanning
+          the whole corpus once per alias.
+        * New parameter: ``n_cores``.
+
     Parameters
     ----------
     text_df : (D x 2) :obj:`pandas.DataFrame`
@@ -110,6 +215,9 @@ def extract_cogat(text_df, id_df=None, text_column="abstract"):
 
     text_column : :obj:`str`, optional
         Name of column in text_df that contains text. Default is 'abstract'.
+    n_cores : :obj:`int`, optional
+        Number of cores to use for parallelization across documents.
+        If <=0, defaults to using all available cores. Default is 1.
 
     Returns
     -------
@@ -135,6 +243,7 @@ def extract_cogat(text_df, id_df=None, text_column="abstract"):
     nimare.extract.download_cognitive_atlas : This function will be called automatically if
                                               ``id_df`` is not provided.
     """
+    n_cores = _check_ncores(n_cores)
     text_df = text_df.copy()
     if id_df is None:
         cogat = download_cognitive_atlas()
@@ -146,23 +255,25 @@ def extract_cogat(text_df, id_df=None, text_column="abstract"):
     text_df[text_column] = text_df[text_column].fillna("")
     text_df[text_column] = text_df[text_column].apply(_uk_to_us)
 
-    # Create regex dictionary
-    regex_dict = {}
-    for term in id_df["alias"].values:
-        term_for_regex = term.replace("(", r"\(").replace(")", r"\)")
-        regex = "\\b" + term_for_regex + "\\b"
-        pattern = re.compile(regex, re.MULTILINE | re.IGNORECASE)
-        regex_dict[term] = pattern
-
-    # Count
+    # Count and replace all aliases in each document in a single pass
+    matcher = _AliasMatcher(id_df["alias"].values, id_df["id"].values)
+    texts = text_df[text_column].tolist()
+    chunks = [chunk.tolist() for chunk in np.array_split(np.arange(len(texts)), n_cores)]
+    results = Parallel(n_jobs=n_cores)(
+        delayed(matcher.transform_texts)([texts[i_text] for i_text in chunk])
+        for chunk in chunks
+        if len(chunk)
+    )
+    results = [result for chunk_results in results for result in chunk_results]
+
+    term_idx = {term_id: i_term for i_term, term_id in enumerate(gazetteer)}
     count_arr = np.zeros((text_df.shape[0], len(gazetteer)), int)
+    for i_text, (_, counts) in enumerate(results):
+        for term_id, count in counts.items():
+            count_arr[i_text, term_idx[term_id]] = count
+
     counts_df = pd.DataFrame(columns=gazetteer, index=text_df.index, data=count_arr)
-    for term_idx in id_df.index:
-        term = id_df["alias"].loc[term_idx]
-        term_id = id_df["id"].loc[term_idx]
-        pattern = regex_dict[term]
-        counts_df[term_id] += text_df[text_column].str.count(pattern).astype(int)
-        text_df[text_column] = text_df[text_column].str.replace(pattern, term_id, regex=True)
+    text_df[text_column] = [text for text, _ in results]
 
     return counts_df, text_df
 
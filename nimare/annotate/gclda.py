@@ -6,15 +6,296 @@ import os.path as op
 import nibabel as nib
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from nilearn._utils import load_niimg
-from scipy.stats import multivariate_normal
+from numba import jit
 
 from nimare.base import NiMAREBase
-from nimare.utils import get_template
+from nimare.utils import _check_ncores, get_template
 
 LGR = logging.getLogger(__name__)
 
 
+@jit(nopython=True, cache=True)
+def _sample_word_topic_assignments(
+    wtoken_word_idx,
+    wtoken_doc_idx,
+    wtoken_topic_idx,
+    n_word_tokens_word_by_topic,
+    total_n_word_tokens_by_topic,
+    n_word_tokens_doc_by_topic,
+    n_peak_tokens_doc_by_topic,
+    beta,
+    gamma,
+    randseed,
+):
+    """Sample new word->topic (z) assignments for all word tokens, in place.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    wtoken_word_idx, wtoken_doc_idx : (n_wtokens,) :obj:`numpy.ndarray` of int
+        Word-type and document indices of the word tokens.
+    wtoken_topic_idx : (n_wtokens,) :obj:`numpy.ndarray` of int
+        Current topic assignments of the word tokens. Updated in place.
+    n_word_tokens_word_by_topic : (W x T) :obj:`numpy.ndarray` of int
+        Updated in place.
+    total_n_word_tokens_by_topic : (1 x T) :obj:`numpy.ndarray` of int
+        Updated in place.
+    n_word_tokens_doc_by_topic : (D x T) :obj:`numpy.ndarray` of int
+        Updated in place.
+    n_peak_tokens_doc_by_topic : (D x T) :obj:`numpy.ndarray` of int
+    beta, gamma : :obj:`float`
+        Model hyperparameters.
+    randseed : :obj:`int`
+        Random seed for this iteration.
+    """
+    np.random.seed(randseed)
+    n_topics = n_word_tokens_word_by_topic.shape[1]
+    beta_sum = beta * n_word_tokens_word_by_topic.shape[0]
+    cdf = np.empty(n_topics)
+
+    for i_wtoken in range(wtoken_word_idx.shape[0]):
+        word = wtoken_word_idx[i_wtoken]
+        doc = wtoken_doc_idx[i_wtoken]
+        topic = wtoken_topic_idx[i_wtoken]
+
+        # Remove the current assignment from the count matrices
+        n_word_tokens_word_by_topic[word, topic] -= 1
+        total_n_word_tokens_by_topic[0, topic] -= 1
+        n_word_tokens_doc_by_topic[doc, topic] -= 1
+
+        # Unnormalized cdf of p(z_i|z,d,w) ~ p(w|t) * p(t|d)
+        running_total = 0.0
+        for j_topic in range(n_topics):
+            running_total += (
+                (n_word_tokens_word_by_topic[word, j_topic] + beta)
+                / (total_n_word_tokens_by_topic[0, j_topic] + beta_sum)
+                * (n_peak_tokens_doc_by_topic[doc, j_topic] + gamma)
+            )
+            cdf[j_topic] = running_total
+
+        # Inverse-cdf sampling: z = # elements of cdf less than rand-sample
+        random_threshold = np.random.random() * running_total
+        topic = 0
+        while topic < n_topics - 1 and cdf[topic] < random_threshold:
+            topic += 1
+
+        wtoken_topic_idx[i_wtoken] = topic
+        n_word_tokens_word_by_topic[word, topic] += 1
+        total_n_word_tokens_by_topic[0, topic] += 1
+        n_word_tokens_doc_by_topic[doc, topic] += 1
+
+
+@jit(nopython=True, cache=True)
+def _sample_peak_assignments(
+    peak_probs,
+    ptoken_doc_idx,
+    peak_topic_idx,
+    peak_region_idx,
+    n_peak_tokens_region_by_topic,
+    n_peak_tokens_doc_by_topic,
+    n_word_tokens_doc_by_topic,
+    alpha,
+    gamma,
+    delta,
+    randseed,
+):
+    """Sample new peak->topic (y) and peak->subregion (r) assignments for all peaks, in place.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    peak_probs : (P x T x R) :obj:`numpy.ndarray`
+        Probability of each peak given each topic's subregions: p(x|r,t).
+    ptoken_doc_idx : (P,) :obj:`numpy.ndarray` of int
+        Document indices of the peak tokens.
+    peak_topic_idx, peak_region_idx : (P,) :obj:`numpy.ndarray` of int
+        Current topic and subregion assignments of the peak tokens. Updated in place.
+    n_peak_tokens_region_by_topic : (R x T) :obj:`numpy.ndarray` of int
+        Updated in place.
+    n_peak_tokens_doc_by_topic : (D x T) :obj:`numpy.ndarray` of int
+        Updated in place.
+    n_word_tokens_doc_by_topic : (D x T) :obj:`numpy.ndarray` of int
+    alpha, gamma, delta : :obj:`float`
+        Model hyperparameters.
+    randseed : :obj:`int`
+        Random seed for this iteration.
+    """
+    np.random.seed(randseed)
+    n_regions, n_topics = n_peak_tokens_region_by_topic.shape
+    delta_sum = delta * n_regions
+
+    # Number of peaks assigned to each topic (column sums of the region-by-topic counts)
+    n_peak_tokens_by_topic = np.zeros(n_topics)
+    for j_region in range(n_regions):
+        for k_topic in range(n_topics):
+            n_peak_tokens_by_topic[k_topic] += n_peak_tokens_region_by_topic[j_region, k_topic]
+
+    p_peak_g_topic = np.empty(n_topics)
+    cdf = np.empty(n_regions * n_topics)
+
+    for i_ptoken in range(ptoken_doc_idx.shape[0]):
+        doc = ptoken_doc_idx[i_ptoken]
+        topic = peak_topic_idx[i_ptoken]
+        region = peak_region_idx[i_ptoken]
+
+        # Remove the current assignment from the count matrices
+        n_peak_tokens_region_by_topic[region, topic] -= 1
+        n_peak_tokens_doc_by_topic[doc, topic] -= 1
+        n_peak_tokens_by_topic[topic] -= 1
+
+        # Multinomial probability p(z|y), computed in log-space and shifted by its maximum
+        # to avoid underflow
+        max_logp = -np.inf
+        for k_topic in range(n_topics):
+            n_doc_topic = n_peak_tokens_doc_by_topic[doc, k_topic] + gamma
+            logp = n_word_tokens_doc_by_topic[doc, k_topic] * np.log(
+                (n_doc_topic + 1) / n_doc_topic
+            )
+            p_peak_g_topic[k_topic] = logp
+            if logp > max_logp:
+                max_logp = logp
+
+        for k_topic in range(n_topics):
+            p_peak_g_topic[k_topic] = np.exp(p_peak_g_topic[k_topic] - max_logp) * (
+                n_peak_tokens_doc_by_topic[doc, k_topic] + alpha
+            )
+
+        # Unnormalized cdf of p(x|r,t) * p(r|t) * p(t|d) * p(z|y),
+        # flattened in (R x T) row-major order
+        running_total = 0.0
+        for j_region in range(n_regions):
+            for k_topic in range(n_topics):
+                running_total += (
+                    peak_probs[i_ptoken, k_topic, j_region]
+                    * (n_peak_tokens_region_by_topic[j_region, k_topic] + delta)
+                    / (n_peak_tokens_by_topic[k_topic] + delta_sum)
+                    * p_peak_g_topic[k_topic]
+                )
+                cdf[j_region * n_topics + k_topic] = running_total
+
+        # Inverse-cdf sampling of a single y/r combination
+        random_threshold = np.random.random() * running_total
+        assignment = 0
+        while assignment < cdf.shape[0] - 1 and cdf[assignment] < random_threshold:
+            assignment += 1
+
+        region = assignment // n_topics
+        topic = assignment % n_topics
+
+        n_peak_tokens_region_by_topic[region, topic] += 1
+        n_peak_tokens_doc_by_topic[doc, topic] += 1
+        n_peak_tokens_by_topic[topic] += 1
+        peak_topic_idx[i_ptoken] = topic
+        peak_region_idx[i_ptoken] = region
+
+
+def _sample_partition(data, topics, peak_probs, params, seeds):
+    """Run approximate distributed (AD-LDA) sampling sweeps over a partition of documents.
+
+    .. versionadded:: 0.5.1
+
+    The partition's documents are sampled against a local copy of the global (word-by-topic and
+    region-by-topic) counts, which is only synchronized with the other partitions after the
+    sweeps are finished.
+
+    Parameters
+    ----------
+    data : :obj:`dict`
+        Token indices for the partition, with documents indexed locally.
+    topics : :obj:`dict`
+        Assignments for the partition's tokens, the document-level counts for the partition's
+        documents, and copies of the global counts. Updated in place.
+    peak_probs : (P x T x R) :obj:`numpy.ndarray`
+        Probability of each of the partition's peaks given each topic's subregions.
+    params : :obj:`dict`
+        Model hyperparameters.
+    seeds : :obj:`list` of :obj:`int`
+        Random seeds, two per sweep.
+
+    Returns
+    -------
+    topics : :obj:`dict`
+        The updated assignments and counts.
+    """
+    for i_sweep in range(len(seeds) // 2):
+        _sample_word_topic_assignments(
+            data["wtoken_word_idx"],
+            data["wtoken_doc_idx"],
+            topics["wtoken_topic_idx"],
+            topics["n_word_tokens_word_by_topic"],
+            topics["total_n_word_tokens_by_topic"],
+            topics["n_word_tokens_doc_by_topic"],
+            topics["n_peak_tokens_doc_by_topic"],
+            float(params["beta"]),
+            float(params["gamma"]),
+            seeds[2 * i_sweep],
+        )
+        _sample_peak_assignments(
+            peak_probs,
+            data["ptoken_doc_idx"],
+            topics["peak_topic_idx"],
+            topics["peak_region_idx"],
+            topics["n_peak_tokens_region_by_topic"],
+            topics["n_peak_tokens_doc_by_topic"],
+            topics["n_word_tokens_doc_by_topic"],
+            float(params["alpha"]),
+            float(params["gamma"]),
+            float(params["delta"]),
+            seeds[2 * i_sweep + 1],
+        )
+
+    return topics
+
+
+def _compute_gaussian_pdfs(coords, regions_mu, regions_sigma, chunk_size=1024):
+    """Evaluate all topic/subregion Gaussians at a set of coordinates.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    coords : (N x D) :obj:`numpy.ndarray`
+        Coordinates at which to evaluate the densities.
+    regions_mu : (T x R x 1 x D) :obj:`numpy.ndarray`
+        Means of the subregions of all topics.
+    regions_sigma : (T x R x D x D) :obj:`numpy.ndarray`
+        Covariance matrices of the subregions of all topics.
+    chunk_size : :obj:`int`, optional
+        Number of coordinates evaluated at once, which bounds the memory used by intermediate
+        (chunk_size x T x R x D) arrays. Default is 1024.
+
+    Returns
+    -------
+    pdfs : (N x T x R) :obj:`numpy.ndarray`
+        Probability density of each coordinate under each topic's subregions.
+    """
+    coords = np.asarray(coords, dtype=float)
+    n_dims = coords.shape[1]
+    mu = regions_mu[:, :, 0, :]
+
+    # Batched Cholesky factors (Sigma = L L^T) give both the inverse and the log-determinant
+    chol = np.linalg.cholesky(regions_sigma)
+    chol_inv = np.linalg.inv(chol)
+    log_norm = -0.5 * n_dims * np.log(2 * np.pi) - np.sum(
+        np.log(np.diagonal(chol, axis1=-2, axis2=-1)), axis=-1
+    )
+
+    pdfs = np.empty((coords.shape[0],) + mu.shape[:2])
+    for start in range(0, coords.shape[0], chunk_size):
+        diff = coords[start : start + chunk_size, None, None, :] - mu[None, ...]
+        # Whitened residuals: z = L^-1 (x - mu), so the Mahalanobis distance is |z|^2
+        whitened = np.einsum("trij,ntrj->ntri", chol_inv, diff)
+        pdfs[start : start + chunk_size] = np.exp(
+            log_norm[None, ...] - 0.5 * np.sum(whitened**2, axis=-1)
+        )
+
+    return pdfs
+
+
 class GCLDAModel(NiMAREBase):
     """Generate a generalized correspondence latent Dirichlet allocation (GCLDA) topic model.
 
@@ -203,9 +484,9 @@ class GCLDAModel(NiMAREBase):
         widx_df.sort_values(by=["docidx", "widx"], inplace=True)
 
         # List of document-indices for word-tokens
-        self.data["wtoken_doc_idx"] = widx_df["docidx"].tolist()
+        self.data["wtoken_doc_idx"] = widx_df["docidx"].values.astype(np.int32)
         # List of word-indices for word-tokens
-        self.data["wtoken_word_idx"] = widx_df["widx"].tolist()
+        self.data["wtoken_word_idx"] = widx_df["widx"].values.astype(np.int32)
 
         # Import all peak-indices into lists
         coordinates_df["docidx"] = coordinates_df["id"].astype(str).map(docidx_mapper)
@@ -213,7 +494,7 @@ class GCLDAModel(NiMAREBase):
         coordinates_df["docidx"] = coordinates_df["docidx"].astype(int)
 
         # List of document-indices for peak-tokens x
-        self.data["ptoken_doc_idx"] = coordinates_df["docidx"].tolist()
+        self.data["ptoken_doc_idx"] = coordinates_df["docidx"].values.astype(np.int32)
         self.data["ptoken_coords"] = coordinates_df[["x", "y", "z"]].values
 
         # Seed random number generator
@@ -221,46 +502,50 @@ class GCLDAModel(NiMAREBase):
 
         # Preallocate vectors of assignment indices
         # word->topic assignments
-        self.topics["wtoken_topic_idx"] = np.zeros(len(self.data["wtoken_word_idx"]), dtype=int)
+        self.topics["wtoken_topic_idx"] = np.zeros(
+            len(self.data["wtoken_word_idx"]),
+            dtype=np.int32,
+        )
 
         # Randomly initialize peak->topic assignments (y) ~ unif(1...n_topics)
         self.topics["peak_topic_idx"] = np.random.randint(
             self.params["n_topics"],
             size=(len(self.data["ptoken_doc_idx"])),
-        )
+        ).astype(np.int32)
 
         # peak->region assignments
-        self.topics["peak_region_idx"] = np.zeros(len(self.data["ptoken_doc_idx"]), dtype=int)
+        self.topics["peak_region_idx"] = np.zeros(len(self.data["ptoken_doc_idx"]), dtype=np.int32)
 
         # Preallocate count matrices
+        # These are contiguous int32 arrays, which are updated in place by the compiled samplers
         # Peaks: D x T: Number of peak-tokens assigned to each topic per document
         self.topics["n_peak_tokens_doc_by_topic"] = np.zeros(
             (len(self.ids), self.params["n_topics"]),
-            dtype=int,
+            dtype=np.int32,
         )
 
         # Peaks: R x T: Number of peak-tokens assigned to each subregion per topic
         self.topics["n_peak_tokens_region_by_topic"] = np.zeros(
             (self.params["n_regions"], self.params["n_topics"]),
-            dtype=int,
+            dtype=np.int32,
         )
 
         # Words: W x T: Number of word-tokens assigned to each topic per word-type
         self.topics["n_word_tokens_word_by_topic"] = np.zeros(
             (len(self.vocabulary), self.params["n_topics"]),
-            dtype=int,
+            dtype=np.int32,
         )
 
         # Words: D x T: Number of word-tokens assigned to each topic per document
         self.topics["n_word_tokens_doc_by_topic"] = np.zeros(
             (len(self.ids), self.params["n_topics"]),
-            dtype=int,
+            dtype=np.int32,
         )
 
         # Words: 1 x T: Total number of word-tokens assigned to each topic (across all docs)
         self.topics["total_n_word_tokens_by_topic"] = np.zeros(
             (1, self.params["n_topics"]),
-            dtype=int,
+            dtype=np.int32,
         )
 
         # Preallocate Gaussians for all subregions
@@ -354,9 +639,14 @@ class GCLDAModel(NiMAREBase):
             self.topics["total_n_word_tokens_by_topic"][0, topic] += 1
             self.topics["n_word_tokens_doc_by_topic"][doc, topic] += 1
 
-    def fit(self, n_iters=5000, loglikely_freq=10):
+    def fit(self, n_iters=5000, loglikely_freq=10, n_cores=1, sync_freq=1):
         """Run multiple iterations.
 
+        .. versionchanged:: 0.5.1
+
+            [ENH] Add ``n_cores`` and ``sync_freq`` parameters for approximate distributed
+            sampling.
+
         .. versionchanged:: 0.0.8
 
             [ENH] Remove ``verbose`` parameter.
@@ -368,7 +658,36 @@ class GCLDAModel(NiMAREBase):
         loglikely_freq : :obj:`int`, optional
             The frequency with which log-likelihood is updated. Default value
             is 1 (log-likelihood is updated every iteration).
+        n_cores : :obj:`int`, optional
+            Number of cores to use for sampling. If <=0, defaults to using all available cores.
+            If 1, the exact (serial) collapsed Gibbs sampler is used.
+            Otherwise, documents are partitioned across processes and sampled with the
+            approximate distributed LDA (AD-LDA) scheme :footcite:p:`newman2009distributed`,
+            in which each process samples against a local copy of the global topic counts.
+            Default is 1.
+
+            .. versionadded:: 0.5.1
+        sync_freq : :obj:`int`, optional
+            Number of iterations each process runs between synchronizations of the global
+            counts, when ``n_cores`` > 1. Spatial parameters are updated at each
+            synchronization. The counts are also synchronized whenever the log-likelihood is
+            updated. Default is 1 (synchronize every iteration).
+
+            .. versionadded:: 0.5.1
+
+        Notes
+        -----
+        Parallel sampling results depend on ``n_cores`` and ``sync_freq``, and are only
+        reproducible for fixed values of both.
+
+        References
+        ----------
+        .. footbibliography::
         """
+        n_cores = _check_ncores(n_cores)
+        if sync_freq < 1:
+            raise ValueError(f"sync_freq must be a positive integer, not {sync_freq}.")
+
         if self.iter == 0:
             # Get Initial Spatial Parameter Estimates
             self._update_regions()
@@ -377,8 +696,19 @@ class GCLDAModel(NiMAREBase):
             # variables tracking loglikely
             self.compute_log_likelihood()
 
-        for i in range(self.iter, n_iters):
-            self._update(loglikely_freq=loglikely_freq)
+        if n_cores == 1:
+            for i in range(self.iter, n_iters):
+                self._update(loglikely_freq=loglikely_freq)
+        else:
+            doc_partitions = self._partition_documents(n_cores)
+            with Parallel(n_jobs=n_cores) as parallel:
+                while self.iter < n_iters:
+                    self._update_parallel(
+                        parallel,
+                        doc_partitions,
+                        n_sweeps=min(sync_freq, n_iters - self.iter),
+                        loglikely_freq=loglikely_freq,
+                    )
 
         # TODO: Handle this more elegantly
         (
@@ -421,170 +751,209 @@ class GCLDAModel(NiMAREBase):
         # Only update log-likelihood every 'loglikely_freq' iterations
         # (Computing log-likelihood isn't necessary and slows things down a bit)
         if self.iter % loglikely_freq == 0:
-            LGR.debug(f"Iter {self.iter:04d}: Computing log-likelihood")
+            self._report_log_likelihood()
 
-            # Compute log-likelihood of model in current state
-            self.compute_log_likelihood()
-            LGR.info(
-                f"Iter {self.iter:04d} Log-likely: x = {self.loglikelihood['x'][-1]:10.1f}, "
-                f"w = {self.loglikelihood['w'][-1]:10.1f}, "
-                f"tot = {self.loglikelihood['total'][-1]:10.1f}"
-            )
+    def _update_parallel(self, parallel, doc_partitions, n_sweeps=1, loglikely_freq=1):
+        """Run ``n_sweeps`` update cycles with approximate distributed sampling.
 
-    def _update_word_topic_assignments(self, randseed):
-        """Update wtoken_topic_idx (z) indicator variables assigning words->topics.
+        .. versionadded:: 0.5.1
 
         Parameters
         ----------
-        randseed : :obj:`int`
-            Random seed for this iteration.
+        parallel : :obj:`joblib.Parallel`
+            Pool of workers to use.
+        doc_partitions : :obj:`list` of :obj:`numpy.ndarray`
+            Sorted indices of the documents in each partition.
+        n_sweeps : :obj:`int`, optional
+            Number of sampling sweeps each worker runs before the counts are synchronized.
+            Default is 1.
+        loglikely_freq : :obj:`int`, optional
+            The frequency with which log-likelihood is updated. Default is 1.
+            The counts are also synchronized at every multiple of ``loglikely_freq``,
+            so that the log-likelihood is computed at the same iterations as in serial mode.
         """
-        # --- Seed random number generator
-        np.random.seed(randseed)
+        while n_sweeps > 0:
+            n_window = min(n_sweeps, loglikely_freq - self.iter % loglikely_freq)
+            self._sample_partitions(parallel, doc_partitions, n_sweeps=n_window)
+            n_sweeps -= n_window
 
-        # Loop over all word tokens
-        for i_wtoken, word in enumerate(self.data["wtoken_word_idx"]):
-            # Find document in which word token (not just word) appears
-            doc = self.data["wtoken_doc_idx"][i_wtoken]
-            # current topic assignment for word token w_i
-            topic = self.topics["wtoken_topic_idx"][i_wtoken]
-
-            # Decrement count-matrices to remove current wtoken_topic_idx
-            # because wtoken will be reassigned to a new topic
-            self.topics["n_word_tokens_word_by_topic"][word, topic] -= 1
-            self.topics["total_n_word_tokens_by_topic"][0, topic] -= 1
-            self.topics["n_word_tokens_doc_by_topic"][doc, topic] -= 1
-
-            # Get sampling distribution:
-            #    p(z_i|z,d,w) ~ p(w|t) * p(t|d)
-            #                 ~ p_w_t * p_topic_g_doc
-            p_word_g_topic = (
-                self.topics["n_word_tokens_word_by_topic"][word, :] + self.params["beta"]
-            ) / (
-                self.topics["total_n_word_tokens_by_topic"]
-                + (self.params["beta"] * len(self.vocabulary))
-            )
-            p_topic_g_doc = (
-                self.topics["n_peak_tokens_doc_by_topic"][doc, :] + self.params["gamma"]
-            )
-            probs = p_word_g_topic * p_topic_g_doc  # The unnormalized sampling distribution
-
-            # Sample a z_i assignment for the current word-token from the sampling distribution
-            probs = np.squeeze(probs) / np.sum(probs)  # Normalize the sampling distribution
-            # Numpy returns a binary [1 x T] vector with a '1' in the index of sampled topic
-            # and zeros everywhere else
-            assigned_topic_vec = np.random.multinomial(1, probs)
-            # Extract selected topic from vector
-            topic = np.where(assigned_topic_vec)[0][0]
-
-            # Update the indices and the count matrices using the sampled z assignment
-            self.topics["wtoken_topic_idx"][i_wtoken] = topic  # Update w_i topic-assignment
-            self.topics["n_word_tokens_word_by_topic"][word, topic] += 1
-            self.topics["total_n_word_tokens_by_topic"][0, topic] += 1
-            self.topics["n_word_tokens_doc_by_topic"][doc, topic] += 1
+            # Only update log-likelihood every 'loglikely_freq' iterations
+            if self.iter % loglikely_freq == 0:
+                self._report_log_likelihood()
 
-    def _update_peak_assignments(self, randseed):
-        """Update y / r indicator variables assigning peaks->topics/subregions.
+    def _sample_partitions(self, parallel, doc_partitions, n_sweeps=1):
+        """Run ``n_sweeps`` sampling sweeps on each partition, then synchronize the counts.
+
+        .. versionadded:: 0.5.1
 
         Parameters
         ----------
-        randseed : :obj:`int`
-            Random seed for this iteration.
+        parallel : :obj:`joblib.Parallel`
+            Pool of workers to use.
+        doc_partitions : :obj:`list` of :obj:`numpy.ndarray`
+            Sorted indices of the documents in each partition.
+        n_sweeps : :obj:`int`, optional
+            Number of sampling sweeps each worker runs before the counts are synchronized.
+            Default is 1.
         """
-        # Seed random number generator
-        np.random.seed(randseed)
+        self.iter += n_sweeps
+        LGR.debug(f"Iter {self.iter:04d}: Sampling z and y|r in {len(doc_partitions)} partitions")
 
-        # Retrieve p(x|r,y) for all subregions
+        wtoken_word_idx = np.asarray(self.data["wtoken_word_idx"], dtype=np.int32)
+        wtoken_doc_idx = np.asarray(self.data["wtoken_doc_idx"], dtype=np.int32)
+        ptoken_doc_idx = np.asarray(self.data["ptoken_doc_idx"], dtype=np.int32)
         peak_probs = self._get_peak_probs(self)
+        global_keys = [
+            "n_word_tokens_word_by_topic",
+            "total_n_word_tokens_by_topic",
+            "n_peak_tokens_region_by_topic",
+        ]
+
+        jobs, token_idx = [], []
+        for i_part, docs in enumerate(doc_partitions):
+            wtoken_idx = np.where(np.isin(wtoken_doc_idx, docs))[0]
+            ptoken_idx = np.where(np.isin(ptoken_doc_idx, docs))[0]
+            token_idx.append((wtoken_idx, ptoken_idx))
+            data = {
+                "wtoken_word_idx": wtoken_word_idx[wtoken_idx],
+                "wtoken_doc_idx": np.searchsorted(docs, wtoken_doc_idx[wtoken_idx]).astype(
+                    np.int32
+                ),
+                "ptoken_doc_idx": np.searchsorted(docs, ptoken_doc_idx[ptoken_idx]).astype(
+                    np.int32
+                ),
+            }
+            topics = {
+                "wtoken_topic_idx": self.topics["wtoken_topic_idx"][wtoken_idx],
+                "peak_topic_idx": self.topics["peak_topic_idx"][ptoken_idx],
+                "peak_region_idx": self.topics["peak_region_idx"][ptoken_idx],
+                "n_word_tokens_doc_by_topic": self.topics["n_word_tokens_doc_by_topic"][docs],
+                "n_peak_tokens_doc_by_topic": self.topics["n_peak_tokens_doc_by_topic"][docs],
+            }
+            topics.update({key: self.topics[key].copy() for key in global_keys})
+            # Two seeds (z and y|r) per sweep per partition
+            seeds = [
+                self.seed + 1 + (i_sweep * len(doc_partitions) + i_part) * 2 + j
+                for i_sweep in range(n_sweeps)
+                for j in range(2)
+            ]
+            jobs.append(
+                delayed(_sample_partition)(
+                    data,
+                    topics,
+                    np.ascontiguousarray(peak_probs[ptoken_idx]),
+                    self.params,
+                    seeds,
+                )
+            )
+        self.seed += 2 * n_sweeps * len(doc_partitions)
+
+        # Merge the partitions' assignments and count deltas
+        global_counts = {key: self.topics[key].copy() for key in global_keys}
+        for docs, (wtoken_idx, ptoken_idx), topics in zip(
+            doc_partitions, token_idx, parallel(jobs)
+        ):
+            self.topics["wtoken_topic_idx"][wtoken_idx] = topics["wtoken_topic_idx"]
+            self.topics["peak_topic_idx"][ptoken_idx] = topics["peak_topic_idx"]
+            self.topics["peak_region_idx"][ptoken_idx] = topics["peak_region_idx"]
+            self.topics["n_word_tokens_doc_by_topic"][docs] = topics["n_word_tokens_doc_by_topic"]
+            self.topics["n_peak_tokens_doc_by_topic"][docs] = topics["n_peak_tokens_doc_by_topic"]
+            for key in global_keys:
+                self.topics[key] += topics[key] - global_counts[key]
 
-        # Iterate over all peaks x, and sample a new y and r assignment for each
-        for i_ptoken, doc in enumerate(self.data["ptoken_doc_idx"]):
-            topic = self.topics["peak_topic_idx"][i_ptoken]
-            region = self.topics["peak_region_idx"][i_ptoken]
+        LGR.debug(f"Iter {self.iter:04d}: Updating spatial params")
+        self._update_regions()
 
-            # Decrement count-matrices to remove current ptoken_topic_idx
-            # because ptoken will be reassigned to a new topic
-            self.topics["n_peak_tokens_region_by_topic"][region, topic] -= 1
-            self.topics["n_peak_tokens_doc_by_topic"][doc, topic] -= 1
+    def _partition_documents(self, n_partitions):
+        """Split documents into contiguous partitions with similar numbers of tokens.
 
-            # Retrieve the probability of generating current x from all
-            # subregions: [R x T] array of probs
-            p_x_subregions = (peak_probs[i_ptoken, :, :]).transpose()
+        .. versionadded:: 0.5.1
 
-            # Compute the probabilities of all subregions given doc
-            #     p(r|d) ~ p(r|t) * p(t|d)
-            # Counts of subregions per topic + prior: p(r|t)
-            p_region_g_topic = self.topics["n_peak_tokens_region_by_topic"] + self.params["delta"]
+        Parameters
+        ----------
+        n_partitions : :obj:`int`
+            Maximum number of partitions.
 
-            # Normalize the columns such that each topic's distribution over subregions sums to 1
-            p_region_g_topic = p_region_g_topic / np.sum(p_region_g_topic, axis=0, keepdims=True)
+        Returns
+        -------
+        doc_partitions : :obj:`list` of :obj:`numpy.ndarray`
+            Sorted indices of the documents in each non-empty partition.
+        """
+        n_docs = len(self.ids)
+        n_tokens = np.bincount(self.data["wtoken_doc_idx"], minlength=n_docs) + np.bincount(
+            self.data["ptoken_doc_idx"], minlength=n_docs
+        )
+        # Assign each document to a partition based on its position in the cumulative token count
+        cumulative = np.cumsum(n_tokens) - n_tokens
+        partition_idx = np.floor(n_partitions * cumulative / n_tokens.sum()).astype(int)
+        doc_partitions = [np.where(partition_idx == i)[0] for i in range(n_partitions)]
+        return [docs for docs in doc_partitions if docs.size]
+
+    def _report_log_likelihood(self):
+        """Compute and log the log-likelihood of the model in its current state."""
+        LGR.debug(f"Iter {self.iter:04d}: Computing log-likelihood")
+
+        # Compute log-likelihood of model in current state
+        self.compute_log_likelihood()
+        LGR.info(
+            f"Iter {self.iter:04d} Log-likely: x = {self.loglikelihood['x'][-1]:10.1f}, "
+            f"w = {self.loglikelihood['w'][-1]:10.1f}, "
+            f"tot = {self.loglikelihood['total'][-1]:10.1f}"
+        )
 
-            # Counts of topics per document + prior: p(t|d)
-            p_topic_g_doc = (
-                self.topics["n_peak_tokens_doc_by_topic"][doc, :] + self.params["alpha"]
-            )
+    def _update_word_topic_assignments(self, randseed):
+        """Update wtoken_topic_idx (z) indicator variables assigning words->topics.
 
-            # Reshape from (ntopics,) to (nregions, ntopics) with duplicated rows
-            # Makes it the same shape as p_region_g_topic
-            p_topic_g_doc = np.array([p_topic_g_doc] * self.params["n_regions"])
-
-            # Compute p(subregion | document): p(r|d) ~ p(r|t) * p(t|d)
-            # [R x T] array of probs
-            p_region_g_doc = p_topic_g_doc * p_region_g_topic
-
-            # Compute the multinomial probability: p(z|y)
-            # Need the current vector of all z and y assignments for current doc
-            # The multinomial from which z is sampled is proportional to number
-            # of y assigned to each topic, plus constant gamma
-            # Compute the proportional probabilities in log-space
-            logp = self.topics["n_word_tokens_doc_by_topic"][doc, :] * np.log(
-                (self.topics["n_peak_tokens_doc_by_topic"][doc, :] + self.params["gamma"] + 1)
-                / (self.topics["n_peak_tokens_doc_by_topic"][doc, :] + self.params["gamma"])
-            )
-            # Add a constant before exponentiating to avoid any underflow issues
-            p_peak_g_topic = np.exp(logp - np.max(logp))
+        .. versionchanged:: 0.5.1
 
-            # Reshape from (ntopics,) to (nregions, ntopics) with duplicated rows
-            p_peak_g_topic = np.array([p_peak_g_topic] * self.params["n_regions"])
+            [ENH] Sample with a compiled kernel instead of looping over tokens in Python.
 
-            # Get the full sampling distribution:
-            # [R x T] array containing the proportional probability of all y/r combinations
-            probs_pdf = p_x_subregions * p_region_g_doc * p_peak_g_topic
+        Parameters
+        ----------
+        randseed : :obj:`int`
+            Random seed for this iteration.
+        """
+        _sample_word_topic_assignments(
+            np.asarray(self.data["wtoken_word_idx"], dtype=np.int32),
+            np.asarray(self.data["wtoken_doc_idx"], dtype=np.int32),
+            self.topics["wtoken_topic_idx"],
+            self.topics["n_word_tokens_word_by_topic"],
+            self.topics["total_n_word_tokens_by_topic"],
+            self.topics["n_word_tokens_doc_by_topic"],
+            self.topics["n_peak_tokens_doc_by_topic"],
+            float(self.params["beta"]),
+            float(self.params["gamma"]),
+            randseed,
+        )
 
-            # Convert from a [R x T] matrix into a [R*T x 1] array we can sample from
-            probs_pdf = np.reshape(probs_pdf, (self.params["n_regions"] * self.params["n_topics"]))
+    def _update_peak_assignments(self, randseed):
+        """Update y / r indicator variables assigning peaks->topics/subregions.
 
-            # Normalize the sampling distribution
-            probs_pdf = probs_pdf / np.sum(probs_pdf)
+        .. versionchanged:: 0.5.1
 
-            # Sample a single element (corresponding to a y_i and c_i assignment for the ptoken)
-            # from the sampling distribution
-            # Returns a binary [1 x R*T] vector with a '1' in location that was sampled
-            # and zeros everywhere else
-            assignment_vec = np.random.multinomial(1, probs_pdf)
+            [ENH] Sample with a compiled kernel instead of looping over tokens in Python.
 
-            # Reshape 1D back to [R x T] 2D
-            assignment_arr = np.reshape(
-                assignment_vec,
-                (self.params["n_regions"], self.params["n_topics"]),
-            )
-            # Transform the linear index of the sampled element into the
-            # subregion/topic (r/y) assignment indices
-            assignment_idx = np.where(assignment_arr)
-            # Subregion sampled (r)
-            region = assignment_idx[0][0]
-            # Topic sampled (y)
-            topic = assignment_idx[1][0]
-
-            # Update the indices and the count matrices using the sampled y/r assignments
-            # Increment count in Subregion x Topic count matrix
-            self.topics["n_peak_tokens_region_by_topic"][region, topic] += 1
-            # Increment count in Document x Topic count matrix
-            self.topics["n_peak_tokens_doc_by_topic"][doc, topic] += 1
-            # Update y->topic assignment
-            self.topics["peak_topic_idx"][i_ptoken] = topic
-            # Update y->subregion assignment
-            self.topics["peak_region_idx"][i_ptoken] = region
+        Parameters
+        ----------
+        randseed : :obj:`int`
+            Random seed for this iteration.
+        """
+        # Retrieve p(x|r,y) for all subregions
+        peak_probs = self._get_peak_probs(self)
+
+        _sample_peak_assignments(
+            np.ascontiguousarray(peak_probs, dtype=float),
+            np.asarray(self.data["ptoken_doc_idx"], dtype=np.int32),
+            self.topics["peak_topic_idx"],
+            self.topics["peak_region_idx"],
+            self.topics["n_peak_tokens_region_by_topic"],
+            self.topics["n_peak_tokens_doc_by_topic"],
+            self.topics["n_word_tokens_doc_by_topic"],
+            float(self.params["alpha"]),
+            float(self.params["gamma"]),
+            float(self.params["delta"]),
+            randseed,
+        )
 
     def _update_regions(self):
         """Update spatial distribution parameters (Gaussians params for all subregions).
@@ -723,10 +1092,20 @@ class GCLDAModel(NiMAREBase):
         using the method described in :footcite:t:`newman2009distributed`.
         Note that this is not computing the joint log-likelihood of model parameters and data.
 
+        .. versionchanged:: 0.5.1
+
+            * [ENH] Compute the log-likelihoods of all tokens at once, instead of looping over
+              tokens.
+            * [FIX] Index documents and word-types with the model's 0-based indices.
+            * [FIX] Use the tokens of ``model``, rather than the current model's, when an
+              external model is provided. Its documents and words are matched to the current
+              model's by ID and word.
+
         Parameters
         ----------
         model : :obj:`~nimare.annotate.gclda.GCLDAModel`, optional
             The model for which log-likelihoods will be calculated.
+            Its documents and words must all be in the current model.
             If not provided, log-likelihood will be calculated for the current model (self).
             Default is None.
         update_vectors : :obj:`bool`, optional
@@ -752,6 +1131,20 @@ class GCLDAModel(NiMAREBase):
             LGR.info("External model detected: Disabling update_vectors")
             update_vectors = False
 
+        # The model's token indices refer to its own documents and vocabulary, which may be
+        # a subset of the current model's, in a different order
+        docidx_mapper = {id_: i for (i, id_) in enumerate(self.ids)}
+        widx_mapper = {word: i for (i, word) in enumerate(self.vocabulary)}
+        missing_ids = [id_ for id_ in model.ids if id_ not in docidx_mapper]
+        missing_words = [word for word in model.vocabulary if word not in widx_mapper]
+        if missing_ids or missing_words:
+            raise ValueError(
+                "All documents and words of the model must be in the current model. "
+                f"Missing documents: {missing_ids}. Missing words: {missing_words}."
+            )
+        model_docidx = np.array([docidx_mapper[id_] for id_ in model.ids], dtype=int)
+        model_widx = np.array([widx_mapper[word] for word in model.vocabulary], dtype=int)
+
         # Pre-compute all probabilities from count matrices that are needed
         # for loglikelihood computations
         # Compute docprobs for y = ND x NT: p( y_i=t | d )
@@ -780,56 +1173,26 @@ class GCLDAModel(NiMAREBase):
         peak_probs = self._get_peak_probs(model)
 
         # Compute observed peaks (x) Loglikelihood:
-        # p(x|model, doc) = p(topic|doc) * p(subregion|topic) * p(x|subregion)
+        # p(x|model, doc) = sum_r sum_t ( p(topic|doc) * p(subregion|topic) * p(x|subregion) )
         #                 = p_topic_g_doc * p_region_g_topic * p_x_r
-        # Initialize variable tracking total loglikelihood of all x tokens
-        x_loglikely = 0
-
-        # Go over all observed peaks and add p(x|model) to running total
-        for i_ptoken in range(len(self.data["ptoken_doc_idx"])):
-            doc = self.data["ptoken_doc_idx"][i_ptoken] - 1  # convert didx from 1-idx to 0-idx
-            p_x = 0  # Running total for p(x|d) across subregions:
-            # Compute p(x_i|d) for each subregion separately and then
-            # sum across the subregions
-            for j_region in range(self.params["n_regions"]):
-                # p(t|d) - p(topic|doc)
-                p_topic_g_doc = docprobs_y[doc]
-
-                # p(r|t) - p(subregion|topic)
-                p_region_g_topic = regionprobs[j_region]
-
-                # p(r|d) - p(subregion|document) = p(topic|doc)*p(subregion|topic)
-                p_region_g_doc = p_topic_g_doc * p_region_g_topic
-
-                # p(x|r) - p(x|subregion)
-                p_x_r = peak_probs[i_ptoken, :, j_region]
-
-                # p(x|subregion,doc) = sum_topics ( p(subregion|doc) * p(x|subregion) )
-                p_x_rd = np.dot(p_region_g_doc, p_x_r)
-                p_x += p_x_rd  # Add probability for current subregion to total
-                # probability for token across subregions
-            # Add probability for current token to running total for all x tokens
-            x_loglikely += np.log(p_x)
+        ptoken_doc_idx = model_docidx[model.data["ptoken_doc_idx"]]
+        p_x = np.einsum(
+            "pt,ptr,rt->p",
+            docprobs_y[ptoken_doc_idx],
+            peak_probs,
+            regionprobs,
+        )
+        x_loglikely = np.sum(np.log(p_x))
 
         # Compute observed words (w) Loglikelihoods:
         # p(w|model, doc) = p(topic|doc) * p(word|topic)
         #                 = p_topic_g_doc * p_w_t
-        w_loglikely = 0  # Initialize variable tracking total loglikelihood of all w tokens
-
         # Compute a matrix of posterior predictives over words:
         # = ND x NW p(w|d) = sum_t ( p(t|d) * p(w|t) )
         p_wtoken_g_doc = np.dot(docprobs_z, np.transpose(wordprobs))
-
-        # Go over all observed word tokens and add p(w|model) to running total
-        for i_wtoken in range(len(self.data["wtoken_word_idx"])):
-            # convert wtoken_word_idx from 1-idx to 0-idx
-            word_token = self.data["wtoken_word_idx"][i_wtoken] - 1
-            # convert wtoken_doc_idx from 1-idx to 0-idx
-            doc = self.data["wtoken_doc_idx"][i_wtoken] - 1
-            # Probability of sampling current w token from d
-            p_wtoken = p_wtoken_g_doc[doc, word_token]
-            # Add log-probability of current token to running total for all w tokens
-            w_loglikely += np.log(p_wtoken)
+        wtoken_doc_idx = model_docidx[model.data["wtoken_doc_idx"]]
+        wtoken_word_idx = model_widx[model.data["wtoken_word_idx"]]
+        w_loglikely = np.sum(np.log(p_wtoken_g_doc[wtoken_doc_idx, wtoken_word_idx]))
         tot_loglikely = x_loglikely + w_loglikely
 
         # Update model log-likelihood history vector (if update_vectors == True)
@@ -848,25 +1211,21 @@ class GCLDAModel(NiMAREBase):
 
         This uses all x values in a model object, and each topic's spatial parameters.
 
+        .. versionchanged:: 0.5.1
+
+            [ENH] Evaluate all topic/subregion Gaussians in one batched computation.
+
         Returns
         -------
         peak_probs : :obj:`numpy.ndarray` of :obj:`numpy.float64`
             nPeaks x nTopics x nRegions matrix of probabilities, giving
             probability of sampling each peak (x) from all subregions.
         """
-        peak_probs = np.zeros(
-            (len(model.data["ptoken_doc_idx"]), self.params["n_topics"], self.params["n_regions"]),
-            dtype=float,
+        return _compute_gaussian_pdfs(
+            model.data["ptoken_coords"],
+            self.topics["regions_mu"],
+            self.topics["regions_sigma"],
         )
-        for i_topic in range(self.params["n_topics"]):
-            for j_region in range(self.params["n_regions"]):
-                pdf = multivariate_normal.pdf(
-                    model.data["ptoken_coords"],
-                    mean=self.topics["regions_mu"][i_topic, j_region, 0, :],
-                    cov=self.topics["regions_sigma"][i_topic, j_region, ...],
-                )
-                peak_probs[:, i_topic, j_region] = pdf
-        return peak_probs
 
     def get_probability_distributions(self):
         """Get conditional probability of selecting each voxel in the brain mask given each topic.
@@ -894,15 +1253,11 @@ class GCLDAModel(NiMAREBase):
         mask_ijk = np.vstack(np.where(self.mask.get_fdata())).T
         mask_xyz = nib.affines.apply_affine(affine, mask_ijk)
 
-        spatial_dists = np.zeros((mask_xyz.shape[0], self.params["n_topics"]), float)
-        for i_topic in range(self.params["n_topics"]):
-            for j_region in range(self.params["n_regions"]):
-                pdf = multivariate_normal.pdf(
-                    mask_xyz,
-                    mean=self.topics["regions_mu"][i_topic, j_region, 0, :],
-                    cov=self.topics["regions_sigma"][i_topic, j_region, ...],
-                )
-                spatial_dists[:, i_topic] += pdf
+        spatial_dists = _compute_gaussian_pdfs(
+            mask_xyz,
+            self.topics["regions_mu"],
+            self.topics["regions_sigma"],
+        ).sum(axis=2)
         p_topic_g_voxel = spatial_dists / np.sum(spatial_dists, axis=1)[:, None]
         p_topic_g_voxel = np.nan_to_num(p_topic_g_voxel, 0)  # might be unnecessary
 
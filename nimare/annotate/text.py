@@ -4,7 +4,6 @@ import logging
 import os.path as op
 
 import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 
 from nimare.utils import get_resource_path
 
@@ -25,6 +24,8 @@ def generate_counts(text_df, text_column="abstract", tfidf=True, min_df=50, max_
         A DataFrame where the index is 'id' and the columns are the
         unigrams/bigrams derived from the data. D = document. T = term.
     """
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
     if text_column not in text_df.columns:
         raise ValueError(f"Column '{text_column}' not found in DataFrame")
 
@@ -1,5 +1,6 @@
 """Base classes for NiMARE."""
 
+import copy
 import gzip
 import inspect
 import logging
@@ -9,6 +10,8 @@ from collections import defaultdict
 
 from nilearn._utils import CacheMixin
 
+from nimare.utils import _is_executor
+
 LGR = logging.getLogger(__name__)
 
 
@@ -23,6 +26,7 @@ class NiMAREBase(CacheMixin, metaclass=ABCMeta):
       I'm not sure that this is actually used or useable in NiMARE.
     - save to save the object to a Pickle file.
     - load to load an instance of the object from a Pickle file.
+    - Executors used as parallel backends are left out of pickled objects, and shared by copies.
 
     TODO: Actually write/refactor class methods. They mostly come directly from sklearn
     https://github.com/scikit-learn/scikit-learn/blob/
@@ -32,6 +36,52 @@ class NiMAREBase(CacheMixin, metaclass=ABCMeta):
     def __init__(self):
         pass
 
+    def __getstate__(self):
+        """Replace Executor backends, which cannot be pickled, with the default backend.
+
+        .. versionadded:: 0.5.1
+
+        Objects are pickled when they are sent to parallel workers or saved.
+        The unpickled objects use joblib's default backend instead.
+        """
+        state = self.__dict__.copy()
+        if _is_executor(state.get("backend")):
+            state["backend"] = None
+
+        # Correctors keep their method's keyword arguments in a dictionary
+        parameters = state.get("parameters")
+        if isinstance(parameters, dict) and _is_executor(parameters.get("backend")):
+            state["parameters"] = {**parameters, "backend": None}
+
+        return state
+
+    def __deepcopy__(self, memo):
+        """Copy the object, sharing its Executor backends with the copy.
+
+        .. versionadded:: 0.5.1
+
+        Objects are copied into MetaResults, which must keep the Executor to which the
+        Estimator or Corrector submits its work.
+        """
+        backends = [self.__dict__.get("backend")]
+        parameters = self.__dict__.get("parameters")
+        if isinstance(parameters, dict):
+            backends.append(parameters.get("backend"))
+        for backend in backends:
+            if _is_executor(backend):
+                memo[id(backend)] = backend
+
+        # Keep subclasses' exclusions (e.g., of cached arrays), but restore the Executors
+        state = self.__getstate__()
+        for key in ("backend", "parameters"):
+            if key in state:
+                state[key] = self.__dict__[key]
+
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        new.__dict__.update(copy.deepcopy(state, memo))
+        return new
+
     def __repr__(self):
         """Show basic NiMARE class representation.
 
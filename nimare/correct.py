@@ -5,8 +5,8 @@ import logging
 from abc import abstractproperty
 
 import numpy as np
-from pymare.stats import bonferroni, fdr
 
+from nimare import profiling
 from nimare.base import NiMAREBase
 from nimare.results import MetaResult
 from nimare.transforms import p_to_z
@@ -178,17 +178,20 @@ class Corrector(NiMAREBase):
         # Otherwise fall back on _transform, and the Corrector methods.
         # In case a method is present in both the Estimator and the Corrector, the Estimator's
         # implementation takes precedence.
-        if hasattr(est, correction_method):
-            LGR.info(
-                "Using correction method implemented in Estimator: "
-                f"{est.__class__.__module__}.{est.__class__.__name__}.{correction_method}."
-            )
-            corr_maps, corr_tables, description = getattr(est, correction_method)(
-                result, **self.parameters
-            )
-        else:
-            self._collect_inputs(result)
-            corr_maps, corr_tables, description = self._transform(result, method=correction_method)
+        with profiling.span(f"{self.__class__.__name__}.transform", category="corrector"):
+            if hasattr(est, correction_method):
+                LGR.info(
+                    "Using correction method implemented in Estimator: "
+                    f"{est.__class__.__module__}.{est.__class__.__name__}.{correction_method}."
+                )
+                corr_maps, corr_tables, description = getattr(est, correction_method)(
+                    result, **self.parameters
+                )
+            else:
+                self._collect_inputs(result)
+                corr_maps, corr_tables, description = self._transform(
+                    result, method=correction_method
+                )
 
         # Update corrected map names and add them to maps dict
         corr_maps = {(k + self._name_suffix): v for k, v in corr_maps.items()}
@@ -203,6 +206,7 @@ class Corrector(NiMAREBase):
 
         # Save the corrected maps
         result.corrector = self
+        result.profile_ = profiling.get_profiler() or getattr(result, "profile_", None)
 
         return result
 
@@ -275,7 +279,11 @@ class FWECorrector(Corrector):
     n_cores : :obj:`int`, default=1
         Number of cores to use for Monte Carlo correction. Default is 1.
     **kwargs
-        Keyword arguments to be used by the FWE correction implementation.
+        Keyword arguments to be used by the FWE correction implementation
+        (e.g., ``voxel_thresh``, ``tail_approximation``, or ``backend`` for the 'montecarlo'
+        method, where supported by the Estimator).
+        ``backend`` may be a joblib backend name or a :class:`concurrent.futures.Executor`,
+        e.g., to submit the permutations to a pool of workers on several machines.
     """
 
     _correction_method = "fwe"
@@ -329,6 +337,8 @@ class FWECorrector(Corrector):
         --------
         nimare.stats.bonferroni
         """
+        from pymare.stats import bonferroni
+
         description = (
             "Family-wise error rate correction was performed with the Bonferroni correction "
             "procedure \\citep{bonferroni1936teoria,shaffer1995multiple}."
@@ -406,6 +416,8 @@ class FDRCorrector(Corrector):
         --------
         pymare.stats.fdr
         """
+        from pymare.stats import fdr
+
         description = (
             "False discovery rate correction was performed with the Benjamini-Hochberg procedure "
             "\\citep{benjamini1995controlling}."
@@ -455,6 +467,8 @@ class FDRCorrector(Corrector):
         --------
         pymare.stats.fdr
         """
+        from pymare.stats import fdr
+
         description = (
             "False discovery rate correction was performed with the Benjamini-Yekutieli procedure "
             "\\citep{benjamini2001control}."
@@ -5,6 +5,7 @@ from .continuous import (
     CorrelationDecoder,
     CorrelationDistributionDecoder,
     gclda_decode_map,
+    gclda_decode_maps,
 )
 from .discrete import (
     BrainMapDecoder,
@@ -14,12 +15,13 @@ from .discrete import (
     gclda_decode_roi,
     neurosynth_decode,
 )
-from .encode import gclda_encode
+from .encode import gclda_encode, gclda_encode_texts
 
 __all__ = [
     "CorrelationDecoder",
     "CorrelationDistributionDecoder",
     "gclda_decode_map",
+    "gclda_decode_maps",
     "BrainMapDecoder",
     "NeurosynthDecoder",
     "ROIAssociationDecoder",
@@ -27,6 +29,7 @@ __all__ = [
     "gclda_decode_roi",
     "neurosynth_decode",
     "gclda_encode",
+    "gclda_encode_texts",
     "continuous",
     "discrete",
     "encode",
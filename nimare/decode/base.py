@@ -21,6 +21,15 @@ class Decoder(NiMAREBase):
 
     __id_cols = ["id", "study_id", "contrast_id"]
 
+    def __getstate__(self):
+        """Drop cached standardized maps, which are recomputed when they are needed.
+
+        .. versionadded:: 0.5.1
+        """
+        state = super().__getstate__()
+        state.pop("_standardized_maps", None)
+        return state
+
     def _collect_inputs(self, dataset, drop_invalid=True):
         """Search for, and validate, required inputs as necessary."""
         if not hasattr(dataset, "slice"):
@@ -1,5 +1,6 @@
 """Methods for decoding unthresholded brain maps into text."""
 
+import copy
 import inspect
 import logging
 import os
@@ -8,18 +9,24 @@ from glob import glob
 import nibabel as nib
 import numpy as np
 import pandas as pd
-from joblib import Parallel, delayed
+from joblib import delayed
 from nilearn._utils import load_niimg
 from nilearn.masking import apply_mask
 from tqdm.auto import tqdm
 
 from nimare.decode.base import Decoder
-from nimare.decode.utils import weight_priors
+from nimare.decode.utils import _scores_to_long, _standardize_rows, weight_priors
 from nimare.meta.cbma.base import CBMAEstimator
 from nimare.meta.cbma.mkda import MKDAChi2
 from nimare.results import MetaResult
-from nimare.stats import pearson
-from nimare.utils import _check_ncores, _check_type, _safe_transform, get_masker
+from nimare.utils import (
+    _check_backend,
+    _check_ncores,
+    _check_type,
+    _run_parallel,
+    _safe_transform,
+    get_masker,
+)
 
 LGR = logging.getLogger(__name__)
 
@@ -113,9 +120,70 @@ def gclda_decode_map(model, image, topic_priors=None, prior_weight=1):
     return decoded_df, topic_weights
 
 
+def gclda_decode_maps(model, images, topic_priors=None, prior_weight=1, top_k=None):
+    """Decode multiple unthresholded images with a GCLDA model at once.
+
+    .. versionadded:: 0.5.1
+
+    This applies the method from :func:`~nimare.decode.continuous.gclda_decode_map` to a set of
+    images, computing the topic and word weights for all images with single matrix products.
+
+    Parameters
+    ----------
+    model : :obj:`~nimare.annotate.gclda.GCLDAModel`
+        Model object needed for decoding.
+    images : :obj:`list` of Niimg-like, or 4D Niimg-like
+        Whole-brain images to decode into text. Must be in same space as model and dataset.
+    topic_priors : :obj:`numpy.ndarray` of :obj:`float`, optional
+        A 1d array of size (n_topics) with values for topic weighting.
+        If None, no weighting is done. Default is None.
+    prior_weight : :obj:`float`, optional
+        The weight by which the prior will affect the decoding.
+        Default is 1.
+    top_k : :obj:`int` or None, optional
+        If not None, only the ``top_k`` terms with the highest weights are returned for each
+        image, in descending order. Default is None.
+
+    Returns
+    -------
+    decoded_df : :obj:`pandas.DataFrame`
+        A DataFrame with one row for each image and word-token, and three columns:
+        "image" (the index of the image), "Term", and "Weight".
+    topic_weights : (I x T) :obj:`numpy.ndarray` of :obj:`float`
+        The weights of the topics used in decoding, for each image.
+
+    See Also
+    --------
+    :func:`~nimare.decode.continuous.gclda_decode_map`
+    :func:`~nimare.decode.encode.gclda_encode_texts`
+    """
+    # Load image files and get voxel values, as an images-by-voxels array
+    input_values = np.atleast_2d(apply_mask(images, model.mask))
+    topic_weights = np.dot(input_values, model.p_topic_g_voxel_)
+    if topic_priors is not None:
+        weighted_priors = weight_priors(topic_priors, prior_weight)
+        topic_weights *= weighted_priors[None, :]
+
+    word_weights = np.dot(topic_weights, model.p_word_g_topic_.T)
+
+    decoded_df = _scores_to_long(
+        {"Weight": word_weights},
+        model.vocabulary,
+        feature_column="Term",
+        top_k=top_k,
+    )
+    return decoded_df, topic_weights
+
+
 class CorrelationDecoder(Decoder):
     """Decode an unthresholded image by correlating the image with meta-analytic maps.
 
+    .. versionchanged:: 0.5.1
+
+        * New parameter: `backend`. Parallel backend, to fit the features' meta-analyses
+          in threads or with an Executor.
+        * Each feature's meta-analysis is fitted with its own copy of `meta_estimator`.
+
     .. versionchanged:: 0.1.0
 
         * New method: `load_imgs`. Load pre-generated meta-analytic maps for decoding.
@@ -147,6 +215,13 @@ class CorrelationDecoder(Decoder):
         Number of cores to use for parallelization.
         If <=0, defaults to using all available cores.
         Default is 1.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+        Parallel backend. If None, joblib's default process-based backend is used.
+        If "threads", all workers share one in-memory copy of the Dataset.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        Default is None.
 
     Warnings
     --------
@@ -168,6 +243,7 @@ class CorrelationDecoder(Decoder):
         meta_estimator=None,
         target_image="z_desc-association",
         n_cores=1,
+        backend=None,
     ):
         meta_estimator = (
             MKDAChi2() if meta_estimator is None else _check_type(meta_estimator, CBMAEstimator)
@@ -179,6 +255,7 @@ class CorrelationDecoder(Decoder):
         self.meta_estimator = meta_estimator
         self.target_image = target_image
         self.n_cores = _check_ncores(n_cores)
+        self.backend = _check_backend(backend)
 
     def _fit(self, dataset):
         """Generate feature-specific meta-analytic maps for dataset.
@@ -197,14 +274,17 @@ class CorrelationDecoder(Decoder):
         maps = {
             r: v
             for r, v in tqdm(
-                Parallel(return_as="generator", n_jobs=self.n_cores)(
-                    delayed(self._run_fit)(feature, dataset) for feature in self.features_
+                _run_parallel(
+                    (delayed(self._run_fit)(feature, dataset) for feature in self.features_),
+                    n_cores=self.n_cores,
+                    backend=self.backend,
                 ),
                 total=n_features,
             )
         }
 
         self.results_ = MetaResult(self, mask=dataset.masker, maps=maps)
+        self._standardized_maps = None
 
     def _run_fit(self, feature, dataset):
         feature_ids = dataset.get_studies_by_label(
@@ -217,14 +297,17 @@ class CorrelationDecoder(Decoder):
         # Create the reduced Dataset
         feature_dset = dataset.slice(feature_ids)
 
+        # Fit a copy of the meta-analytic estimator, which may be shared by several workers
+        meta_estimator = copy.deepcopy(self.meta_estimator)
+
         # Check if the meta method is a pairwise estimator
         # This seems like a somewhat inelegant solution
-        if "dataset2" in inspect.getfullargspec(self.meta_estimator.fit).args:
+        if "dataset2" in inspect.getfullargspec(meta_estimator.fit).args:
             nonfeature_ids = sorted(list(set(self.inputs_["id"]) - set(feature_ids)))
             nonfeature_dset = dataset.slice(nonfeature_ids)
-            meta_results = self.meta_estimator.fit(feature_dset, nonfeature_dset)
+            meta_results = meta_estimator.fit(feature_dset, nonfeature_dset)
         else:
-            meta_results = self.meta_estimator.fit(feature_dset)
+            meta_results = meta_estimator.fit(feature_dset)
 
         feature_data = meta_results.get_map(
             self.target_image,
@@ -284,6 +367,7 @@ class CorrelationDecoder(Decoder):
 
         maps = {feature: image for feature, image in zip(features, images)}
         self.results_ = MetaResult(self, mask=self.masker, maps=maps)
+        self._standardized_maps = None
 
     def transform(self, img):
         """Correlate target image with each feature-specific meta-analytic map.
@@ -304,26 +388,92 @@ class CorrelationDecoder(Decoder):
                 "Call 'fit' or 'load_imgs' before using 'transform'."
             )
 
-        # Make sure we return a copy of the MetaResult
-        results = self.results_.copy()
-        features = list(results.maps.keys())
-        images = np.array(list(results.maps.values()))
+        features, maps_std = self._get_standardized_maps()
 
-        img_vec = results.masker.transform(img)
-        corrs = pearson(img_vec, images)
+        img_vec = self.results_.masker.transform(img)
+        img_std = _standardize_rows(img_vec, dtype=maps_std.dtype)
+        corrs = np.dot(maps_std, img_std[0])
         out_df = pd.DataFrame(index=features, columns=["r"], data=corrs)
         out_df.index.name = "feature"
 
-        # Update self.results_ to include the new table
-        results.tables["correlation"] = out_df
+        # Update self.results_ to include the new table.
+        # The maps are not modified, so the new MetaResult shares them instead of copying them.
+        results = copy.copy(self.results_)
+        results.tables = {**self.results_.tables, "correlation": out_df}
         self.results_ = results
 
         return out_df
 
+    def transform_batch(self, imgs, top_k=None, dtype="float64", memfile=None):
+        """Correlate multiple target images with each feature-specific meta-analytic map.
+
+        .. versionadded:: 0.5.1
+
+        The meta-analytic maps are standardized once and cached, so that all image-by-feature
+        correlations are computed with a single matrix product.
+
+        Parameters
+        ----------
+        imgs : :obj:`list` of Niimg-like, or 4D Niimg-like
+            Images to decode. Must be in same space as ``dataset``.
+        top_k : :obj:`int` or None, optional
+            If not None, only the ``top_k`` most correlated features are returned for each image,
+            in descending order. Default is None.
+        dtype : :obj:`str`, optional
+            Datatype of the standardized maps and images. Use "float32" to halve memory usage.
+            Default is "float64".
+        memfile : :obj:`str` or None, optional
+            Name of a memory-mapped file in which to store the standardized maps.
+            If None, memory-mapping will not be used. Default is None.
+
+        Returns
+        -------
+        out_df : :obj:`pandas.DataFrame`
+            DataFrame with one row for each image and feature, and three columns:
+            "image" (the index of the image), "feature", and "r".
+        """
+        if not hasattr(self, "results_"):
+            raise AttributeError(
+                f"This {self.__class__.__name__} instance is not fitted yet. "
+                "Call 'fit' or 'load_imgs' before using 'transform_batch'."
+            )
+
+        features, maps_std = self._get_standardized_maps(dtype=dtype, memfile=memfile)
+
+        imgs_arr = np.atleast_2d(self.results_.masker.transform(imgs))
+        imgs_std = _standardize_rows(imgs_arr, dtype=maps_std.dtype)
+        corrs = np.dot(imgs_std, maps_std.T)
+
+        return _scores_to_long({"r": corrs}, features, top_k=top_k)
+
+    def _get_standardized_maps(self, dtype="float64", memfile=None):
+        """Return the standardized meta-analytic maps, computing them only when needed."""
+        features = list(self.results_.maps.keys())
+        # Maps are cached for each dtype, so that transform and transform_batch can alternate
+        caches = getattr(self, "_standardized_maps", None) or {}
+        cache = caches.get(np.dtype(dtype))
+        if cache is None or cache[0] != features or cache[2] != memfile:
+            maps_std = _standardize_rows(
+                list(self.results_.maps.values()),
+                dtype=dtype,
+                memfile=memfile,
+            )
+            cache = (features, maps_std, memfile)
+            caches = {key: value for key, value in caches.items() if value[0] == features}
+            caches[maps_std.dtype] = cache
+            self._standardized_maps = caches
+
+        return cache[0], cache[1]
+
 
 class CorrelationDistributionDecoder(Decoder):
     """Decode an unthresholded image by correlating the image with study-wise images.
 
+    .. versionchanged:: 0.5.1
+
+        * New parameter: `backend`. Parallel backend, to collect the features' images
+          in threads or with an Executor.
+
     .. versionchanged:: 0.1.0
 
         * New attribute: `results_`. MetaResult object containing masker, meta-analytic maps,
@@ -347,6 +497,13 @@ class CorrelationDistributionDecoder(Decoder):
         Number of cores to use for parallelization.
         If <=0, defaults to using all available cores.
         Default is 1.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+        Parallel backend. If None, joblib's default process-based backend is used.
+        If "threads", all workers share one in-memory copy of the Dataset.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        Default is None.
 
     Warnings
     --------
@@ -366,12 +523,14 @@ class CorrelationDistributionDecoder(Decoder):
         frequency_threshold=0.001,
         target_image="z",
         n_cores=1,
+        backend=None,
     ):
         self.feature_group = feature_group
         self.features = features
         self.frequency_threshold = frequency_threshold
         self._required_inputs["images"] = ("image", target_image)
         self.n_cores = _check_ncores(n_cores)
+        self.backend = _check_backend(backend)
 
     def _fit(self, dataset):
         """Collect sets of maps from the Dataset corresponding to each requested feature.
@@ -390,14 +549,17 @@ class CorrelationDistributionDecoder(Decoder):
         maps = {
             r: v
             for r, v in tqdm(
-                Parallel(return_as="generator", n_jobs=self.n_cores)(
-                    delayed(self._run_fit)(feature, dataset) for feature in self.features_
+                _run_parallel(
+                    (delayed(self._run_fit)(feature, dataset) for feature in self.features_),
+                    n_cores=self.n_cores,
+                    backend=self.backend,
                 ),
                 total=n_features,
             )
         }
 
         self.results_ = MetaResult(self, mask=dataset.masker, maps=maps)
+        self._standardized_maps = None
 
     def _run_fit(self, feature, dataset):
         feature_ids = dataset.get_studies_by_label(
@@ -440,23 +602,108 @@ class CorrelationDistributionDecoder(Decoder):
                 "Call 'fit' before using 'transform'."
             )
 
-        # Make sure we return a copy of the MetaResult
-        results = self.results_.copy()
-        features = list(results.maps.keys())
-
-        img_vec = results.masker.transform(img)
+        img_vec = self.results_.masker.transform(img)
+        features, corrs_z_mean, corrs_z_std = self._correlate(img_vec)
         out_df = pd.DataFrame(
-            index=features, columns=["mean", "std"], data=np.zeros((len(features), 2))
+            index=features,
+            columns=["mean", "std"],
+            data=np.column_stack((corrs_z_mean[0], corrs_z_std[0])),
         )
         out_df.index.name = "feature"
-        for feature, feature_arr in results.maps.items():
-            corrs = pearson(img_vec, feature_arr)
-            corrs_z = np.arctanh(corrs)
-            out_df.loc[feature, "mean"] = np.mean(corrs_z)
-            out_df.loc[feature, "std"] = np.std(corrs_z)
-
-        # Update self.results_ to include the new table
-        results.tables["correlation"] = out_df
+
+        # Update self.results_ to include the new table.
+        # The maps are not modified, so the new MetaResult shares them instead of copying them.
+        results = copy.copy(self.results_)
+        results.tables = {**self.results_.tables, "correlation": out_df}
         self.results_ = results
 
         return out_df
+
+    def transform_batch(self, imgs, top_k=None, dtype="float64", memfile=None):
+        """Correlate multiple target images with each map associated with each feature.
+
+        .. versionadded:: 0.5.1
+
+        The maps of all features are standardized once and cached, so that the correlations of
+        all images with all maps are computed with a single matrix product.
+
+        Parameters
+        ----------
+        imgs : :obj:`list` of Niimg-like, or 4D Niimg-like
+            Images to decode. Must be in same space as ``dataset``.
+        top_k : :obj:`int` or None, optional
+            If not None, only the ``top_k`` features with the highest mean correlations are
+            returned for each image, in descending order. Default is None.
+        dtype : :obj:`str`, optional
+            Datatype of the standardized maps and images. Use "float32" to halve memory usage.
+            Default is "float64".
+        memfile : :obj:`str` or None, optional
+            Name of a memory-mapped file in which to store the standardized maps.
+            If None, memory-mapping will not be used. Default is None.
+
+        Returns
+        -------
+        out_df : :obj:`pandas.DataFrame`
+            DataFrame with one row for each image and feature, and four columns:
+            "image" (the index of the image), "feature", "mean", and "std".
+        """
+        if not hasattr(self, "results_"):
+            raise AttributeError(
+                f"This {self.__class__.__name__} instance is not fitted yet. "
+                "Call 'fit' before using 'transform_batch'."
+            )
+
+        imgs_arr = np.atleast_2d(self.results_.masker.transform(imgs))
+        features, corrs_z_mean, corrs_z_std = self._correlate(
+            imgs_arr,
+            dtype=dtype,
+            memfile=memfile,
+        )
+
+        return _scores_to_long({"mean": corrs_z_mean, "std": corrs_z_std}, features, top_k=top_k)
+
+    def _correlate(self, imgs_arr, dtype="float64", memfile=None):
+        """Summarize the Fisher's z-transformed correlations of images with each feature's maps.
+
+        Parameters
+        ----------
+        imgs_arr : (I x V) :obj:`numpy.ndarray`
+            Masked images.
+        dtype : :obj:`str`, optional
+            Datatype of the standardized maps and images. Default is "float64".
+        memfile : :obj:`str` or None, optional
+            Name of a memory-mapped file in which to store the standardized maps.
+            Default is None.
+
+        Returns
+        -------
+        features : :obj:`list` of :obj:`str`
+            Feature names.
+        corrs_z_mean, corrs_z_std : (I x F) :obj:`numpy.ndarray`
+            Mean and standard deviation of the z-transformed correlations of each image with
+            each feature's maps.
+        """
+        features = list(self.results_.maps.keys())
+        # Maps are cached for each dtype, so that transform and transform_batch can alternate
+        caches = getattr(self, "_standardized_maps", None) or {}
+        cache = caches.get(np.dtype(dtype))
+        if cache is None or cache[0] != features or cache[3] != memfile:
+            # Stack all features' maps, keeping track of where each feature starts
+            n_maps = np.array([np.atleast_2d(arr).shape[0] for arr in self.results_.maps.values()])
+            maps = [row for arr in self.results_.maps.values() for row in np.atleast_2d(arr)]
+            maps_std = _standardize_rows(maps, dtype=dtype, memfile=memfile)
+            cache = (features, maps_std, n_maps, memfile)
+            caches = {key: value for key, value in caches.items() if value[0] == features}
+            caches[maps_std.dtype] = cache
+            self._standardized_maps = caches
+
+        _, maps_std, n_maps, _ = cache
+        starts = np.concatenate(([0], np.cumsum(n_maps)[:-1]))
+
+        imgs_std = _standardize_rows(imgs_arr, dtype=maps_std.dtype)
+        corrs_z = np.arctanh(np.dot(imgs_std, maps_std.T))
+        corrs_z_mean = np.add.reduceat(corrs_z, starts, axis=1) / n_maps
+        corrs_z_dev = corrs_z - np.repeat(corrs_z_mean, n_maps, axis=1)
+        corrs_z_std = np.sqrt(np.add.reduceat(corrs_z_dev**2, starts, axis=1) / n_maps)
+
+        return features, corrs_z_mean, corrs_z_std
@@ -3,12 +3,11 @@
 import numpy as np
 import pandas as pd
 from nilearn._utils import load_niimg
-from pymare.stats import bonferroni, fdr
-from scipy import special
+from scipy import sparse, special
 from scipy.stats import binom
 
 from nimare.decode.base import Decoder
-from nimare.decode.utils import weight_priors
+from nimare.decode.utils import _scores_to_long, weight_priors
 from nimare.meta.kernel import KernelTransformer, MKDAKernel
 from nimare.stats import one_way, pearson, two_way
 from nimare.transforms import p_to_z
@@ -111,6 +110,183 @@ def gclda_decode_roi(model, roi, topic_priors=None, prior_weight=1.0):
     return decoded_df, topic_weights
 
 
+def _get_term_counts(coordinates, annotations, features, frequency_threshold):
+    """Precompute the study-by-feature matrix and foci counts used by the count-based decoders.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    coordinates : :class:`pandas.DataFrame`
+        DataFrame containing coordinates, with a column named 'id'.
+    annotations : :class:`pandas.DataFrame`
+        DataFrame containing labels, with a column named 'id'.
+    features : :obj:`list`
+        List of features in dataset annotations to use for decoding.
+    frequency_threshold : :obj:`float`
+        Threshold to apply to dataset annotations.
+
+    Returns
+    -------
+    term_counts : :obj:`dict`
+        Dictionary with the following keys: "study_ids" (IDs of the annotated studies),
+        "term_matrix" (sparse study-by-feature matrix of binarized labels), "n_foci"
+        (number of foci in each study), "in_coordinates" (whether each study has coordinates),
+        and "n_foci_in_database" (total number of foci).
+    """
+    features_df = annotations.set_index("id", drop=True)
+    study_ids = features_df.index
+    term_matrix = sparse.csr_matrix(
+        features_df[features].ge(frequency_threshold).values.astype(np.int64)
+    )
+    n_foci = coordinates["id"].value_counts().reindex(study_ids, fill_value=0).values
+
+    return {
+        "study_ids": study_ids,
+        "term_matrix": term_matrix,
+        "n_foci": n_foci,
+        "in_coordinates": study_ids.isin(coordinates["id"]),
+        "n_foci_in_database": coordinates.shape[0],
+    }
+
+
+def _get_selection_matrix(study_ids, selections):
+    """Build a sparse selection-by-study indicator matrix from lists of study IDs."""
+    if not len(selections):
+        return sparse.csr_matrix((0, len(study_ids)), dtype=np.int64)
+
+    rows, cols = [], []
+    for i_sel, ids in enumerate(selections):
+        idx = study_ids.get_indexer(ids)
+        if np.any(idx < 0):
+            missing = [id_ for id_, i_study in zip(ids, idx) if i_study < 0]
+            raise KeyError(f"Studies not found in annotations: {missing}")
+
+        rows.append(np.full(idx.size, i_sel))
+        cols.append(idx)
+
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    # Repeated IDs are summed, so each selection counts its studies like a list of IDs would
+    return sparse.csr_matrix(
+        (np.ones(rows.size, dtype=np.int64), (rows, cols)),
+        shape=(len(selections), len(study_ids)),
+    )
+
+
+def _count_selections(term_counts, selections, selections2=None):
+    """Count selected and unselected studies, with and without each feature.
+
+    Parameters
+    ----------
+    term_counts : :obj:`dict`
+        Output of :func:`_get_term_counts`.
+    selections : :obj:`list` of :obj:`list`
+        Study IDs in each selection.
+    selections2 : :obj:`list` of :obj:`list` or None, optional
+        Study IDs in each "unselected" set. If None, all studies with coordinates that are not
+        in the corresponding selection are used. Default is None.
+
+    Returns
+    -------
+    n_selected, n_unselected : (K x 1) :obj:`numpy.ndarray`
+        Number of selected and unselected studies for each selection.
+    n_selected_term, n_unselected_term : (K x F) :obj:`numpy.ndarray`
+        Number of selected and unselected studies with each feature, for each selection.
+    """
+    study_ids = term_counts["study_ids"]
+    term_matrix = term_counts["term_matrix"]
+
+    sel_matrix = _get_selection_matrix(study_ids, selections)
+    n_selected = np.asarray(sel_matrix.sum(axis=1), dtype=float)
+    n_selected_term = (sel_matrix @ term_matrix).toarray().astype(float)
+
+    if selections2 is None:
+        # Unselected studies are the (unique) studies with coordinates outside of each selection
+        in_coordinates = term_counts["in_coordinates"].astype(np.int64)
+        selected = (sel_matrix > 0).astype(np.int64) @ sparse.diags(in_coordinates)
+        n_unselected = in_coordinates.sum() - np.asarray(selected.sum(axis=1), dtype=float)
+        n_unselected_term = (term_matrix.T @ in_coordinates)[None, :] - (
+            selected @ term_matrix
+        ).toarray()
+    else:
+        unsel_matrix = _get_selection_matrix(study_ids, selections2)
+        n_unselected = np.asarray(unsel_matrix.sum(axis=1), dtype=float)
+        n_unselected_term = (unsel_matrix @ term_matrix).toarray()
+
+    return n_selected, n_unselected, n_selected_term, n_unselected_term.astype(float)
+
+
+def _check_selections(selections, selections2=None):
+    """Convert selections into lists of study IDs, along with the selections' labels."""
+    if isinstance(selections, dict):
+        labels = list(selections.keys())
+        selections = list(selections.values())
+        if isinstance(selections2, dict):
+            selections2 = [selections2[label] for label in labels]
+    else:
+        labels = list(range(len(selections)))
+
+    if selections2 is not None and len(selections2) != len(selections):
+        raise ValueError(
+            f"Number of unselected sets ({len(selections2)}) does not match number of "
+            f"selections ({len(selections)})."
+        )
+
+    return labels, selections, selections2
+
+
+def _two_way_by_selection(
+    n_selected_term,
+    n_selected_noterm,
+    n_unselected_term,
+    n_unselected_noterm,
+):
+    """Run two-way chi-square tests of association for every selection and feature."""
+    cells = np.array(
+        [
+            [n_selected_term, n_selected_noterm],
+            [n_unselected_term, n_unselected_noterm],
+        ]
+    )
+    # (2 x 2 x K x F) to (K x F x 2 x 2), with the same orientation as a per-selection test
+    cells = np.transpose(cells, (2, 3, 1, 0))
+    return two_way(cells.reshape(-1, 2, 2)).reshape(n_selected_term.shape)
+
+
+def _correct_pvalues(p_values, u, correction):
+    """Correct p-values for multiple comparisons across features, separately by selection."""
+    from pymare.stats import bonferroni, fdr
+
+    if not p_values.size:
+        return p_values
+
+    if correction in ("bh", "by"):
+        return np.vstack([fdr(p_row, alpha=u, method=correction) for p_row in p_values])
+    elif correction == "bonferroni":
+        return np.vstack([bonferroni(p_row) for p_row in p_values])
+
+    return p_values
+
+
+def _results_to_df(results, features, labels=None):
+    """Convert decoding results to a DataFrame for one selection or a long DataFrame for many."""
+    if labels is None:
+        out_df = pd.DataFrame(
+            {name: values[0] for name, values in results.items()},
+            index=features,
+        )
+        out_df.index.name = "Term"
+        return out_df
+
+    return _scores_to_long(
+        results,
+        features,
+        feature_column="Term",
+        index_column="selection",
+        index_labels=labels,
+    )
+
+
 class BrainMapDecoder(Decoder):
     """Perform image-to-text decoding for discrete inputs according to the BrainMap method.
 
@@ -172,7 +348,12 @@ class BrainMapDecoder(Decoder):
         self.correction = correction
 
     def _fit(self, dataset):
-        pass
+        self._term_counts = _get_term_counts(
+            self.inputs_["coordinates"],
+            self.inputs_["annotations"],
+            self.features_,
+            self.frequency_threshold,
+        )
 
     def transform(self, ids, ids2=None):
         """Apply the decoding method to a Dataset.
@@ -195,18 +376,50 @@ class BrainMapDecoder(Decoder):
             label: 'pForward', 'zForward', 'likelihoodForward', 'pReverse',
             'zReverse', and 'probReverse'.
         """
-        results = brainmap_decode(
-            self.inputs_["coordinates"],
-            self.inputs_["annotations"],
-            ids=ids,
-            ids2=ids2,
-            features=self.features_,
-            frequency_threshold=self.frequency_threshold,
+        results = _brainmap_decode(
+            self._term_counts,
+            [ids],
+            selections2=None if ids2 is None else [ids2],
+            u=self.u,
+            correction=self.correction,
+        )
+
+        return _results_to_df(results, self.features_)
+
+    def transform_batch(self, selections, selections2=None):
+        """Apply the decoding method to many selections of studies at once.
+
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        selections : :obj:`list` of :obj:`list`, or :obj:`dict`
+            Subsets of studies indicating targets for decoding (e.g., studies reporting at least
+            one peak in each parcel of an atlas). If a dictionary, keys are used as the labels
+            of the selections and values are lists of study IDs.
+        selections2 : :obj:`list` of :obj:`list`, :obj:`dict`, or None, optional
+            Second subsets of studies, representing "unselected" studies for each selection.
+            If None, then all studies in coordinates/annotations dataframes **not** in each
+            selection will be used. Default is None.
+
+        Returns
+        -------
+        results : :class:`pandas.DataFrame`
+            Table with one row for each selection and label, a "selection" column with the
+            label (or index) of the selection, a "Term" column, and the following values:
+            'pForward', 'zForward', 'likelihoodForward', 'pReverse', 'zReverse', and
+            'probReverse'.
+        """
+        labels, selections, selections2 = _check_selections(selections, selections2)
+        results = _brainmap_decode(
+            self._term_counts,
+            selections,
+            selections2=selections2,
             u=self.u,
             correction=self.correction,
         )
 
-        return results
+        return _results_to_df(results, self.features_, labels=labels)
 
 
 def brainmap_decode(
@@ -271,117 +484,109 @@ def brainmap_decode(
     ----------
     .. footbibliography::
     """
-    dataset_ids = sorted(list(set(coordinates["id"].values)))
-    if ids2 is None:
-        unselected = sorted(list(set(dataset_ids) - set(ids)))
-    else:
-        unselected = ids2[:]
+    term_counts = _get_term_counts(coordinates, annotations, features, frequency_threshold)
+    results = _brainmap_decode(
+        term_counts,
+        [ids],
+        selections2=None if ids2 is None else [ids2],
+        u=u,
+        correction=correction,
+    )
+    return _results_to_df(results, features)
 
-    # Binarize with frequency threshold
-    features_df = annotations.set_index("id", drop=True)
-    features_df = features_df[features].ge(frequency_threshold)
 
-    sel_array = features_df.loc[ids].values
-    unsel_array = features_df.loc[unselected].values
+def _brainmap_decode(term_counts, selections, selections2=None, u=0.05, correction="fdr_bh"):
+    """Apply the BrainMap decoding method to many selections at once.
 
-    n_selected = len(ids)
-    n_unselected = len(unselected)
+    .. versionadded:: 0.5.1
 
-    # the number of times any term is used (e.g., if one experiment uses
-    # two terms, that counts twice). Why though?
-    n_exps_across_terms = np.sum(np.sum(features_df))
+    Parameters
+    ----------
+    term_counts : :obj:`dict`
+        Output of :func:`_get_term_counts`.
+    selections : :obj:`list` of :obj:`list`
+        Study IDs in each selection.
+    selections2 : :obj:`list` of :obj:`list` or None, optional
+        Study IDs in each "unselected" set. Default is None.
+    u : :obj:`float`, optional
+        Alpha level for multiple comparisons correction. Default is 0.05.
+    correction : {None, "bh", "by", "bonferroni"}, optional
+        Multiple comparisons correction method to apply.
 
-    n_selected_term = np.sum(sel_array, axis=0)
-    n_unselected_term = np.sum(unsel_array, axis=0)
+    Returns
+    -------
+    results : :obj:`dict` of (K x F) :obj:`numpy.ndarray`
+        'pForward', 'zForward', 'likelihoodForward', 'pReverse', 'zReverse', and 'probReverse'
+        values for each selection and feature.
+    """
+    n_selected, n_unselected, n_selected_term, n_unselected_term = _count_selections(
+        term_counts,
+        selections,
+        selections2,
+    )
+    term_matrix = term_counts["term_matrix"]
+    n_foci = term_counts["n_foci"]
 
     n_selected_noterm = n_selected - n_selected_term
     n_unselected_noterm = n_unselected - n_unselected_term
 
+    # the number of times any term is used (e.g., if one experiment uses
+    # two terms, that counts twice). Why though?
+    n_exps_across_terms = term_matrix.sum()
+
     n_term = n_selected_term + n_unselected_term
     p_term = n_term / n_exps_across_terms
 
-    n_foci_in_database = coordinates.shape[0]
-    p_selected = n_selected / n_foci_in_database
+    p_selected = n_selected / term_counts["n_foci_in_database"]
 
-    # I hope there's a way to do this without the for loop
-    n_term_foci = np.zeros(len(features))
-    n_noterm_foci = np.zeros(len(features))
-    for i, term in enumerate(features):
-        term_ids = features_df.loc[features_df[term] == 1].index.values
-        noterm_ids = features_df.loc[features_df[term] == 0].index.values
-        n_term_foci[i] = coordinates["id"].isin(term_ids).sum()
-        n_noterm_foci[i] = coordinates["id"].isin(noterm_ids).sum()
+    # Number of foci reported by studies with and without each term
+    n_term_foci = term_matrix.T @ n_foci
+    n_noterm_foci = n_foci.sum() - n_term_foci
 
     p_selected_g_term = n_selected_term / n_term_foci  # probForward
     l_selected_g_term = p_selected_g_term / p_selected  # likelihoodForward
     p_selected_g_noterm = n_selected_noterm / n_noterm_foci
 
     p_term_g_selected = p_selected_g_term * p_term / p_selected  # probReverse
-    p_term_g_selected = p_term_g_selected / np.nansum(p_term_g_selected)  # Normalize
+    p_term_g_selected = p_term_g_selected / np.nansum(
+        p_term_g_selected, axis=1, keepdims=True
+    )  # Normalize
 
     # Significance testing
     # Forward inference significance is determined with a binomial distribution
     p_fi = 1 - binom.cdf(k=n_selected_term, n=n_term_foci, p=p_selected)
-    sign_fi = np.sign(
-        n_selected_term - np.mean(n_selected_term)
-    ).ravel()  # pylint: disable=no-member
+    sign_fi = np.sign(n_selected_term - np.mean(n_selected_term, axis=1, keepdims=True))
 
     # Two-way chi-square test for association of activation
-    cells = np.array(
-        [
-            [n_selected_term, n_selected_noterm],  # pylint: disable=no-member
-            [n_unselected_term, n_unselected_noterm],
-        ]
-    ).T
-    chi2_ri = two_way(cells)
+    chi2_ri = _two_way_by_selection(
+        n_selected_term,
+        n_selected_noterm,
+        n_unselected_term,
+        n_unselected_noterm,
+    )
     p_ri = special.chdtrc(1, chi2_ri)
-    sign_ri = np.sign(p_selected_g_term - p_selected_g_noterm).ravel()  # pylint: disable=no-member
+    sign_ri = np.sign(p_selected_g_term - p_selected_g_noterm)
 
     # Ignore rare features
     p_fi[n_selected_term < 5] = 1.0
     p_ri[n_selected_term < 5] = 1.0
 
     # Multiple comparisons correction across features. Separately done for FI and RI.
-    if correction in ("bh", "by"):
-        p_corr_fi = fdr(p_fi, alpha=u, method=correction)
-        p_corr_ri = fdr(p_ri, alpha=u, method=correction)
-    elif correction == "bonferroni":
-        p_corr_fi = bonferroni(p_fi)
-        p_corr_ri = bonferroni(p_ri)
-    else:
-        p_corr_fi = p_fi
-        p_corr_ri = p_ri
+    p_corr_fi = _correct_pvalues(p_fi, u, correction)
+    p_corr_ri = _correct_pvalues(p_ri, u, correction)
 
     # Compute z-values
     z_corr_fi = p_to_z(p_corr_fi, "two") * sign_fi
     z_corr_ri = p_to_z(p_corr_ri, "two") * sign_ri
 
-    # Effect size
-    arr = np.array(
-        [
-            p_corr_fi,
-            z_corr_fi,
-            l_selected_g_term,  # pylint: disable=no-member
-            p_corr_ri,
-            z_corr_ri,
-            p_term_g_selected,
-        ]
-    ).T
-
-    out_df = pd.DataFrame(
-        data=arr,
-        index=features,
-        columns=[
-            "pForward",
-            "zForward",
-            "likelihoodForward",
-            "pReverse",
-            "zReverse",
-            "probReverse",
-        ],
-    )
-    out_df.index.name = "Term"
-    return out_df
+    return {
+        "pForward": p_corr_fi,
+        "zForward": z_corr_fi,
+        "likelihoodForward": l_selected_g_term,
+        "pReverse": p_corr_ri,
+        "zReverse": z_corr_ri,
+        "probReverse": p_term_g_selected,
+    }
 
 
 class NeurosynthDecoder(Decoder):
@@ -457,7 +662,12 @@ class NeurosynthDecoder(Decoder):
         self.correction = correction
 
     def _fit(self, dataset):
-        pass
+        self._term_counts = _get_term_counts(
+            self.inputs_["coordinates"],
+            self.inputs_["annotations"],
+            self.features_,
+            self.frequency_threshold,
+        )
 
     def transform(self, ids, ids2=None):
         """Apply the decoding method to a Dataset.
@@ -480,18 +690,49 @@ class NeurosynthDecoder(Decoder):
             label: 'pForward', 'zForward', 'probForward', 'pReverse', 'zReverse',
             and 'probReverse'.
         """
-        results = neurosynth_decode(
-            self.inputs_["coordinates"],
-            self.inputs_["annotations"],
-            ids=ids,
-            ids2=ids2,
-            features=self.features_,
-            frequency_threshold=self.frequency_threshold,
+        results = _neurosynth_decode(
+            self._term_counts,
+            [ids],
+            selections2=None if ids2 is None else [ids2],
             prior=self.prior,
             u=self.u,
             correction=self.correction,
         )
-        return results
+        return _results_to_df(results, self.features_)
+
+    def transform_batch(self, selections, selections2=None):
+        """Apply the decoding method to many selections of studies at once.
+
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        selections : :obj:`list` of :obj:`list`, or :obj:`dict`
+            Subsets of studies indicating targets for decoding (e.g., studies reporting at least
+            one peak in each parcel of an atlas). If a dictionary, keys are used as the labels
+            of the selections and values are lists of study IDs.
+        selections2 : :obj:`list` of :obj:`list`, :obj:`dict`, or None, optional
+            Second subsets of studies, representing "unselected" studies for each selection.
+            If None, then all studies in Dataset **not** in each selection will be used.
+            Default is None.
+
+        Returns
+        -------
+        results : :class:`pandas.DataFrame`
+            Table with one row for each selection and label, a "selection" column with the
+            label (or index) of the selection, a "Term" column, and the following values:
+            'pForward', 'zForward', 'probForward', 'pReverse', 'zReverse', and 'probReverse'.
+        """
+        labels, selections, selections2 = _check_selections(selections, selections2)
+        results = _neurosynth_decode(
+            self._term_counts,
+            selections,
+            selections2=selections2,
+            prior=self.prior,
+            u=self.u,
+            correction=self.correction,
+        )
+        return _results_to_df(results, self.features_, labels=labels)
 
 
 def neurosynth_decode(
@@ -570,24 +811,56 @@ def neurosynth_decode(
     ----------
     .. footbibliography::
     """
-    dataset_ids = sorted(list(set(coordinates["id"].values)))
-    if ids2 is None:
-        unselected = sorted(list(set(dataset_ids) - set(ids)))
-    else:
-        unselected = ids2[:]
+    term_counts = _get_term_counts(coordinates, annotations, features, frequency_threshold)
+    results = _neurosynth_decode(
+        term_counts,
+        [ids],
+        selections2=None if ids2 is None else [ids2],
+        prior=prior,
+        u=u,
+        correction=correction,
+    )
+    return _results_to_df(results, features)
 
-    # Binarize with frequency threshold
-    features_df = annotations.set_index("id", drop=True)
-    features_df = features_df[features].ge(frequency_threshold)
 
-    sel_array = features_df.loc[ids].values
-    unsel_array = features_df.loc[unselected].values
+def _neurosynth_decode(
+    term_counts,
+    selections,
+    selections2=None,
+    prior=0.5,
+    u=0.05,
+    correction="fdr_bh",
+):
+    """Apply the Neurosynth decoding method to many selections at once.
+
+    .. versionadded:: 0.5.1
 
-    n_selected = len(ids)
-    n_unselected = len(unselected)
+    Parameters
+    ----------
+    term_counts : :obj:`dict`
+        Output of :func:`_get_term_counts`.
+    selections : :obj:`list` of :obj:`list`
+        Study IDs in each selection.
+    selections2 : :obj:`list` of :obj:`list` or None, optional
+        Study IDs in each "unselected" set. Default is None.
+    prior : :obj:`float`, optional
+        Uniform prior probability of each label being active in a study. Default is 0.5.
+    u : :obj:`float`, optional
+        Alpha level for multiple comparisons correction. Default is 0.05.
+    correction : {None, "bh", "by", "bonferroni"}, optional
+        Multiple comparisons correction method to apply.
 
-    n_selected_term = np.sum(sel_array, axis=0)
-    n_unselected_term = np.sum(unsel_array, axis=0)
+    Returns
+    -------
+    results : :obj:`dict` of (K x F) :obj:`numpy.ndarray`
+        'pForward', 'zForward', 'probForward', 'pReverse', 'zReverse', and 'probReverse' values
+        for each selection and feature.
+    """
+    n_selected, n_unselected, n_selected_term, n_unselected_term = _count_selections(
+        term_counts,
+        selections,
+        selections2,
+    )
 
     n_selected_noterm = n_selected - n_selected_term
     n_unselected_noterm = n_unselected - n_unselected_term
@@ -606,34 +879,25 @@ def neurosynth_decode(
         prior = p_term
 
     # Significance testing
-    # One-way chi-square test for uniformity of term frequency across terms
-    chi2_fi = one_way(n_selected_term, n_term)
+    # One-way chi-square test for uniformity of term frequency across terms.
+    # one_way compares values along the first axis, so features go first.
+    chi2_fi = one_way(n_selected_term.T, n_term.T).T
     p_fi = special.chdtrc(1, chi2_fi)
-    sign_fi = np.sign(
-        n_selected_term - np.mean(n_selected_term)
-    ).ravel()  # pylint: disable=no-member
+    sign_fi = np.sign(n_selected_term - np.mean(n_selected_term, axis=1, keepdims=True))
 
     # Two-way chi-square test for association
-    cells = np.array(
-        [
-            [n_selected_term, n_selected_noterm],  # pylint: disable=no-member
-            [n_unselected_term, n_unselected_noterm],
-        ]
-    ).T
-    chi2_ri = two_way(cells)
+    chi2_ri = _two_way_by_selection(
+        n_selected_term,
+        n_selected_noterm,
+        n_unselected_term,
+        n_unselected_noterm,
+    )
     p_ri = special.chdtrc(1, chi2_ri)
-    sign_ri = np.sign(p_selected_g_term - p_selected_g_noterm).ravel()  # pylint: disable=no-member
+    sign_ri = np.sign(p_selected_g_term - p_selected_g_noterm)
 
     # Multiple comparisons correction across terms. Separately done for FI and RI.
-    if correction in ("bh", "by"):
-        p_corr_fi = fdr(p_fi, alpha=u, method=correction)
-        p_corr_ri = fdr(p_ri, alpha=u, method=correction)
-    elif correction == "bonferroni":
-        p_corr_fi = bonferroni(p_fi)
-        p_corr_ri = bonferroni(p_ri)
-    else:
-        p_corr_fi = p_fi
-        p_corr_ri = p_ri
+    p_corr_fi = _correct_pvalues(p_fi, u, correction)
+    p_corr_ri = _correct_pvalues(p_ri, u, correction)
 
     # Compute z-values
     z_corr_fi = p_to_z(p_corr_fi, "two") * sign_fi
@@ -646,24 +910,14 @@ def neurosynth_decode(
     # est. prob. of activation in ROI reflecting brain state described by term
     p_term_g_selected_g_prior = p_selected_g_term * prior / p_selected_g_term_g_prior
 
-    arr = np.array(
-        [
-            p_corr_fi,
-            z_corr_fi,
-            p_selected_g_term_g_prior,  # pylint: disable=no-member
-            p_corr_ri,
-            z_corr_ri,
-            p_term_g_selected_g_prior,
-        ]
-    ).T
-
-    out_df = pd.DataFrame(
-        data=arr,
-        index=features,
-        columns=["pForward", "zForward", "probForward", "pReverse", "zReverse", "probReverse"],
-    )
-    out_df.index.name = "Term"
-    return out_df
+    return {
+        "pForward": p_corr_fi,
+        "zForward": z_corr_fi,
+        "probForward": p_selected_g_term_g_prior,
+        "pReverse": p_corr_ri,
+        "zReverse": z_corr_ri,
+        "probReverse": p_term_g_selected_g_prior,
+    }
 
 
 class ROIAssociationDecoder(Decoder):
@@ -730,12 +984,12 @@ class ROIAssociationDecoder(Decoder):
         self.frequency_threshold = 0
 
     def _fit(self, dataset):
-        roi_values = self.kernel_transformer.transform(
+        # Average MA values within the ROI directly from the sparse MA maps
+        self.roi_values_ = self.kernel_transformer.transform_roi(
             self.inputs_["coordinates"],
             self.masker,
-            return_type="array",
+            summary="mean",
         )
-        self.roi_values_ = roi_values.mean(axis=1)
 
     def transform(self):
         """Apply the decoding method to a Dataset.
@@ -2,7 +2,6 @@
 
 import numpy as np
 from nilearn.masking import unmask
-from sklearn.feature_extraction.text import CountVectorizer
 
 from nimare.decode.utils import weight_priors
 
@@ -80,6 +79,8 @@ def gclda_encode(model, text, out_file=None, topic_priors=None, prior_weight=1.0
     ----------
     .. footbibliography::
     """
+    from sklearn.feature_extraction.text import CountVectorizer
+
     if isinstance(text, list):
         text = " ".join(text)
 
@@ -108,3 +109,58 @@ def gclda_encode(model, text, out_file=None, topic_priors=None, prior_weight=1.0
     if out_file is not None:
         img.to_filename(out_file)
     return img, topic_weights
+
+
+def gclda_encode_texts(model, texts, out_file=None, topic_priors=None, prior_weight=1.0):
+    """Encode multiple texts into images with a GCLDA model at once.
+
+    .. versionadded:: 0.5.1
+
+    This applies the method from :func:`~nimare.decode.encode.gclda_encode` to a set of texts,
+    computing the topic and voxel weights for all texts with single matrix products.
+
+    Parameters
+    ----------
+    model : :obj:`~nimare.annotate.gclda.GCLDAModel`
+        Model object needed for decoding.
+    texts : :obj:`list` of :obj:`str`
+        Texts to encode into images.
+    out_file : :obj:`str`, optional
+        If not None, writes the encoded 4D image to a file.
+    topic_priors : :obj:`numpy.ndarray` of :obj:`float`, optional
+        A 1d array of size (n_topics) with values for topic weighting.
+        If None, no weighting is done. Default is None.
+    prior_weight : :obj:`float`, optional
+        The weight by which the prior will affect the encoding.
+        Default is 1.
+
+    Returns
+    -------
+    img : :obj:`nibabel.nifti1.Nifti1Image`
+        The encoded 4D image, with one volume for each text.
+    topic_weights : (N x T) :obj:`numpy.ndarray` of :obj:`float`
+        The weights of the topics used in encoding, for each text.
+
+    See Also
+    --------
+    :func:`~nimare.decode.encode.gclda_encode`
+    :func:`~nimare.decode.continuous.gclda_decode_maps`
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    vocabulary = [term.replace("_", " ") for term in model.vocabulary]
+    max_len = max([len(term.split(" ")) for term in vocabulary])
+    vectorizer = CountVectorizer(vocabulary=model.vocabulary, ngram_range=(1, max_len))
+    word_counts = vectorizer.fit_transform(texts)  # Sparse texts-by-words array
+
+    topic_weights = np.asarray(word_counts @ model.p_topic_g_word_)
+    if topic_priors is not None:
+        weighted_priors = weight_priors(topic_priors, prior_weight)
+        topic_weights *= weighted_priors[None, :]
+
+    voxel_weights = np.dot(topic_weights, model.p_voxel_g_topic_.T)
+    img = unmask(voxel_weights, model.mask)
+
+    if out_file is not None:
+        img.to_filename(out_file)
+    return img, topic_weights
@@ -1,6 +1,7 @@
 """Utility functions for decoding/encoding."""
 
 import numpy as np
+import pandas as pd
 
 
 def weight_priors(topic_priors, prior_weight):
@@ -42,3 +43,95 @@ def weight_priors(topic_priors, prior_weight):
     # Weight priors with uniform base
     weighted_priors = topic_priors + uniform
     return weighted_priors
+
+
+def _standardize_rows(rows, dtype=np.float64, memfile=None):
+    """Mean-center each row and scale it to unit norm.
+
+    The dot product of two rows standardized this way is their Pearson correlation coefficient,
+    so correlating many images with many maps reduces to a single matrix product.
+
+    Parameters
+    ----------
+    rows : (M, N) array_like or :obj:`list` of (N,) array_like
+        Rows to standardize.
+    dtype : :obj:`str` or :obj:`numpy.dtype`, optional
+        Datatype of the standardized array. Default is float64.
+    memfile : :obj:`str` or None, optional
+        Name of a memory-mapped file in which to store the standardized array.
+        If None, memory-mapping will not be used. Default is None.
+
+    Returns
+    -------
+    standardized : (M, N) :obj:`numpy.ndarray` or :obj:`numpy.memmap`
+        Standardized rows. Rows with zero variance are filled with NaNs.
+    """
+    n_rows = len(rows)
+    n_cols = np.size(rows[0])
+    if memfile:
+        standardized = np.memmap(memfile, dtype=dtype, mode="w+", shape=(n_rows, n_cols))
+    else:
+        standardized = np.empty((n_rows, n_cols), dtype=dtype)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i_row in range(n_rows):
+            row = np.asarray(rows[i_row], dtype=np.float64).ravel()
+            row = row - row.mean()
+            standardized[i_row] = row / np.sqrt(np.dot(row, row))
+
+    return standardized
+
+
+def _scores_to_long(
+    scores,
+    features,
+    feature_column="feature",
+    top_k=None,
+    index_column="image",
+    index_labels=None,
+):
+    """Convert image-by-feature score arrays to a long-format DataFrame.
+
+    Parameters
+    ----------
+    scores : :obj:`dict` of (I x F) :obj:`numpy.ndarray`
+        Score arrays, with column names as keys. If ``top_k`` is not None, features are ranked
+        according to the first array.
+    features : :obj:`list` of :obj:`str`
+        Feature names, in the same order as the columns of the score arrays.
+    feature_column : :obj:`str`, optional
+        Name of the column with the feature names. Default is "feature".
+    top_k : :obj:`int` or None, optional
+        If not None, only the ``top_k`` highest-scoring features are retained for each image,
+        in descending order. Default is None.
+    index_column : :obj:`str`, optional
+        Name of the column identifying the images. Default is "image".
+    index_labels : :obj:`list` or None, optional
+        Labels of the images, in the same order as the rows of the score arrays.
+        Default is None, which uses the index of each image.
+
+    Returns
+    -------
+    out_df : :obj:`pandas.DataFrame`
+        DataFrame with one row for each image and feature, a column identifying the image,
+        a feature column, and one column for each score array.
+    """
+    names = list(scores.keys())
+    n_images, n_features = scores[names[0]].shape
+    features = np.asarray(features)
+
+    if top_k is None:
+        feature_idx = np.tile(np.arange(n_features), (n_images, 1))
+    else:
+        # NaNs are sorted last
+        feature_idx = np.argsort(-scores[names[0]], axis=1, kind="stable")[:, :top_k]
+
+    image_idx = np.repeat(np.arange(n_images), feature_idx.shape[1])
+    if index_labels is not None:
+        image_idx = np.asarray(index_labels)[image_idx]
+
+    out_df = pd.DataFrame({index_column: image_idx, feature_column: features[feature_idx.ravel()]})
+    for name in names:
+        out_df[name] = np.take_along_axis(scores[name], feature_idx, axis=1).ravel()
+
+    return out_df
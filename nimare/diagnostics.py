@@ -6,16 +6,23 @@ from abc import abstractmethod
 
 import numpy as np
 import pandas as pd
-from joblib import Parallel, delayed
+from joblib import delayed
 from nilearn import input_data
 from nilearn.reporting import get_clusters_table
 from scipy.spatial.distance import cdist
 from tqdm.auto import tqdm
 
+from nimare import profiling
 from nimare.base import NiMAREBase
 from nimare.meta.cbma.base import PairwiseCBMAEstimator
 from nimare.meta.ibma import IBMAEstimator
-from nimare.utils import _check_ncores, get_masker, mm2vox
+from nimare.utils import (
+    _check_backend,
+    _check_ncores,
+    _run_parallel,
+    get_masker,
+    mm2vox,
+)
 
 LGR = logging.getLogger(__name__)
 
@@ -26,6 +33,10 @@ NEGTAIL_LBL = "NegativeTail"  # Label assigned to negative tail clusters
 class Diagnostics(NiMAREBase):
     """Base class for diagnostic methods.
 
+    .. versionchanged:: 0.5.1
+
+        * New parameter: ``backend``, to process the experiments in threads or with an Executor.
+
     .. versionchanged:: 0.1.2
 
         * New parameter display_second_group, which controls whether the second group is displayed.
@@ -53,6 +64,16 @@ class Diagnostics(NiMAREBase):
         Number of cores to use for parallelization.
         If <=0, defaults to using all available cores.
         Default is 1.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+        Parallel backend. If None, joblib's default process-based backend is used,
+        and each worker receives its own copy of the MetaResult.
+        If "threads", all workers share one in-memory copy of the MetaResult.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        Default is None.
+
+        .. versionadded:: 0.5.1
 
     """
 
@@ -63,12 +84,14 @@ class Diagnostics(NiMAREBase):
         cluster_threshold=None,
         display_second_group=False,
         n_cores=1,
+        backend=None,
     ):
         self.target_image = target_image
         self.voxel_thresh = voxel_thresh
         self.cluster_threshold = cluster_threshold
         self.display_second_group = display_second_group
         self.n_cores = _check_ncores(n_cores)
+        self.backend = _check_backend(backend)
 
     @abstractmethod
     def _transform(self, expid, label_map, result):
@@ -144,13 +167,14 @@ class Diagnostics(NiMAREBase):
         else:
             two_sided = (target_img.get_fdata() < 0).any()
 
-        clusters_table, label_maps = get_clusters_table(
-            target_img,
-            stat_threshold,
-            self.cluster_threshold,
-            two_sided=two_sided,
-            return_label_maps=True,
-        )
+        with profiling.span("cluster_labeling", category="diagnostics"):
+            clusters_table, label_maps = get_clusters_table(
+                target_img,
+                stat_threshold,
+                self.cluster_threshold,
+                two_sided=two_sided,
+                return_label_maps=True,
+            )
 
         n_clusters = clusters_table.shape[0]
         if n_clusters == 0:
@@ -187,6 +211,7 @@ class Diagnostics(NiMAREBase):
             result.maps[label_map_names[0]] = None
 
             result.diagnostics.append(self)
+            result.profile_ = profiling.get_profiler() or getattr(result, "profile_", None)
             return result
 
         tables_dict = {clusters_table_name: clusters_table}
@@ -228,9 +253,19 @@ class Diagnostics(NiMAREBase):
             contributions = [
                 r
                 for r in tqdm(
-                    Parallel(return_as="generator", n_jobs=self.n_cores)(
-                        delayed(self._transform)(expid, label_map, sign, result)
-                        for expid in meta_ids
+                    profiling.trace_batches(
+                        _run_parallel(
+                            (
+                                delayed(self._transform)(expid, label_map, sign, result)
+                                for expid in meta_ids
+                            ),
+                            n_cores=self.n_cores,
+                            backend=self.backend,
+                        ),
+                        name=f"{diag_name}.experiments",
+                        batch_size=10,
+                        category="diagnostics",
+                        counter="experiments",
                     ),
                     total=len(meta_ids),
                 )
@@ -260,6 +295,7 @@ class Diagnostics(NiMAREBase):
 
         # Add diagnostics class to result, since more than one can be run
         result.diagnostics.append(self)
+        result.profile_ = profiling.get_profiler() or getattr(result, "profile_", None)
         return result
 
 
@@ -4,6 +4,7 @@ from abc import abstractmethod
 
 from joblib import Memory
 
+from nimare import profiling
 from nimare.base import NiMAREBase
 from nimare.results import MetaResult
 
@@ -127,13 +128,21 @@ class Estimator(NiMAREBase):
         "fitting" methods are implemented as `_fit`, although users should
         call `fit`.
         """
-        self._collect_inputs(dataset, drop_invalid=drop_invalid)
-        self._preprocess_input(dataset)
-        maps, tables, description = self._cache(self._fit, func_memory_level=1)(dataset)
+        with profiling.span(f"{self.__class__.__name__}.fit", category="estimator"):
+            with profiling.span("collect_inputs", category="estimator"):
+                self._collect_inputs(dataset, drop_invalid=drop_invalid)
+
+            with profiling.span("preprocess_input", category="estimator"):
+                self._preprocess_input(dataset)
+
+            with profiling.span("fit", category="estimator"):
+                maps, tables, description = self._cache(self._fit, func_memory_level=1)(dataset)
 
         if hasattr(self, "masker") and self.masker is not None:
             masker = self.masker
         else:
             masker = dataset.masker
 
-        return MetaResult(self, mask=masker, maps=maps, tables=tables, description=description)
+        result = MetaResult(self, mask=masker, maps=maps, tables=tables, description=description)
+        result.profile_ = profiling.get_profiler()
+        return result
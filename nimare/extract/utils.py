@@ -8,7 +8,6 @@ import os.path as op
 
 import numpy as np
 import pandas as pd
-import requests
 from fuzzywuzzy import fuzz
 
 from nimare.utils import _uk_to_us
@@ -164,6 +163,8 @@ def _download_zipped_file(url, filename=None):
     .. versionadded:: 0.0.2
 
     """
+    import requests
+
     if filename is None:
         data_dir = op.abspath(op.getcwd())
         filename = op.join(data_dir, url.split("/")[-1])
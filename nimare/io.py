@@ -10,7 +10,6 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import requests
 from scipy import sparse
 
 from nimare.dataset import Dataset
@@ -570,6 +569,8 @@ def convert_neurovault_to_dataset(
     :obj:`~nimare.dataset.Dataset`
         Dataset object containing experiment information from neurovault.
     """
+    import requests
+
     img_dir = Path(_get_dataset_dir("_".join(contrasts.keys()), data_dir=img_dir))
 
     if map_type_conversion is None:
@@ -4,24 +4,73 @@ import logging
 
 import numpy as np
 import pandas as pd
-import sparse
-from joblib import Memory, Parallel, delayed
+from joblib import Memory, delayed
+from scipy import sparse
 from tqdm.auto import tqdm
 
-from nimare import _version
+from nimare import _version, profiling
 from nimare.meta.cbma.base import CBMAEstimator, PairwiseCBMAEstimator
 from nimare.meta.kernel import ALEKernel
-from nimare.stats import null_to_p, nullhist_to_p
+from nimare.meta.utils import _get_iteration_rng, _get_random_seed
 from nimare.transforms import p_to_z
-from nimare.utils import _check_ncores, use_memmap
+from nimare.utils import _check_backend, _check_ncores, _round2, _run_parallel
 
 LGR = logging.getLogger(__name__)
 __version__ = _version.get_versions()["version"]
 
+# Number of permutations evaluated with each matrix product in ALESubtraction
+_N_PERMS_PER_BLOCK = 256
+# Maximum number of elements in the dense arrays used for each chunk of voxels in ALESubtraction
+_MAX_BLOCK_ELEMENTS = 2**24
+
+# Lower bound of log(1 - MA) values in the accumulators of ALE estimators
+_MIN_LOG_VALUE = np.log(np.finfo(np.float64).tiny)
+
+
+def _compute_ale(ma_values):
+    """Compute ALE values as the union of the MA values across experiments.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    ma_values : (E x V) :obj:`scipy.sparse.csr_matrix` or array_like
+        MA values, with one row for each experiment. Arrays may have any number of dimensions,
+        and the ALE values are computed along the first one.
+
+    Returns
+    -------
+    stat_values : :obj:`numpy.ndarray`
+        ALE values.
+    """
+    if not sparse.issparse(ma_values):
+        # MA values may be stored in float32, but the product is accumulated in float64
+        return 1.0 - np.prod(1.0 - np.asarray(ma_values, dtype=np.float64), axis=0)
+
+    # Zeros do not change the product, so only the nonzero MA values of each voxel are reduced
+    ma_values = ma_values.tocsc()
+    ma_values.sort_indices()
+    has_values = np.diff(ma_values.indptr) > 0
+
+    prod_values = np.ones(ma_values.shape[1])
+    if has_values.any():
+        prod_values[has_values] = np.multiply.reduceat(
+            1.0 - ma_values.data.astype(np.float64),
+            ma_values.indptr[:-1][has_values],
+        )
+
+    return 1.0 - prod_values
+
 
 class ALE(CBMAEstimator):
     """Activation likelihood estimation.
 
+    .. versionchanged:: 0.5.1
+
+        - New method: :meth:`update`, to add or remove experiments without refitting.
+        - New parameter: ``backend``, to run the Monte Carlo null distribution in threads or
+          with an Executor.
+
     .. versionchanged:: 0.2.1
 
         - New parameters: ``memory`` and ``memory_level`` for memory caching.
@@ -70,6 +119,16 @@ class ALE(CBMAEstimator):
         This is only used if ``null_method=="montecarlo"``.
         If <=0, defaults to using all available cores.
         Default is 1.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, default=None
+        Parallel backend. If None, joblib's default process-based backend is used.
+        If "threads", all workers share one in-memory copy of the inputs.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        This is only used if ``null_method=="montecarlo"``.
+        Default is None.
+
+        .. versionadded:: 0.5.1
     **kwargs
         Keyword arguments. Arguments for the kernel_transformer can be assigned here,
         with the prefix ``kernel__`` in the variable name.
@@ -86,6 +145,10 @@ class ALE(CBMAEstimator):
         Null distributions for the uncorrected summary-statistic-to-p-value conversion and any
         multiple-comparisons correction methods.
         Entries are added to this attribute if and when the corresponding method is applied.
+        Each null that is used to compute p-values also gets a
+        :class:`~nimare.stats.NullDistribution` entry, under the same key with a ``nulldist_``
+        prefix instead of ``values_`` or ``histweights_``
+        (e.g., ``nulldist_corr-none_method-approximate``).
 
         If ``null_method == "approximate"``:
 
@@ -116,6 +179,12 @@ class ALE(CBMAEstimator):
             -   ``values_desc-mass_level-cluster_corr-fwe_method-montecarlo``: The maximum cluster
                 mass from each Monte Carlo iteration. An array of shape (n_iters,).
 
+    accumulators_ : :obj:`dict` or None
+        Running summaries of the experiments, which are used by :meth:`update`, including the
+        voxel-wise sums of log(1 - MA) values and the MA-value histogram of each experiment.
+        Only available if ``null_method == "approximate"`` and all MA values are probabilities
+        (e.g., not with a :class:`~nimare.meta.kernel.KDAKernel`).
+
     Notes
     -----
     The ALE algorithm was originally developed in :footcite:t:`turkeltaub2002meta`,
@@ -140,6 +209,7 @@ class ALE(CBMAEstimator):
         memory=Memory(location=None, verbose=0),
         memory_level=0,
         n_cores=1,
+        backend=None,
         **kwargs,
     ):
         if not (isinstance(kernel_transformer, ALEKernel) or kernel_transformer == ALEKernel):
@@ -159,6 +229,7 @@ class ALE(CBMAEstimator):
         self.null_method = null_method
         self.n_iters = None if null_method == "approximate" else n_iters or 5000
         self.n_cores = _check_ncores(n_cores)
+        self.backend = _check_backend(backend)
         self.dataset = None
 
     def _generate_description(self):
@@ -205,57 +276,49 @@ class ALE(CBMAEstimator):
         return description
 
     def _compute_summarystat_est(self, ma_values):
-        stat_values = 1.0 - np.prod(1.0 - ma_values, axis=0)
-
-        # np.array type is used by _determine_histogram_bins to calculate max_poss_ale
-        if isinstance(stat_values, sparse._coo.core.COO):
-            # NOTE: This may not work correctly with a non-NiftiMasker.
-            mask_data = self.masker.mask_img.get_fdata().astype(bool)
-
-            stat_values = stat_values.todense().reshape(-1)  # Indexing a .reshape(-1) is faster
-            stat_values = stat_values[mask_data.reshape(-1)]
-
-            # This is used by _compute_null_approximate
-            self.__n_mask_voxels = stat_values.shape[0]
-
-        return stat_values
+        return _compute_ale(ma_values)
 
     def _determine_histogram_bins(self, ma_maps):
         """Determine histogram bins for null distribution methods.
 
         Parameters
         ----------
-        ma_maps : :obj:`sparse._coo.core.COO`
+        ma_maps : :obj:`scipy.sparse.csr_matrix`
             MA maps.
 
         Notes
         -----
         This method adds one entry to the null_distributions_ dict attribute: "histogram_bins".
         """
-        if not isinstance(ma_maps, sparse._coo.core.COO):
+        if not sparse.issparse(ma_maps):
             raise ValueError(f"Unsupported data type '{type(ma_maps)}'")
 
-        # Determine bins for null distribution histogram
+        # Need to convert to dense because np.ceil is too slow with sparse
+        max_ma_values = ma_maps.max(axis=1).toarray().ravel()
+        self.null_distributions_["histogram_bins"] = self._compute_histogram_bins(max_ma_values)
+
+    def _compute_histogram_bins(self, max_ma_values):
+        """Compute the histogram bin centers for experiments with given maximum MA values.
+
+        .. versionadded:: 0.5.1
+        """
         # Remember that numpy histogram bins are bin edges, not centers
         # Assuming values of 0, .001, .002, etc., bins are -.0005-.0005, .0005-.0015, etc.
         INV_STEP_SIZE = 100000
         step_size = 1 / INV_STEP_SIZE
-        # Need to convert to dense because np.ceil is too slow with sparse
-        max_ma_values = ma_maps.max(axis=[1, 2, 3]).todense()
 
         # round up based on resolution
         max_ma_values = np.ceil(max_ma_values * INV_STEP_SIZE) / INV_STEP_SIZE
         max_poss_ale = self._compute_summarystat(max_ma_values)
         # create bin centers
-        hist_bins = np.round(np.arange(0, max_poss_ale + (1.5 * step_size), step_size), 5)
-        self.null_distributions_["histogram_bins"] = hist_bins
+        return np.round(np.arange(0, max_poss_ale + (1.5 * step_size), step_size), 5)
 
     def _compute_null_approximate(self, ma_maps):
         """Compute uncorrected ALE null distribution using approximate solution.
 
         Parameters
         ----------
-        ma_maps : :obj:`sparse._coo.core.COO`
+        ma_maps : :obj:`scipy.sparse.csr_matrix`
             MA maps.
 
         Notes
@@ -265,42 +328,49 @@ class ALE(CBMAEstimator):
             - "histogram_bins"
             - "histweights_corr-none_method-approximate"
         """
-        if not isinstance(ma_maps, sparse._coo.core.COO):
+        if not sparse.issparse(ma_maps):
             raise ValueError(f"Unsupported data type '{type(ma_maps)}'")
 
         assert "histogram_bins" in self.null_distributions_.keys()
 
-        # Derive bin edges from histogram bin centers for numpy histogram function
-        bin_centers = self.null_distributions_["histogram_bins"]
-        step_size = bin_centers[1] - bin_centers[0]
-        inv_step_size = 1 / step_size
-        bin_edges = bin_centers - (step_size / 2)
-        bin_edges = np.append(bin_centers, bin_centers[-1] + step_size)
+        max_ma_values = ma_maps.max(axis=1).toarray().ravel()
+        ma_hists = self._compute_ma_histograms(ma_maps, max_ma_values)
+        self.null_distributions_["histweights_corr-none_method-approximate"] = (
+            self._convolve_ma_histograms(ma_hists)
+        )
 
-        n_exp = ma_maps.shape[0]
-        n_bins = bin_centers.shape[0]
-        ma_hists = np.zeros((n_exp, n_bins))
-        data = ma_maps.data
-        coords = ma_maps.coords
-        for exp_idx in range(n_exp):
-            # The first column of coords is the fourth dimension of the dense array
-            study_ma_values = data[coords[0, :] == exp_idx]
+    def _convolve_ma_histograms(self, ma_hists, ale_hist=None):
+        """Combine MA-value histograms into a histogram of ALE values.
 
-            n_nonzero_voxels = study_ma_values.shape[0]
-            n_zero_voxels = self.__n_mask_voxels - n_nonzero_voxels
+        .. versionadded:: 0.5.1
 
-            ma_hists[exp_idx, :] = np.histogram(study_ma_values, bins=bin_edges, density=False)[
-                0
-            ].astype(float)
-            ma_hists[exp_idx, 0] += n_zero_voxels
+        Parameters
+        ----------
+        ma_hists : (E x B) :obj:`scipy.sparse.csr_matrix`
+            Normalized MA-value histograms of E experiments, on the first B bins in the
+            "histogram_bins" null distribution.
+        ale_hist : :obj:`numpy.ndarray` or None, optional
+            Histogram of ALE values from other experiments, with one value for each bin in
+            "histogram_bins", with which the experiments are combined. Default is None.
 
-        # Normalize MA histograms to get probabilities
-        ma_hists /= ma_hists.sum(1)[:, None]
+        Returns
+        -------
+        ale_hist : :obj:`numpy.ndarray`
+            Histogram of ALE values, with one value for each bin in "histogram_bins".
+        """
+        bin_centers = self.null_distributions_["histogram_bins"]
+        step_size = bin_centers[1] - bin_centers[0]
+        inv_step_size = 1 / step_size
 
-        ale_hist = ma_hists[0, :].copy()
+        ma_hists = ma_hists.tocsr(copy=True)
+        ma_hists.resize((ma_hists.shape[0], bin_centers.shape[0]))
+        first_exp = 0
+        if ale_hist is None:
+            ale_hist = ma_hists[0].toarray().ravel()
+            first_exp = 1
 
-        for i_exp in range(1, ma_hists.shape[0]):
-            exp_hist = ma_hists[i_exp, :]
+        for i_exp in range(first_exp, ma_hists.shape[0]):
+            exp_hist = ma_hists[i_exp].toarray().ravel()
 
             # Find histogram bins with nonzero values for each histogram.
             ale_idx = np.where(ale_hist > 0)[0]
@@ -319,11 +389,48 @@ class ALE(CBMAEstimator):
             ale_hist = np.zeros(ale_hist.shape)
             np.add.at(ale_hist, score_idx, probabilities)
 
-        self.null_distributions_["histweights_corr-none_method-approximate"] = ale_hist
+        return ale_hist
+
+    def _compute_accumulators(self, ma_values, coordinates):
+        if ma_values.nnz and ma_values.data.max() > 1:
+            # log(1 - MA) is undefined for kernels whose MA values are not probabilities
+            return None
+
+        # Sums of log(1 - MA) values, clipped for MA values of 1 so that experiments can still be
+        # subtracted, are the log of the voxel-wise products in the ALE values
+        log_values = ma_values.astype(np.float64)
+        log_values.data = np.maximum(np.log1p(-log_values.data), _MIN_LOG_VALUE)
+
+        max_ma_values = ma_values.max(axis=1).toarray().ravel()
+        return {
+            "stat": np.asarray(log_values.sum(axis=0)).ravel(),
+            "max_ma_values": max_ma_values,
+            "ma_hists": self._compute_ma_histograms(ma_values, max_ma_values),
+        }
+
+    def _compute_summarystat_from_accumulators(self):
+        return -np.expm1(self.accumulators_["stat"])
 
 
 class ALESubtraction(PairwiseCBMAEstimator):
-    """ALE subtraction analysis.
+    r"""ALE subtraction analysis.
+
+    .. versionchanged:: 0.5.1
+
+        - Count exceedances of the observed ALE-difference scores as permutations finish,
+          instead of storing the full voxel-wise null distributions in a memmapped array.
+          Memory use no longer grows with ``n_iters``.
+        - Compute the ALE maps of many permutations at once, as matrix products of group
+          indicators and single-precision log-transformed MA values, in chunks of voxels
+          processed in parallel.
+          Permutations that reproduce the observed ALE-difference score now consistently count
+          as ties, whereas they were previously broken arbitrarily by floating-point error.
+          As a result, p-values change in a small proportion of voxels (about 1.5% on the test
+          data), mostly low-MA voxels with such ties, along with a few near-ties that single
+          precision no longer resolves. The ALE-difference (stat) maps are still computed in
+          double precision.
+        - New parameter: ``backend``, to process the chunks of voxels in threads or with an
+          Executor.
 
     .. versionchanged:: 0.2.1
 
@@ -362,6 +469,15 @@ class ALESubtraction(PairwiseCBMAEstimator):
         Default is 1.
 
         .. versionadded:: 0.0.12
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, default=None
+        Parallel backend. If None, joblib's default process-based backend is used.
+        If "threads", all workers share one in-memory copy of the MA maps.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        Default is None.
+
+        .. versionadded:: 0.5.1
     **kwargs
         Keyword arguments. Arguments for the kernel_transformer can be assigned here,
         with the prefix ``kernel__`` in the variable name. Another optional argument is ``mask``.
@@ -382,8 +498,17 @@ class ALESubtraction(PairwiseCBMAEstimator):
     The ALE subtraction algorithm is also implemented as part of the GingerALE app provided by the
     BrainMap organization (https://www.brainmap.org/ale/).
 
-    The voxel-wise null distributions used by this Estimator are very large, so they are not
-    retained as Estimator attributes.
+    The voxel-wise null distributions used by this Estimator are very large, so they are never
+    stored. Instead, for each voxel, the permuted ALE-difference scores below and above the
+    observed score are counted as each permutation finishes, which is all that is needed for
+    exact p-values.
+
+    Since :math:`\log(1 - ALE) = \sum_{e} \log(1 - MA_{e})`, the ALE maps for a block of
+    permutations are obtained by multiplying a (permutations x experiments) matrix of group
+    indicators with an (experiments x voxels) matrix of :math:`\log(1 - MA)` values, in single
+    precision. The observed ALE-difference scores are recomputed the same way for comparison
+    with the null distributions, so that permutations that reproduce the observed groups tie
+    with them, while the reported ``stat`` map is computed in double precision.
 
     Warnings
     --------
@@ -408,6 +533,7 @@ class ALESubtraction(PairwiseCBMAEstimator):
         memory=Memory(location=None, verbose=0),
         memory_level=0,
         n_cores=1,
+        backend=None,
         **kwargs,
     ):
         if not (isinstance(kernel_transformer, ALEKernel) or kernel_transformer == ALEKernel):
@@ -429,9 +555,7 @@ class ALESubtraction(PairwiseCBMAEstimator):
         self.dataset2 = None
         self.n_iters = n_iters
         self.n_cores = _check_ncores(n_cores)
-        # memory_limit needs to exist to trigger use_memmap decorator, but it will also be used if
-        # a Dataset with pre-generated MA maps is provided.
-        self.memory_limit = "100mb"
+        self.backend = _check_backend(backend)
 
     def _generate_description(self):
         if (
@@ -482,7 +606,6 @@ class ALESubtraction(PairwiseCBMAEstimator):
         )
         return description
 
-    @use_memmap(LGR, n_files=3)
     def _fit(self, dataset1, dataset2):
         self.dataset1 = dataset1
         self.dataset2 = dataset2
@@ -504,60 +627,57 @@ class ALESubtraction(PairwiseCBMAEstimator):
         del grp1_ale_values, grp2_ale_values
 
         n_grp1 = ma_maps1.shape[0]
-        n_voxels = diff_ale_values.shape[0]
-
-        # Combine the MA maps into a single array to draw from for null distribution
-        ma_arr = sparse.concatenate((ma_maps1, ma_maps2))
 
+        # Combine the MA maps into a single (E x V) array to draw from for null distribution,
+        # in a format that can be split across voxels
+        ma_arr = sparse.vstack((ma_maps1, ma_maps2)).tocsc()
         del ma_maps1, ma_maps2
 
-        # Calculate null distribution for each voxel based on group-assignment randomization
-        # Use a memmapped 2D array
-        iter_diff_values = np.memmap(
-            self.memmap_filenames[2],
-            dtype=ma_arr.dtype,
-            mode="w+",
-            shape=(self.n_iters, n_voxels),
-        )
-
-        _ = [
+        n_exps, n_voxels = ma_arr.shape
+
+        # Group 1 membership for the observed groups (first row) and each permutation
+        in_grp1 = np.zeros((self.n_iters + 1, n_exps), dtype=bool)
+        in_grp1[0, :n_grp1] = True
+        for i_iter in range(self.n_iters):
+            gen = np.random.default_rng(seed=i_iter)
+            id_idx = np.arange(n_exps)
+            gen.shuffle(id_idx)
+            in_grp1[i_iter + 1, id_idx[:n_grp1]] = True
+
+        # Calculate null distribution for each voxel based on group-assignment randomization,
+        # keeping only running counts so that memory use does not depend on the number of
+        # iterations
+        chunk_size = max(1, _MAX_BLOCK_ELEMENTS // max(n_exps, 2 * _N_PERMS_PER_BLOCK))
+        chunks = [slice(start, start + chunk_size) for start in range(0, n_voxels, chunk_size)]
+        chunk_null_counts = [
             r
             for r in tqdm(
-                Parallel(return_as="generator", n_jobs=self.n_cores)(
-                    delayed(self._run_permutation)(i_iter, n_grp1, ma_arr, iter_diff_values)
-                    for i_iter in range(self.n_iters)
+                profiling.trace_batches(
+                    _run_parallel(
+                        (
+                            delayed(self._run_permutations)(ma_arr[:, chunk], in_grp1)
+                            for chunk in chunks
+                        ),
+                        n_cores=self.n_cores,
+                        backend=self.backend,
+                    ),
+                    name="voxel_chunks",
+                    batch_size=1,
+                    category="estimator",
+                    counter="voxel_chunks",
                 ),
-                total=self.n_iters,
+                total=len(chunks),
             )
         ]
+        null_counts = {
+            key: np.concatenate([counts[key] for counts in chunk_null_counts])
+            for key in chunk_null_counts[0].keys()
+        }
+        del ma_arr, chunk_null_counts
 
-        # Determine p-values based on voxel-wise null distributions
-        # I know that joblib probably preserves order of outputs, but I'm paranoid, so we track
-        # the iteration as well and sort the resulting p-value array based on that.
-        p_values, voxel_idx = tqdm(
-            zip(
-                *Parallel(return_as="generator", n_jobs=self.n_cores)(
-                    delayed(self._alediff_to_p_voxel)(
-                        i_voxel,
-                        diff_ale_values[i_voxel],
-                        iter_diff_values[:, i_voxel],
-                    )
-                    for i_voxel in range(n_voxels)
-                ),
-            ),
-            total=n_voxels,
-        )
-
-        # Convert to an array and sort the p-values array based on the voxel index.
-        p_values = np.array(p_values)[np.array(voxel_idx)]
-
-        diff_signs = np.sign(diff_ale_values - np.median(iter_diff_values, axis=0))
-
-        if isinstance(iter_diff_values, np.memmap):
-            LGR.debug(f"Closing memmap at {iter_diff_values.filename}")
-            iter_diff_values._mmap.close()
-
-        del iter_diff_values
+        # Determine p-values and signs based on voxel-wise null distributions
+        p_values, diff_signs = self._null_counts_to_p(null_counts, null_counts["diff_values"])
+        del null_counts
 
         z_arr = p_to_z(p_values, tail="two") * diff_signs
         logp_arr = -np.log10(p_values)
@@ -573,51 +693,170 @@ class ALESubtraction(PairwiseCBMAEstimator):
         return maps, {}, description
 
     def _compute_summarystat_est(self, ma_values):
-        stat_values = 1.0 - np.prod(1.0 - ma_values, axis=0)
+        return _compute_ale(ma_values)
+
+    def _run_permutations(self, ma_values, in_grp1):
+        """Summarize the ALESubtraction null distributions for a chunk of voxels.
+
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        ma_values : :obj:`scipy.sparse.csc_matrix` of shape (E, V)
+            The voxel-wise (V) modeled activation values for all experiments E.
+        in_grp1 : :obj:`numpy.ndarray` of shape (1 + I, E)
+            Boolean array indicating the experiments in the first group (of two, total), for the
+            observed groups (first row) and each of the I permutations.
+
+        Returns
+        -------
+        null_counts : :obj:`dict`
+            Null distribution summaries, from :meth:`_init_null_counts`, plus the observed
+            ALE-difference scores (``"diff_values"``).
+        """
+        # log(1 - MA), with MA values of 1 mapped to the lowest finite value so that experiments
+        # outside of a group contribute zeros instead of NaNs to the matrix products
+        log_values = np.log1p(-ma_values.toarray().astype(np.float32))
+        np.maximum(log_values, np.finfo(np.float32).min, out=log_values)
+
+        null_counts = None
+        for start in range(0, in_grp1.shape[0], _N_PERMS_PER_BLOCK):
+            block = in_grp1[start : start + _N_PERMS_PER_BLOCK]
+            n_perms = block.shape[0]
+
+            # log(1 - ALE) for group 1 and group 2 in each permutation
+            groups = np.vstack((block, ~block)).astype(np.float32)
+            log_ale_values = groups @ log_values
+
+            # ALE1 - ALE2 = (1 - exp(log(1 - ALE1))) - (1 - exp(log(1 - ALE2)))
+            iter_diff_values = np.expm1(log_ale_values[n_perms:]) - np.expm1(
+                log_ale_values[:n_perms]
+            )
+            if null_counts is None:
+                diff_values = iter_diff_values[0]
+                null_counts = self._init_null_counts(diff_values, iter_diff_values.dtype)
+                null_counts["diff_values"] = diff_values
+                iter_diff_values = iter_diff_values[1:]
 
-        if isinstance(stat_values, sparse._coo.core.COO):
-            # NOTE: This may not work correctly with a non-NiftiMasker.
-            mask_data = self.masker.mask_img.get_fdata().astype(bool)
+            self._update_null_counts(null_counts, diff_values, iter_diff_values)
 
-            stat_values = stat_values.todense().reshape(-1)  # Indexing a .reshape(-1) is faster
-            stat_values = stat_values[mask_data.reshape(-1)]
+        return null_counts
 
-        return stat_values
+    @staticmethod
+    def _init_null_counts(diff_ale_values, dtype):
+        """Initialize the running summaries of the voxel-wise null distributions.
 
-    def _run_permutation(self, i_iter, n_grp1, ma_arr, iter_diff_values):
-        """Run a single permutations of the ALESubtraction null distribution procedure.
+        .. versionadded:: 0.5.1
 
-        This method writes out a single row to the memmapped array in ``iter_diff_values``.
+        Parameters
+        ----------
+        diff_ale_values : :obj:`numpy.ndarray` of shape (V,)
+            The observed ALE-difference scores.
+        dtype : :obj:`numpy.dtype`
+            The data type of the permuted ALE-difference scores.
+
+        Returns
+        -------
+        null_counts : :obj:`dict`
+            Dictionary with, for each voxel, the number of permuted scores below (``"n_below"``)
+            and above (``"n_above"``) the observed score, and the closest permuted scores below
+            (``"below_max"``) and above (``"above_min"``) it.
+        """
+        n_voxels = diff_ale_values.shape[0]
+        return {
+            "n_below": np.zeros(n_voxels, dtype=np.int64),
+            "n_above": np.zeros(n_voxels, dtype=np.int64),
+            "below_max": np.full(n_voxels, -np.inf, dtype=dtype),
+            "above_min": np.full(n_voxels, np.inf, dtype=dtype),
+        }
+
+    @staticmethod
+    def _update_null_counts(null_counts, diff_ale_values, iter_diff_values):
+        """Add a block of permutations' ALE-difference scores to the null distribution summaries.
+
+        .. versionadded:: 0.5.1
 
         Parameters
         ----------
-        i_iter : :obj:`int`
-            The iteration number.
-        n_grp1 : :obj:`int`
-            The number of experiments in the first group (of two, total).
-        ma_arr : :obj:`numpy.ndarray` of shape (E, V)
-            The voxel-wise (V) modeled activation values for all experiments E.
-        iter_diff_values : :obj:`numpy.memmap` of shape (I, V)
-            The null distribution of ALE-difference scores, with one row per iteration (I)
-            and one column per voxel (V).
+        null_counts : :obj:`dict`
+            Null distribution summaries, from :meth:`_init_null_counts`. Updated in place.
+        diff_ale_values : :obj:`numpy.ndarray` of shape (V,)
+            The observed ALE-difference scores.
+        iter_diff_values : :obj:`numpy.ndarray` of shape (P, V)
+            The ALE-difference scores for P permutations.
         """
-        gen = np.random.default_rng(seed=i_iter)
-        id_idx = np.arange(ma_arr.shape[0])
-        gen.shuffle(id_idx)
-        iter_grp1_ale_values = self._compute_summarystat_est(ma_arr[id_idx[:n_grp1], :])
-        iter_grp2_ale_values = self._compute_summarystat_est(ma_arr[id_idx[n_grp1:], :])
-        iter_diff_values[i_iter, :] = iter_grp1_ale_values - iter_grp2_ale_values
+        if iter_diff_values.shape[0] == 0:
+            return
+
+        below = iter_diff_values < diff_ale_values
+        above = iter_diff_values > diff_ale_values
+        null_counts["n_below"] += below.sum(axis=0)
+        null_counts["n_above"] += above.sum(axis=0)
+        np.maximum(
+            null_counts["below_max"],
+            np.where(below, iter_diff_values, -np.inf).max(axis=0),
+            out=null_counts["below_max"],
+        )
+        np.minimum(
+            null_counts["above_min"],
+            np.where(above, iter_diff_values, np.inf).min(axis=0),
+            out=null_counts["above_min"],
+        )
 
-    def _alediff_to_p_voxel(self, i_voxel, stat_value, voxel_null):
-        """Compute one voxel's p-value from its specific null distribution.
+    def _null_counts_to_p(self, null_counts, diff_ale_values):
+        """Compute p-values and signs from the null distribution summaries.
 
-        Notes
-        -----
+        .. versionadded:: 0.5.1
+
+        The p-values are identical to those of :func:`~nimare.stats.null_to_p` with
+        ``tail="two"`` and ``symmetric=False`` applied to the full null distributions.
         In cases with differently-sized groups, the ALE-difference values will be biased and
-        skewed, but the null distributions will be too, so symmetric should be False.
+        skewed, but the null distributions will be too, so they are not assumed to be symmetric.
+
+        Parameters
+        ----------
+        null_counts : :obj:`dict`
+            Null distribution summaries, from :meth:`_init_null_counts`.
+        diff_ale_values : :obj:`numpy.ndarray` of shape (V,)
+            The observed ALE-difference scores.
+
+        Returns
+        -------
+        p_values : :obj:`numpy.ndarray` of shape (V,)
+            Two-sided p-values.
+        diff_signs : :obj:`numpy.ndarray` of shape (V,)
+            Signs of the differences between the observed scores and the medians of the null
+            distributions.
         """
-        p_value = null_to_p(stat_value, voxel_null, tail="two", symmetric=False)
-        return p_value, i_voxel
+        n_iters = self.n_iters
+        n_below, n_above = null_counts["n_below"], null_counts["n_above"]
+        n_not_above = n_iters - n_above
+
+        # Proportions of the null distribution at or above (p_l) or at or below (p_r) the score
+        p_l = 1 - n_below / n_iters
+        p_r = 1 - n_above / n_iters
+        p_values = 2 * np.minimum(p_l, p_r)
+        smallest_value = np.maximum(np.finfo(float).eps, 1.0 / n_iters)
+        p_values = np.maximum(smallest_value, np.minimum(p_values, 1.0 - smallest_value))
+
+        # The middle value(s) of each sorted null distribution are either below, equal to, or
+        # above the observed score. When they straddle it, they are the closest values to it.
+        if n_iters % 2:
+            i_mid = (n_iters + 1) // 2
+            diff_signs = np.zeros(diff_ale_values.shape)
+            diff_signs[n_below >= i_mid] = 1
+            diff_signs[n_not_above < i_mid] = -1
+        else:
+            i_mid = n_iters // 2
+            dtype = null_counts["below_max"].dtype
+            lower = np.where(n_below == i_mid, null_counts["below_max"], diff_ale_values)
+            upper = np.where(n_not_above == i_mid, null_counts["above_min"], diff_ale_values)
+            medians = (lower.astype(dtype) + upper.astype(dtype)) / 2
+            diff_signs = np.sign(diff_ale_values - medians)
+            diff_signs[n_below > i_mid] = 1
+            diff_signs[n_not_above < i_mid] = -1
+
+        return p_values, diff_signs
 
     def correct_fwe_montecarlo(self):
         """Perform Monte Carlo-based FWE correction.
@@ -636,6 +875,15 @@ class SCALE(CBMAEstimator):
 
     This method was originally introduced in :footcite:t:`langner2014meta`.
 
+    .. versionchanged:: 0.5.1
+
+        - Count exceedances of the observed ALE values as permutations finish, instead of storing
+          the full voxel-wise null distributions in a memmapped array.
+          Memory use no longer grows with ``n_iters``, and p-values are unchanged.
+        - Each permutation draws its coordinates from ``xyz`` on the worker that runs it,
+          so results no longer depend on ``n_cores``.
+        - New parameter: ``backend``, to run the permutations in threads or with an Executor.
+
     .. versionchanged:: 0.2.1
 
         - New parameters: ``memory`` and ``memory_level`` for memory caching.
@@ -675,6 +923,15 @@ class SCALE(CBMAEstimator):
     memory_level : :obj:`int`, default=0
         Rough estimator of the amount of memory used by caching.
         Higher value means more memory for caching. Zero means no caching.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, default=None
+        Parallel backend. If None, joblib's default process-based backend is used.
+        If "threads", all workers share one in-memory copy of the inputs.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        Default is None.
+
+        .. versionadded:: 0.5.1
     **kwargs
         Keyword arguments. Arguments for the kernel_transformer can be assigned here,
         with the prefix '\kernel__' in the variable name.
@@ -692,7 +949,8 @@ class SCALE(CBMAEstimator):
 
         .. important::
             The voxel-wise null distributions used by this Estimator are very large, so they are
-            not retained as Estimator attributes.
+            never stored. Instead, for each voxel, the permuted ALE values at or above the
+            observed value are counted as each permutation finishes.
 
         If :meth:`fit` is applied:
 
@@ -712,6 +970,7 @@ class SCALE(CBMAEstimator):
         kernel_transformer=ALEKernel,
         memory=Memory(location=None, verbose=0),
         memory_level=0,
+        backend=None,
         **kwargs,
     ):
         if not (isinstance(kernel_transformer, ALEKernel) or kernel_transformer == ALEKernel):
@@ -739,9 +998,7 @@ class SCALE(CBMAEstimator):
         self.xyz = xyz
         self.n_iters = n_iters
         self.n_cores = _check_ncores(n_cores)
-        # memory_limit needs to exist to trigger use_memmap decorator, but it will also be used if
-        # a Dataset with pre-generated MA maps is provided.
-        self.memory_limit = "100mb"
+        self.backend = _check_backend(backend)
 
     def _generate_description(self):
         if (
@@ -768,7 +1025,6 @@ class SCALE(CBMAEstimator):
         )
         return description
 
-    @use_memmap(LGR, n_files=2)
     def _fit(self, dataset):
         """Perform specific coactivation likelihood estimation meta-analysis on dataset.
 
@@ -787,7 +1043,7 @@ class SCALE(CBMAEstimator):
         )
 
         # Determine bins for null distribution histogram
-        max_ma_values = ma_values.max(axis=[1, 2, 3]).todense()
+        max_ma_values = ma_values.max(axis=1).toarray().ravel()
 
         max_poss_ale = self._compute_summarystat_est(max_ma_values)
         self.null_distributions_["histogram_bins"] = np.round(
@@ -799,36 +1055,31 @@ class SCALE(CBMAEstimator):
         del ma_values
 
         iter_df = self.inputs_["coordinates"].copy()
-        rand_idx = np.random.choice(self.xyz.shape[0], size=(iter_df.shape[0], self.n_iters))
-        rand_xyz = self.xyz[rand_idx, :]
-        iter_xyzs = np.split(rand_xyz, rand_xyz.shape[1], axis=1)
-
-        perm_scale_values = np.memmap(
-            self.memmap_filenames[1],
-            dtype=stat_values.dtype,
-            mode="w+",
-            shape=(self.n_iters, stat_values.shape[0]),
-        )
-        _ = [
-            r
-            for r in tqdm(
-                Parallel(return_as="generator", n_jobs=self.n_cores)(
-                    delayed(self._run_permutation)(
-                        i_iter, iter_xyzs[i_iter], iter_df, perm_scale_values
-                    )
-                    for i_iter in range(self.n_iters)
+        # Each iteration draws its own coordinates, on the worker that runs it
+        seed = _get_random_seed()
+
+        # Keep only running counts of the permuted ALE values, so that memory use does not depend
+        # on the number of iterations
+        null_counts = self._init_null_counts(stat_values)
+        for iter_stat_values in tqdm(
+            profiling.trace_batches(
+                _run_parallel(
+                    (
+                        delayed(self._run_permutation)(i_iter, seed, iter_df)
+                        for i_iter in range(self.n_iters)
+                    ),
+                    n_cores=self.n_cores,
+                    backend=self.backend,
                 ),
-                total=self.n_iters,
-            )
-        ]
-
-        p_values, z_values = self._scale_to_p(stat_values, perm_scale_values)
-
-        if isinstance(perm_scale_values, np.memmap):
-            LGR.debug(f"Closing memmap at {perm_scale_values.filename}")
-            perm_scale_values._mmap.close()
+                name="permutations",
+                category="estimator",
+            ),
+            total=self.n_iters,
+        ):
+            self._update_null_counts(null_counts, iter_stat_values)
 
-        del perm_scale_values
+        p_values, z_values = self._scale_to_p(stat_values, null_counts)
+        del null_counts
 
         logp_values = -np.log10(p_values)
         logp_values[np.isinf(logp_values)] = -np.log10(np.finfo(float).eps)
@@ -848,33 +1099,91 @@ class SCALE(CBMAEstimator):
         """
         if isinstance(data, pd.DataFrame):
             ma_values = self.kernel_transformer.transform(
-                data, masker=self.masker, return_type="sparse"
+                data, masker=self.masker, return_type="csr"
             )
-        elif isinstance(data, (np.ndarray, sparse._coo.core.COO)):
+        elif isinstance(data, np.ndarray) or sparse.issparse(data):
             ma_values = data
         else:
             raise ValueError(f"Unsupported data type '{type(data)}'")
 
-        stat_values = 1.0 - np.prod(1.0 - ma_values, axis=0)
+        return _compute_ale(ma_values)
+
+    def _init_null_counts(self, stat_values):
+        """Initialize the running summaries of the voxel-wise null distributions.
+
+        .. versionadded:: 0.5.1
 
-        if isinstance(stat_values, sparse._coo.core.COO):
-            # NOTE: This may not work correctly with a non-NiftiMasker.
-            mask_data = self.masker.mask_img.get_fdata().astype(bool)
+        Permuted ALE values are assigned to the bins of a histogram, with zeros in the first bin
+        and nonzero values binned according to the "histogram_bins" element in the
+        null_distributions_ attribute.
 
-            stat_values = stat_values.todense().reshape(-1)  # Indexing a .reshape(-1) is faster
-            stat_values = stat_values[mask_data.reshape(-1)]
+        Parameters
+        ----------
+        stat_values : (V) array
+            ALE values.
+
+        Returns
+        -------
+        null_counts : :obj:`dict`
+            Dictionary with, for each voxel, the bin of the observed ALE value
+            (``"stat_bin"``), the number of binned permuted values (``"n_values"``), the number
+            of them in or above the observed value's bin (``"n_exceed"``), and the highest
+            nonempty bin (``"top_bin"``) and its count (``"top_count"``).
+        """
+        histogram_bins = self.null_distributions_["histogram_bins"]
+        n_bins = len(histogram_bins)
+        inv_step = 1 / (histogram_bins[1] - histogram_bins[0])  # assume equal spacing
+
+        stat_bins = np.zeros(stat_values.shape, dtype=int)
+        idx = np.where(stat_values > 0)[0]
+        stat_bins[idx] = np.minimum(_round2(stat_values[idx] * inv_step), n_bins - 1)
+
+        n_voxels = stat_values.shape[0]
+        return {
+            "stat_bin": stat_bins,
+            "n_values": np.zeros(n_voxels, dtype=np.int64),
+            "n_exceed": np.zeros(n_voxels, dtype=np.int64),
+            "top_bin": np.full(n_voxels, -1, dtype=int),
+            "top_count": np.zeros(n_voxels, dtype=np.int64),
+        }
 
-        return stat_values
+    def _update_null_counts(self, null_counts, iter_stat_values):
+        """Add one permutation's ALE values to the null distribution summaries.
 
-    def _scale_to_p(self, stat_values, scale_values):
+        .. versionadded:: 0.5.1
+        """
+        histogram_bins = self.null_distributions_["histogram_bins"]
+        n_bins = len(histogram_bins)
+
+        # Bin edges are the bin centers, as in numpy.histogram, with the last bin closed
+        iter_bins = np.minimum(
+            np.searchsorted(histogram_bins, iter_stat_values, "right"), n_bins - 1
+        )
+        iter_bins[iter_stat_values == 0] = 0
+        valid = iter_stat_values <= histogram_bins[-1]
+
+        null_counts["n_values"] += valid
+        null_counts["n_exceed"] += valid & (iter_bins >= null_counts["stat_bin"])
+
+        top_bin = null_counts["top_bin"]
+        null_counts["top_count"] += valid & (iter_bins == top_bin)
+        new_top = valid & (iter_bins > top_bin)
+        top_bin[new_top] = iter_bins[new_top]
+        null_counts["top_count"][new_top] = 1
+
+    def _scale_to_p(self, stat_values, null_counts):
         """Compute p- and z-values.
 
+        .. versionchanged:: 0.5.1
+
+            Use summaries of the null distributions, rather than the null distributions.
+
         Parameters
         ----------
         stat_values : (V) array
             ALE values.
-        scale_values : (I x V) array
-            Permutation ALE values.
+        null_counts : :obj:`dict`
+            Null distribution summaries, from :meth:`_init_null_counts`.
 
         Returns
         -------
@@ -883,61 +1192,33 @@ class SCALE(CBMAEstimator):
 
         Notes
         -----
-        This method also uses the "histogram_bins" element in the null_distributions_ attribute.
+        The p-values are identical to those of :func:`~nimare.stats.nullhist_to_p` applied to
+        histograms of the full null distributions.
         """
-        n_voxels = stat_values.shape[0]
-
-        # I know that joblib probably preserves order of outputs, but I'm paranoid, so we track
-        # the iteration as well and sort the resulting p-value array based on that.
-        p_values, voxel_idx = tqdm(
-            zip(
-                *Parallel(return_as="generator", n_jobs=self.n_cores)(
-                    delayed(self._scale_to_p_voxel)(
-                        i_voxel, stat_values[i_voxel], scale_values[:, i_voxel]
-                    )
-                    for i_voxel in range(n_voxels)
-                )
-            ),
-            total=n_voxels,
-        )
+        n_values = null_counts["n_values"]
+        p_values = np.where(stat_values > 0, null_counts["n_exceed"] / n_values, 1.0)
 
-        # Convert to an array and sort the p-values array based on the voxel index.
-        p_values = np.array(p_values)[np.array(voxel_idx)]
+        # P-values are clipped based on the highest nonempty bin of the null histogram
+        smallest_value = null_counts["top_count"] / n_values
+        p_values = np.maximum(smallest_value, np.minimum(p_values, 1.0))
 
         z_values = p_to_z(p_values, tail="one")
         return p_values, z_values
 
-    def _scale_to_p_voxel(self, i_voxel, stat_value, voxel_null):
-        """Compute one voxel's p-value from its specific null distribution."""
-        scale_zeros = voxel_null == 0
-        n_zeros = np.sum(scale_zeros)
-        voxel_null[scale_zeros] = np.nan
-        scale_hist = np.empty(len(self.null_distributions_["histogram_bins"]))
-        scale_hist[0] = n_zeros
-
-        scale_hist[1:] = np.histogram(
-            a=voxel_null,
-            bins=self.null_distributions_["histogram_bins"],
-            range=(
-                np.min(self.null_distributions_["histogram_bins"]),
-                np.max(self.null_distributions_["histogram_bins"]),
-            ),
-            density=False,
-        )[0]
+    def _run_permutation(self, i_row, seed, iter_df):
+        """Run a single random SCALE permutation of a dataset.
 
-        p_value = nullhist_to_p(
-            stat_value,
-            scale_hist,
-            self.null_distributions_["histogram_bins"],
-        )
-        return p_value, i_voxel
-
-    def _run_permutation(self, i_row, iter_xyz, iter_df, perm_scale_values):
-        """Run a single random SCALE permutation of a dataset."""
-        iter_xyz = np.squeeze(iter_xyz)
-        iter_df[["x", "y", "z"]] = iter_xyz
-        stat_values = self._compute_summarystat_est(iter_df)
-        perm_scale_values[i_row, :] = stat_values
+        .. versionchanged:: 0.5.1
+
+            Return the ALE values instead of writing them to a memmapped array, and draw the
+            coordinates from the iteration's own random stream instead of receiving them.
+            Work on a copy of ``iter_df``, which is shared by all workers with the "threads"
+            backend.
+        """
+        iter_df = iter_df.copy()
+        rng = _get_iteration_rng(seed, i_row)
+        iter_df[["x", "y", "z"]] = self.xyz[rng.integers(self.xyz.shape[0], size=iter_df.shape[0])]
+        return self._compute_summarystat_est(iter_df)
 
     def correct_fwe_montecarlo(self):
         """Perform Monte Carlo-based FWE correction.
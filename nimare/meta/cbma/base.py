@@ -6,33 +6,58 @@ from abc import abstractmethod
 import nibabel as nib
 import numpy as np
 import pandas as pd
-import sparse
-from joblib import Memory, Parallel, delayed
+from joblib import Memory, delayed
 from nilearn.input_data import NiftiMasker
-from scipy import ndimage
+from scipy import ndimage, sparse
 from tqdm.auto import tqdm
 
+from nimare import profiling
 from nimare.estimator import Estimator
+from nimare.meta.cbma.nulls import get_design_signature
 from nimare.meta.kernel import KernelTransformer
-from nimare.meta.utils import _calculate_cluster_measures, _get_last_bin
+from nimare.meta.utils import (
+    _calculate_cluster_measures,
+    _get_iteration_rng,
+    _get_last_bin,
+    _get_random_seed,
+    _histogram_counts,
+    _sample_mask_xyz,
+    _unmask_values,
+)
 from nimare.results import MetaResult
-from nimare.stats import null_to_p, nullhist_to_p
+from nimare.stats import NullDistribution
 from nimare.transforms import p_to_z
 from nimare.utils import (
     _add_metadata_to_dataframe,
+    _check_backend,
     _check_ncores,
     _check_type,
+    _run_parallel,
     get_masker,
     mm2vox,
-    vox2mm,
 )
 
 LGR = logging.getLogger(__name__)
 
+# Entries of null_distributions_ that CBMAEstimator.update keeps and updates
+_APPROXIMATE_NULL_KEYS = (
+    "histogram_bins",
+    "histogram_means",
+    "histweights_corr-none_method-approximate",
+)
+
 
 class CBMAEstimator(Estimator):
     """Base class for coordinate-based meta-analysis methods.
 
+    .. versionchanged:: 0.5.1
+
+        * New keyword-only parameter: ``precision``, passed on to the kernel transformer.
+        * Use 2D sparse matrices of masked MA values, instead of 4D sparse arrays.
+        * New method: :meth:`update`, to add or remove experiments without refitting.
+        * Store the null distributions used to compute p-values as
+          :class:`~nimare.stats.NullDistribution` objects, in ``null_distributions_``.
+
     .. versionchanged:: 0.0.12
 
         * Remove *low_memory* option
@@ -58,6 +83,12 @@ class CBMAEstimator(Estimator):
     memory_level : :obj:`int`, default=0
         Rough estimator of the amount of memory used by caching.
         Higher value means more memory for caching. Zero means no caching.
+    precision : {"double", "single"} or None, optional
+        Precision with which the kernel transformer stores MA maps. "single" stores MA values
+        in float32 (or compact unsigned integers, for binary and count kernels), which halves
+        the memory they use, while summary statistics, null distributions, and output maps are
+        still computed in float64. If None, the kernel transformer's own setting is used.
+        Ignored if ``kernel_transformer`` has already been initialized. Default is None.
     *args
         Optional arguments to the :obj:`~nimare.base.Estimator` __init__
         (called automatically).
@@ -77,6 +108,7 @@ class CBMAEstimator(Estimator):
         memory_level=0,
         *,
         mask=None,
+        precision=None,
         **kwargs,
     ):
         if mask is not None:
@@ -95,6 +127,8 @@ class CBMAEstimator(Estimator):
         kernel_args = {k.split("kernel__")[1]: v for k, v in kernel_args.items()}
         if "memory" not in kernel_args.keys() and "memory_level" not in kernel_args.keys():
             kernel_args.update(memory=memory, memory_level=memory_level)
+        if precision is not None:
+            kernel_args.setdefault("precision", precision)
         kernel_transformer = _check_type(kernel_transformer, KernelTransformer, **kernel_args)
         self.kernel_transformer = kernel_transformer
 
@@ -168,27 +202,40 @@ class CBMAEstimator(Estimator):
 
         self.null_distributions_ = {}
 
-        ma_values = self._collect_ma_maps(
-            coords_key="coordinates",
-            maps_key="ma_maps",
-        )
+        with profiling.span("ma_maps", category="estimator"):
+            ma_values = self._collect_ma_maps(
+                coords_key="coordinates",
+                maps_key="ma_maps",
+            )
 
-        # Infer a weight vector, when applicable. Primarily used only for MKDADensity.
-        self.weight_vec_ = self._compute_weights(ma_values)
+        with profiling.span("summary_stat", category="estimator"):
+            # Infer a weight vector, when applicable. Primarily used only for MKDADensity.
+            self.weight_vec_ = self._compute_weights(ma_values)
 
-        stat_values = self._compute_summarystat(ma_values)
+            stat_values = self._compute_summarystat(ma_values)
 
         # Determine null distributions for summary stat (OF) to p conversion
-        self._determine_histogram_bins(ma_values)
-        if self.null_method.startswith("approximate"):
-            self._compute_null_approximate(ma_values)
+        with profiling.span("null_distribution", category="estimator"):
+            self._determine_histogram_bins(ma_values)
+            if self.null_method.startswith("approximate"):
+                self._compute_null_approximate(ma_values)
+
+            elif self.null_method == "montecarlo":
+                self._compute_null_montecarlo(
+                    n_iters=self.n_iters, n_cores=self.n_cores, backend=self.backend
+                )
 
-        elif self.null_method == "montecarlo":
-            self._compute_null_montecarlo(n_iters=self.n_iters, n_cores=self.n_cores)
+            else:
+                # A hidden option only used for internal validation/testing
+                self._compute_null_reduced_montecarlo(ma_values, n_iters=self.n_iters)
 
-        else:
-            # A hidden option only used for internal validation/testing
-            self._compute_null_reduced_montecarlo(ma_values, n_iters=self.n_iters)
+        # Keep running summaries of the experiments, so that they can be updated later on
+        self.accumulators_ = None
+        if self.null_method == "approximate":
+            with profiling.span("accumulators", category="estimator"):
+                self.accumulators_ = self._summarize_experiments(
+                    self.inputs_["coordinates"], ma_values
+                )
 
         p_values, z_values = self._summarystat_to_p(stat_values, null_method=self.null_method)
 
@@ -196,6 +243,149 @@ class CBMAEstimator(Estimator):
         description = self._generate_description()
         return maps, {}, description
 
+    def update(self, dataset=None, remove_ids=None, drop_invalid=True):
+        """Add experiments to, or remove experiments from, a fitted Estimator.
+
+        .. versionadded:: 0.5.1
+
+        When an Estimator is fit with ``null_method="approximate"``, it keeps running summaries
+        of the experiments in its ``accumulators_`` attribute (e.g., the sum of log(1 - MA)
+        values for ALE, or the sum of MA values for KDA).
+        Updates only generate the MA maps of the added and removed experiments, fold them into
+        these summaries, and convolve the histograms of the added experiments into the
+        approximate null distribution, so their cost depends on the size of the change rather
+        than that of the whole Dataset.
+
+        Parameters
+        ----------
+        dataset : :obj:`~nimare.dataset.Dataset` or None, optional
+            Dataset with the experiments to add. Its IDs must not already be in the Dataset the
+            Estimator was fit to, unless they are also in ``remove_ids``. Default is None.
+        remove_ids : :obj:`list` of :obj:`str` or None, optional
+            IDs of the experiments to remove. Default is None.
+        drop_invalid : :obj:`bool`, optional
+            Whether to automatically ignore any added studies without the required data or not.
+            Default is True.
+
+        Returns
+        -------
+        :obj:`~nimare.results.MetaResult`
+            Results for the updated set of experiments.
+
+        Notes
+        -----
+        Only :class:`~nimare.meta.cbma.ale.ALE` (with a kernel whose MA values are
+        probabilities), :class:`~nimare.meta.cbma.mkda.MKDADensity`,
+        and :class:`~nimare.meta.cbma.mkda.KDA` (with a kernel with a fixed ``value``) support
+        updates.
+
+        Null distributions from earlier corrections of the Estimator (e.g., Monte Carlo FWE
+        correction) are removed, so results must be corrected again after an update.
+
+        Results match those from refitting the Estimator to the updated Dataset, up to
+        floating-point error. The null distribution cannot be stably deconvolved, so removing
+        experiments rebuilds it from the stored MA-value histograms of the remaining experiments.
+        This does not require their MA maps, but does scale with the number of experiments.
+        """
+        cls_name = self.__class__.__name__
+        if getattr(self, "accumulators_", None) is None:
+            raise ValueError(
+                f"{cls_name} must be fit with null_method='approximate' before it can be updated. "
+                "Only ALE, MKDADensity, and KDA estimators support updates."
+            )
+
+        remove_ids = [] if remove_ids is None else list(np.atleast_1d(remove_ids))
+        if dataset is None and not remove_ids:
+            raise ValueError("At least one of 'dataset' and 'remove_ids' must be provided.")
+
+        missing_ids = np.setdiff1d(remove_ids, self.accumulators_["id"])
+        if missing_ids.size:
+            raise ValueError(f"Experiments not found in the Estimator: {missing_ids.tolist()}")
+
+        keep = ~np.isin(self.accumulators_["id"], remove_ids)
+        if not keep.any() and dataset is None:
+            raise ValueError("At least one experiment must remain in the Estimator.")
+
+        remaining_ids = [id_ for id_ in self.dataset.ids if id_ not in remove_ids]
+        if dataset is not None:
+            shared_ids = np.intersect1d(dataset.ids, remaining_ids)
+            if shared_ids.size:
+                raise ValueError(
+                    f"Experiments already in the Estimator: {shared_ids.tolist()}. "
+                    "Remove them with 'remove_ids' to replace them."
+                )
+
+        with profiling.span(f"{cls_name}.update", category="estimator"):
+            coordinates = self.inputs_["coordinates"]
+            removed = coordinates["id"].isin(remove_ids)
+            removed_coordinates, coordinates = coordinates.loc[removed], coordinates.loc[~removed]
+
+            added_coordinates = None
+            if dataset is not None:
+                # Collect and preprocess the new inputs without overwriting the fitted ones
+                inputs = self.inputs_
+                self.inputs_ = {}
+                try:
+                    with profiling.span("collect_inputs", category="estimator"):
+                        self._collect_inputs(dataset, drop_invalid=drop_invalid)
+
+                    with profiling.span("preprocess_input", category="estimator"):
+                        self._preprocess_input(dataset)
+
+                    added_coordinates = self.inputs_["coordinates"]
+                finally:
+                    self.inputs_ = inputs
+
+            with profiling.span("accumulators", category="estimator"):
+                added = None
+                if added_coordinates is not None:
+                    added = self._summarize_experiments(added_coordinates)
+                    if added is None:
+                        raise ValueError(
+                            f"The added experiments cannot be summarized by {cls_name}, so it "
+                            "must be refit to the updated Dataset."
+                        )
+
+                accumulators = self._merge_accumulators(
+                    self.accumulators_,
+                    keep,
+                    self._summarize_experiments(removed_coordinates) if remove_ids else None,
+                    added,
+                )
+
+            self.accumulators_ = accumulators
+            self.inputs_["coordinates"] = pd.concat(
+                [coordinates, added_coordinates], ignore_index=True
+            ).sort_values(by="id", kind="stable", ignore_index=True)
+            self.inputs_["id"] = accumulators["id"].tolist()
+
+            self.dataset = self.dataset.slice(remaining_ids) if remove_ids else self.dataset
+            if dataset is not None:
+                self.dataset = self.dataset.merge(dataset)
+
+            with profiling.span("summary_stat", category="estimator"):
+                stat_values = self._compute_summarystat_from_accumulators()
+                # Avoid rounding errors from removed experiments in voxels without MA values
+                stat_values[accumulators["n_nonzero"] == 0] = 0
+
+            with profiling.span("null_distribution", category="estimator"):
+                # Only the approximate null is updated. Lookups of the previous null, and nulls
+                # from earlier corrections (e.g., Monte Carlo FWE), are out of date.
+                self.null_distributions_ = {
+                    key: value
+                    for key, value in self.null_distributions_.items()
+                    if key in _APPROXIMATE_NULL_KEYS
+                }
+                self._update_null_approximate(accumulators.pop("added"), rebuild=not keep.all())
+
+            p_values, z_values = self._summarystat_to_p(stat_values, null_method=self.null_method)
+            maps = {"stat": stat_values, "p": p_values, "z": z_values}
+            description = self._generate_description()
+
+        result = MetaResult(self, mask=self.masker, maps=maps, tables={}, description=description)
+        result.profile_ = profiling.get_profiler()
+        return result
+
     def _compute_weights(self, ma_values):
         """Perform optional weight computation routine.
 
@@ -205,9 +395,195 @@ class CBMAEstimator(Estimator):
         """
         return None
 
-    def _collect_ma_maps(self, coords_key="coordinates", maps_key="ma_maps", return_type="sparse"):
+    def _summarize_experiments(self, coordinates, ma_values=None):
+        """Summarize experiments with accumulators that can be updated.
+
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        coordinates : :obj:`pandas.DataFrame`
+            Coordinates of the experiments.
+        ma_values : (E x V) :obj:`scipy.sparse.csr_matrix` or None, optional
+            MA maps of the experiments. If None, they are generated from ``coordinates``.
+            Default is None.
+
+        Returns
+        -------
+        accumulators : :obj:`dict` or None
+            The estimator-specific accumulators from ``_compute_accumulators``, plus the sorted
+            IDs of the experiments ("id") and the number of experiments with nonzero MA values
+            in each voxel ("n_nonzero"). None if the Estimator does not support updates.
+        """
+        if ma_values is None:
+            ma_values = self.kernel_transformer.transform(
+                coordinates, masker=self.masker, return_type="csr"
+            )
+
+        accumulators = self._compute_accumulators(ma_values, coordinates)
+        if accumulators is not None:
+            accumulators["id"] = np.unique(coordinates["id"].values)
+            accumulators["n_nonzero"] = ma_values.getnnz(axis=0)
+
+        return accumulators
+
+    @staticmethod
+    def _merge_accumulators(accumulators, keep, removed=None, added=None):
+        """Remove and add experiments to a set of accumulators.
+
+        .. versionadded:: 0.5.1
+
+        The "stat" and "n_nonzero" accumulators are voxel-wise sums over experiments, and all
+        other accumulators have one row for each experiment. Rows are sorted by ID, and a
+        boolean "added" entry flags the rows of the added experiments.
+        """
+        voxelwise_keys = ("stat", "n_nonzero")
+        keep_idx = np.where(keep)[0]
+        merged = {}
+        for key, value in accumulators.items():
+            if key in voxelwise_keys:
+                merged[key] = value - removed[key] if removed is not None else value.copy()
+            else:
+                merged[key] = value[keep_idx]
+
+        merged["added"] = np.zeros(keep_idx.size, dtype=bool)
+        if added is not None:
+            added["added"] = np.ones(added["id"].size, dtype=bool)
+            for key, value in added.items():
+                if key in voxelwise_keys:
+                    merged[key] = merged[key] + value
+                elif sparse.issparse(value):
+                    n_columns = max(merged[key].shape[1], value.shape[1])
+                    merged[key].resize((merged[key].shape[0], n_columns))
+                    value.resize((value.shape[0], n_columns))
+                    merged[key] = sparse.vstack((merged[key], value), format="csr")
+                else:
+                    merged[key] = np.concatenate((merged[key], value))
+
+        order = np.argsort(merged["id"], kind="stable")
+        for key, value in merged.items():
+            if key not in voxelwise_keys:
+                merged[key] = value[order]
+
+        return merged
+
+    def _compute_accumulators(self, ma_values, coordinates):
+        """Compute estimator-specific accumulators for a set of experiments.
+
+        .. versionadded:: 0.5.1
+
+        Estimators that support :meth:`update` must override this method, along with
+        ``_compute_summarystat_from_accumulators``, and either ``_compute_histogram_bins``,
+        ``_compute_ma_histograms``, and ``_convolve_ma_histograms``, or
+        ``_update_null_approximate``.
+
+        Parameters
+        ----------
+        ma_values : (E x V) :obj:`scipy.sparse.csr_matrix`
+            MA maps of the experiments, with rows sorted by ID.
+        coordinates : :obj:`pandas.DataFrame`
+            Coordinates of the experiments.
+
+        Returns
+        -------
+        accumulators : :obj:`dict` or None
+            A voxel-wise sum over experiments ("stat"), from which the summary statistic can be
+            computed, and any per-experiment arrays with one row for each experiment.
+            None if the Estimator does not support updates.
+        """
+        return None
+
+    def _compute_summarystat_from_accumulators(self):
+        """Compute summary statistics from the ``accumulators_`` attribute.
+
+        .. versionadded:: 0.5.1
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support updates.")
+
+    def _compute_ma_histograms(self, ma_maps, max_ma_values):
+        """Compute the normalized histogram of MA values of each experiment.
+
+        .. versionadded:: 0.5.1
+
+        Each experiment's histogram uses the bins from ``_compute_histogram_bins`` for that
+        experiment alone, which are the first bins for any set of experiments that includes it,
+        so the histograms do not need to be recomputed when other experiments are added.
+
+        Parameters
+        ----------
+        ma_maps : (E x V) :obj:`scipy.sparse.csr_matrix`
+            MA maps.
+        max_ma_values : (E,) :obj:`numpy.ndarray`
+            Maximum possible MA value of each experiment.
+
+        Returns
+        -------
+        ma_hists : (E x B) :obj:`scipy.sparse.csr_matrix`
+            Normalized histograms, where B is the largest number of bins for one experiment.
+        """
+        ma_maps = ma_maps.tocsr()
+        n_exp, n_voxels = ma_maps.shape
+        hist_idx, hist_values, hist_ptr = [], [], [0]
+        n_bins = 0
+        for exp_idx in range(n_exp):
+            # Derive bin edges from histogram bin centers for numpy histogram function
+            bin_centers = self._compute_histogram_bins(max_ma_values[exp_idx : exp_idx + 1])
+            step_size = bin_centers[1] - bin_centers[0]
+            bin_edges = np.append(bin_centers, bin_centers[-1] + step_size)
+            n_bins = max(n_bins, bin_centers.shape[0])
+
+            # Each row holds the nonzero MA values of one experiment
+            study_ma_values = ma_maps.data[ma_maps.indptr[exp_idx] : ma_maps.indptr[exp_idx + 1]]
+            exp_hist = np.histogram(study_ma_values, bins=bin_edges, density=False)[0].astype(
+                float
+            )
+            exp_hist[0] += n_voxels - study_ma_values.shape[0]
+            exp_hist /= exp_hist.sum()
+
+            nonzero_idx = np.where(exp_hist > 0)[0]
+            hist_idx.append(nonzero_idx)
+            hist_values.append(exp_hist[nonzero_idx])
+            hist_ptr.append(hist_ptr[-1] + nonzero_idx.shape[0])
+
+        return sparse.csr_matrix(
+            (np.concatenate(hist_values), np.concatenate(hist_idx), np.array(hist_ptr)),
+            shape=(n_exp, n_bins),
+        )
+
+    def _update_null_approximate(self, added, rebuild):
+        """Update the approximate null distribution after experiments are added or removed.
+
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        added : (E,) :obj:`numpy.ndarray` of :obj:`bool`
+            Whether each experiment in the ``accumulators_`` attribute was just added.
+        rebuild : :obj:`bool`
+            Whether to rebuild the null distribution from the histograms of all experiments,
+            instead of convolving the histograms of the added ones into the current one.
+        """
+        bin_centers = self._compute_histogram_bins(self.accumulators_["max_ma_values"])
+        self.null_distributions_["histogram_bins"] = bin_centers
+
+        ma_hists = self.accumulators_["ma_hists"]
+        if rebuild:
+            stat_hist = self._convolve_ma_histograms(ma_hists)
+        else:
+            stat_hist = np.zeros(bin_centers.shape[0])
+            old_hist = self.null_distributions_["histweights_corr-none_method-approximate"]
+            stat_hist[: old_hist.shape[0]] = old_hist
+            stat_hist = self._convolve_ma_histograms(ma_hists[np.where(added)[0]], stat_hist)
+
+        self.null_distributions_["histweights_corr-none_method-approximate"] = stat_hist
+
+    def _collect_ma_maps(self, coords_key="coordinates", maps_key="ma_maps", return_type="csr"):
         """Collect modeled activation maps from Estimator inputs.
 
+        .. versionchanged:: 0.5.1
+
+            * Return masked MA maps as a 2D CSR matrix by default.
+
         Parameters
         ----------
         coords_key : :obj:`str`, optional
@@ -219,12 +595,14 @@ class CBMAEstimator(Estimator):
             This key should only be present if the kernel transformer was already fitted to the
             input Dataset.
             Default is "ma_maps".
+        return_type : {"csr", "summary_array"}, optional
+            Return type passed to the kernel transformer. Default is "csr".
 
         Returns
         -------
-        ma_maps : :obj:`sparse._coo.core.COO`
-            Return a 4D sparse array of shape
-            (n_studies, mask.shape) with MA maps.
+        ma_maps : :obj:`scipy.sparse.csr_matrix` or :obj:`numpy.ndarray`
+            Return a 2D sparse matrix of shape (n_studies, n_voxels) with masked MA maps,
+            or a 1D array with the summary of the MA maps, if return_type is "summary_array".
         """
         LGR.debug(f"Generating MA maps from coordinates ({coords_key}).")
 
@@ -244,13 +622,17 @@ class CBMAEstimator(Estimator):
         For ALE and SCALE, the values are known as ALE values.
         For (M)KDA, they are "OF" scores.
 
+        .. versionchanged:: 0.5.1
+
+            * Use 2D sparse matrices of masked MA values instead of 4D sparse arrays.
+
         Parameters
         ----------
-        data : array, sparse._coo.core.COO, pandas.DataFrame, or list of img_like
+        data : array, scipy.sparse matrix, pandas.DataFrame, or list of img_like
             Data from which to estimate summary statistics.
             The data can be:
             (1) a 1d contrast-len or 2d contrast-by-voxel array of MA values,
-            (2) a 4d sparse array of MA maps,
+            (2) a 2d contrast-by-voxel sparse matrix of MA values,
             (3) a DataFrame containing coordinates to produce MA values,
             or (4) a list of imgs containing MA values.
 
@@ -261,11 +643,11 @@ class CBMAEstimator(Estimator):
         """
         if isinstance(data, pd.DataFrame):
             ma_values = self.kernel_transformer.transform(
-                data, masker=self.masker, return_type="sparse"
+                data, masker=self.masker, return_type="csr"
             )
         elif isinstance(data, list):
             ma_values = self.masker.transform(data)
-        elif isinstance(data, (np.ndarray, sparse._coo.core.COO)):
+        elif isinstance(data, np.ndarray) or sparse.issparse(data):
             ma_values = data
         else:
             raise ValueError(f"Unsupported data type '{type(data)}'")
@@ -304,37 +686,18 @@ class CBMAEstimator(Estimator):
             Same shape as stat_values.
         """
         if null_method.startswith("approximate"):
-            assert "histogram_bins" in self.null_distributions_.keys()
-            assert "histweights_corr-none_method-approximate" in self.null_distributions_.keys()
-
-            p_values = nullhist_to_p(
-                stat_values,
-                self.null_distributions_["histweights_corr-none_method-approximate"],
-                self.null_distributions_["histogram_bins"],
-            )
+            null = self._get_null_distribution("histweights_corr-none_method-approximate")
 
         elif null_method == "montecarlo":
-            assert "histogram_bins" in self.null_distributions_.keys()
-            assert "histweights_corr-none_method-montecarlo" in self.null_distributions_.keys()
-
-            p_values = nullhist_to_p(
-                stat_values,
-                self.null_distributions_["histweights_corr-none_method-montecarlo"],
-                self.null_distributions_["histogram_bins"],
-            )
+            null = self._get_null_distribution("histweights_corr-none_method-montecarlo")
 
         elif null_method == "reduced_montecarlo":
-            assert "values_corr-none_method-reducedMontecarlo" in self.null_distributions_.keys()
-
-            p_values = null_to_p(
-                stat_values,
-                self.null_distributions_["values_corr-none_method-reducedMontecarlo"],
-                tail="upper",
-            )
+            null = self._get_null_distribution("values_corr-none_method-reducedMontecarlo")
 
         else:
             raise ValueError("Argument 'null_method' must be one of: 'approximate', 'montecarlo'.")
 
+        p_values = null.p(stat_values, tail="upper")
         z_values = p_to_z(p_values, tail="one")
         return p_values, z_values
 
@@ -360,47 +723,55 @@ class CBMAEstimator(Estimator):
             null_method = self.null_method
 
         if null_method.startswith("approximate"):
-            assert "histogram_bins" in self.null_distributions_.keys()
-            assert "histweights_corr-none_method-approximate" in self.null_distributions_.keys()
-
-            # Convert unnormalized histogram weights to null distribution
-            histogram_weights = self.null_distributions_[
-                "histweights_corr-none_method-approximate"
-            ]
-            null_distribution = histogram_weights / np.sum(histogram_weights)
-            null_distribution = np.cumsum(null_distribution[::-1])[::-1]
-            null_distribution /= np.max(null_distribution)
-            null_distribution = np.squeeze(null_distribution)
-
-            # Desired bin is the first one _before_ the target p-value (for uniformity
-            # with the montecarlo null).
-            ss_idx = np.maximum(0, np.where(null_distribution <= p)[0][0] - 1)
-            ss = self.null_distributions_["histogram_bins"][ss_idx]
+            null = self._get_null_distribution("histweights_corr-none_method-approximate")
 
         elif null_method == "montecarlo":
-            assert "histogram_bins" in self.null_distributions_.keys()
-            assert "histweights_corr-none_method-montecarlo" in self.null_distributions_.keys()
-
-            hist_weights = self.null_distributions_["histweights_corr-none_method-montecarlo"]
-            # Desired bin is the first one _before_ the target p-value (for uniformity
-            # with the montecarlo null).
-            ss_idx = np.maximum(0, np.where(hist_weights <= p)[0][0] - 1)
-            ss = self.null_distributions_["histogram_bins"][ss_idx]
+            null = self._get_null_distribution("histweights_corr-none_method-montecarlo")
 
         elif null_method == "reduced_montecarlo":
-            assert "values_corr-none_method-reducedMontecarlo" in self.null_distributions_.keys()
-
-            null_dist = np.sort(
-                self.null_distributions_["values_corr-none_method-reducedMontecarlo"]
-            )
-            n_vals = len(null_dist)
-            ss_idx = np.floor(p * n_vals).astype(int)
-            ss = null_dist[-ss_idx]
+            null = self._get_null_distribution("values_corr-none_method-reducedMontecarlo")
 
         else:
             raise ValueError("Argument 'null_method' must be one of: 'approximate', 'montecarlo'.")
 
-        return ss
+        return null.threshold_for_p(p)
+
+    def _get_null_distribution(self, key):
+        """Get the :class:`~nimare.stats.NullDistribution` of an entry in null_distributions_.
+
+        .. versionadded:: 0.5.1
+
+        The NullDistribution is created the first time it is requested, and stored in
+        ``null_distributions_`` under the same key, with a ``nulldist_`` prefix instead of
+        ``values_`` or ``histweights_``.
+
+        Parameters
+        ----------
+        key : :obj:`str`
+            Key of the null values (``values_*``) or histogram weights (``histweights_*``)
+            in ``null_distributions_``.
+
+        Returns
+        -------
+        :class:`~nimare.stats.NullDistribution`
+        """
+        null_type, null_desc = key.split("_", 1)
+        null_key = f"nulldist_{null_desc}"
+        if null_key not in self.null_distributions_:
+            assert key in self.null_distributions_.keys()
+
+            if null_type == "histweights":
+                assert "histogram_bins" in self.null_distributions_.keys()
+                null = NullDistribution(
+                    histogram_weights=self.null_distributions_[key],
+                    histogram_bins=self.null_distributions_["histogram_bins"],
+                )
+            else:
+                null = NullDistribution(values=self.null_distributions_[key])
+
+            self.null_distributions_[null_key] = null
+
+        return self.null_distributions_[null_key]
 
     def _compute_null_reduced_montecarlo(self, ma_maps, n_iters=5000):
         """Compute uncorrected null distribution using the reduced montecarlo method.
@@ -411,7 +782,7 @@ class CBMAEstimator(Estimator):
 
         Parameters
         ----------
-        ma_maps : (C x V) array
+        ma_maps : (C x V) array or sparse matrix
             Contrast by voxel array of MA values, after weighting with weight_vec.
 
         Notes
@@ -423,13 +794,8 @@ class CBMAEstimator(Estimator):
         --------
         This method is only retained for testing and algorithm development.
         """
-        if isinstance(ma_maps, sparse._coo.core.COO):
-            masker = self.dataset.masker if not self.masker else self.masker
-            mask = masker.mask_img
-            mask_data = mask.get_fdata().astype(bool)
-
-            ma_maps = ma_maps.todense()
-            ma_maps = ma_maps[:, mask_data]
+        if sparse.issparse(ma_maps):
+            ma_maps = ma_maps.toarray()
 
         n_studies, n_voxels = ma_maps.shape
         null_ijk = np.random.choice(np.arange(n_voxels), (n_iters, n_studies))
@@ -437,16 +803,26 @@ class CBMAEstimator(Estimator):
         null_dist = self._compute_summarystat(iter_ma_values)
         self.null_distributions_["values_corr-none_method-reducedMontecarlo"] = null_dist
 
-    def _compute_null_montecarlo_permutation(self, iter_xyz, iter_df):
+    def _compute_null_montecarlo_permutation(self, i_iter, seed, mask_idx, iter_df):
         """Run a single Monte Carlo permutation of a dataset.
 
         Does the shared work between uncorrected stat-to-p conversion and vFWE.
 
+        .. versionchanged:: 0.5.1
+
+            Draw the permuted coordinates from the iteration's own random stream,
+            instead of receiving them.
+
         Parameters
         ----------
-        params : tuple
-            A tuple containing 2 elements, respectively providing (1) the permuted
-            coordinates and (2) the original coordinate DataFrame.
+        i_iter : :obj:`int`
+            Index of the iteration.
+        seed : :obj:`int`
+            Root seed of the random streams of the Monte Carlo procedure.
+        mask_idx : :obj:`numpy.ndarray`
+            Flat indices of the voxels in the mask, from which coordinates are drawn.
+        iter_df : :obj:`pandas.DataFrame`
+            The coordinates DataFrame, to be filled with the permuted coordinates.
 
         Returns
         -------
@@ -457,11 +833,13 @@ class CBMAEstimator(Estimator):
         # be safe.
         iter_df = iter_df.copy()
 
-        iter_xyz = np.squeeze(iter_xyz)
-        iter_df[["x", "y", "z"]] = iter_xyz
+        rng = _get_iteration_rng(seed, i_iter)
+        iter_df[["x", "y", "z"]] = _sample_mask_xyz(
+            self.masker.mask_img, mask_idx, iter_df.shape[0], rng
+        )
 
         iter_ma_maps = self.kernel_transformer.transform(
-            iter_df, masker=self.masker, return_type="sparse"
+            iter_df, masker=self.masker, return_type="csr"
         )
         iter_ss_map = self._compute_summarystat(iter_ma_maps)
 
@@ -473,18 +851,24 @@ class CBMAEstimator(Estimator):
         bin_edges = bin_centers - (step_size / 2)
         bin_edges = np.append(bin_centers, bin_centers[-1] + step_size)
 
-        counts, _ = np.histogram(iter_ss_map, bins=bin_edges, density=False)
+        counts = _histogram_counts(iter_ss_map, bin_edges)
         return counts
 
-    def _compute_null_montecarlo(self, n_iters, n_cores):
+    def _compute_null_montecarlo(self, n_iters, n_cores, backend=None):
         """Compute uncorrected null distribution using Monte Carlo method.
 
+        .. versionchanged:: 0.5.1
+
+            New parameter: ``backend``.
+
         Parameters
         ----------
         n_iters : int
             Number of permutations.
         n_cores : int
             Number of cores to use.
+        backend : None or str, optional
+            Parallel backend. See :func:`~nimare.utils._check_backend`.
 
         Notes
         -----
@@ -492,27 +876,30 @@ class CBMAEstimator(Estimator):
         "histweights_corr-none_method-montecarlo" and
         "histweights_level-voxel_corr-fwe_method-montecarlo".
         """
-        null_ijk = np.vstack(np.where(self.masker.mask_img.get_fdata())).T
-
         n_cores = _check_ncores(n_cores)
+        backend = _check_backend(backend)
 
-        rand_idx = np.random.choice(
-            null_ijk.shape[0],
-            size=(self.inputs_["coordinates"].shape[0], n_iters),
-        )
-        rand_ijk = null_ijk[rand_idx, :]
-        rand_xyz = vox2mm(rand_ijk, self.masker.mask_img.affine)
-        iter_xyzs = np.split(rand_xyz, rand_xyz.shape[1], axis=1)
+        # Each iteration draws its own coordinates, on the worker that runs it
+        seed = _get_random_seed()
+        mask_idx = np.flatnonzero(self.masker.mask_img.get_fdata())
         iter_df = self.inputs_["coordinates"].copy()
 
         perm_histograms = [
             r
             for r in tqdm(
-                Parallel(return_as="generator", n_jobs=n_cores)(
-                    delayed(self._compute_null_montecarlo_permutation)(
-                        iter_xyzs[i_iter], iter_df=iter_df
-                    )
-                    for i_iter in range(n_iters)
+                profiling.trace_batches(
+                    _run_parallel(
+                        (
+                            delayed(self._compute_null_montecarlo_permutation)(
+                                i_iter, seed, mask_idx, iter_df=iter_df
+                            )
+                            for i_iter in range(n_iters)
+                        ),
+                        n_cores=n_cores,
+                        backend=backend,
+                    ),
+                    name="permutations",
+                    category="estimator",
                 ),
                 total=n_iters,
             )
@@ -534,7 +921,9 @@ class CBMAEstimator(Estimator):
 
     def _correct_fwe_montecarlo_permutation(
         self,
-        iter_xyz,
+        i_iter,
+        seed,
+        mask_idx,
         iter_df,
         conn,
         voxel_thresh,
@@ -544,13 +933,22 @@ class CBMAEstimator(Estimator):
 
         Does the shared work between vFWE and cFWE.
 
+        .. versionchanged:: 0.5.1
+
+            Draw the permuted coordinates from the iteration's own random stream,
+            instead of receiving them.
+
         Parameters
         ----------
-        iter_xyz : :obj:`numpy.ndarray` of shape (C, 3)
-            The permuted coordinates. One row for each peak.
-            Columns correspond to x, y, and z coordinates.
+        i_iter : :obj:`int`
+            Index of the iteration.
+        seed : :obj:`int`
+            Root seed of the random streams of the Monte Carlo procedure.
+        mask_idx : :obj:`numpy.ndarray`
+            Flat indices of the voxels in the mask, from which coordinates are drawn,
+            and in which the summary statistics are placed for cluster labeling.
         iter_df : :obj:`pandas.DataFrame`
-            The coordinates DataFrame, to be filled with the permuted coordinates in ``iter_xyz``
+            The coordinates DataFrame, to be filled with the permuted coordinates
             before permutation MA maps are generated.
         conn : :obj:`numpy.ndarray` of shape (3, 3, 3)
             The 3D structuring array for labeling clusters.
@@ -568,11 +966,13 @@ class CBMAEstimator(Estimator):
         """
         iter_df = iter_df.copy()
 
-        iter_xyz = np.squeeze(iter_xyz)
-        iter_df[["x", "y", "z"]] = iter_xyz
+        rng = _get_iteration_rng(seed, i_iter)
+        iter_df[["x", "y", "z"]] = _sample_mask_xyz(
+            self.masker.mask_img, mask_idx, iter_df.shape[0], rng
+        )
 
         iter_ma_maps = self.kernel_transformer.transform(
-            iter_df, masker=self.masker, return_type="sparse"
+            iter_df, masker=self.masker, return_type="csr"
         )
         iter_ss_map = self._compute_summarystat(iter_ma_maps)
 
@@ -585,7 +985,7 @@ class CBMAEstimator(Estimator):
             iter_max_size, iter_max_mass = None, None
         else:
             # Cluster-level inference
-            iter_ss_map = self.masker.inverse_transform(iter_ss_map).get_fdata()
+            iter_ss_map = _unmask_values(iter_ss_map, mask_idx, self.masker.mask_img.shape)
             iter_max_size, iter_max_mass = _calculate_cluster_measures(
                 iter_ss_map, voxel_thresh, conn, tail="upper"
             )
@@ -598,11 +998,23 @@ class CBMAEstimator(Estimator):
         n_iters=5000,
         n_cores=1,
         vfwe_only=False,
+        null_library=None,
+        tail_approximation=None,
+        backend=None,
     ):
         """Perform FWE correction using the max-value permutation method.
 
         Only call this method from within a Corrector.
 
+        .. versionchanged:: 0.5.1
+
+            * Each permutation draws its random coordinates on the worker that runs it,
+              from a random stream of its own.
+              Results still follow ``np.random.seed``, and no longer depend on ``n_cores``.
+            * New parameter: ``tail_approximation``, to model the upper tails of the null
+              distributions with generalized Pareto distributions.
+            * New parameter: ``backend``, to run the permutations in threads or with an Executor.
+
         .. versionchanged:: 0.0.13
 
             Change cluster neighborhood from faces+edges to faces, to match Nilearn.
@@ -632,6 +1044,33 @@ class CBMAEstimator(Estimator):
             If True, only calculate the voxel-level FWE-corrected maps. Voxel-level correction
             can be performed very quickly if the Estimator's ``null_method`` was "montecarlo".
             Default is False.
+        null_library : :obj:`~nimare.meta.cbma.nulls.MonteCarloNullLibrary` or None, optional
+            Library of previously-computed null distributions.
+            If provided, null distributions for the same design are reused, and extended with
+            new iterations if fewer than ``n_iters`` are stored.
+            New iterations are added to the library. Default is None.
+
+            .. versionadded:: 0.5.1
+        tail_approximation : {None, "gpd"}, optional
+            If "gpd", fit a generalized Pareto distribution to the upper tail of each maximum
+            value null distribution, to estimate FWE-corrected p-values below ``1 / n_iters``.
+            See :class:`~nimare.stats.NullDistribution` for details.
+            With this option, around 1000 iterations are usually enough.
+            Not used with a precalculated histogram (``vfwe_only=True`` and the "montecarlo"
+            ``null_method``). Default is None.
+
+            .. versionadded:: 0.5.1
+        backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+            Parallel backend for the permutations. If None, the Estimator's ``backend`` is used,
+            if it has one. Otherwise, joblib's default process-based backend is used, and each
+            worker receives its own copy of the Estimator and its inputs.
+            If "threads", all workers share one in-memory copy, which keeps memory use
+            flat as ``n_cores`` grows. The name of any registered joblib backend is also
+            accepted, as is a :class:`concurrent.futures.Executor` (e.g., a pool of workers on
+            several machines), to which the permutations are submitted in batches.
+            ``n_cores`` is not used with an Executor. Default is None.
+
+            .. versionadded:: 0.5.1
 
         Returns
         -------
@@ -667,6 +1106,9 @@ class CBMAEstimator(Estimator):
             -   ``values_desc-mass_level-cluster_corr-fwe_method-montecarlo``: The maximum cluster
                 mass from each Monte Carlo iteration. An array of shape (n_iters,).
 
+        Each of these keys also has a :class:`~nimare.stats.NullDistribution` counterpart,
+        with a ``nulldist_`` prefix, which is used to look up the FWE-corrected p-values.
+
         See Also
         --------
         nimare.correct.FWECorrector : The Corrector from which to call this method.
@@ -687,13 +1129,17 @@ class CBMAEstimator(Estimator):
 
         if vfwe_only and (self.null_method == "montecarlo"):
             LGR.info("Using precalculated histogram for voxel-level FWE correction.")
+            if tail_approximation is not None:
+                LGR.warning(
+                    "Tail approximation is not available with a precalculated histogram. "
+                    "Using the histogram's p-values."
+                )
 
             # Determine p- and z-values from stat values and null distribution.
-            p_vfwe_values = nullhist_to_p(
-                stat_values,
-                self.null_distributions_["histweights_level-voxel_corr-fwe_method-montecarlo"],
-                self.null_distributions_["histogram_bins"],
+            null = self._get_null_distribution(
+                "histweights_level-voxel_corr-fwe_method-montecarlo"
             )
+            p_vfwe_values = null.p(stat_values)
 
         else:
             if vfwe_only:
@@ -703,22 +1149,31 @@ class CBMAEstimator(Estimator):
                     "Running permutations from scratch."
                 )
 
-            null_xyz = vox2mm(
-                np.vstack(np.where(self.masker.mask_img.get_fdata())).T,
-                self.masker.mask_img.affine,
-            )
-
             n_cores = _check_ncores(n_cores)
+            if backend is None:
+                backend = getattr(self, "backend", None)
+            backend = _check_backend(backend)
 
             # Identify summary statistic corresponding to intensity threshold
             ss_thresh = self._p_to_summarystat(voxel_thresh)
 
-            rand_idx = np.random.choice(
-                null_xyz.shape[0],
-                size=(self.inputs_["coordinates"].shape[0], n_iters),
-            )
-            rand_xyz = null_xyz[rand_idx, :]
-            iter_xyzs = np.split(rand_xyz, rand_xyz.shape[1], axis=1)
+            # Only run the iterations that are not already available for this design
+            n_new_iters = n_iters
+            if null_library is not None:
+                signature = get_design_signature(
+                    self, voxel_thresh=None if vfwe_only else ss_thresh
+                )
+                n_stored_iters = null_library.get_n_iters(signature)
+                n_new_iters = max(n_iters - n_stored_iters, 0)
+                LGR.info(
+                    f"Reusing {n_iters - n_new_iters} stored Monte Carlo iterations and running "
+                    f"{n_new_iters} new ones."
+                )
+                profiling.count("null_iterations_reused", n_iters - n_new_iters)
+
+            # Each iteration draws its own coordinates, on the worker that runs it
+            seed = _get_random_seed() if n_new_iters else None
+            mask_idx = np.flatnonzero(self.masker.mask_img.get_fdata())
             iter_df = self.inputs_["coordinates"].copy()
 
             # Define connectivity matrix for cluster labeling
@@ -727,47 +1182,87 @@ class CBMAEstimator(Estimator):
             perm_results = [
                 r
                 for r in tqdm(
-                    Parallel(return_as="generator", n_jobs=n_cores)(
-                        delayed(self._correct_fwe_montecarlo_permutation)(
-                            iter_xyzs[i_iter],
-                            iter_df=iter_df,
-                            conn=conn,
-                            voxel_thresh=ss_thresh,
-                            vfwe_only=vfwe_only,
-                        )
-                        for i_iter in range(n_iters)
+                    profiling.trace_batches(
+                        _run_parallel(
+                            (
+                                delayed(self._correct_fwe_montecarlo_permutation)(
+                                    i_iter,
+                                    seed,
+                                    mask_idx,
+                                    iter_df=iter_df,
+                                    conn=conn,
+                                    voxel_thresh=ss_thresh,
+                                    vfwe_only=vfwe_only,
+                                )
+                                for i_iter in range(n_new_iters)
+                            ),
+                            n_cores=n_cores,
+                            backend=backend,
+                        ),
+                        name="permutations",
+                        category="corrector",
                     ),
-                    total=n_iters,
+                    total=n_new_iters,
                 )
             ]
 
-            fwe_voxel_max, fwe_cluster_size_max, fwe_cluster_mass_max = zip(*perm_results)
+            fwe_voxel_max, fwe_cluster_size_max, fwe_cluster_mass_max = (
+                zip(*perm_results) if perm_results else ((), (), ())
+            )
+
+            if null_library is not None:
+                new_nulls = {"voxel": fwe_voxel_max}
+                if not vfwe_only:
+                    new_nulls.update(size=fwe_cluster_size_max, mass=fwe_cluster_mass_max)
+
+                if n_new_iters:
+                    nulls = null_library.update(signature, new_nulls)
+                else:
+                    nulls = null_library.get(signature)
+
+                fwe_voxel_max = nulls["voxel"][:n_iters]
+                if not vfwe_only:
+                    fwe_cluster_size_max = nulls["size"][:n_iters]
+                    fwe_cluster_mass_max = nulls["mass"][:n_iters]
 
             if not vfwe_only:
                 # Cluster-level FWE
                 # Extract the summary statistics in voxel-wise (3D) form, threshold, and
                 # cluster-label
-                thresh_stat_values = self.masker.inverse_transform(stat_values).get_fdata()
-                thresh_stat_values[thresh_stat_values <= ss_thresh] = 0
-                labeled_matrix, _ = ndimage.label(thresh_stat_values, conn)
-
-                cluster_labels, idx, cluster_sizes = np.unique(
-                    labeled_matrix,
-                    return_inverse=True,
-                    return_counts=True,
-                )
-                assert cluster_labels[0] == 0
+                with profiling.span("cluster_labeling", category="corrector"):
+                    thresh_stat_values = self.masker.inverse_transform(stat_values).get_fdata()
+                    thresh_stat_values[thresh_stat_values <= ss_thresh] = 0
+                    labeled_matrix, _ = ndimage.label(thresh_stat_values, conn)
+
+                    cluster_labels, idx, cluster_sizes = np.unique(
+                        labeled_matrix,
+                        return_inverse=True,
+                        return_counts=True,
+                    )
+                    assert cluster_labels[0] == 0
 
-                # Cluster mass-based inference
-                cluster_masses = np.zeros(cluster_labels.shape)
-                for i_val in cluster_labels:
-                    if i_val == 0:
-                        cluster_masses[i_val] = 0
+                    # Cluster mass-based inference
+                    cluster_masses = np.zeros(cluster_labels.shape)
+                    for i_val in cluster_labels:
+                        if i_val == 0:
+                            cluster_masses[i_val] = 0
 
-                    cluster_mass = np.sum(thresh_stat_values[labeled_matrix == i_val] - ss_thresh)
-                    cluster_masses[i_val] = cluster_mass
+                        cluster_mass = np.sum(
+                            thresh_stat_values[labeled_matrix == i_val] - ss_thresh
+                        )
+                        cluster_masses[i_val] = cluster_mass
 
-                p_cmfwe_vals = null_to_p(cluster_masses, fwe_cluster_mass_max, "upper")
+                self.null_distributions_[
+                    "values_desc-mass_level-cluster_corr-fwe_method-montecarlo"
+                ] = fwe_cluster_mass_max
+                self.null_distributions_[
+                    "nulldist_desc-mass_level-cluster_corr-fwe_method-montecarlo"
+                ] = NullDistribution(
+                    values=fwe_cluster_mass_max, tail_approximation=tail_approximation
+                )
+                p_cmfwe_vals = self.null_distributions_[
+                    "nulldist_desc-mass_level-cluster_corr-fwe_method-montecarlo"
+                ].p(cluster_masses)
                 p_cmfwe_map = p_cmfwe_vals[np.reshape(idx, labeled_matrix.shape)]
 
                 p_cmfwe_values = np.squeeze(
@@ -781,7 +1276,17 @@ class CBMAEstimator(Estimator):
 
                 # Cluster size-based inference
                 cluster_sizes[0] = 0  # replace background's "cluster size" with zeros
-                p_csfwe_vals = null_to_p(cluster_sizes, fwe_cluster_size_max, "upper")
+                self.null_distributions_[
+                    "values_desc-size_level-cluster_corr-fwe_method-montecarlo"
+                ] = fwe_cluster_size_max
+                self.null_distributions_[
+                    "nulldist_desc-size_level-cluster_corr-fwe_method-montecarlo"
+                ] = NullDistribution(
+                    values=fwe_cluster_size_max, tail_approximation=tail_approximation
+                )
+                p_csfwe_vals = self.null_distributions_[
+                    "nulldist_desc-size_level-cluster_corr-fwe_method-montecarlo"
+                ].p(cluster_sizes)
                 p_csfwe_map = p_csfwe_vals[np.reshape(idx, labeled_matrix.shape)]
 
                 p_csfwe_values = np.squeeze(
@@ -793,19 +1298,17 @@ class CBMAEstimator(Estimator):
                 logp_csfwe_values[np.isinf(logp_csfwe_values)] = -np.log10(np.finfo(float).eps)
                 z_csfwe_values = p_to_z(p_csfwe_values, tail="one")
 
-                self.null_distributions_[
-                    "values_desc-size_level-cluster_corr-fwe_method-montecarlo"
-                ] = fwe_cluster_size_max
-                self.null_distributions_[
-                    "values_desc-mass_level-cluster_corr-fwe_method-montecarlo"
-                ] = fwe_cluster_mass_max
-
             # Voxel-level FWE
             LGR.info("Using null distribution for voxel-level FWE correction.")
-            p_vfwe_values = null_to_p(stat_values, fwe_voxel_max, tail="upper")
             self.null_distributions_["values_level-voxel_corr-fwe_method-montecarlo"] = (
                 fwe_voxel_max
             )
+            self.null_distributions_["nulldist_level-voxel_corr-fwe_method-montecarlo"] = (
+                NullDistribution(values=fwe_voxel_max, tail_approximation=tail_approximation)
+            )
+            p_vfwe_values = self.null_distributions_[
+                "nulldist_level-voxel_corr-fwe_method-montecarlo"
+            ].p(stat_values)
 
         z_vfwe_values = p_to_z(p_vfwe_values, tail="one")
         logp_vfwe_values = -np.log10(p_vfwe_values)
@@ -852,6 +1355,12 @@ class CBMAEstimator(Estimator):
                 "distribution."
             )
 
+        if tail_approximation == "gpd" and not (vfwe_only and self.null_method == "montecarlo"):
+            description += (
+                " The upper tails of the null distributions were modeled with generalized Pareto "
+                "distributions \\citep{winkler2016faster}."
+            )
+
         return maps, {}, description
 
 
@@ -916,32 +1425,46 @@ class PairwiseCBMAEstimator(CBMAEstimator):
         "fitting" methods are implemented as `_fit`, although users should
         call `fit`.
         """
-        # Reproduce fit() for dataset1 to collect and process inputs.
-        self._collect_inputs(dataset1, drop_invalid=drop_invalid)
-        self._preprocess_input(dataset1)
-        if "ma_maps" in self.inputs_.keys():
-            # Grab pre-generated MA maps
-            self.inputs_["ma_maps1"] = self.inputs_.pop("ma_maps")
+        with profiling.span(f"{self.__class__.__name__}.fit", category="estimator"):
+            # Reproduce fit() for dataset1 to collect and process inputs.
+            with profiling.span("collect_inputs", category="estimator"):
+                self._collect_inputs(dataset1, drop_invalid=drop_invalid)
 
-        self.inputs_["id1"] = self.inputs_.pop("id")
-        self.inputs_["coordinates1"] = self.inputs_.pop("coordinates")
+            with profiling.span("preprocess_input", category="estimator"):
+                self._preprocess_input(dataset1)
 
-        # Reproduce fit() for dataset2 to collect and process inputs.
-        self._collect_inputs(dataset2, drop_invalid=drop_invalid)
-        self._preprocess_input(dataset2)
-        if "ma_maps" in self.inputs_.keys():
-            # Grab pre-generated MA maps
-            self.inputs_["ma_maps2"] = self.inputs_.pop("ma_maps")
+            if "ma_maps" in self.inputs_.keys():
+                # Grab pre-generated MA maps
+                self.inputs_["ma_maps1"] = self.inputs_.pop("ma_maps")
 
-        self.inputs_["id2"] = self.inputs_.pop("id")
-        self.inputs_["coordinates2"] = self.inputs_.pop("coordinates")
+            self.inputs_["id1"] = self.inputs_.pop("id")
+            self.inputs_["coordinates1"] = self.inputs_.pop("coordinates")
 
-        # Now run the Estimator-specific _fit() method.
-        maps, tables, description = self._cache(self._fit, func_memory_level=1)(dataset1, dataset2)
+            # Reproduce fit() for dataset2 to collect and process inputs.
+            with profiling.span("collect_inputs", category="estimator"):
+                self._collect_inputs(dataset2, drop_invalid=drop_invalid)
+
+            with profiling.span("preprocess_input", category="estimator"):
+                self._preprocess_input(dataset2)
+
+            if "ma_maps" in self.inputs_.keys():
+                # Grab pre-generated MA maps
+                self.inputs_["ma_maps2"] = self.inputs_.pop("ma_maps")
+
+            self.inputs_["id2"] = self.inputs_.pop("id")
+            self.inputs_["coordinates2"] = self.inputs_.pop("coordinates")
+
+            # Now run the Estimator-specific _fit() method.
+            with profiling.span("fit", category="estimator"):
+                maps, tables, description = self._cache(self._fit, func_memory_level=1)(
+                    dataset1, dataset2
+                )
 
         if hasattr(self, "masker") and self.masker is not None:
             masker = self.masker
         else:
             masker = dataset1.masker
 
-        return MetaResult(self, mask=masker, maps=maps, tables=tables, description=description)
+        result = MetaResult(self, mask=masker, maps=maps, tables=tables, description=description)
+        result.profile_ = profiling.get_profiler()
+        return result
@@ -2,32 +2,78 @@
 
 import logging
 
+import joblib
 import nibabel as nib
 import numpy as np
-import sparse
-from joblib import Memory, Parallel, delayed
-from pymare.stats import fdr
-from scipy import ndimage
+from joblib import Memory, delayed
+from scipy import ndimage, sparse
 from scipy.stats import chi2
 from tqdm.auto import tqdm
 
-from nimare import _version
+from nimare import _version, profiling
 from nimare.meta.cbma.base import CBMAEstimator, PairwiseCBMAEstimator
+from nimare.meta.cbma.nulls import get_design_signature
 from nimare.meta.kernel import KDAKernel, MKDAKernel
-from nimare.meta.utils import _calculate_cluster_measures
-from nimare.stats import null_to_p, one_way, two_way
+from nimare.meta.utils import (
+    _calculate_cluster_measures,
+    _get_iteration_rng,
+    _get_random_seed,
+    _sample_mask_xyz,
+    _unmask_values,
+)
+from nimare.stats import NullDistribution, one_way, two_way
 from nimare.transforms import p_to_z
-from nimare.utils import _check_ncores, vox2mm
+from nimare.utils import _check_backend, _check_ncores, _run_parallel
 
 LGR = logging.getLogger(__name__)
 __version__ = _version.get_versions()["version"]
 
 
+def _compute_experiment_weights(coordinates):
+    """Compute unnormalized MKDA weights from experiments' sample sizes and inference types.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    coordinates : :obj:`pandas.DataFrame`
+        Coordinates of the experiments, with optional "sample_size" and "inference" columns.
+
+    Returns
+    -------
+    weights : :obj:`numpy.ndarray`
+        The square root of the sample size times 0.75 for fixed-effects or 1 for random-effects
+        inference, for each experiment, sorted by ID.
+    """
+    # TODO: Incorporate sample-size and inference metadata extraction and
+    # merging into df.
+    # This will need to be distinct from the kernel_transformer-based kind
+    # done in CBMAEstimator._preprocess_input
+    ids_df = coordinates.groupby("id").first()
+
+    # Default to unit weighting for missing inference or sample size
+    if "inference" not in ids_df.columns:
+        ids_df["inference"] = "rfx"
+    if "sample_size" not in ids_df.columns:
+        ids_df["sample_size"] = 1.0
+
+    n = ids_df["sample_size"].astype(float).values
+    inf = ids_df["inference"].map({"ffx": 0.75, "rfx": 1.0}).values
+
+    return np.sqrt(n) * inf
+
+
 class MKDADensity(CBMAEstimator):
     r"""Multilevel kernel density analysis- Density analysis.
 
     The MKDA density method was originally introduced in :footcite:t:`wager2007meta`.
 
+    .. versionchanged:: 0.5.1
+
+        - New method: :meth:`update`, to add or remove experiments without refitting.
+        - New parameter: ``backend``, to run the Monte Carlo null distribution in threads or
+          with an Executor.
+
     .. versionchanged:: 0.2.1
 
         - New parameters: ``memory`` and ``memory_level`` for memory caching.
@@ -74,6 +120,16 @@ class MKDADensity(CBMAEstimator):
         This is only used if ``null_method=="montecarlo"``.
         If <=0, defaults to using all available cores.
         Default is 1.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+        Parallel backend. If None, joblib's default process-based backend is used.
+        If "threads", all workers share one in-memory copy of the inputs.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        This is only used if ``null_method=="montecarlo"``.
+        Default is None.
+
+        .. versionadded:: 0.5.1
     **kwargs
         Keyword arguments. Arguments for the kernel_transformer can be assigned
         here, with the prefix '\kernel__' in the variable name.
@@ -89,6 +145,10 @@ class MKDADensity(CBMAEstimator):
         Null distributions for the uncorrected summary-statistic-to-p-value conversion and any
         multiple-comparisons correction methods.
         Entries are added to this attribute if and when the corresponding method is applied.
+        Each null that is used to compute p-values also gets a
+        :class:`~nimare.stats.NullDistribution` entry, under the same key with a ``nulldist_``
+        prefix instead of ``values_`` or ``histweights_``
+        (e.g., ``nulldist_corr-none_method-approximate``).
 
         If ``null_method == "approximate"``:
 
@@ -120,6 +180,11 @@ class MKDADensity(CBMAEstimator):
             -   ``values_desc-mass_level-cluster_corr-fwe_method-montecarlo``: The maximum cluster
                 mass from each Monte Carlo iteration. An array of shape (n_iters,).
 
+    accumulators_ : :obj:`dict` or None
+        Running summaries of the experiments, which are used by :meth:`update`, including the
+        voxel-wise weighted sums of MA values and the weight and mean MA value of each
+        experiment. Only available if ``null_method == "approximate"``.
+
     Notes
     -----
     The MKDA density algorithm is also implemented in MATLAB at
@@ -140,6 +205,7 @@ class MKDADensity(CBMAEstimator):
         memory=Memory(location=None, verbose=0),
         memory_level=0,
         n_cores=1,
+        backend=None,
         **kwargs,
     ):
         if not (isinstance(kernel_transformer, MKDAKernel) or kernel_transformer == MKDAKernel):
@@ -159,6 +225,7 @@ class MKDADensity(CBMAEstimator):
         self.null_method = null_method
         self.n_iters = None if null_method == "approximate" else n_iters or 5000
         self.n_cores = _check_ncores(n_cores)
+        self.backend = _check_backend(backend)
         self.dataset = None
 
     def _generate_description(self):
@@ -193,43 +260,22 @@ class MKDADensity(CBMAEstimator):
 
     def _compute_weights(self, ma_values):
         """Determine experiment-wise weights per the conventional MKDA approach."""
-        # TODO: Incorporate sample-size and inference metadata extraction and
-        # merging into df.
-        # This will need to be distinct from the kernel_transformer-based kind
-        # done in CBMAEstimator._preprocess_input
-        ids_df = self.inputs_["coordinates"].groupby("id").first()
-
-        n_exp = len(ids_df)
-
-        # Default to unit weighting for missing inference or sample size
-        if "inference" not in ids_df.columns:
-            ids_df["inference"] = "rfx"
-        if "sample_size" not in ids_df.columns:
-            ids_df["sample_size"] = 1.0
-
-        n = ids_df["sample_size"].astype(float).values
-        inf = ids_df["inference"].map({"ffx": 0.75, "rfx": 1.0}).values
+        weights = _compute_experiment_weights(self.inputs_["coordinates"])
+        n_exp = weights.shape[0]
 
-        weight_vec = n_exp * ((np.sqrt(n) * inf) / np.sum(np.sqrt(n) * inf))
+        weight_vec = n_exp * (weights / np.sum(weights))
         weight_vec = weight_vec[:, None]
 
         assert weight_vec.shape[0] == ma_values.shape[0]
         return weight_vec
 
     def _compute_summarystat_est(self, ma_values):
-        ma_values = ma_values.reshape((ma_values.shape[0], -1))
-        stat_values = ma_values.T.dot(self.weight_vec_)
-
-        if isinstance(ma_values, sparse._coo.core.COO):
-            # NOTE: This may not work correctly with a non-NiftiMasker.
-            mask_data = self.masker.mask_img.get_fdata().astype(bool)
-
-            stat_values = stat_values[mask_data.reshape(-1)].ravel()
-            # This is used by _compute_null_approximate
-            self.__n_mask_voxels = stat_values.shape[0]
+        if sparse.issparse(ma_values):
+            stat_values = np.asarray(ma_values.T.dot(self.weight_vec_)).ravel()
         else:
             # np.array type is used by _compute_null_reduced_montecarlo
-            stat_values = stat_values.ravel()
+            ma_values = ma_values.reshape((ma_values.shape[0], -1))
+            stat_values = ma_values.T.dot(self.weight_vec_).ravel()
 
         return stat_values
 
@@ -238,30 +284,19 @@ class MKDADensity(CBMAEstimator):
 
         Parameters
         ----------
-        ma_maps : :obj:`sparse._coo.core.COO`
-            MA maps.
-            The ma_maps can be a 4d sparse array of MA maps,
+        ma_maps : :obj:`scipy.sparse.csr_matrix`
+            MA maps, with one row of masked MA values for each experiment.
 
         Notes
         -----
         This method adds two entries to the null_distributions_ dict attribute: "histogram_bins",
         and "histogram_means" only if ``null_method == "approximate"``.
         """
-        if not isinstance(ma_maps, sparse._coo.core.COO):
+        if not sparse.issparse(ma_maps):
             raise ValueError(f"Unsupported data type '{type(ma_maps)}'")
 
-        n_exp = ma_maps.shape[0]
-        prop_active = np.zeros(n_exp)
-        data = ma_maps.data
-        coords = ma_maps.coords
-        for exp_idx in range(n_exp):
-            # The first column of coords is the fourth dimension of the dense array
-            study_ma_values = data[coords[0, :] == exp_idx]
-
-            n_nonzero_voxels = study_ma_values.shape[0]
-            n_zero_voxels = self.__n_mask_voxels - n_nonzero_voxels
-
-            prop_active[exp_idx] = np.mean(np.hstack([study_ma_values, np.zeros(n_zero_voxels)]))
+        # Mean MA value of each experiment across the mask
+        prop_active = np.asarray(ma_maps.sum(axis=1, dtype=np.float64)).ravel() / ma_maps.shape[1]
 
         self.null_distributions_["histogram_bins"] = np.arange(len(prop_active) + 1, step=1)
 
@@ -295,6 +330,29 @@ class MKDADensity(CBMAEstimator):
 
         self.null_distributions_["histweights_corr-none_method-approximate"] = ss_hist
 
+    def _compute_accumulators(self, ma_values, coordinates):
+        weights = _compute_experiment_weights(coordinates)
+        return {
+            "stat": np.asarray(ma_values.T.dot(weights)).ravel(),
+            "weights": weights,
+            "means": np.asarray(ma_values.sum(axis=1, dtype=np.float64)).ravel()
+            / ma_values.shape[1],
+        }
+
+    def _compute_summarystat_from_accumulators(self):
+        # Weights are normalized to sum to the number of experiments
+        weights = self.accumulators_["weights"]
+        n_exp = weights.shape[0]
+        self.weight_vec_ = (n_exp * (weights / np.sum(weights)))[:, None]
+        return self.accumulators_["stat"] * (n_exp / np.sum(weights))
+
+    def _update_null_approximate(self, added, rebuild):
+        # The null distribution only depends on the mean MA value of each experiment
+        prop_active = self.accumulators_["means"]
+        self.null_distributions_["histogram_bins"] = np.arange(len(prop_active) + 1, step=1)
+        self.null_distributions_["histogram_means"] = prop_active
+        self._compute_null_approximate(None)
+
 
 class MKDAChi2(PairwiseCBMAEstimator):
     r"""Multilevel kernel density analysis- Chi-square analysis.
@@ -352,6 +410,10 @@ class MKDAChi2(PairwiseCBMAEstimator):
             established null distribution.
 
         Entries are added to this attribute if and when the corresponding method is applied.
+        Each null that is used to compute p-values also gets a
+        :class:`~nimare.stats.NullDistribution` entry, under the same key with a ``nulldist_``
+        prefix instead of ``values_`` or ``histweights_``
+        (e.g., ``nulldist_desc-pAgF_level-voxel_corr-fwe_method-montecarlo``).
 
         If :meth:`correct_fwe_montecarlo` is applied:
 
@@ -533,13 +595,23 @@ class MKDAChi2(PairwiseCBMAEstimator):
         description = self._generate_description()
         return maps, {}, description
 
-    def _run_fwe_permutation(self, iter_xyz1, iter_xyz2, iter_df1, iter_df2, conn, voxel_thresh):
+    def _run_fwe_permutation(self, i_iter, seed, mask_idx, iter_df1, iter_df2, conn, voxel_thresh):
         """Run a single permutation of the Monte Carlo FWE correction procedure.
 
+        .. versionchanged:: 0.5.1
+
+            Draw the random coordinates from the iteration's own random stream,
+            instead of receiving them.
+
         Parameters
         ----------
-        iter_xyz1, iter_xyz2 : :obj:`numpy.ndarray`
-            Random coordinates for the permutation.
+        i_iter : :obj:`int`
+            Index of the iteration.
+        seed : :obj:`int`
+            Root seed of the random streams of the Monte Carlo procedure.
+        mask_idx : :obj:`numpy.ndarray`
+            Flat indices of the voxels in the mask, from which coordinates are drawn,
+            and in which the chi-squared values are placed for cluster labeling.
         iter_df1, iter_df2 : :obj:`pandas.DataFrame`
             DataFrames with as many rows as there are coordinates in each of the two datasets,
             to be filled in with random coordinates for the permutation.
@@ -568,10 +640,10 @@ class MKDAChi2(PairwiseCBMAEstimator):
         iter_df1 = iter_df1.copy()
         iter_df2 = iter_df2.copy()
 
-        iter_xyz1 = np.squeeze(iter_xyz1)
-        iter_xyz2 = np.squeeze(iter_xyz2)
-        iter_df1[["x", "y", "z"]] = iter_xyz1
-        iter_df2[["x", "y", "z"]] = iter_xyz2
+        rng = _get_iteration_rng(seed, i_iter)
+        mask_img = self.masker.mask_img
+        iter_df1[["x", "y", "z"]] = _sample_mask_xyz(mask_img, mask_idx, iter_df1.shape[0], rng)
+        iter_df2[["x", "y", "z"]] = _sample_mask_xyz(mask_img, mask_idx, iter_df2.shape[0], rng)
 
         # Generate MA maps and calculate count variables for first dataset
         n_selected_active_voxels = self.kernel_transformer.transform(
@@ -597,7 +669,7 @@ class MKDAChi2(PairwiseCBMAEstimator):
         pAgF_max_chi2_value = np.max(np.abs(pAgF_chi2_vals))
 
         # Cluster-level inference
-        pAgF_chi2_map = self.masker.inverse_transform(pAgF_chi2_vals).get_fdata()
+        pAgF_chi2_map = _unmask_values(pAgF_chi2_vals, mask_idx, mask_img.shape)
         pAgF_max_size, pAgF_max_mass = _calculate_cluster_measures(
             pAgF_chi2_map, voxel_thresh, conn, tail="two"
         )
@@ -620,7 +692,7 @@ class MKDAChi2(PairwiseCBMAEstimator):
         pFgA_max_chi2_value = np.max(np.abs(pFgA_chi2_vals))
 
         # Cluster-level inference
-        pFgA_chi2_map = self.masker.inverse_transform(pFgA_chi2_vals).get_fdata()
+        pFgA_chi2_map = _unmask_values(pFgA_chi2_vals, mask_idx, mask_img.shape)
         pFgA_max_size, pFgA_max_mass = _calculate_cluster_measures(
             pFgA_chi2_map, voxel_thresh, conn, tail="two"
         )
@@ -637,6 +709,10 @@ class MKDAChi2(PairwiseCBMAEstimator):
     def _apply_correction(self, stat_values, voxel_thresh, vfwe_null, csfwe_null, cmfwe_null):
         """Apply different kinds of FWE correction to statistical value matrix.
 
+        .. versionchanged:: 0.5.1
+
+            Take :class:`~nimare.stats.NullDistribution` objects instead of arrays of null values.
+
         .. versionchanged:: 0.0.13
 
             Change cluster neighborhood from faces+edges to faces, to match Nilearn.
@@ -647,7 +723,7 @@ class MKDAChi2(PairwiseCBMAEstimator):
             1D array of summary-statistic values.
         voxel_thresh : :obj:`float`
             Summary statistic threshold for defining clusters.
-        vfwe_null, csfwe_null, cmfwe_null : :obj:`numpy.ndarray`
+        vfwe_null, csfwe_null, cmfwe_null : :class:`~nimare.stats.NullDistribution`
             Null distributions for FWE correction.
 
         Returns
@@ -661,7 +737,7 @@ class MKDAChi2(PairwiseCBMAEstimator):
         conn = ndimage.generate_binary_structure(rank=3, connectivity=1)
 
         # Voxel-level FWE
-        p_vfwe_values = null_to_p(np.abs(stat_values), vfwe_null, tail="upper")
+        p_vfwe_values = vfwe_null.p(np.abs(stat_values))
 
         # Crop p-values of 0 or 1 to nearest values that won't evaluate to 0 or 1.
         # Prevents inf z-values.
@@ -699,7 +775,7 @@ class MKDAChi2(PairwiseCBMAEstimator):
             cluster_mass = np.sum(np.abs(stat_map_thresh[labeled_matrix == i_val]) - voxel_thresh)
             cluster_masses[i_val] = cluster_mass
 
-        p_cmfwe_vals = null_to_p(cluster_masses, cmfwe_null, tail="upper")
+        p_cmfwe_vals = cmfwe_null.p(cluster_masses)
         p_cmfwe_map = p_cmfwe_vals[np.reshape(idx, labeled_matrix.shape)]
 
         p_cmfwe_values = np.squeeze(
@@ -708,7 +784,7 @@ class MKDAChi2(PairwiseCBMAEstimator):
 
         # Cluster size-based inference
         cluster_sizes[0] = 0  # replace background's "cluster size" with zeros
-        p_csfwe_vals = null_to_p(cluster_sizes, csfwe_null, tail="upper")
+        p_csfwe_vals = csfwe_null.p(cluster_sizes)
         p_csfwe_map = p_csfwe_vals[np.reshape(idx, labeled_matrix.shape)]
         p_csfwe_values = np.squeeze(
             self.masker.transform(nib.Nifti1Image(p_csfwe_map, self.masker.mask_img.affine))
@@ -716,11 +792,30 @@ class MKDAChi2(PairwiseCBMAEstimator):
 
         return p_vfwe_values, p_csfwe_values, p_cmfwe_values
 
-    def correct_fwe_montecarlo(self, result, voxel_thresh=0.001, n_iters=1000, n_cores=1):
+    def correct_fwe_montecarlo(
+        self,
+        result,
+        voxel_thresh=0.001,
+        n_iters=1000,
+        n_cores=1,
+        null_library=None,
+        tail_approximation=None,
+        backend=None,
+    ):
         """Perform FWE correction using the max-value permutation method.
 
         Only call this method from within a Corrector.
 
+        .. versionchanged:: 0.5.1
+
+            * Each permutation draws its random coordinates on the worker that runs it,
+              so results no longer depend on ``n_cores``.
+            * Store the null distributions as :class:`~nimare.stats.NullDistribution` objects.
+            * New parameter: ``tail_approximation``, to model the upper tails of the null
+              distributions with generalized Pareto distributions.
+            * New parameter: ``backend``, to run the permutations in threads or with an Executor.
+            * New parameter: ``null_library``, to reuse null distributions across corrections.
+
         .. versionchanged:: 0.0.13
 
             Change cluster neighborhood from faces+edges to faces, to match Nilearn.
@@ -741,6 +836,30 @@ class MKDAChi2(PairwiseCBMAEstimator):
         n_cores : :obj:`int`, default=1
             Number of cores to use for parallelization.
             If <=0, defaults to using all available cores. Default is 1.
+        null_library : :obj:`~nimare.meta.cbma.nulls.MonteCarloNullLibrary` or None, optional
+            Library of previously-computed null distributions.
+            If provided, null distributions for the same designs of both Datasets (and the same
+            ``voxel_thresh``) are reused, and extended with new iterations if fewer than
+            ``n_iters`` are stored.
+            New iterations are added to the library. Default is None.
+
+            .. versionadded:: 0.5.1
+        tail_approximation : {None, "gpd"}, optional
+            If "gpd", fit a generalized Pareto distribution to the upper tail of each maximum
+            value null distribution, to estimate FWE-corrected p-values below ``1 / n_iters``.
+            See :class:`~nimare.stats.NullDistribution` for details. Default is None.
+
+            .. versionadded:: 0.5.1
+        backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+            Parallel backend for the permutations. If None, joblib's default process-based
+            backend is used, and each worker receives its own copy of the Estimator and its
+            inputs. If "threads", all workers share one in-memory copy, which keeps memory use
+            flat as ``n_cores`` grows. The name of any registered joblib backend is also
+            accepted, as is a :class:`concurrent.futures.Executor` (e.g., a pool of workers on
+            several machines), to which the permutations are submitted in batches.
+            ``n_cores`` is not used with an Executor. Default is None.
+
+            .. versionadded:: 0.5.1
 
         Returns
         -------
@@ -809,6 +928,9 @@ class MKDAChi2(PairwiseCBMAEstimator):
                 cluster mass value from the p(F|A) two-way chi-squared test from each Monte Carlo
                 iteration. An array of shape (n_iters,).
 
+        Each of these keys also has a :class:`~nimare.stats.NullDistribution` counterpart,
+        with a ``nulldist_`` prefix, which is used to look up the FWE-corrected p-values.
+
         See Also
         --------
         nimare.correct.FWECorrector : The Corrector from which to call this method.
@@ -820,10 +942,6 @@ class MKDAChi2(PairwiseCBMAEstimator):
         >>> corrector = FWECorrector(method='montecarlo', n_iters=5, n_cores=1)
         >>> cresult = corrector.transform(result)
         """
-        null_xyz = vox2mm(
-            np.vstack(np.where(self.masker.mask_img.get_fdata())).T,
-            self.masker.mask_img.affine,
-        )
         pAgF_chi2_vals = result.get_map("chi2_desc-uniformity", return_type="array")
         pFgA_chi2_vals = result.get_map("chi2_desc-association", return_type="array")
         pAgF_z_vals = result.get_map("z_desc-uniformity", return_type="array")
@@ -832,52 +950,91 @@ class MKDAChi2(PairwiseCBMAEstimator):
         pFgA_sign = np.sign(pFgA_z_vals)
 
         n_cores = _check_ncores(n_cores)
+        backend = _check_backend(backend)
 
         iter_df1 = self.inputs_["coordinates1"]
         iter_df2 = self.inputs_["coordinates2"]
-        rand_idx1 = np.random.choice(null_xyz.shape[0], size=(iter_df1.shape[0], n_iters))
-        rand_xyz1 = null_xyz[rand_idx1, :]
-        iter_xyzs1 = np.split(rand_xyz1, rand_xyz1.shape[1], axis=1)
-        rand_idx2 = np.random.choice(null_xyz.shape[0], size=(iter_df2.shape[0], n_iters))
-        rand_xyz2 = null_xyz[rand_idx2, :]
-        iter_xyzs2 = np.split(rand_xyz2, rand_xyz2.shape[1], axis=1)
+        mask_idx = np.flatnonzero(self.masker.mask_img.get_fdata())
         eps = np.spacing(1)
 
         # Identify summary statistic corresponding to intensity threshold
         ss_thresh = chi2.isf(voxel_thresh, 1)
 
+        # Only run the iterations that are not already available for these designs
+        n_new_iters = n_iters
+        if null_library is not None:
+            signature = joblib.hash(
+                tuple(
+                    get_design_signature(self, coords_key=coords_key, voxel_thresh=ss_thresh)
+                    for coords_key in ("coordinates1", "coordinates2")
+                )
+            )
+            n_new_iters = max(n_iters - null_library.get_n_iters(signature), 0)
+            LGR.info(
+                f"Reusing {n_iters - n_new_iters} stored Monte Carlo iterations and running "
+                f"{n_new_iters} new ones."
+            )
+            profiling.count("null_iterations_reused", n_iters - n_new_iters)
+
+        # Each iteration draws its own coordinates, on the worker that runs it
+        seed = _get_random_seed() if n_new_iters else None
+
         # Define connectivity matrix for cluster labeling
         conn = ndimage.generate_binary_structure(rank=3, connectivity=1)
 
         perm_results = [
             r
             for r in tqdm(
-                Parallel(return_as="generator", n_jobs=n_cores)(
-                    delayed(self._run_fwe_permutation)(
-                        iter_xyz1=iter_xyzs1[i_iter],
-                        iter_xyz2=iter_xyzs2[i_iter],
-                        iter_df1=iter_df1,
-                        iter_df2=iter_df2,
-                        conn=conn,
-                        voxel_thresh=ss_thresh,
-                    )
-                    for i_iter in range(n_iters)
+                _run_parallel(
+                    (
+                        delayed(self._run_fwe_permutation)(
+                            i_iter,
+                            seed,
+                            mask_idx,
+                            iter_df1=iter_df1,
+                            iter_df2=iter_df2,
+                            conn=conn,
+                            voxel_thresh=ss_thresh,
+                        )
+                        for i_iter in range(n_new_iters)
+                    ),
+                    n_cores=n_cores,
+                    backend=backend,
                 ),
-                total=n_iters,
+                total=n_new_iters,
             )
         ]
 
-        del rand_idx1, rand_xyz1, iter_xyzs1
-        del rand_idx2, rand_xyz2, iter_xyzs2
-
-        (
-            pAgF_vfwe_null,
-            pAgF_csfwe_null,
-            pAgF_cmfwe_null,
-            pFgA_vfwe_null,
-            pFgA_csfwe_null,
-            pFgA_cmfwe_null,
-        ) = zip(*perm_results)
+        null_names = ["pAgF", "pAgFsize", "pAgFmass", "pFgA", "pFgAsize", "pFgAmass"]
+        max_values = (
+            dict(zip(null_names, zip(*perm_results)))
+            if perm_results
+            else {name: () for name in null_names}
+        )
+        if null_library is not None:
+            if n_new_iters:
+                max_values = null_library.update(signature, max_values)
+            else:
+                max_values = null_library.get(signature)
+
+            max_values = {name: max_values[name][:n_iters] for name in null_names}
+
+        # Store the maximum values from each iteration, along with their NullDistributions
+        null_descs = [
+            "desc-pAgF_level-voxel_corr-fwe_method-montecarlo",
+            "desc-pAgFsize_level-cluster_corr-fwe_method-montecarlo",
+            "desc-pAgFmass_level-cluster_corr-fwe_method-montecarlo",
+            "desc-pFgA_level-voxel_corr-fwe_method-montecarlo",
+            "desc-pFgAsize_level-cluster_corr-fwe_method-montecarlo",
+            "desc-pFgAmass_level-cluster_corr-fwe_method-montecarlo",
+        ]
+        nulls = []
+        for null_desc, null_values in zip(null_descs, max_values.values()):
+            self.null_distributions_[f"values_{null_desc}"] = null_values
+            self.null_distributions_[f"nulldist_{null_desc}"] = NullDistribution(
+                values=null_values, tail_approximation=tail_approximation
+            )
+            nulls.append(self.null_distributions_[f"nulldist_{null_desc}"])
 
         del perm_results
 
@@ -885,43 +1042,19 @@ class MKDAChi2(PairwiseCBMAEstimator):
         pAgF_p_vfwe_vals, pAgF_p_csfwe_vals, pAgF_p_cmfwe_vals = self._apply_correction(
             pAgF_chi2_vals,
             ss_thresh,
-            vfwe_null=pAgF_vfwe_null,
-            csfwe_null=pAgF_csfwe_null,
-            cmfwe_null=pAgF_cmfwe_null,
-        )
-
-        self.null_distributions_["values_desc-pAgF_level-voxel_corr-fwe_method-montecarlo"] = (
-            pAgF_vfwe_null
+            vfwe_null=nulls[0],
+            csfwe_null=nulls[1],
+            cmfwe_null=nulls[2],
         )
-        self.null_distributions_[
-            "values_desc-pAgFsize_level-cluster_corr-fwe_method-montecarlo"
-        ] = pAgF_csfwe_null
-        self.null_distributions_[
-            "values_desc-pAgFmass_level-cluster_corr-fwe_method-montecarlo"
-        ] = pAgF_cmfwe_null
-
-        del pAgF_vfwe_null, pAgF_csfwe_null, pAgF_cmfwe_null
 
         # pFgA_FWE
         pFgA_p_vfwe_vals, pFgA_p_csfwe_vals, pFgA_p_cmfwe_vals = self._apply_correction(
             pFgA_chi2_vals,
             ss_thresh,
-            vfwe_null=pFgA_vfwe_null,
-            csfwe_null=pFgA_csfwe_null,
-            cmfwe_null=pFgA_cmfwe_null,
-        )
-
-        self.null_distributions_["values_desc-pFgA_level-voxel_corr-fwe_method-montecarlo"] = (
-            pFgA_vfwe_null
+            vfwe_null=nulls[3],
+            csfwe_null=nulls[4],
+            cmfwe_null=nulls[5],
         )
-        self.null_distributions_[
-            "values_desc-pFgAsize_level-cluster_corr-fwe_method-montecarlo"
-        ] = pFgA_csfwe_null
-        self.null_distributions_[
-            "values_desc-pFgAmass_level-cluster_corr-fwe_method-montecarlo"
-        ] = pFgA_cmfwe_null
-
-        del pFgA_vfwe_null, pFgA_csfwe_null, pFgA_cmfwe_null
 
         # Convert p-values
         # pAgF
@@ -1007,6 +1140,8 @@ class MKDAChi2(PairwiseCBMAEstimator):
         >>> corrector = FDRCorrector(method='indep', alpha=0.05)
         >>> cresult = corrector.transform(result)
         """
+        from pymare.stats import fdr
+
         pAgF_p_vals = result.get_map("p_desc-uniformity", return_type="array")
         pFgA_p_vals = result.get_map("p_desc-association", return_type="array")
         pAgF_z_vals = result.get_map("z_desc-uniformity", return_type="array")
@@ -1032,6 +1167,12 @@ class MKDAChi2(PairwiseCBMAEstimator):
 class KDA(CBMAEstimator):
     r"""Kernel density analysis.
 
+    .. versionchanged:: 0.5.1
+
+        - New method: :meth:`update`, to add or remove experiments without refitting.
+        - New parameter: ``backend``, to run the Monte Carlo null distribution in threads or
+          with an Executor.
+
     .. versionchanged:: 0.2.1
 
         - New parameters: ``memory`` and ``memory_level`` for memory caching.
@@ -1078,6 +1219,16 @@ class KDA(CBMAEstimator):
         This is only used if ``null_method=="montecarlo"``.
         If <=0, defaults to using all available cores.
         Default is 1.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+        Parallel backend. If None, joblib's default process-based backend is used.
+        If "threads", all workers share one in-memory copy of the inputs.
+        The name of any registered joblib backend is also accepted, as is a
+        :class:`concurrent.futures.Executor` (e.g., a pool of workers on several machines),
+        to which the tasks are submitted in batches. ``n_cores`` is not used with an Executor.
+        This is only used if ``null_method=="montecarlo"``.
+        Default is None.
+
+        .. versionadded:: 0.5.1
     **kwargs
         Keyword arguments. Arguments for the kernel_transformer can be assigned
         here, with the prefix '\kernel__' in the variable name.
@@ -1093,6 +1244,10 @@ class KDA(CBMAEstimator):
         Null distributions for the uncorrected summary-statistic-to-p-value conversion and any
         multiple-comparisons correction methods.
         Entries are added to this attribute if and when the corresponding method is applied.
+        Each null that is used to compute p-values also gets a
+        :class:`~nimare.stats.NullDistribution` entry, under the same key with a ``nulldist_``
+        prefix instead of ``values_`` or ``histweights_``
+        (e.g., ``nulldist_corr-none_method-approximate``).
 
         If ``null_method == "approximate"``:
 
@@ -1123,6 +1278,11 @@ class KDA(CBMAEstimator):
             -   ``values_desc-mass_level-cluster_corr-fwe_method-montecarlo``: The maximum cluster
                 mass from each Monte Carlo iteration. An array of shape (n_iters,).
 
+    accumulators_ : :obj:`dict` or None
+        Running summaries of the experiments, which are used by :meth:`update`, including the
+        voxel-wise sums of MA values and the MA-value histogram of each experiment.
+        Only available if ``null_method == "approximate"`` and the kernel has a fixed ``value``.
+
     Notes
     -----
     Kernel density analysis was first introduced in :footcite:t:`wager2003valence` and
@@ -1149,6 +1309,7 @@ class KDA(CBMAEstimator):
         memory=Memory(location=None, verbose=0),
         memory_level=0,
         n_cores=1,
+        backend=None,
         **kwargs,
     ):
         LGR.warning(
@@ -1174,6 +1335,7 @@ class KDA(CBMAEstimator):
         self.null_method = null_method
         self.n_iters = None if null_method == "approximate" else n_iters or 5000
         self.n_cores = _check_ncores(n_cores)
+        self.backend = _check_backend(backend)
         self.dataset = None
 
     def _generate_description(self):
@@ -1212,11 +1374,11 @@ class KDA(CBMAEstimator):
 
         Parameters
         ----------
-        ma_maps : :obj:`numpy.ndarray` or :obj:`sparse._coo.core.COO`
+        ma_maps : :obj:`numpy.ndarray` or :obj:`scipy.sparse.csr_matrix`
             MA maps.
             The ma_maps can be:
             (1) a 1d contrast-len or 2d contrast-by-voxel array of MA values,
-            or (2) a 4d sparse array of MA maps,
+            or (2) a 2d sparse matrix of masked MA maps, with one row per contrast.
 
         Returns
         -------
@@ -1224,17 +1386,10 @@ class KDA(CBMAEstimator):
             OF values. One value per voxel.
         """
         # OF is just a sum of MA values.
-        if isinstance(ma_values, sparse._coo.core.COO):
-            # NOTE: This may not work correctly with a non-NiftiMasker.
-            mask_data = self.masker.mask_img.get_fdata().astype(bool)
-
-            stat_values = ma_values.sum(axis=0)
-
-            stat_values = stat_values.todense().reshape(-1)
-            stat_values = stat_values[mask_data.reshape(-1)]
-
-            # This is used by _compute_null_approximate
-            self.__n_mask_voxels = stat_values.shape[0]
+        if sparse.issparse(ma_values):
+            # Sum compact unsigned MA values into the signed type of double-precision MA maps
+            dtype = np.int64 if np.issubdtype(ma_values.dtype, np.unsignedinteger) else None
+            stat_values = np.asarray(ma_values.sum(axis=0, dtype=dtype)).ravel()
         else:
             # np.array type is used by _determine_histogram_bins to calculate max_poss_value
             stat_values = np.sum(ma_values, axis=0)
@@ -1246,14 +1401,14 @@ class KDA(CBMAEstimator):
 
         Parameters
         ----------
-        ma_maps : :obj:`sparse._coo.core.COO`
+        ma_maps : :obj:`scipy.sparse.csr_matrix`
             MA maps.
 
         Notes
         -----
         This method adds one entry to the null_distributions_ dict attribute: "histogram_bins".
         """
-        if not isinstance(ma_maps, sparse._coo.core.COO):
+        if not sparse.issparse(ma_maps):
             raise ValueError(f"Unsupported data type '{type(ma_maps)}'")
 
         # assumes that groupby results in same order as MA maps
@@ -1262,12 +1417,10 @@ class KDA(CBMAEstimator):
         # Determine bins for null distribution histogram
         if hasattr(self.kernel_transformer, "value"):
             # Binary-sphere kernels (KDA & MKDA)
-            # The maximum possible MA value for each study is the weighting factor (generally 1)
-            # times the number of foci in the study.
-            # We grab the weighting factor from the kernel transformer.
-            step_size = self.kernel_transformer.value  # typically 1
-            max_ma_values = step_size * n_foci_per_study
-            max_poss_value = self._compute_summarystat_est(max_ma_values)
+            max_ma_values = self.kernel_transformer.value * n_foci_per_study
+            self.null_distributions_["histogram_bins"] = self._compute_histogram_bins(
+                max_ma_values
+            )
         else:
             # Continuous-sphere kernels (ALE)
             LGR.info(
@@ -1279,7 +1432,7 @@ class KDA(CBMAEstimator):
             # The maximum possible MA value is the max value from each MA map,
             # unlike the case with a summation-based kernel.
             # Need to convert to dense because np.ceil is too slow with sparse
-            max_ma_values = ma_maps.max(axis=[1, 2, 3]).todense()
+            max_ma_values = ma_maps.max(axis=1).toarray().ravel()
 
             # round up based on resolution
             # hardcoding 1000 here because figuring out what to round to was difficult.
@@ -1290,17 +1443,32 @@ class KDA(CBMAEstimator):
             hist_bins = np.linspace(0, max_poss_value, N_BINS - 1)
             step_size = hist_bins[1] - hist_bins[0]
 
+            hist_bins = np.arange(0, max_poss_value + (step_size * 1.5), step_size)
+            self.null_distributions_["histogram_bins"] = hist_bins
+
+    def _compute_histogram_bins(self, max_ma_values):
+        """Compute the histogram bin centers for experiments with given maximum MA values.
+
+        .. versionadded:: 0.5.1
+
+        This is only used for binary-sphere kernels.
+        """
+        # The maximum possible MA value for each study is the weighting factor (generally 1)
+        # times the number of foci in the study.
+        # We grab the weighting factor from the kernel transformer.
+        step_size = self.kernel_transformer.value  # typically 1
+        max_poss_value = self._compute_summarystat_est(max_ma_values)
+
         # Weighting is not supported yet, so I'm going to build my bins around the min MA value.
         # The histogram bins are bin *centers*, not edges.
-        hist_bins = np.arange(0, max_poss_value + (step_size * 1.5), step_size)
-        self.null_distributions_["histogram_bins"] = hist_bins
+        return np.arange(0, max_poss_value + (step_size * 1.5), step_size)
 
     def _compute_null_approximate(self, ma_maps):
         """Compute uncorrected null distribution using approximate solution.
 
         Parameters
         ----------
-        ma_maps : :obj:`sparse._coo.core.COO`
+        ma_maps : :obj:`scipy.sparse.csr_matrix`
             MA maps.
 
         Notes
@@ -1308,27 +1476,25 @@ class KDA(CBMAEstimator):
         This method adds two entries to the null_distributions_ dict attribute:
         "histogram_bins" and "histogram_weights".
         """
-        if not isinstance(ma_maps, sparse._coo.core.COO):
+        if not sparse.issparse(ma_maps):
             raise ValueError(f"Unsupported data type '{type(ma_maps)}'")
 
         # Derive bin edges from histogram bin centers for numpy histogram function
         bin_centers = self.null_distributions_["histogram_bins"]
         step_size = bin_centers[1] - bin_centers[0]
-        inv_step_size = 1 / step_size
         bin_edges = bin_centers - (step_size / 2)
         bin_edges = np.append(bin_centers, bin_centers[-1] + step_size)
 
         n_exp = ma_maps.shape[0]
         n_bins = bin_centers.shape[0]
         ma_hists = np.zeros((n_exp, n_bins))
-        data = ma_maps.data
-        coords = ma_maps.coords
+        ma_maps = ma_maps.tocsr()
         for exp_idx in range(n_exp):
-            # The first column of coords is the fourth dimension of the dense array
-            study_ma_values = data[coords[0, :] == exp_idx]
+            # Each row holds the nonzero MA values of one experiment
+            study_ma_values = ma_maps.data[ma_maps.indptr[exp_idx] : ma_maps.indptr[exp_idx + 1]]
 
             n_nonzero_voxels = study_ma_values.shape[0]
-            n_zero_voxels = self.__n_mask_voxels - n_nonzero_voxels
+            n_zero_voxels = ma_maps.shape[1] - n_nonzero_voxels
 
             ma_hists[exp_idx, :] = np.histogram(study_ma_values, bins=bin_edges, density=False)[
                 0
@@ -1339,10 +1505,42 @@ class KDA(CBMAEstimator):
         ma_hists /= ma_hists.sum(1)[:, None]
 
         # Null distribution to convert summary statistics to p-values.
-        stat_hist = ma_hists[0, :].copy()
+        self.null_distributions_["histweights_corr-none_method-approximate"] = (
+            self._convolve_ma_histograms(sparse.csr_matrix(ma_hists))
+        )
+
+    def _convolve_ma_histograms(self, ma_hists, stat_hist=None):
+        """Combine MA-value histograms into a histogram of OF values.
 
-        for i_exp in range(1, ma_hists.shape[0]):
-            exp_hist = ma_hists[i_exp, :]
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        ma_hists : (E x B) :obj:`scipy.sparse.csr_matrix`
+            Normalized MA-value histograms of E experiments, on the first B bins in the
+            "histogram_bins" null distribution.
+        stat_hist : :obj:`numpy.ndarray` or None, optional
+            Histogram of OF values from other experiments, with one value for each bin in
+            "histogram_bins", to which the experiments are added. Default is None.
+
+        Returns
+        -------
+        stat_hist : :obj:`numpy.ndarray`
+            Histogram of OF values, with one value for each bin in "histogram_bins".
+        """
+        bin_centers = self.null_distributions_["histogram_bins"]
+        step_size = bin_centers[1] - bin_centers[0]
+        inv_step_size = 1 / step_size
+
+        ma_hists = ma_hists.tocsr(copy=True)
+        ma_hists.resize((ma_hists.shape[0], bin_centers.shape[0]))
+        first_exp = 0
+        if stat_hist is None:
+            stat_hist = ma_hists[0].toarray().ravel()
+            first_exp = 1
+
+        for i_exp in range(first_exp, ma_hists.shape[0]):
+            exp_hist = ma_hists[i_exp].toarray().ravel()
 
             # Find histogram bins with nonzero values for each histogram.
             stat_idx = np.where(stat_hist > 0)[0]
@@ -1358,4 +1556,21 @@ class KDA(CBMAEstimator):
             stat_hist = np.zeros(stat_hist.shape)
             np.add.at(stat_hist, score_idx, probabilities)
 
-        self.null_distributions_["histweights_corr-none_method-approximate"] = stat_hist
+        return stat_hist
+
+    def _compute_accumulators(self, ma_values, coordinates):
+        if not hasattr(self.kernel_transformer, "value"):
+            # The histogram bins of other kernels depend on all of the experiments
+            return None
+
+        # assumes that groupby results in same order as MA maps
+        n_foci_per_study = coordinates.groupby("id").size().values
+        max_ma_values = self.kernel_transformer.value * n_foci_per_study
+        return {
+            "stat": self._compute_summarystat_est(ma_values),
+            "max_ma_values": max_ma_values,
+            "ma_hists": self._compute_ma_histograms(ma_values, max_ma_values),
+        }
+
+    def _compute_summarystat_from_accumulators(self):
+        return self.accumulators_["stat"].copy()
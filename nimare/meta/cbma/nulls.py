@@ -0,0 +1,185 @@
+"""Reusable Monte Carlo null distributions for coordinate-based meta-analyses."""
+
+import logging
+import os
+import os.path as op
+
+import joblib
+import numpy as np
+
+from nimare.base import NiMAREBase
+
+LGR = logging.getLogger(__name__)
+
+# Keyword parameters that do not change the values of the modeled activation maps.
+_IGNORED_KERNEL_PARAMS = ("memory", "memory_level")
+
+# Per-experiment metadata columns that influence the summary statistic under the null.
+# Sample sizes change ALE kernel widths, and both columns change MKDA weights.
+_DESIGN_COLUMNS = ("sample_size", "inference")
+
+
+def get_design_signature(estimator, coords_key="coordinates", voxel_thresh=None):
+    """Build a canonical signature of a CBMA design for Monte Carlo null reuse.
+
+    .. versionadded:: 0.5.1
+
+    The Monte Carlo null distributions used by FWE correction are generated by replacing each
+    experiment's foci with coordinates drawn at random from the mask, so they depend on the mask,
+    the kernel, the Estimator, and the multiset of experiment designs, but not on where the
+    observed foci are located.
+
+    Parameters
+    ----------
+    estimator : :obj:`~nimare.meta.cbma.base.CBMAEstimator`
+        A fitted CBMA Estimator.
+    coords_key : :obj:`str`, default="coordinates"
+        Key to ``estimator.inputs_`` with the coordinates DataFrame.
+    voxel_thresh : :obj:`float` or None, optional
+        Cluster-defining summary-statistic threshold.
+        Cluster-level null distributions depend on this threshold, while voxel-level ones do not.
+        If None, the signature only describes the voxel-level null distribution.
+
+    Returns
+    -------
+    signature : :obj:`str`
+        A hash that is identical for Estimators whose Monte Carlo null distributions are
+        exchangeable.
+    """
+    masker = estimator.masker
+    mask_img = masker.mask_img
+    mask_data = np.asarray(mask_img.get_fdata(), dtype=bool)
+
+    kernel = estimator.kernel_transformer
+    kernel_params = {
+        k: v
+        for k, v in kernel.get_params().items()
+        if k not in _IGNORED_KERNEL_PARAMS and "__" not in k
+    }
+
+    coordinates = estimator.inputs_[coords_key]
+    columns = [c for c in _DESIGN_COLUMNS if c in coordinates.columns]
+    design = coordinates.groupby("id")[columns].first() if columns else None
+    n_foci = coordinates.groupby("id").size().rename("n_foci")
+    design = n_foci.to_frame() if design is None else design.join(n_foci)
+    # The null does not depend on experiment order or identity, so sort the rows.
+    design = sorted(tuple(str(v) for v in row) for row in design.itertuples(index=False))
+
+    components = (
+        estimator.__class__.__name__,
+        mask_data.shape,
+        np.packbits(mask_data).tobytes(),
+        np.round(mask_img.affine, 6).tobytes(),
+        kernel.__class__.__name__,
+        sorted((k, str(v)) for k, v in kernel_params.items()),
+        design,
+        None if voxel_thresh is None else float(np.round(voxel_thresh, 10)),
+    )
+    return joblib.hash(components)
+
+
+class MonteCarloNullLibrary(NiMAREBase):
+    """A store of Monte Carlo null distributions keyed by design signature.
+
+    .. versionadded:: 0.5.1
+
+    Null distributions of maximum statistics from a Monte Carlo FWE correction procedure only
+    depend on the design of the meta-analysis (see :func:`get_design_signature`).
+    This library retains those null distributions so that repeated analyses of identical designs
+    (e.g., sensitivity analyses) can reuse them, and so that an existing null distribution can be
+    extended with more iterations instead of being recomputed from scratch.
+
+    Parameters
+    ----------
+    location : :obj:`str` or None, optional
+        Directory in which null distributions are persisted, as one ``.npz`` file per design.
+        If None, null distributions are only retained in memory. Default is None.
+
+    Notes
+    -----
+    Pass the library to a Monte Carlo correction procedure through the
+    :class:`~nimare.correct.FWECorrector`:
+
+    >>> library = MonteCarloNullLibrary("/path/to/nulls")
+    >>> corrector = FWECorrector(method="montecarlo", n_iters=5000, null_library=library)
+    >>> cresult = corrector.transform(result)
+
+    Each entry is a dictionary of 1D arrays with the same length, one per null distribution
+    (e.g., ``"voxel"``, ``"size"``, and ``"mass"``).
+    """
+
+    def __init__(self, location=None):
+        if location is not None:
+            os.makedirs(location, exist_ok=True)
+
+        self.location = location
+        self._nulls = {}
+
+    def _get_filename(self, signature):
+        return op.join(self.location, f"{signature}.npz")
+
+    def __contains__(self, signature):
+        """Check if a null distribution is available for a design signature."""
+        return self.get(signature) is not None
+
+    def get(self, signature):
+        """Load the null distributions for a design signature.
+
+        Parameters
+        ----------
+        signature : :obj:`str`
+            Design signature from :func:`get_design_signature`.
+
+        Returns
+        -------
+        nulls : :obj:`dict` of :obj:`numpy.ndarray` or None
+            The stored null distributions, or None if none are available.
+        """
+        if signature not in self._nulls and self.location is not None:
+            filename = self._get_filename(signature)
+            if op.isfile(filename):
+                with np.load(filename) as data:
+                    self._nulls[signature] = {k: data[k] for k in data.files}
+
+        return self._nulls.get(signature)
+
+    def get_n_iters(self, signature):
+        """Count the Monte Carlo iterations stored for a design signature."""
+        nulls = self.get(signature)
+        if not nulls:
+            return 0
+
+        return min(arr.shape[0] for arr in nulls.values())
+
+    def update(self, signature, nulls):
+        """Extend the stored null distributions for a design signature with new iterations.
+
+        Parameters
+        ----------
+        signature : :obj:`str`
+            Design signature from :func:`get_design_signature`.
+        nulls : :obj:`dict` of array_like
+            New null distribution values, with one array of shape (n_iters,) per null.
+
+        Returns
+        -------
+        nulls : :obj:`dict` of :obj:`numpy.ndarray`
+            The combined (stored and new) null distributions.
+        """
+        nulls = {k: np.asarray(v) for k, v in nulls.items()}
+        stored = self.get(signature)
+        if stored:
+            if set(stored.keys()) != set(nulls.keys()):
+                raise ValueError(
+                    f"Null distributions {sorted(nulls.keys())} do not match the stored ones "
+                    f"({sorted(stored.keys())})."
+                )
+
+            nulls = {k: np.concatenate((stored[k], v)) for k, v in nulls.items()}
+
+        self._nulls[signature] = nulls
+        if self.location is not None:
+            np.savez(self._get_filename(signature), **nulls)
+
+        LGR.debug(f"Stored {self.get_n_iters(signature)} iterations for design {signature}.")
+        return nulls
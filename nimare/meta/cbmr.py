@@ -20,7 +20,14 @@ from nimare import _version
 from nimare.diagnostics import FocusFilter
 from nimare.estimator import Estimator
 from nimare.meta import models
-from nimare.utils import b_spline_bases, dummy_encoding_moderators, get_masker, mm2vox
+from nimare.utils import (
+    _check_ncores,
+    _spline_bases_variance,
+    b_spline_bases,
+    dummy_encoding_moderators,
+    get_masker,
+    mm2vox,
+)
 
 LGR = logging.getLogger(__name__)
 __version__ = _version.get_versions()["version"]
@@ -29,6 +36,11 @@ __version__ = _version.get_versions()["version"]
 class CBMREstimator(Estimator):
     """Coordinate-based meta-regression with a spatial model.
 
+    .. versionchanged:: 0.5.1
+
+        * New parameter: ``n_cores``, to optimize the groups of models without study-level
+          moderators in parallel.
+
     .. versionadded:: 0.1.0
 
     Parameters
@@ -84,6 +96,12 @@ class CBMREstimator(Estimator):
     device: :obj:`string`, optional
         Device type ('cpu' or 'cuda') represents the device on which operations will be allocated
         Default is 'cpu'
+    n_cores : :obj:`int`, optional
+        Number of cores to use for parallelization.
+        This is only used without study-level moderators, when the groups share no coefficients
+        and are optimized separately.
+        If <=0, defaults to using all available cores.
+        Default is 1.
     **kwargs
         Keyword arguments. Arguments for the Estimator can be assigned here,
         Another optional argument is ``mask``.
@@ -124,6 +142,7 @@ class CBMREstimator(Estimator):
         lr_decay=0.999,
         tol=1e-9,
         device="cpu",
+        n_cores=1,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -144,6 +163,7 @@ class CBMREstimator(Estimator):
         self.lr_decay = lr_decay
         self.tol = tol
         self.device = device
+        self.n_cores = _check_ncores(n_cores)
         if self.device == "cuda" and not torch.cuda.is_available():
             LGR.debug("cuda not found, use device cpu")
             self.device = "cpu"
@@ -345,6 +365,12 @@ class CBMREstimator(Estimator):
                         moderators_by_group[group] = group_moderators
                     self.inputs_["moderators_by_group"] = moderators_by_group
 
+                # index of each voxel in the masked data, or -1 outside of the mask
+                mask_data = np.asarray(mask_img.dataobj).astype(bool)
+                n_mask_voxels = np.count_nonzero(mask_data)
+                masked_index = np.full(mask_data.size, -1, dtype=np.int64)
+                masked_index[np.flatnonzero(mask_data)] = np.arange(n_mask_voxels)
+
                 foci_per_voxel, foci_per_study = dict(), dict()
                 for group in self.groups:
                     group_study_id = studies_by_group[group]
@@ -356,14 +382,12 @@ class CBMREstimator(Estimator):
                     # Mask space is assumed to be the same as the Dataset's space
                     group_xyz = group_coordinates[["x", "y", "z"]].values
                     group_ijk = mm2vox(group_xyz, mask_img.affine)
-                    group_foci_per_voxel = np.zeros(mask_img.shape, dtype=np.int32)
-                    for ijk in group_ijk:
-                        group_foci_per_voxel[ijk[0], ijk[1], ijk[2]] += 1
-                    # will not work with maskers that aren't NiftiMaskers
-                    group_foci_per_voxel = nib.Nifti1Image(
-                        group_foci_per_voxel, mask_img.affine, mask_img.header
-                    )
-                    group_foci_per_voxel = masker.transform(group_foci_per_voxel).transpose()
+                    group_masked_ijk = masked_index[
+                        np.ravel_multi_index(group_ijk.T, mask_data.shape)
+                    ]
+                    group_foci_per_voxel = np.bincount(
+                        group_masked_ijk[group_masked_ijk >= 0], minlength=n_mask_voxels
+                    ).reshape((-1, 1))
                     # number of foci per voxel/study
                     # n_group_study = len(group_study_id)
                     group_foci_per_study = group_coordinates.groupby(["study_id"]).size()
@@ -407,6 +431,7 @@ class CBMREstimator(Estimator):
             moderators_by_group,
             self.inputs_["foci_per_voxel"],
             self.inputs_["foci_per_study"],
+            n_cores=self.n_cores,
         )
 
         maps, tables = self.model.summary()
@@ -732,7 +757,14 @@ class CBMRInference(object):
         group comparison test.
         """
         X = self.estimator.inputs_["coef_spline_bases"]
-        n_brain_voxel, spatial_coef_dim = X.shape
+        n_brain_voxel = X.shape[0]
+        moderators_by_group = (
+            self.estimator.inputs_["moderators_by_group"] if self.moderators else None
+        )
+        # The spatial coefficients of different groups are independent, so the covariance of
+        # the coefficients of the involved groups is block diagonal. Each group's block, and the
+        # variance of its log intensity, are computed once and shared by all contrasts.
+        cov_spatial_coef_by_group, var_log_intensity_by_group = dict(), dict()
         con_group_count = 0
         for con_group in self.t_con_groups:
             con_group_involved_index = np.where(np.any(con_group != 0, axis=0))[0].tolist()
@@ -741,17 +773,19 @@ class CBMRInference(object):
             # Simplify contrast matrix by removing irrelevant columns
             simp_con_group = con_group[:, ~np.all(con_group == 0, axis=0)]
             # Covariance of involved group-wise spatial coef (either one or multiple groups)
-            moderators_by_group = (
-                self.estimator.inputs_["moderators_by_group"] if self.moderators else None
-            )
-            f_spatial_coef = self.estimator.model.fisher_info_multiple_group_spatial(
-                con_group_involved,
-                self.estimator.inputs_["coef_spline_bases"],
-                moderators_by_group,
-                self.estimator.inputs_["foci_per_voxel"],
-                self.estimator.inputs_["foci_per_study"],
-            )
-            cov_spatial_coef = np.linalg.inv(f_spatial_coef)
+            for group in con_group_involved:
+                if group not in cov_spatial_coef_by_group:
+                    f_spatial_coef = self.estimator.model.fisher_info_multiple_group_spatial(
+                        [group],
+                        X,
+                        moderators_by_group,
+                        self.estimator.inputs_["foci_per_voxel"],
+                        self.estimator.inputs_["foci_per_study"],
+                    )
+                    cov_spatial_coef_by_group[group] = np.linalg.inv(f_spatial_coef)
+                    var_log_intensity_by_group[group] = _spline_bases_variance(
+                        X, cov_spatial_coef_by_group[group]
+                    )
             # compute numerator: contrast vector * group-wise log spatial intensity
             involved_log_intensity_per_voxel = list()
             for group in con_group_involved:
@@ -777,15 +811,9 @@ class CBMRInference(object):
             # (with multiple contrasts) are conducted
             m, _ = con_group.shape
             if m == 1:  # a single contrast vector, use Wald test
-                var_log_intensity = []
-                for k in range(n_con_group_involved):
-                    cov_spatial_coef_k = cov_spatial_coef[
-                        k * spatial_coef_dim : (k + 1) * spatial_coef_dim,
-                        k * spatial_coef_dim : (k + 1) * spatial_coef_dim,
-                    ]
-                    var_log_intensity_k = np.sum(np.multiply(X @ cov_spatial_coef_k, X), axis=1)
-                    var_log_intensity.append(var_log_intensity_k)
-                var_log_intensity = np.stack(var_log_intensity, axis=0)
+                var_log_intensity = np.stack(
+                    [var_log_intensity_by_group[group] for group in con_group_involved], axis=0
+                )
                 involved_var_log_intensity = simp_con_group**2 @ var_log_intensity
                 involved_std_log_intensity = np.sqrt(involved_var_log_intensity)
                 # Conduct Wald test (Z test)
@@ -797,19 +825,14 @@ class CBMRInference(object):
                         scipy.stats.norm.sf(abs(z_stats_spatial)) * 2
                     )  # shape: (1, n_voxels)
             else:  # GLH tests (with multiple contrasts)
-                cov_log_intensity = np.empty(shape=(0, n_brain_voxel))
-                for k in range(n_con_group_involved):
-                    for s in range(n_con_group_involved):
-                        cov_beta_ks = cov_spatial_coef[
-                            k * spatial_coef_dim : (k + 1) * spatial_coef_dim,
-                            s * spatial_coef_dim : (s + 1) * spatial_coef_dim,
-                        ]
-                        cov_group_log_intensity = (
-                            (X.dot(cov_beta_ks) * X).sum(axis=1).reshape((1, -1))
-                        )
-                        cov_log_intensity = np.concatenate(
-                            (cov_log_intensity, cov_group_log_intensity), axis=0
-                        )  # (m^2, n_voxels)
+                # log intensities of different groups are uncorrelated
+                cov_log_intensity = np.zeros(
+                    (n_con_group_involved, n_con_group_involved, n_brain_voxel)
+                )
+                for k, group in enumerate(con_group_involved):
+                    cov_log_intensity[k, k] = var_log_intensity_by_group[group]
+                # (m^2, n_voxels)
+                cov_log_intensity = cov_log_intensity.reshape((-1, n_brain_voxel))
                 # GLH on log_intensity (eta)
                 chi_sq_spatial = self._chi_square_log_intensity(
                     m,
@@ -883,22 +906,14 @@ class CBMRInference(object):
             Voxel-wise chi-square statistics for GLH tests on group-wise spatial
             intensity estimations.
         """
-        chi_sq_spatial = np.empty(shape=(0,))
-        for j in range(n_brain_voxel):
-            contrast_log_intensity_j = contrast_log_intensity[:, j].reshape(m, 1)
-            v_j = cov_log_intensity[:, j].reshape((n_con_group_involved, n_con_group_involved))
-            cv_jc = simp_con_group @ v_j @ simp_con_group.T
-            cv_jc_inv = np.linalg.inv(cv_jc)
-            chi_sq_spatial_j = contrast_log_intensity_j.T @ cv_jc_inv @ contrast_log_intensity_j
-            chi_sq_spatial = np.concatenate(
-                (
-                    chi_sq_spatial,
-                    chi_sq_spatial_j.reshape(
-                        1,
-                    ),
-                ),
-                axis=0,
-            )
+        # Solve the (m x m) systems of all voxels at once
+        contrast_log_intensity = contrast_log_intensity.T.reshape((n_brain_voxel, m, 1))
+        v = cov_log_intensity.T.reshape(
+            (n_brain_voxel, n_con_group_involved, n_con_group_involved)
+        )
+        cv_c = simp_con_group @ v @ simp_con_group.T
+        cv_c_inv_contrast = np.linalg.solve(cv_c, contrast_log_intensity)
+        chi_sq_spatial = np.sum(contrast_log_intensity * cv_c_inv_contrast, axis=(1, 2))
         return chi_sq_spatial
 
     @_check_fit
@@ -910,23 +925,24 @@ class CBMRInference(object):
         the existence of moderator effects and difference in moderator
         effects across multiple moderator effects.
         """
+        moderators_by_group = (
+            self.estimator.inputs_["moderators_by_group"] if self.moderators else None
+        )
+        # The covariance of moderator coefficients is shared by all contrasts
+        f_moderator_coef = self.estimator.model.fisher_info_multiple_group_moderator(
+            self.estimator.inputs_["coef_spline_bases"],
+            moderators_by_group,
+            self.estimator.inputs_["foci_per_voxel"],
+            self.estimator.inputs_["foci_per_study"],
+        )
+        cov_moderator_coef = np.linalg.inv(f_moderator_coef)
+        moderator_coef = self.result.tables["moderators_regression_coef"].to_numpy().T
+
         con_moderator_count = 0
         for con_moderator in self.t_con_moderators:
             m_con_moderator, _ = con_moderator.shape
-            moderator_coef = self.result.tables["moderators_regression_coef"].to_numpy().T
             contrast_moderator_coef = np.matmul(con_moderator, moderator_coef)
 
-            moderators_by_group = (
-                self.estimator.inputs_["moderators_by_group"] if self.moderators else None
-            )
-            f_moderator_coef = self.estimator.model.fisher_info_multiple_group_moderator(
-                self.estimator.inputs_["coef_spline_bases"],
-                moderators_by_group,
-                self.estimator.inputs_["foci_per_voxel"],
-                self.estimator.inputs_["foci_per_study"],
-            )
-
-            cov_moderator_coef = np.linalg.inv(f_moderator_coef)
             if m_con_moderator == 1:  # a single contrast vector, use Wald test
                 var_moderator_coef = np.diag(cov_moderator_coef)
                 involved_var_moderator_coef = con_moderator**2 @ var_moderator_coef
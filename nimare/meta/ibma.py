@@ -8,7 +8,6 @@ from collections import Counter
 import nibabel as nib
 import numpy as np
 import pandas as pd
-import pymare
 from joblib import Memory
 
 try:
@@ -20,11 +19,11 @@ except ImportError:
 
 from nilearn.image import concat_imgs, resample_to_img
 from nilearn.input_data import NiftiMasker
-from nilearn.mass_univariate import permuted_ols
 
-from nimare import _version
+from nimare import _version, profiling
 from nimare.estimator import Estimator
 from nimare.meta.utils import _apply_liberal_mask
+from nimare.stats import NullDistribution
 from nimare.transforms import d_to_g, p_to_z, t_to_d, t_to_z
 from nimare.utils import _boolean_unmask, _check_ncores, get_masker
 
@@ -35,6 +34,10 @@ __version__ = _version.get_versions()["version"]
 class IBMAEstimator(Estimator):
     """Base class for meta-analysis methods in :mod:`~nimare.meta`.
 
+    .. versionchanged:: 0.5.1
+
+        - New keyword-only parameter: ``precision``.
+
     .. versionchanged:: 0.2.1
 
         - New parameters: ``memory`` and ``memory_level`` for memory caching.
@@ -50,6 +53,12 @@ class IBMAEstimator(Estimator):
         * Generic kwargs and args converted to named kwargs.
           All remaining kwargs are for resampling.
 
+    Parameters
+    ----------
+    precision : {"double", "single"}, optional
+        Precision with which the masked input images are stored in ``inputs_``.
+        "single" stores them in float32, which halves the memory they use, while models are
+        still fit in float64. Default is "double".
     """
 
     def __init__(
@@ -59,9 +68,14 @@ class IBMAEstimator(Estimator):
         memory_level=0,
         *,
         mask=None,
+        precision="double",
         **kwargs,
     ):
+        if precision not in ("double", "single"):
+            raise ValueError('Argument "precision" must be "double" or "single".')
+
         self.aggressive_mask = aggressive_mask
+        self.precision = precision
 
         if mask is not None:
             mask = get_masker(mask, memory=memory, memory_level=memory_level)
@@ -110,21 +124,25 @@ class IBMAEstimator(Estimator):
 
         for name, (type_, _) in self._required_inputs.items():
             if type_ == "image":
-                # Resampling will only occur if shape/affines are different
-                imgs = [
-                    (
-                        nib.load(img)
-                        if check_same_fov(nib.load(img), reference_masker=mask_img)
-                        else resample_to_img(nib.load(img), mask_img, **self._resample_kwargs)
-                    )
-                    for img in self.inputs_[name]
-                ]
+                with profiling.span("load_images", category="io", images=len(self.inputs_[name])):
+                    # Resampling will only occur if shape/affines are different
+                    imgs = [
+                        (
+                            nib.load(img)
+                            if check_same_fov(nib.load(img), reference_masker=mask_img)
+                            else resample_to_img(nib.load(img), mask_img, **self._resample_kwargs)
+                        )
+                        for img in self.inputs_[name]
+                    ]
 
-                # input to NiFtiLabelsMasker must be 4d
-                img4d = concat_imgs(imgs, ensure_ndim=4)
+                    # input to NiFtiLabelsMasker must be 4d
+                    img4d = concat_imgs(imgs, ensure_ndim=4)
 
-                # Mask required input images using either the dataset's mask or the estimator's.
-                temp_arr = masker.transform(img4d)
+                    # Mask required input images using either the dataset's mask or the
+                    # estimator's.
+                    temp_arr = masker.transform(img4d)
+                    if self.precision == "single":
+                        temp_arr = temp_arr.astype(np.float32, copy=False)
 
                 # To save memory, we only save the original image array and perform masking later
                 # in the estimator if self.aggressive_mask is True.
@@ -241,6 +259,10 @@ class Fishers(IBMAEstimator):
 
     def _fit_model(self, stat_maps):
         """Fit the model to the data."""
+        import pymare
+
+        stat_maps = stat_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = stat_maps.shape
 
         pymare_dset = pymare.Dataset(y=stat_maps)
@@ -433,6 +455,10 @@ class Stouffers(IBMAEstimator):
 
     def _fit_model(self, stat_maps, study_mask=None, corr=None):
         """Fit the model to the data."""
+        import pymare
+
+        stat_maps = stat_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = stat_maps.shape
 
         if study_mask is None:
@@ -601,6 +627,11 @@ class WeightedLeastSquares(IBMAEstimator):
 
     def _fit_model(self, beta_maps, varcope_maps):
         """Fit the model to the data."""
+        import pymare
+
+        beta_maps = beta_maps.astype(np.float64, copy=False)
+        varcope_maps = varcope_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = beta_maps.shape
 
         pymare_dset = pymare.Dataset(y=beta_maps, v=varcope_maps)
@@ -743,6 +774,11 @@ class DerSimonianLaird(IBMAEstimator):
 
     def _fit_model(self, beta_maps, varcope_maps):
         """Fit the model to the data."""
+        import pymare
+
+        beta_maps = beta_maps.astype(np.float64, copy=False)
+        varcope_maps = varcope_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = beta_maps.shape
 
         pymare_dset = pymare.Dataset(y=beta_maps, v=varcope_maps)
@@ -893,6 +929,11 @@ class Hedges(IBMAEstimator):
 
     def _fit_model(self, beta_maps, varcope_maps):
         """Fit the model to the data."""
+        import pymare
+
+        beta_maps = beta_maps.astype(np.float64, copy=False)
+        varcope_maps = varcope_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = beta_maps.shape
 
         pymare_dset = pymare.Dataset(y=beta_maps, v=varcope_maps)
@@ -1059,6 +1100,10 @@ class SampleSizeBasedLikelihood(IBMAEstimator):
 
     def _fit_model(self, beta_maps, study_mask=None):
         """Fit the model to the data."""
+        import pymare
+
+        beta_maps = beta_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = beta_maps.shape
 
         if study_mask is None:
@@ -1231,6 +1276,11 @@ class VarianceBasedLikelihood(IBMAEstimator):
 
     def _fit_model(self, beta_maps, varcope_maps):
         """Fit the model to the data."""
+        import pymare
+
+        beta_maps = beta_maps.astype(np.float64, copy=False)
+        varcope_maps = varcope_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = beta_maps.shape
 
         pymare_dset = pymare.Dataset(y=beta_maps, v=varcope_maps)
@@ -1384,13 +1434,17 @@ class PermutedOLS(IBMAEstimator):
 
     def _fit_model(self, beta_maps, n_perm=0):
         """Fit the model to the data."""
+        from nilearn.mass_univariate import permuted_ols
+
+        beta_maps = beta_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = beta_maps.shape
 
         # Use intercept as explanatory variable
         tested_vars = np.ones((n_studies, 1))
         confounding_vars = None
 
-        log_p_map, t_map, _ = permuted_ols(
+        log_p_map, t_map, h0_fmax = permuted_ols(
             tested_vars,
             beta_maps,
             confounding_vars=confounding_vars,
@@ -1408,7 +1462,10 @@ class PermutedOLS(IBMAEstimator):
         z_map = t_to_z(t_map, dof)
         dof_map = np.tile(dof, n_voxels).astype(np.int32)
 
-        return log_p_map.squeeze(), t_map.squeeze(), z_map.squeeze(), dof_map
+        # There is a single regressor, so the max-value null distribution is 1D
+        h0_fmax = np.ravel(h0_fmax)
+
+        return log_p_map.squeeze(), t_map.squeeze(), z_map.squeeze(), dof_map, h0_fmax
 
     def _fit(self, dataset):
         self.dataset = dataset
@@ -1417,9 +1474,9 @@ class PermutedOLS(IBMAEstimator):
             voxel_mask = self.inputs_["aggressive_mask"]
             result_maps = self._fit_model(self.inputs_["beta_maps"][:, voxel_mask])
 
-            # Skip log_p_map
+            # Skip log_p_map and the null distribution
             t_map, z_map, dof_map = tuple(
-                map(lambda x: _boolean_unmask(x, voxel_mask), result_maps[1:])
+                map(lambda x: _boolean_unmask(x, voxel_mask), result_maps[1:4])
             )
         else:
             n_voxels = self.inputs_["beta_maps"].shape[1]
@@ -1433,6 +1490,7 @@ class PermutedOLS(IBMAEstimator):
                     t_map[bag["voxel_mask"]],
                     z_map[bag["voxel_mask"]],
                     dof_map[bag["voxel_mask"]],
+                    _,  # Skip the null distribution
                 ) = self._fit_model(bag["values"])
 
         maps = {"t": t_map, "z": z_map, "dof": dof_map}
@@ -1440,9 +1498,27 @@ class PermutedOLS(IBMAEstimator):
 
         return maps, {}, description
 
-    def correct_fwe_montecarlo(self, result, n_iters=5000, n_cores=1):
+    def _approximate_tail(self, log_p_map, t_map, h0_fmax, tail_approximation):
+        """Replace -log10(p) values in the upper tail of the max-value null with modeled ones."""
+        null = NullDistribution(values=h0_fmax, tail_approximation=tail_approximation)
+        if null.tail_fit_ is None:
+            return log_p_map
+
+        # Two-sided tests compare absolute t-values to the maximum absolute t-values
+        stat_values = np.abs(t_map) if self.two_sided else t_map
+        in_tail = stat_values > null.tail_fit_["threshold"]
+        log_p_map = log_p_map.copy()
+        log_p_map[in_tail] = -np.log10(null.p(stat_values[in_tail]))
+        return log_p_map
+
+    def correct_fwe_montecarlo(self, result, n_iters=5000, n_cores=1, tail_approximation=None):
         """Perform FWE correction using the max-value permutation method.
 
+        .. versionchanged:: 0.5.1
+
+            * New parameter: ``tail_approximation``, to model the upper tail of the null
+              distribution with a generalized Pareto distribution.
+
         .. versionchanged:: 0.0.8
 
             * [FIX] Remove single-dimensional entries of each array of returns (:obj:`dict`).
@@ -1461,6 +1537,13 @@ class PermutedOLS(IBMAEstimator):
         n_cores : :obj:`int`, default=1
             Number of cores to use for parallelization.
             If <=0, defaults to using all available cores. Default is 1.
+        tail_approximation : {None, "gpd"}, optional
+            If "gpd", fit a generalized Pareto distribution to the upper tail of the maximum
+            t-value null distribution, and use it for the FWE-corrected p-values of t-values in
+            that tail, to estimate p-values below ``1 / n_iters``.
+            See :class:`~nimare.stats.NullDistribution` for details. Default is None.
+
+            .. versionadded:: 0.5.1
 
         Returns
         -------
@@ -1486,9 +1569,11 @@ class PermutedOLS(IBMAEstimator):
 
         if self.aggressive_mask:
             voxel_mask = self.inputs_["aggressive_mask"]
-            log_p_map, t_map, _, _ = self._fit_model(
+            log_p_map, t_map, _, _, h0_fmax = self._fit_model(
                 self.inputs_["beta_maps"][:, voxel_mask], n_perm=n_iters
             )
+            if tail_approximation is not None:
+                log_p_map = self._approximate_tail(log_p_map, t_map, h0_fmax, tail_approximation)
 
             # Fill complete maps
             p_map = np.power(10.0, -log_p_map)
@@ -1507,9 +1592,13 @@ class PermutedOLS(IBMAEstimator):
             z_map = np.zeros(n_voxels, dtype=float)
 
             for bag in self.inputs_["data_bags"]["beta_maps"]:
-                log_p_map_tmp, t_map_tmp, _, _ = self._fit_model(
+                log_p_map_tmp, t_map_tmp, _, _, h0_fmax = self._fit_model(
                     self.inputs_["beta_maps"][:, bag["voxel_mask"]], n_perm=n_iters
                 )
+                if tail_approximation is not None:
+                    log_p_map_tmp = self._approximate_tail(
+                        log_p_map_tmp, t_map_tmp, h0_fmax, tail_approximation
+                    )
 
                 # Fill complete maps
                 p_map_tmp = np.power(10.0, -log_p_map_tmp)
@@ -1530,6 +1619,11 @@ class PermutedOLS(IBMAEstimator):
             "max-value permutation method detailed in \\cite{freedman1983nonstochastic}. "
             f"{n_iters} iterations were performed to generate the null distribution."
         )
+        if tail_approximation == "gpd":
+            description += (
+                " The upper tail of the null distribution was modeled with a generalized Pareto "
+                "distribution \\citep{winkler2016faster}."
+            )
 
         return maps, {}, description
 
@@ -1613,6 +1707,10 @@ class FixedEffectsHedges(IBMAEstimator):
 
     def _fit_model(self, t_maps, study_mask=None):
         """Fit the model to the data."""
+        import pymare
+
+        t_maps = t_maps.astype(np.float64, copy=False)
+
         n_studies, n_voxels = t_maps.shape
 
         if study_mask is None:
@@ -13,17 +13,41 @@ import nibabel as nib
 import numpy as np
 import pandas as pd
 from joblib import Memory
+from nilearn.image import resample_to_img
+from scipy import sparse
 
+from nimare import profiling
 from nimare.base import NiMAREBase
-from nimare.meta.utils import compute_ale_ma, compute_kda_ma, get_ale_kernel
-from nimare.utils import _add_metadata_to_dataframe, mm2vox
+from nimare.meta.utils import (
+    _coo_to_csr,
+    _csr_to_coo,
+    compute_ale_ma,
+    compute_kda_ma,
+    get_ale_kernel,
+)
+from nimare.utils import _add_metadata_to_dataframe, get_masker, mm2vox
 
 LGR = logging.getLogger(__name__)
 
 
+def _check_ma_maps(ma_maps, mask_data):
+    """Get MA maps from a kernel's ``_transform`` as an (E x V) CSR matrix of masked values.
+
+    Kernels that still generate 4D sparse arrays in the space of the mask image are converted.
+    """
+    if not sparse.issparse(ma_maps):
+        return _coo_to_csr(ma_maps, mask_data)
+
+    return ma_maps.tocsr()
+
+
 class KernelTransformer(NiMAREBase):
     """Base class for modeled activation-generating methods in :mod:`~nimare.meta.kernel`.
 
+    .. versionchanged:: 0.5.1
+
+        - New parameter: ``precision``, to store MA values with compact data types.
+
     .. versionchanged:: 0.2.1
 
         - Add return_type='summary_array' option to transform method.
@@ -46,6 +70,9 @@ class KernelTransformer(NiMAREBase):
     memory_level : :obj:`int`, default=0
         Rough estimator of the amount of memory used by caching.
         Higher value means more memory for caching. Zero means no caching.
+    precision : {"double", "single"}, default="double"
+        Precision with which MA values are stored. With "single", subclasses store MA values
+        in a compact data type, while statistics computed from them are accumulated in float64.
 
     Notes
     -----
@@ -54,9 +81,18 @@ class KernelTransformer(NiMAREBase):
     apply them to datasets with missing data.
     """
 
-    def __init__(self, memory=Memory(location=None, verbose=0), memory_level=0):
+    def __init__(
+        self,
+        memory=Memory(location=None, verbose=0),
+        memory_level=0,
+        precision="double",
+    ):
+        if precision not in ("double", "single"):
+            raise ValueError('Argument "precision" must be "double" or "single".')
+
         self.memory = memory
         self.memory_level = memory_level
+        self.precision = precision
 
     def _infer_names(self, **kwargs):
         """Determine filename pattern and image type.
@@ -93,6 +129,11 @@ class KernelTransformer(NiMAREBase):
     def transform(self, dataset, masker=None, return_type="image"):
         """Generate modeled activation images for each Contrast in dataset.
 
+        .. versionchanged:: 0.5.1
+
+            - Add return_type='csr' option. MA maps are generated in this masked format,
+              and converted to the other formats as needed.
+
         Parameters
         ----------
         dataset : :obj:`~nimare.dataset.Dataset` or :obj:`pandas.DataFrame`
@@ -101,9 +142,9 @@ class KernelTransformer(NiMAREBase):
             Mask to apply to MA maps. Required if ``dataset`` is a DataFrame.
             If None (and ``dataset`` is a Dataset), the Dataset's masker attribute will be used.
             Default is None.
-        return_type : {'sparse', 'array', 'image', 'summary_array'}, optional
-            Whether to return a sparse matrix ('sparse'), a numpy array ('array'),
-            or a list of niimgs ('image').
+        return_type : {'sparse', 'csr', 'array', 'image', 'summary_array'}, optional
+            Whether to return a sparse matrix ('sparse'), a masked sparse matrix ('csr'),
+            a numpy array ('array'), or a list of niimgs ('image').
             Default is 'image'.
 
         Returns
@@ -113,6 +154,8 @@ class KernelTransformer(NiMAREBase):
             If return_type is 'sparse', a 4D sparse array (E x S), where E is
             the number of unique experiments, and the remaining 3 dimensions are
             equal to `shape` of the images.
+            If return_type is 'csr', a 2D :obj:`scipy.sparse.csr_matrix` (E x V), where V is
+            the number of voxels in the mask.
             If return_type is 'array', a 2D numpy array (C x V), where C is
             contrast and V is voxel.
             If return_type is 'summary_array', a 1D numpy array (V,) containing
@@ -128,11 +171,164 @@ class KernelTransformer(NiMAREBase):
             Name of the corresponding column in the Dataset.images DataFrame.
             If :meth:`_infer_names` is executed.
         """
-        if return_type not in ("sparse", "array", "image", "summary_array"):
+        if return_type not in ("sparse", "csr", "array", "image", "summary_array"):
             raise ValueError(
-                'Argument "return_type" must be "image", "array", "summary_array", "sparse".'
+                'Argument "return_type" must be "image", "array", "summary_array", "sparse", '
+                '"csr".'
+            )
+
+        mask, coordinates = self._prepare_coordinates(dataset, masker)
+
+        # Generate the MA maps
+        args = (mask, coordinates, "summary_array" if return_type == "summary_array" else "csr")
+
+        with profiling.span(f"{self.__class__.__name__}.transform", category="kernel"):
+            transform = self._cache(self._transform, func_memory_level=2)
+            if profiling.get_profiler() is not None:
+                # Only cached MA maps are reused, so check the cache before calling
+                cached = getattr(transform, "check_call_in_cache", lambda *args: False)(*args)
+                n_exps = len(np.unique(coordinates["id"].values))
+                profiling.count("ma_maps_cached" if cached else "ma_maps", n_exps)
+
+            transformed_maps, exp_ids = transform(*args)
+
+        if return_type == "summary_array":
+            return transformed_maps
+
+        mask_data = mask.get_fdata().astype(bool)
+        transformed_maps = _check_ma_maps(transformed_maps, mask_data)
+
+        if return_type == "csr":
+            return transformed_maps
+        elif return_type == "sparse":
+            return _csr_to_coo(transformed_maps, mask_data)
+        elif return_type == "array":
+            return transformed_maps.toarray()
+
+        imgs = []
+        for i_exp, _ in enumerate(exp_ids):
+            kernel_data = np.zeros(mask_data.shape, dtype=transformed_maps.dtype)
+            kernel_data[mask_data] = transformed_maps[i_exp].toarray().ravel()
+            img = nib.Nifti1Image(kernel_data, mask.affine, dtype=kernel_data.dtype)
+            imgs.append(img)
+
+        return imgs
+
+    def transform_roi(self, dataset, masker=None, roi=None, summary="mean"):
+        """Summarize each Contrast's modeled activation within a region of interest.
+
+        .. versionadded:: 0.5.1
+
+        Only voxels inside the region of interest are evaluated, and the summary is computed
+        directly from the sparse MA maps, so whole-brain MA maps are never densified.
+
+        Parameters
+        ----------
+        dataset : :obj:`~nimare.dataset.Dataset` or :obj:`pandas.DataFrame`
+            Dataset for which to summarize MA maps. Can be a DataFrame if necessary.
+        masker : img_like or None, optional
+            Mask to apply to MA maps. Required if ``dataset`` is a DataFrame.
+            If None (and ``dataset`` is a Dataset), the Dataset's masker attribute will be used.
+            Default is None.
+        roi : img_like, nilearn Masker, or None, optional
+            Region of interest. The summary is computed over voxels in both the mask and the
+            region of interest. If the region of interest is not on the mask's grid, it is
+            resampled to the mask with nearest-neighbor interpolation.
+            If None, the whole mask is used.
+            Default is None.
+        summary : {'mean', 'sum'}, optional
+            Summary of the MA values within the region of interest. Default is 'mean'.
+
+        Returns
+        -------
+        roi_values : (C,) :class:`numpy.ndarray`
+            Summary of the MA values within the region of interest for each Contrast with
+            coordinates, ordered by Contrast ID. Contrasts without any coordinates are omitted,
+            matching the rows returned by :meth:`transform`.
+        """
+        if summary not in ("mean", "sum"):
+            raise ValueError('Argument "summary" must be "mean" or "sum".')
+
+        mask, coordinates = self._prepare_coordinates(dataset, masker)
+        exp_ids = np.unique(coordinates["id"].values)
+
+        mask_data = mask.get_fdata().astype(bool)
+        if roi is not None:
+            roi_img = get_masker(roi).mask_img
+            if roi_img.shape != mask.shape or not np.allclose(roi_img.affine, mask.affine):
+                roi_img = resample_to_img(roi_img, mask, interpolation="nearest")
+            mask_data &= np.asarray(roi_img.dataobj).astype(bool)
+            mask = nib.Nifti1Image(mask_data.astype(np.int32), mask.affine, header=mask.header)
+
+        roi_values = np.zeros(len(exp_ids))
+        n_voxels = mask_data.sum()
+        if n_voxels == 0:
+            LGR.warning("No voxels in region of interest.")
+            return roi_values
+
+        # Drop foci that are too far from the region of interest to contribute to it
+        extent = self._get_kernel_extent(mask)
+        if extent is not None:
+            roi_ijks = np.vstack(np.where(mask_data)).T
+            ijks = coordinates[["i", "j", "k"]].values
+            near_roi = np.all(
+                (ijks >= roi_ijks.min(axis=0) - extent) & (ijks <= roi_ijks.max(axis=0) + extent),
+                axis=1,
             )
+            coordinates = coordinates.loc[near_roi]
 
+        if coordinates.shape[0]:
+            transformed, roi_exp_ids = self._cache(self._transform, func_memory_level=2)(
+                mask, coordinates, "csr"
+            )
+            transformed = _check_ma_maps(transformed, mask_data)
+            roi_values[np.searchsorted(exp_ids, roi_exp_ids)] = np.asarray(
+                transformed.sum(axis=1)
+            ).ravel()
+
+        if summary == "mean":
+            roi_values /= n_voxels
+
+        return roi_values
+
+    def _get_kernel_extent(self, mask):
+        """Get the maximum distance, in voxels, of a kernel's nonzero values from its focus.
+
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        mask : niimg-like
+            Mask image, used to determine voxel sizes.
+
+        Returns
+        -------
+        extent : (3,) :class:`numpy.ndarray` or None
+            Extent of the kernel along each axis. None if the extent is not known in advance.
+        """
+        return None
+
+    def _prepare_coordinates(self, dataset, masker=None):
+        """Get the mask and the coordinates, with voxel indices and any required metadata.
+
+        .. versionadded:: 0.5.1
+
+        Parameters
+        ----------
+        dataset : :obj:`~nimare.dataset.Dataset` or :obj:`pandas.DataFrame`
+            Dataset for which to make images. Can be a DataFrame if necessary.
+        masker : img_like or None, optional
+            Mask to apply to MA maps. Required if ``dataset`` is a DataFrame.
+            If None (and ``dataset`` is a Dataset), the Dataset's masker attribute will be used.
+            Default is None.
+
+        Returns
+        -------
+        mask : :obj:`nibabel.nifti1.Nifti1Image`
+            Mask image.
+        coordinates : :obj:`pandas.DataFrame`
+            Coordinates, with "i", "j", and "k" columns.
+        """
         if isinstance(dataset, pd.DataFrame):
             assert (
                 masker is not None
@@ -171,45 +367,14 @@ class KernelTransformer(NiMAREBase):
                     filter_func=np.mean,
                 )
 
-        if return_type == "array":
-            mask_data = mask.get_fdata().astype(bool)
-        elif return_type == "image":
-            dtype = type(self.value) if hasattr(self, "value") else float
-            mask_data = mask.get_fdata().astype(dtype)
+        return mask, coordinates
 
-        # Generate the MA maps
-        if return_type == "summary_array" or return_type == "sparse":
-            args = (mask, coordinates, return_type)
-        else:
-            args = (mask, coordinates)
-
-        transformed_maps = self._cache(self._transform, func_memory_level=2)(*args)
+    def _transform(self, mask, coordinates, return_type="csr"):
+        """Apply the kernel's unique transformer.
 
-        if return_type == "sparse" or return_type == "summary_array":
-            return transformed_maps[0]
+        .. versionchanged:: 0.5.1
 
-        imgs = []
-        # Loop over exp ids since sparse._coo.core.COO is not iterable
-        for i_exp, _ in enumerate(transformed_maps[1]):
-            kernel_data = transformed_maps[0][i_exp].todense()
-
-            if return_type == "array":
-                img = kernel_data[mask_data]
-                imgs.append(img)
-            elif return_type == "image":
-                kernel_data *= mask_data
-                img = nib.Nifti1Image(kernel_data, mask.affine, dtype=kernel_data.dtype)
-                imgs.append(img)
-
-        del kernel_data, transformed_maps
-
-        if return_type == "array":
-            return np.vstack(imgs)
-        elif return_type == "image":
-            return imgs
-
-    def _transform(self, mask, coordinates, return_type="sparse"):
-        """Apply the kernel's unique transformer.
+            - Return masked MA maps as a 2D CSR matrix, instead of a 4D sparse array.
 
         Parameters
         ----------
@@ -220,26 +385,23 @@ class KernelTransformer(NiMAREBase):
             The DataFrame must have the following columns: "id", "i", "j", "k".
             Additionally, individual kernels may require other columns
             (e.g., "sample_size" for ALE).
-        return_type : {'sparse', 'summary_array'}, optional
-            Whether to return a 4D sparse matrix ('sparse') where each contrast map is
+        return_type : {'csr', 'summary_array'}, optional
+            Whether to return a 2D sparse matrix ('csr') where each contrast map is
             saved separately or a 1D numpy array ('summary_array') where the contrast maps
             are combined.
-            Default is 'sparse'.
+            Default is 'csr'.
 
         Returns
         -------
-        transformed_maps : N-length list of (3D array, str) tuples or (4D array, 1D array) tuple
-            Transformed data, containing one element for each study.
+        transformed_maps : (2D sparse matrix or 1D array, 1D array) tuple
+            Transformed data and a numpy array of shape (N,) with the study IDs.
 
-            -   Case 1: A kernel that is not an (M)KDAKernel
-                Each list entry is composed of a 3D array (the MA map) and the study's ID.
+            -   Case 1: return_type='csr'
+                The transformed data is a :obj:`scipy.sparse.csr_matrix` of shape (N, V),
+                containing the MA values of the N studies in the V voxels of the mask.
 
-            -   Case 2: (M)KDAKernel
-                There is a length-2 tuple with a 4D numpy array of the shape (N, X, Y, Z),
-                containing all of the MA maps, and a numpy array of shape (N,) with the study IDs.
-
-            -  Case 3: A kernel with return_type='summary_array'.
-                The transformed data is a 1D numpy array of shape (X, Y, Z) containing the
+            -   Case 2: A kernel with return_type='summary_array'.
+                The transformed data is a 1D numpy array of shape (V,) containing the
                 summary measure for each voxel.
         """
         pass
@@ -252,6 +414,10 @@ class ALEKernel(KernelTransformer):
     will be determined on a study-wise basis based on the sample sizes available in the input,
     via the method described in :footcite:t:`eickhoff2012activation`.
 
+    .. versionchanged:: 0.5.1
+
+        - New parameter: ``precision``.
+
     .. versionchanged:: 0.2.1
 
         - New parameters: ``memory`` and ``memory_level`` for memory caching.
@@ -281,6 +447,9 @@ class ALEKernel(KernelTransformer):
     memory_level : :obj:`int`, default=0
         Rough estimator of the amount of memory used by caching.
         Higher value means more memory for caching. Zero means no caching.
+    precision : {"double", "single"}, default="double"
+        Precision with which MA values are stored. With "single", MA values are stored as
+        float32.
 
     References
     ----------
@@ -293,14 +462,15 @@ class ALEKernel(KernelTransformer):
         sample_size=None,
         memory=Memory(location=None, verbose=0),
         memory_level=0,
+        precision="double",
     ):
         if fwhm is not None and sample_size is not None:
             raise ValueError('Only one of "fwhm" and "sample_size" may be provided.')
         self.fwhm = fwhm
         self.sample_size = sample_size
-        super().__init__(memory=memory, memory_level=memory_level)
+        super().__init__(memory=memory, memory_level=memory_level, precision=precision)
 
-    def _transform(self, mask, coordinates, return_type="sparse"):
+    def _transform(self, mask, coordinates, return_type="csr"):
         ijks = coordinates[["i", "j", "k"]].values
         exp_idx = coordinates["id"].values
 
@@ -326,6 +496,8 @@ class ALEKernel(KernelTransformer):
             exp_idx=exp_idx,
             sample_sizes=sample_sizes,
             use_dict=use_dict,
+            dtype=np.float32 if self.precision == "single" else np.float64,
+            return_type="csr",
         )
 
         exp_ids = np.unique(exp_idx)
@@ -367,6 +539,10 @@ class ALEKernel(KernelTransformer):
 class KDAKernel(KernelTransformer):
     """Generate KDA modeled activation images from coordinates.
 
+    .. versionchanged:: 0.5.1
+
+        - New parameter: ``precision``.
+
     .. versionchanged:: 0.2.1
 
         - Add new parameter ``return_type`` to transform method.
@@ -395,6 +571,10 @@ class KDAKernel(KernelTransformer):
     memory_level : :obj:`int`, default=0
         Rough estimator of the amount of memory used by caching.
         Higher value means more memory for caching. Zero means no caching.
+    precision : {"double", "single"}, default="double"
+        Precision with which MA values are stored. With "single", MA values, which are sums of
+        overlapping spheres, are stored in the smallest unsigned integer type that holds the
+        largest possible sum (or as float32 if ``value`` is not an integer).
     """
 
     _sum_overlap = True
@@ -405,21 +585,34 @@ class KDAKernel(KernelTransformer):
         value=1,
         memory=Memory(location=None, verbose=0),
         memory_level=0,
+        precision="double",
     ):
         self.r = float(r)
         self.value = value
-        super().__init__(memory=memory, memory_level=memory_level)
+        super().__init__(memory=memory, memory_level=memory_level, precision=precision)
 
-    def _transform(self, mask, coordinates, return_type="sparse"):
-        """Return type can either be sparse or summary_array."""
+    def _transform(self, mask, coordinates, return_type="csr"):
+        """Return type can either be csr or summary_array."""
         ijks = coordinates[["i", "j", "k"]].values
         exp_idx = coordinates["id"].values
-        if return_type == "sparse":
+        if return_type == "csr":
             sum_across_studies = False
         elif return_type == "summary_array":
             sum_across_studies = True
         else:
-            raise ValueError('Argument "return_type" must be "sparse" or "summary_array".')
+            raise ValueError('Argument "return_type" must be "csr" or "summary_array".')
+
+        dtype = None
+        if self.precision == "single":
+            # Overlapping spheres from the same study may be summed
+            max_value = self.value
+            if self._sum_overlap:
+                max_value *= np.unique(exp_idx, return_counts=True)[1].max()
+
+            if float(max_value).is_integer():
+                dtype = np.min_scalar_type(int(max_value))
+            else:
+                dtype = np.float32
 
         transformed = compute_kda_ma(
             mask,
@@ -429,10 +622,16 @@ class KDAKernel(KernelTransformer):
             exp_idx,
             sum_overlap=self._sum_overlap,
             sum_across_studies=sum_across_studies,
+            dtype=dtype,
+            return_type="csr",
         )
         exp_ids = np.unique(exp_idx)
         return transformed, exp_ids
 
+    def _get_kernel_extent(self, mask):
+        vox_dims = np.array(mask.header.get_zooms()[:3])
+        return np.ceil(self.r / vox_dims).astype(int)
+
     def _generate_description(self):
         """Generate a description of the fitted KernelTransformer.
 
@@ -454,6 +653,10 @@ class KDAKernel(KernelTransformer):
 class MKDAKernel(KDAKernel):
     """Generate MKDA modeled activation images from coordinates.
 
+    .. versionchanged:: 0.5.1
+
+        - New parameter: ``precision``.
+
     .. versionchanged:: 0.2.1
 
         - New parameters: ``memory`` and ``memory_level`` for memory caching.
@@ -479,6 +682,10 @@ class MKDAKernel(KDAKernel):
     memory_level : :obj:`int`, default=0
         Rough estimator of the amount of memory used by caching.
         Higher value means more memory for caching. Zero means no caching.
+    precision : {"double", "single"}, default="double"
+        Precision with which MA values are stored. With "single", the binary MA values are
+        stored in the smallest unsigned integer type that holds ``value`` (or as float32 if
+        ``value`` is not an integer).
     """
 
     _sum_overlap = False
@@ -5,6 +5,12 @@ import logging
 
 import numpy as np
 import pandas as pd
+import scipy.linalg
+import scipy.sparse
+from joblib import Parallel, delayed
+from scipy import special
+
+from nimare.utils import _spline_bases_variance
 
 try:
     import torch
@@ -16,6 +22,39 @@ except ImportError as e:
 LGR = logging.getLogger(__name__)
 
 
+def _spline_bases_matmul(coef_spline_bases, coef):
+    """Multiply a dense or sparse B-spline design matrix by regression coefficients."""
+    if coef_spline_bases.is_sparse:
+        return torch.sparse.mm(coef_spline_bases, coef)
+
+    return torch.matmul(coef_spline_bases, coef)
+
+
+def _weighted_gram(design, weights):
+    """Compute ``design.T @ diag(weights) @ design`` for a dense or sparse design matrix."""
+    if scipy.sparse.issparse(design):
+        return (design.T @ design.multiply(weights[:, None])).toarray()
+
+    design = np.asarray(design)
+    return (design * weights[:, None]).T @ design
+
+
+def _group_key(group):
+    """Return the key of a group in the model's torch containers.
+
+    Torch module and parameter names cannot contain ".", which may appear in group names.
+    """
+    return group.replace("%", "%25").replace(".", "%2E")
+
+
+def _optimize_group_model(group_model, coef_spline_bases, foci_per_voxel, foci_per_study):
+    """Optimize a single-group model, for use in parallel workers."""
+    group_model._optimizer(coef_spline_bases, None, foci_per_voxel, foci_per_study)
+    # Do not send the design tensor back to the parent process
+    group_model._spline_bases_cache = None
+    return group_model
+
+
 class GeneralLinearModelEstimator(torch.nn.Module):
     """Base class for GLM estimators.
 
@@ -44,6 +83,9 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         "vectorize": True,
         "outer_jacobian_strategy": "forward-mode",
     }
+    # torch.func transforms and forward-mode AD do not support sparse tensors,
+    # so sparse designs are differentiated with one backward pass per coefficient
+    _sparse_hessian_kwargs = {"create_graph": False, "vectorize": False}
 
     def __init__(
         self,
@@ -124,7 +166,7 @@ class GeneralLinearModelEstimator(torch.nn.Module):
                 self.spatial_coef_dim, 1, bias=False
             ).double()
             torch.nn.init.uniform_(spatial_coef_linear_group.weight, a=-0.01, b=0.01)
-            spatial_coef_linears[group] = spatial_coef_linear_group
+            spatial_coef_linears[_group_key(group)] = spatial_coef_linear_group
         self.spatial_coef_linears = torch.nn.ModuleDict(spatial_coef_linears)
 
     def init_moderator_weights(self):
@@ -206,6 +248,58 @@ class GeneralLinearModelEstimator(torch.nn.Module):
 
         return loss
 
+    def _spline_bases_tensor(self, coef_spline_bases):
+        """Load the B-spline design matrix into a tensor.
+
+        Sparse design matrices are loaded into sparse COO tensors.
+        The tensor for the most recent design matrix is kept, so the optimizer, standard error
+        estimation and Fisher information calls on the same matrix only convert it once.
+        """
+        if isinstance(coef_spline_bases, torch.Tensor):
+            return coef_spline_bases
+
+        cached = getattr(self, "_spline_bases_cache", None)
+        if cached is not None and cached[0] is coef_spline_bases:
+            return cached[1]
+
+        if scipy.sparse.issparse(coef_spline_bases):
+            coef_spline_bases_coo = coef_spline_bases.tocoo()
+            indices = np.vstack((coef_spline_bases_coo.row, coef_spline_bases_coo.col))
+            coef_spline_bases_tensor = torch.sparse_coo_tensor(
+                torch.tensor(indices, dtype=torch.int64, device=self.device),
+                torch.tensor(coef_spline_bases_coo.data, dtype=torch.float64, device=self.device),
+                size=coef_spline_bases_coo.shape,
+            ).coalesce()
+        else:
+            coef_spline_bases_tensor = torch.tensor(
+                coef_spline_bases, dtype=torch.float64, device=self.device
+            )
+
+        self._spline_bases_cache = (coef_spline_bases, coef_spline_bases_tensor)
+        return coef_spline_bases_tensor
+
+    def _hessian(self, func, inputs, coef_spline_bases):
+        """Compute the Hessian of a function of regression coefficients.
+
+        Parameters
+        ----------
+        func : callable
+            Function of ``inputs`` that returns a scalar tensor.
+        inputs : :obj:`torch.Tensor`
+            Regression coefficients.
+        coef_spline_bases : :obj:`torch.Tensor`
+            B-spline design matrix used by ``func``, which may be sparse.
+
+        Returns
+        -------
+        torch.Tensor
+            Hessian of ``func`` at ``inputs``.
+        """
+        if coef_spline_bases.is_sparse:
+            return torch.autograd.functional.hessian(func, inputs, **self._sparse_hessian_kwargs)
+
+        return torch.func.hessian(func)(inputs)
+
     def _optimizer(self, coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study):
         """
         Optimize the loss (negative log-likelihood) function with L-BFGS.
@@ -230,9 +324,7 @@ class GeneralLinearModelEstimator(torch.nn.Module):
             line_search_fn="strong_wolfe",
         )
         # load dataset info to torch.tensor
-        coef_spline_bases = torch.tensor(
-            coef_spline_bases, dtype=torch.float64, device=self.device
-        )
+        coef_spline_bases = self._spline_bases_tensor(coef_spline_bases)
         if moderators_by_group:
             moderators_by_group_tensor = dict()
             for group in self.groups:
@@ -267,9 +359,55 @@ class GeneralLinearModelEstimator(torch.nn.Module):
 
         return
 
-    def fit(self, coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study):
-        """Fit the model and estimate standard error of estimates."""
-        self._optimizer(coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study)
+    def _group_model(self, group):
+        """Create a copy of the model for a single group, with the same initial weights."""
+        group_model = type(self)(
+            spatial_coef_dim=self.spatial_coef_dim,
+            moderators_coef_dim=None,
+            penalty=self.penalty,
+            lr=self.lr,
+            lr_decay=self.lr_decay,
+            n_iter=self.n_iter,
+            tol=self.tol,
+            device=self.device,
+        )
+        group_model.init_weights([group], None, self.spatial_coef_dim, None)
+        state_dict = self.state_dict()
+        group_model.load_state_dict({name: state_dict[name] for name in group_model.state_dict()})
+        return group_model
+
+    def _optimizer_by_group(self, coef_spline_bases, foci_per_voxel, foci_per_study, n_cores):
+        """Optimize the spatial model of each group separately, in parallel.
+
+        Without study-level moderators, the groups share no coefficients and the loss is a sum
+        of group-wise losses, so each group can be optimized on its own.
+        """
+        group_models = Parallel(n_jobs=n_cores)(
+            delayed(_optimize_group_model)(
+                self._group_model(group),
+                coef_spline_bases,
+                {group: foci_per_voxel[group]},
+                {group: foci_per_study[group]},
+            )
+            for group in self.groups
+        )
+        for group_model in group_models:
+            self.load_state_dict(group_model.state_dict(), strict=False)
+
+    def fit(
+        self, coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study, n_cores=1
+    ):
+        """Fit the model and estimate standard error of estimates.
+
+        .. versionchanged:: 0.5.1
+
+            New parameter: ``n_cores``. Without study-level moderators, groups are optimized
+            separately, in parallel, if ``n_cores`` is greater than 1.
+        """
+        if n_cores > 1 and not self.moderators_coef_dim and len(self.groups) > 1:
+            self._optimizer_by_group(coef_spline_bases, foci_per_voxel, foci_per_study, n_cores)
+        else:
+            self._optimizer(coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study)
         self.extract_optimized_params(coef_spline_bases, moderators_by_group)
         self.standard_error_estimation(
             coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study
@@ -282,14 +420,14 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         spatial_regression_coef, spatial_intensity_estimation = dict(), dict()
         for group in self.groups:
             # Extract optimized spatial regression coefficients from the model
-            group_spatial_coef_linear_weight = self.spatial_coef_linears[group].weight
+            group_spatial_coef_linear_weight = self.spatial_coef_linears[_group_key(group)].weight
             group_spatial_coef_linear_weight = (
                 group_spatial_coef_linear_weight.cpu().detach().numpy().flatten()
             )
             spatial_regression_coef[group] = group_spatial_coef_linear_weight
             # Estimate group-specific spatial intensity
             group_spatial_intensity_estimation = np.exp(
-                np.matmul(coef_spline_bases, group_spatial_coef_linear_weight)
+                coef_spline_bases @ group_spatial_coef_linear_weight
             )
             spatial_intensity_estimation["spatialIntensity_group-" + group] = (
                 group_spatial_intensity_estimation
@@ -312,6 +450,128 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         self.moderators_coef = moderators_coef
         self.moderators_effect = moderators_effect
 
+    def _fisher_info_spatial(
+        self,
+        coef_spline_bases,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        """Compute the Fisher information of a group's spatial regression coefficients.
+
+        Models with a closed-form Fisher information override this method. Otherwise, it returns
+        None and the negative Hessian of the log-likelihood is computed with autograd.
+
+        Parameters
+        ----------
+        coef_spline_bases : :obj:`numpy.ndarray` or :obj:`scipy.sparse.spmatrix`
+            Coefficient of B-spline bases evaluated at each voxel.
+        mu_spatial : :obj:`numpy.ndarray`
+            Spatial intensity at each voxel.
+        mu_moderators : :obj:`numpy.ndarray`
+            Moderator effect of each study.
+        group_foci_per_voxel : :obj:`numpy.ndarray`
+            Number of foci per voxel.
+        group_foci_per_study : :obj:`numpy.ndarray`
+            Number of foci per study.
+        group_overdispersion : :obj:`float`, optional
+            Overdispersion parameter of the group. Default is None.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            Fisher information matrix of the spatial regression coefficients.
+        """
+        return None
+
+    def _fisher_info_moderators(
+        self,
+        group_moderators,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        """Compute a group's contribution to the Fisher information of moderator coefficients.
+
+        Models with a closed-form Fisher information override this method. Otherwise, it returns
+        None and the negative Hessian of the log-likelihood is computed with autograd.
+        The parameters are the same as for :meth:`_fisher_info_spatial`, except that
+        ``group_moderators`` (the study-level moderators of the group) replaces
+        ``coef_spline_bases``.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            Fisher information matrix of the moderator regression coefficients.
+        """
+        return None
+
+    def _fisher_info_kwargs(
+        self,
+        group,
+        coef_spline_bases,
+        moderators_by_group,
+        foci_per_voxel,
+        foci_per_study,
+        moderators_coef,
+    ):
+        """Collect the current estimates of a group for the closed-form Fisher information."""
+        group_spatial_coef = (
+            self.spatial_coef_linears[_group_key(group)].weight.detach().cpu().numpy()
+        )
+        mu_spatial = np.exp(coef_spline_bases @ group_spatial_coef.ravel())
+        group_foci_per_study = np.asarray(foci_per_study[group]).ravel()
+        if moderators_coef is not None:
+            mu_moderators = np.exp(moderators_by_group[group] @ np.ravel(moderators_coef))
+        else:
+            mu_moderators = np.ones(group_foci_per_study.shape[0])
+
+        fisher_info_kwargs = {
+            "mu_spatial": mu_spatial,
+            "mu_moderators": mu_moderators,
+            "group_foci_per_voxel": np.asarray(foci_per_voxel[group]).ravel(),
+            "group_foci_per_study": group_foci_per_study,
+        }
+        if hasattr(self, "overdispersion"):
+            fisher_info_kwargs["group_overdispersion"] = float(
+                self.overdispersion[_group_key(group)]
+            )
+
+        return fisher_info_kwargs
+
+    def _single_group_ll_kwargs(
+        self, group, coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study
+    ):
+        """Load a group's inputs to `_log_likelihood_single_group` into tensors."""
+        if self.moderators_coef_dim:
+            group_moderators = torch.tensor(
+                moderators_by_group[group], dtype=torch.float64, device=self.device
+            )
+            moderators_coef = self.moderators_linear.weight
+        else:
+            group_moderators, moderators_coef = None, None
+
+        ll_single_group_kwargs = {
+            "moderators_coef": moderators_coef,
+            "coef_spline_bases": self._spline_bases_tensor(coef_spline_bases),
+            "group_moderators": group_moderators,
+            "group_foci_per_voxel": torch.tensor(
+                foci_per_voxel[group], dtype=torch.float64, device=self.device
+            ),
+            "group_foci_per_study": torch.tensor(
+                foci_per_study[group], dtype=torch.float64, device=self.device
+            ),
+            "device": self.device,
+        }
+        if hasattr(self, "overdispersion"):
+            ll_single_group_kwargs["group_overdispersion"] = self.overdispersion[_group_key(group)]
+
+        return ll_single_group_kwargs
+
     def standard_error_estimation(
         self, coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study
     ):
@@ -321,88 +581,97 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         Information Matrix and then take the square root of the diagonal elements.
         For log spatial intensity, we use the delta method to estimate its standard error.
         For models with over-dispersion parameter, we also estimate its standard error.
+
+        .. versionchanged:: 0.5.1
+
+            Use the closed-form Fisher information of the model, if it has one, instead of
+            the autograd Hessian of the log-likelihood.
         """
         spatial_regression_coef_se, log_spatial_intensity_se, spatial_intensity_se = (
             dict(),
             dict(),
             dict(),
         )
+        moderators_coef_estimate = (
+            self.moderators_linear.weight.detach().cpu().numpy()
+            if self.moderators_coef_dim
+            else None
+        )
         for group in self.groups:
-            group_foci_per_voxel = torch.tensor(
-                foci_per_voxel[group], dtype=torch.float64, device=self.device
-            )
-            group_foci_per_study = torch.tensor(
-                foci_per_study[group], dtype=torch.float64, device=self.device
+            fisher_info_kwargs = self._fisher_info_kwargs(
+                group,
+                coef_spline_bases,
+                moderators_by_group,
+                foci_per_voxel,
+                foci_per_study,
+                moderators_coef_estimate,
             )
-            group_spatial_coef = self.spatial_coef_linears[group].weight
-            if self.moderators_coef_dim:
-                group_moderators = torch.tensor(
-                    moderators_by_group[group], dtype=torch.float64, device=self.device
+            f_spatial_coef = self._fisher_info_spatial(coef_spline_bases, **fisher_info_kwargs)
+            if f_spatial_coef is None:
+                ll_single_group_kwargs = self._single_group_ll_kwargs(
+                    group, coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study
                 )
-                moderators_coef = self.moderators_linear.weight
-            else:
-                group_moderators, moderators_coef = None, None
-
-            ll_single_group_kwargs = {
-                "moderators_coef": moderators_coef if self.moderators_coef_dim else None,
-                "coef_spline_bases": torch.tensor(
-                    coef_spline_bases, dtype=torch.float64, device=self.device
-                ),
-                "group_moderators": group_moderators if self.moderators_coef_dim else None,
-                "group_foci_per_voxel": group_foci_per_voxel,
-                "group_foci_per_study": group_foci_per_study,
-                "device": self.device,
-            }
-
-            if hasattr(self, "overdispersion"):
-                ll_single_group_kwargs["group_overdispersion"] = self.overdispersion[group]
 
-            # create a negative log-likelihood function
-            def nll_spatial_coef(group_spatial_coef):
-                return -self._log_likelihood_single_group(
-                    group_spatial_coef=group_spatial_coef,
-                    **ll_single_group_kwargs,
+                # create a negative log-likelihood function
+                def nll_spatial_coef(group_spatial_coef):
+                    return -self._log_likelihood_single_group(
+                        group_spatial_coef=group_spatial_coef,
+                        **ll_single_group_kwargs,
+                    )
+
+                f_spatial_coef = self._hessian(
+                    nll_spatial_coef,
+                    self.spatial_coef_linears[_group_key(group)].weight,
+                    ll_single_group_kwargs["coef_spline_bases"],
                 )
+                f_spatial_coef = f_spatial_coef.detach().cpu().numpy()
 
-            f_spatial_coef = torch.func.hessian(nll_spatial_coef)(group_spatial_coef)
             f_spatial_coef = f_spatial_coef.reshape((self.spatial_coef_dim, self.spatial_coef_dim))
-            cov_spatial_coef = np.linalg.inv(f_spatial_coef.detach().numpy())
+            cov_spatial_coef = np.linalg.inv(f_spatial_coef)
             var_spatial_coef = np.diag(cov_spatial_coef)
             se_spatial_coef = np.sqrt(var_spatial_coef)
             spatial_regression_coef_se[group] = se_spatial_coef
 
-            var_log_spatial_intensity = np.einsum(
-                "ij,ji->i",
-                coef_spline_bases,
-                cov_spatial_coef @ coef_spline_bases.T,
-            )
+            var_log_spatial_intensity = _spline_bases_variance(coef_spline_bases, cov_spatial_coef)
             se_log_spatial_intensity = np.sqrt(var_log_spatial_intensity)
             log_spatial_intensity_se[group] = se_log_spatial_intensity
 
-            group_studywise_spatial_intensity = np.exp(
-                np.matmul(coef_spline_bases, group_spatial_coef.detach().cpu().numpy().T)
-            ).flatten()
+            group_studywise_spatial_intensity = fisher_info_kwargs["mu_spatial"]
             se_spatial_intensity = group_studywise_spatial_intensity * se_log_spatial_intensity
             spatial_intensity_se[group] = se_spatial_intensity
 
-        # Inference on regression coefficient of moderators
+        # Inference on regression coefficient of moderators (of the last group)
         if self.moderators_coef_dim:
-            # modify ll_single_group_kwargs so that spatial_coef is fixed
-            # and moderators_coef can vary
-            del ll_single_group_kwargs["moderators_coef"]
-            ll_single_group_kwargs["group_spatial_coef"] = group_spatial_coef
-
-            def nll_moderators_coef(moderators_coef):
-                return -self._log_likelihood_single_group(
-                    moderators_coef=moderators_coef,
-                    **ll_single_group_kwargs,
+            f_moderators_coef = self._fisher_info_moderators(
+                moderators_by_group[group], **fisher_info_kwargs
+            )
+            if f_moderators_coef is None:
+                # spatial_coef is fixed and moderators_coef can vary
+                ll_single_group_kwargs = self._single_group_ll_kwargs(
+                    group, coef_spline_bases, moderators_by_group, foci_per_voxel, foci_per_study
+                )
+                del ll_single_group_kwargs["moderators_coef"]
+                ll_single_group_kwargs["group_spatial_coef"] = self.spatial_coef_linears[
+                    _group_key(group)
+                ].weight
+
+                def nll_moderators_coef(moderators_coef):
+                    return -self._log_likelihood_single_group(
+                        moderators_coef=moderators_coef,
+                        **ll_single_group_kwargs,
+                    )
+
+                f_moderators_coef = self._hessian(
+                    nll_moderators_coef,
+                    self.moderators_linear.weight,
+                    ll_single_group_kwargs["coef_spline_bases"],
                 )
+                f_moderators_coef = f_moderators_coef.detach().cpu().numpy()
 
-            f_moderators_coef = torch.func.hessian(nll_moderators_coef)(moderators_coef)
             f_moderators_coef = f_moderators_coef.reshape(
                 (self.moderators_coef_dim, self.moderators_coef_dim)
             )
-            cov_moderators_coef = np.linalg.inv(f_moderators_coef.detach().numpy())
+            cov_moderators_coef = np.linalg.inv(f_moderators_coef)
             var_moderators = np.diag(cov_moderators_coef).reshape((1, self.moderators_coef_dim))
             se_moderators = np.sqrt(var_moderators)
         else:
@@ -472,6 +741,11 @@ class GeneralLinearModelEstimator(torch.nn.Module):
 
         Fisher information matrix is estimated by negative Hessian of the log-likelihood.
 
+        .. versionchanged:: 0.5.1
+
+            Use the closed-form Fisher information of the model, if it has one. The spatial
+            coefficients of different groups are independent, so the matrix is block diagonal.
+
         Parameters
         ----------
         involved_groups : :obj:`list`
@@ -490,6 +764,24 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         numpy.ndarray
             Fisher information matrix of spatial regression coefficients (for involved groups).
         """
+        moderators_coef = self.moderators_coef if self.moderators_coef_dim else None
+        f_spatial_coef = [
+            self._fisher_info_spatial(
+                coef_spline_bases,
+                **self._fisher_info_kwargs(
+                    group,
+                    coef_spline_bases,
+                    moderators_by_group,
+                    foci_per_voxel,
+                    foci_per_study,
+                    moderators_coef,
+                ),
+            )
+            for group in involved_groups
+        ]
+        if all(group_f is not None for group_f in f_spatial_coef):
+            return scipy.linalg.block_diag(*f_spatial_coef)
+
         n_involved_groups = len(involved_groups)
         involved_foci_per_voxel = [
             torch.tensor(foci_per_voxel[group], dtype=torch.float64, device=self.device)
@@ -499,7 +791,9 @@ class GeneralLinearModelEstimator(torch.nn.Module):
             torch.tensor(foci_per_study[group], dtype=torch.float64, device=self.device)
             for group in involved_groups
         ]
-        spatial_coef = [self.spatial_coef_linears[group].weight.T for group in involved_groups]
+        spatial_coef = [
+            self.spatial_coef_linears[_group_key(group)].weight.T for group in involved_groups
+        ]
         spatial_coef = torch.stack(spatial_coef, dim=0)
         if self.moderators_coef_dim:
             involved_moderators_by_group = [
@@ -514,9 +808,7 @@ class GeneralLinearModelEstimator(torch.nn.Module):
 
         ll_mult_group_kwargs = {
             "moderator_coef": moderators_coef,
-            "coef_spline_bases": torch.tensor(
-                coef_spline_bases, dtype=torch.float64, device=self.device
-            ),
+            "coef_spline_bases": self._spline_bases_tensor(coef_spline_bases),
             "foci_per_voxel": involved_foci_per_voxel,
             "foci_per_study": involved_foci_per_study,
             "moderators": involved_moderators_by_group,
@@ -525,7 +817,7 @@ class GeneralLinearModelEstimator(torch.nn.Module):
 
         if hasattr(self, "overdispersion"):
             ll_mult_group_kwargs["overdispersion_coef"] = [
-                self.overdispersion[group] for group in involved_groups
+                self.overdispersion[_group_key(group)] for group in involved_groups
             ]
 
         # create a negative log-likelihood function
@@ -535,7 +827,9 @@ class GeneralLinearModelEstimator(torch.nn.Module):
                 **ll_mult_group_kwargs,
             )
 
-        h = torch.func.hessian(nll_spatial_coef)(spatial_coef)
+        h = self._hessian(
+            nll_spatial_coef, spatial_coef, ll_mult_group_kwargs["coef_spline_bases"]
+        )
         h = h.view(n_involved_groups * self.spatial_coef_dim, -1)
 
         return h.detach().cpu().numpy()
@@ -547,6 +841,10 @@ class GeneralLinearModelEstimator(torch.nn.Module):
 
         Fisher information matrix is estimated by negative Hessian of the log-likelihood.
 
+        .. versionchanged:: 0.5.1
+
+            Use the closed-form Fisher information of the model, if it has one.
+
         Parameters
         ----------
         coef_spline_bases : :obj:`numpy.ndarray`
@@ -563,6 +861,23 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         numpy.ndarray
             Fisher information matrix of study-level moderator regressors.
         """
+        f_moderators_coef = [
+            self._fisher_info_moderators(
+                moderators_by_group[group],
+                **self._fisher_info_kwargs(
+                    group,
+                    coef_spline_bases,
+                    moderators_by_group,
+                    foci_per_voxel,
+                    foci_per_study,
+                    self.moderators_coef,
+                ),
+            )
+            for group in self.groups
+        ]
+        if all(group_f is not None for group_f in f_moderators_coef):
+            return np.sum(f_moderators_coef, axis=0)
+
         foci_per_voxel = [
             torch.tensor(foci_per_voxel[group], dtype=torch.float64, device=self.device)
             for group in self.groups
@@ -571,7 +886,9 @@ class GeneralLinearModelEstimator(torch.nn.Module):
             torch.tensor(foci_per_study[group], dtype=torch.float64, device=self.device)
             for group in self.groups
         ]
-        spatial_coef = [self.spatial_coef_linears[group].weight.T for group in self.groups]
+        spatial_coef = [
+            self.spatial_coef_linears[_group_key(group)].weight.T for group in self.groups
+        ]
         spatial_coef = torch.stack(spatial_coef, dim=0)
 
         if self.moderators_coef_dim:
@@ -587,9 +904,7 @@ class GeneralLinearModelEstimator(torch.nn.Module):
 
         ll_mult_group_kwargs = {
             "spatial_coef": spatial_coef,
-            "coef_spline_bases": torch.tensor(
-                coef_spline_bases, dtype=torch.float64, device=self.device
-            ),
+            "coef_spline_bases": self._spline_bases_tensor(coef_spline_bases),
             "foci_per_voxel": foci_per_voxel,
             "foci_per_study": foci_per_study,
             "moderators": moderators_by_group,
@@ -597,7 +912,7 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         }
         if hasattr(self, "overdispersion"):
             ll_mult_group_kwargs["overdispersion_coef"] = [
-                self.overdispersion[group] for group in self.groups
+                self.overdispersion[_group_key(group)] for group in self.groups
             ]
 
         # create a negative log-likelihood function w.r.t moderator coefficients
@@ -607,7 +922,9 @@ class GeneralLinearModelEstimator(torch.nn.Module):
                 **ll_mult_group_kwargs,
             )
 
-        h = torch.func.hessian(nll_moderator_coef)(moderator_coef)
+        h = self._hessian(
+            nll_moderator_coef, moderator_coef, ll_mult_group_kwargs["coef_spline_bases"]
+        )
         h = h.view(self.moderators_coef_dim, self.moderators_coef_dim)
 
         return h.detach().cpu().numpy()
@@ -644,7 +961,7 @@ class GeneralLinearModelEstimator(torch.nn.Module):
         for group in self.groups:
             partial_kwargs = {"coef_spline_bases": coef_spline_bases}
             if overdispersion:
-                partial_kwargs["group_overdispersion"] = self.overdispersion[group]
+                partial_kwargs["group_overdispersion"] = self.overdispersion[_group_key(group)]
             if getattr(self, "square_root", False):
                 partial_kwargs["group_overdispersion"] = (
                     partial_kwargs["group_overdispersion"] ** 2
@@ -666,11 +983,15 @@ class GeneralLinearModelEstimator(torch.nn.Module):
                     **partial_kwargs,
                 )
 
-            group_spatial_coef = self.spatial_coef_linears[group].weight
+            group_spatial_coef = self.spatial_coef_linears[_group_key(group)].weight
             group_f = torch.autograd.functional.hessian(
                 nll_spatial_coef,
                 group_spatial_coef,
-                **self._hessian_kwargs,
+                **(
+                    self._sparse_hessian_kwargs
+                    if coef_spline_bases.is_sparse
+                    else self._hessian_kwargs
+                ),
             )
 
             group_f = group_f.reshape((self.spatial_coef_dim, self.spatial_coef_dim))
@@ -701,7 +1022,7 @@ class OverdispersionModelEstimator(GeneralLinearModelEstimator):
             overdispersion_init_group = torch.tensor(1e-2).double()
             if self.square_root:
                 overdispersion_init_group = torch.sqrt(overdispersion_init_group)
-            overdispersion[group] = torch.nn.Parameter(
+            overdispersion[_group_key(group)] = torch.nn.Parameter(
                 overdispersion_init_group, requires_grad=True
             )
         self.overdispersion = torch.nn.ParameterDict(overdispersion)
@@ -723,7 +1044,7 @@ class OverdispersionModelEstimator(GeneralLinearModelEstimator):
         )
         overdispersion_param = dict()
         for group in self.groups:
-            group_overdispersion = self.overdispersion[group]
+            group_overdispersion = self.overdispersion[_group_key(group)]
             group_overdispersion = group_overdispersion.cpu().detach().numpy()
             overdispersion_param[group] = group_overdispersion
         tables["overdispersion_coef"] = pd.DataFrame.from_dict(
@@ -746,6 +1067,30 @@ class PoissonEstimator(GeneralLinearModelEstimator):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+    def _fisher_info_spatial(
+        self,
+        coef_spline_bases,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        # I(beta) = sum(mu^Z) X^T diag(mu^X) X
+        return _weighted_gram(coef_spline_bases, np.sum(mu_moderators) * mu_spatial)
+
+    def _fisher_info_moderators(
+        self,
+        group_moderators,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        # I(gamma) = sum(mu^X) Z^T diag(mu^Z) Z
+        return _weighted_gram(group_moderators, np.sum(mu_spatial) * mu_moderators)
+
     def _log_likelihood_single_group(
         self,
         group_spatial_coef,
@@ -756,7 +1101,7 @@ class PoissonEstimator(GeneralLinearModelEstimator):
         group_foci_per_study,
         device="cpu",
     ):
-        log_mu_spatial = torch.matmul(coef_spline_bases, group_spatial_coef.T)
+        log_mu_spatial = _spline_bases_matmul(coef_spline_bases, group_spatial_coef.T)
         mu_spatial = torch.exp(log_mu_spatial)
         if moderators_coef is None:
             n_study, _ = group_foci_per_study.shape
@@ -786,7 +1131,7 @@ class PoissonEstimator(GeneralLinearModelEstimator):
     ):
         n_groups = len(spatial_coef)
         log_spatial_intensity = [
-            torch.matmul(coef_spline_bases, spatial_coef[i, :, :]) for i in range(n_groups)
+            _spline_bases_matmul(coef_spline_bases, spatial_coef[i, :, :]) for i in range(n_groups)
         ]
         spatial_intensity = [
             torch.exp(group_log_spatial_intensity)
@@ -832,7 +1177,7 @@ class PoissonEstimator(GeneralLinearModelEstimator):
         """
         log_l = 0
         for group in self.groups:
-            group_spatial_coef = self.spatial_coef_linears[group].weight
+            group_spatial_coef = self.spatial_coef_linears[_group_key(group)].weight
             group_foci_per_voxel = foci_per_voxel[group]
             group_foci_per_study = foci_per_study[group]
             if isinstance(moderators, dict):
@@ -891,6 +1236,70 @@ class NegativeBinomialEstimator(OverdispersionModelEstimator):
 
         return sum_three_term
 
+    def _fisher_info_spatial(
+        self,
+        coef_spline_bases,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        # With k = sum(mu^Z) / (alpha * sum((mu^Z)^2)) and r = k * sum(mu^Z),
+        # p_j = mu^X_j / (mu^X_j + k), so each voxel contributes independently:
+        # I(beta) = X^T diag((r + y) * mu^X * k / (mu^X + k)^2) X
+        k = np.sum(mu_moderators) / (group_overdispersion * np.sum(mu_moderators**2))
+        r = k * np.sum(mu_moderators)
+        weights = (r + group_foci_per_voxel) * mu_spatial * k / (mu_spatial + k) ** 2
+        return _weighted_gram(coef_spline_bases, weights)
+
+    def _fisher_info_moderators(
+        self,
+        group_moderators,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        # The log-likelihood depends on the moderator coefficients only through r and k,
+        # which are functions of A = sum(mu^Z) and B = sum((mu^Z)^2), so the Hessian follows
+        # from the chain rule: F_r * H(r) + F_k * H(k) + J^T H(F) J, with J = [grad(r), grad(k)]
+        y = group_foci_per_voxel
+        sum_mu, sum_mu_sq = np.sum(mu_moderators), np.sum(mu_moderators**2)
+        k = sum_mu / (group_overdispersion * sum_mu_sq)
+        r = k * sum_mu
+
+        grad_log_a = group_moderators.T @ mu_moderators / sum_mu
+        grad_log_b = 2 * group_moderators.T @ mu_moderators**2 / sum_mu_sq
+        hess_a = _weighted_gram(group_moderators, mu_moderators)
+        hess_b = 4 * _weighted_gram(group_moderators, mu_moderators**2)
+        hess_log_a = hess_a / sum_mu - np.outer(grad_log_a, grad_log_a)
+        hess_log_b = hess_b / sum_mu_sq - np.outer(grad_log_b, grad_log_b)
+        grad_log_k = grad_log_a - grad_log_b
+        grad_log_r = 2 * grad_log_a - grad_log_b
+        grad_k, grad_r = k * grad_log_k, r * grad_log_r
+        hess_k = k * (np.outer(grad_log_k, grad_log_k) + hess_log_a - hess_log_b)
+        hess_r = r * (np.outer(grad_log_r, grad_log_r) + 2 * hess_log_a - hess_log_b)
+
+        # derivatives of the log-likelihood w.r.t. r and k
+        d_r = np.sum(
+            special.digamma(y + r) - special.digamma(r) + np.log(k) - np.log(mu_spatial + k)
+        )
+        d_k = np.sum(r / k - (r + y) / (mu_spatial + k))
+        d_rr = np.sum(special.polygamma(1, y + r) - special.polygamma(1, r))
+        d_rk = np.sum(1 / k - 1 / (mu_spatial + k))
+        d_kk = np.sum((r + y) / (mu_spatial + k) ** 2 - r / k**2)
+
+        hess = (
+            d_r * hess_r
+            + d_k * hess_k
+            + d_rr * np.outer(grad_r, grad_r)
+            + d_rk * (np.outer(grad_r, grad_k) + np.outer(grad_k, grad_r))
+            + d_kk * np.outer(grad_k, grad_k)
+        )
+        return -hess
+
     def _log_likelihood_single_group(
         self,
         group_overdispersion,
@@ -902,7 +1311,7 @@ class NegativeBinomialEstimator(OverdispersionModelEstimator):
         group_foci_per_study,
         device="cpu",
     ):
-        log_mu_spatial = torch.matmul(coef_spline_bases, group_spatial_coef.T)
+        log_mu_spatial = _spline_bases_matmul(coef_spline_bases, group_spatial_coef.T)
         mu_spatial = torch.exp(log_mu_spatial)
         if moderators_coef is not None:
             log_mu_moderators = torch.matmul(group_moderators, moderators_coef.T)
@@ -944,7 +1353,7 @@ class NegativeBinomialEstimator(OverdispersionModelEstimator):
     ):
         n_groups = len(foci_per_voxel)
         log_spatial_intensity = [
-            torch.matmul(coef_spline_bases, spatial_coef[i, :, :]) for i in range(n_groups)
+            _spline_bases_matmul(coef_spline_bases, spatial_coef[i, :, :]) for i in range(n_groups)
         ]
         spatial_intensity = [
             torch.exp(group_log_spatial_intensity)
@@ -1011,8 +1420,8 @@ class NegativeBinomialEstimator(OverdispersionModelEstimator):
         """
         log_l = 0
         for group in self.groups:
-            group_overdispersion = self.overdispersion[group] ** 2
-            group_spatial_coef = self.spatial_coef_linears[group].weight
+            group_overdispersion = self.overdispersion[_group_key(group)] ** 2
+            group_spatial_coef = self.spatial_coef_linears[_group_key(group)].weight
             group_foci_per_voxel = foci_per_voxel[group]
             group_foci_per_study = foci_per_study[group]
             if isinstance(moderators, dict):
@@ -1059,6 +1468,43 @@ class ClusteredNegativeBinomialEstimator(OverdispersionModelEstimator):
         kwargs["square_root"] = False
         super().__init__(**kwargs)
 
+    def _fisher_info_spatial(
+        self,
+        coef_spline_bases,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        # The log-likelihood depends on the spatial coefficients through log(mu^X) and
+        # Lambda = sum(mu^X), which gives a weighted Gram matrix plus a rank-one term:
+        # I(beta) = a X^T diag(mu^X) X - b (X^T mu^X)(X^T mu^X)^T
+        v = 1 / group_overdispersion
+        mu_sum_per_study = np.sum(mu_spatial) * mu_moderators
+        a = np.sum((group_foci_per_study + v) * mu_moderators / (mu_sum_per_study + v))
+        b = np.sum((group_foci_per_study + v) * mu_moderators**2 / (mu_sum_per_study + v) ** 2)
+        grad_mu_sum = np.ravel(coef_spline_bases.T @ mu_spatial)
+        return a * _weighted_gram(coef_spline_bases, mu_spatial) - b * np.outer(
+            grad_mu_sum, grad_mu_sum
+        )
+
+    def _fisher_info_moderators(
+        self,
+        group_moderators,
+        mu_spatial,
+        mu_moderators,
+        group_foci_per_voxel,
+        group_foci_per_study,
+        group_overdispersion=None,
+    ):
+        # I(gamma) = Z^T diag((n + v) * v * u / (u + v)^2) Z, with n the foci per study and
+        # u = sum(mu^X) * mu^Z
+        v = 1 / group_overdispersion
+        mu_sum_per_study = np.sum(mu_spatial) * mu_moderators
+        weights = (group_foci_per_study + v) * v * mu_sum_per_study / (mu_sum_per_study + v) ** 2
+        return _weighted_gram(group_moderators, weights)
+
     def _log_likelihood_single_group(
         self,
         group_overdispersion,
@@ -1071,7 +1517,7 @@ class ClusteredNegativeBinomialEstimator(OverdispersionModelEstimator):
         device="cpu",
     ):
         v = 1 / group_overdispersion
-        log_mu_spatial = torch.matmul(coef_spline_bases, group_spatial_coef.T)
+        log_mu_spatial = _spline_bases_matmul(coef_spline_bases, group_spatial_coef.T)
         mu_spatial = torch.exp(log_mu_spatial)
         if moderators_coef is not None:
             log_mu_moderators = torch.matmul(group_moderators, moderators_coef.T)
@@ -1111,7 +1557,7 @@ class ClusteredNegativeBinomialEstimator(OverdispersionModelEstimator):
         v = [1 / group_overdispersion_coef for group_overdispersion_coef in overdispersion_coef]
         # estimated intensity and log estimated intensity
         log_spatial_intensity = [
-            torch.matmul(coef_spline_bases, spatial_coef[i, :, :]) for i in range(n_groups)
+            _spline_bases_matmul(coef_spline_bases, spatial_coef[i, :, :]) for i in range(n_groups)
         ]
         spatial_intensity = [
             torch.exp(group_log_spatial_intensity)
@@ -1166,8 +1612,8 @@ class ClusteredNegativeBinomialEstimator(OverdispersionModelEstimator):
         """
         log_l = 0
         for group in self.groups:
-            group_overdispersion = self.overdispersion[group]
-            group_spatial_coef = self.spatial_coef_linears[group].weight
+            group_overdispersion = self.overdispersion[_group_key(group)]
+            group_spatial_coef = self.spatial_coef_linears[_group_key(group)].weight
             group_foci_per_voxel = foci_per_voxel[group]
             group_foci_per_study = foci_per_study[group]
             if isinstance(moderators, dict):
@@ -6,11 +6,12 @@ import numpy as np
 import sparse
 from numba import jit
 from scipy import ndimage
+from scipy import sparse as sp
 
-from nimare.utils import unique_rows
+from nimare.utils import unique_rows, vox2mm
 
 
-@jit(nopython=True, cache=True)
+@jit(nopython=True, cache=True, nogil=True)
 def _convolve_sphere(kernel, ijks, index, max_shape):
     """Convolve peaks with a spherical kernel.
 
@@ -59,9 +60,15 @@ def compute_kda_ma(
     exp_idx=None,
     sum_overlap=False,
     sum_across_studies=False,
+    dtype=None,
+    return_type="sparse",
 ):
     """Compute (M)KDA modeled activation (MA) map.
 
+    .. versionchanged:: 0.5.1
+
+        * New parameters: `dtype` and `return_type`.
+
     .. versionchanged:: 0.0.12
 
         * Remove low-memory option in favor of sparse arrays.
@@ -94,14 +101,23 @@ def compute_kda_ma(
         Whether to sum voxel values in overlapping spheres.
     sum_across_studies : :obj:`bool`
         Whether to sum voxel values across studies.
+    dtype : :obj:`numpy.dtype` or None, optional
+        Data type of the values of the sparse MA maps. Must be able to hold the largest MA value.
+        If None, the type of `value` is used. Ignored if `sum_across_studies` is True.
+        Default is None.
+    return_type : {'sparse', 'csr'}, optional
+        Whether to return a 4D sparse array ('sparse') or a 2D :obj:`scipy.sparse.csr_matrix`
+        of shape (n_studies, n_mask_voxels) ('csr'), with one column for each voxel in the mask.
+        Ignored if `sum_across_studies` is True. Default is 'sparse'.
 
     Returns
     -------
-    kernel_data : :obj:`sparse._coo.core.COO`
+    kernel_data : :obj:`sparse._coo.core.COO` or :obj:`scipy.sparse.csr_matrix`
         4D sparse array. If `exp_idx` is none, a 3d array in the same
         shape as the `shape` argument is returned. If `exp_idx` is passed, a 4d array
         is returned, where the first dimension has size equal to the number of
         unique experiments, and the remaining 3 dimensions are equal to `shape`.
+        If `return_type` is 'csr', a 2D sparse matrix of masked MA values.
     """
     if sum_overlap and sum_across_studies:
         raise NotImplementedError("sum_overlap and sum_across_studies cannot both be True.")
@@ -119,8 +135,6 @@ def compute_kda_ma(
     exp_idx_uniq, exp_idx = np.unique(exp_idx, return_inverse=True)
     n_studies = len(exp_idx_uniq)
 
-    kernel_shape = (n_studies,) + shape
-
     n_dim = ijks.shape[1]
     xx, yy, zz = [slice(-r // vox_dims[i], r // vox_dims[i] + 0.01, 1) for i in range(n_dim)]
     cube = np.vstack([row.ravel() for row in (np.mgrid[xx, yy, zz]).astype(np.int32)])
@@ -147,7 +161,10 @@ def compute_kda_ma(
         kernel_data = all_values[mask_data.reshape(-1)]
 
     else:
-        all_coords = []
+        # Column of each in-mask voxel in the masked MA maps, or -1 outside of the mask
+        mask_idx = _get_mask_idx(mask_data)
+
+        all_cols = []
         # Loop over experiments
         for i_exp, _ in enumerate(exp_idx_uniq):
             curr_exp_idx = exp_idx == i_exp
@@ -158,27 +175,91 @@ def compute_kda_ma(
                 all_spheres = unique_rows(all_spheres)
 
             # Apply mask
-            sphere_idx_inside_mask = np.where(mask_data[tuple(all_spheres.T)])[0]
-            all_spheres = all_spheres[sphere_idx_inside_mask, :]
-
-            # Combine experiment id with coordinates
-            all_coords.append(all_spheres)
+            cols = mask_idx[tuple(all_spheres.T)]
+            all_cols.append(cols[cols >= 0])
 
         # Add exp_idx to coordinates
-        exp_shapes = [coords.shape[0] for coords in all_coords]
+        exp_shapes = [cols.shape[0] for cols in all_cols]
         exp_indicator = np.repeat(np.arange(len(exp_shapes)), exp_shapes)
+        all_cols = np.hstack(all_cols)
 
-        all_coords = np.vstack(all_coords).T
-        all_coords = np.insert(all_coords, 0, exp_indicator, axis=0)
-
-        kernel_data = sparse.COO(
-            all_coords, data=value, has_duplicates=sum_overlap, shape=kernel_shape
+        # Values from overlapping spheres are summed when converting to CSR
+        data = np.full(all_cols.shape[0], value, dtype=dtype)
+        kernel_data = sp.csr_matrix(
+            (data, (exp_indicator, all_cols)),
+            shape=(n_studies, mask_data.sum()),
         )
 
+        if return_type == "sparse":
+            kernel_data = _csr_to_coo(kernel_data, mask_data)
+
     return kernel_data
 
 
-def compute_ale_ma(mask, ijks, kernel=None, exp_idx=None, sample_sizes=None, use_dict=False):
+@jit(nopython=True, cache=True, nogil=True)
+def _paste_ale_kernel(ma_values, kernel, ijk):
+    """Take the element-wise maximum of an MA map and an ALE kernel centered on each peak.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    ma_values : 3D numpy.ndarray
+        MA map of one experiment. This array is changed in place.
+    kernel : 3D numpy.ndarray
+        ALE kernel, with an odd number of voxels along each dimension.
+    ijk : 2D numpy.ndarray
+        The IJK coordinates of the experiment's peaks.
+    """
+    mid = kernel.shape[0] // 2
+    mid1 = mid + 1
+    for j_peak in range(ijk.shape[0]):
+        i, j, k = ijk[j_peak, 0], ijk[j_peak, 1], ijk[j_peak, 2]
+        xl = max(i - mid, 0)
+        xh = min(i + mid1, ma_values.shape[0])
+        yl = max(j - mid, 0)
+        yh = min(j + mid1, ma_values.shape[1])
+        zl = max(k - mid, 0)
+        zh = min(k + mid1, ma_values.shape[2])
+        xlk = mid - (i - xl)
+        xhk = mid - (i - xh)
+        ylk = mid - (j - yl)
+        yhk = mid - (j - yh)
+        zlk = mid - (k - zl)
+        zhk = mid - (k - zh)
+
+        if (
+            (xl >= 0)
+            & (xh >= 0)
+            & (yl >= 0)
+            & (yh >= 0)
+            & (zl >= 0)
+            & (zh >= 0)
+            & (xlk >= 0)
+            & (xhk >= 0)
+            & (ylk >= 0)
+            & (yhk >= 0)
+            & (zlk >= 0)
+            & (zhk >= 0)
+        ):
+            for x in range(xl, xh):
+                for y in range(yl, yh):
+                    for z in range(zl, zh):
+                        value = kernel[xlk + x - xl, ylk + y - yl, zlk + z - zl]
+                        if value > ma_values[x, y, z]:
+                            ma_values[x, y, z] = value
+
+
+def compute_ale_ma(
+    mask,
+    ijks,
+    kernel=None,
+    exp_idx=None,
+    sample_sizes=None,
+    use_dict=False,
+    dtype=np.float64,
+    return_type="sparse",
+):
     """Generate ALE modeled activation (MA) maps.
 
     Replaces the values around each focus in ijk with the contrast-specific
@@ -186,6 +267,10 @@ def compute_ale_ma(mask, ijks, kernel=None, exp_idx=None, sample_sizes=None, use
     accounts for foci which are near to one another and may have overlapping
     kernels.
 
+    .. versionchanged:: 0.5.1
+
+        * New parameters: `dtype` and `return_type`.
+
     .. versionchanged:: 0.0.12
 
         * This function now returns a 4D sparse array.
@@ -215,14 +300,21 @@ def compute_ale_ma(mask, ijks, kernel=None, exp_idx=None, sample_sizes=None, use
         If True, empty kernels dictionary is used to retain the kernel for each element of
         sample_sizes. If False and sample_sizes is int, the ale kernel is calculated for
         sample_sizes. If False and sample_sizes is None, the unique kernels is used.
+    dtype : :obj:`numpy.dtype`, optional
+        Floating-point data type of the MA values. Default is float64.
+    return_type : {'sparse', 'csr'}, optional
+        Whether to return a 4D sparse array ('sparse') or a 2D :obj:`scipy.sparse.csr_matrix`
+        of shape (n_studies, n_mask_voxels) ('csr'), with one column for each voxel in the mask.
+        Default is 'sparse'.
 
     Returns
     -------
-    kernel_data : :obj:`sparse._coo.core.COO`
+    kernel_data : :obj:`sparse._coo.core.COO` or :obj:`scipy.sparse.csr_matrix`
         4D sparse array. If `exp_idx` is none, a 3d array in the same
         shape as the `shape` argument is returned. If `exp_idx` is passed, a 4d array
         is returned, where the first dimension has size equal to the number of
         unique experiments, and the remaining 3 dimensions are equal to `shape`.
+        If `return_type` is 'csr', a 2D sparse matrix of masked MA values.
     """
     if use_dict:
         if kernel is not None:
@@ -246,9 +338,7 @@ def compute_ale_ma(mask, ijks, kernel=None, exp_idx=None, sample_sizes=None, use
     exp_idx_uniq, exp_idx = np.unique(exp_idx, return_inverse=True)
     n_studies = len(exp_idx_uniq)
 
-    kernel_shape = (n_studies,) + shape
-    all_exp = []
-    all_coords = []
+    all_cols = []
     all_data = []
     for i_exp, _ in enumerate(exp_idx_uniq):
         # Index peaks by experiment
@@ -266,58 +356,147 @@ def compute_ale_ma(mask, ijks, kernel=None, exp_idx=None, sample_sizes=None, use
         elif sample_sizes is not None:
             _, kernel = get_ale_kernel(mask, sample_size=sample_sizes)
 
-        mid = int(np.floor(kernel.shape[0] / 2.0))
-        mid1 = mid + 1
-        ma_values = np.zeros(shape)
-        for j_peak in range(ijk.shape[0]):
-            i, j, k = ijk[j_peak, :]
-            xl = max(i - mid, 0)
-            xh = min(i + mid1, ma_values.shape[0])
-            yl = max(j - mid, 0)
-            yh = min(j + mid1, ma_values.shape[1])
-            zl = max(k - mid, 0)
-            zh = min(k + mid1, ma_values.shape[2])
-            xlk = mid - (i - xl)
-            xhk = mid - (i - xh)
-            ylk = mid - (j - yl)
-            yhk = mid - (j - yh)
-            zlk = mid - (k - zl)
-            zhk = mid - (k - zh)
+        ma_values = np.zeros(shape, dtype=dtype)
+        _paste_ale_kernel(ma_values, kernel, ijk)
+        # Only keep voxels inside the mask
+        ma_values = ma_values[mask_data]
+        nonzero_idx = np.where(ma_values > 0)[0]
 
-            if (
-                (xl >= 0)
-                & (xh >= 0)
-                & (yl >= 0)
-                & (yh >= 0)
-                & (zl >= 0)
-                & (zh >= 0)
-                & (xlk >= 0)
-                & (xhk >= 0)
-                & (ylk >= 0)
-                & (yhk >= 0)
-                & (zlk >= 0)
-                & (zhk >= 0)
-            ):
-                ma_values[xl:xh, yl:yh, zl:zh] = np.maximum(
-                    ma_values[xl:xh, yl:yh, zl:zh], kernel[xlk:xhk, ylk:yhk, zlk:zhk]
-                )
-        # Set voxel outside the mask to zero.
-        ma_values[~mask_data] = 0
-        nonzero_idx = np.where(ma_values > 0)
-
-        all_exp.append(np.full(nonzero_idx[0].shape[0], i_exp))
-        all_coords.append(np.vstack(nonzero_idx))
+        all_cols.append(nonzero_idx)
         all_data.append(ma_values[nonzero_idx])
 
-    exp = np.hstack(all_exp)
-    coords = np.vstack((exp.flatten(), np.hstack(all_coords)))
-    data = np.hstack(all_data).flatten()
+    indptr = np.concatenate(([0], np.cumsum([cols.shape[0] for cols in all_cols])))
+    kernel_data = sp.csr_matrix(
+        (np.hstack(all_data), np.hstack(all_cols), indptr),
+        shape=(n_studies, mask_data.sum()),
+    )
 
-    kernel_data = sparse.COO(coords, data, shape=kernel_shape)
+    if return_type == "sparse":
+        kernel_data = _csr_to_coo(kernel_data, mask_data)
 
     return kernel_data
 
 
+def _get_mask_idx(mask_data):
+    """Map each voxel of a 3D mask to its column in masked data, or to -1 outside the mask.
+
+    .. versionadded:: 0.5.1
+    """
+    mask_idx = np.full(mask_data.shape, -1, dtype=np.int64)
+    mask_idx[mask_data] = np.arange(mask_data.sum())
+    return mask_idx
+
+
+def _csr_to_coo(ma_maps, mask_data):
+    """Convert masked MA maps to a 4D sparse array in the space of the mask image.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    ma_maps : :obj:`scipy.sparse.csr_matrix` of shape (E, V)
+        MA maps, with one row for each experiment and one column for each voxel in the mask.
+    mask_data : :obj:`numpy.ndarray` of shape (X, Y, Z)
+        Boolean mask.
+
+    Returns
+    -------
+    :obj:`sparse._coo.core.COO` of shape (E, X, Y, Z)
+        MA maps.
+    """
+    ma_maps = ma_maps.tocoo()
+    mask_ijk = np.vstack(np.where(mask_data))
+    coords = np.vstack((ma_maps.row, mask_ijk[:, ma_maps.col]))
+    return sparse.COO(coords, ma_maps.data, shape=(ma_maps.shape[0],) + mask_data.shape)
+
+
+def _coo_to_csr(ma_maps, mask_data):
+    """Convert a 4D sparse array of MA maps to masked MA maps.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    ma_maps : :obj:`sparse._coo.core.COO` of shape (E, X, Y, Z)
+        MA maps.
+    mask_data : :obj:`numpy.ndarray` of shape (X, Y, Z)
+        Boolean mask.
+
+    Returns
+    -------
+    :obj:`scipy.sparse.csr_matrix` of shape (E, V)
+        MA maps, with one row for each experiment and one column for each voxel in the mask.
+        Values outside of the mask are dropped.
+    """
+    cols = _get_mask_idx(mask_data)[tuple(ma_maps.coords[1:])]
+    in_mask = cols >= 0
+    return sp.csr_matrix(
+        (ma_maps.data[in_mask], (ma_maps.coords[0, in_mask], cols[in_mask])),
+        shape=(ma_maps.shape[0], mask_data.sum()),
+    )
+
+
+def _get_random_seed():
+    """Draw the root seed for the random streams of a Monte Carlo procedure.
+
+    .. versionadded:: 0.5.1
+
+    The seed is drawn from NumPy's global random state, so that ``np.random.seed`` still makes
+    Monte Carlo procedures reproducible.
+    """
+    return int(np.random.randint(np.iinfo(np.int32).max))
+
+
+def _get_iteration_rng(seed, i_iter):
+    """Get the random number generator for one Monte Carlo iteration.
+
+    .. versionadded:: 0.5.1
+
+    The stream of each iteration depends only on the root seed and on the iteration's index,
+    as with :meth:`numpy.random.SeedSequence.spawn`.
+    This lets workers generate their own permutations, with results that do not depend on the
+    number of workers or on the order in which iterations are run.
+
+    Parameters
+    ----------
+    seed : :obj:`int`
+        Root seed, from :func:`_get_random_seed`.
+    i_iter : :obj:`int`
+        Index of the iteration.
+
+    Returns
+    -------
+    :obj:`numpy.random.Generator`
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(i_iter,)))
+
+
+def _sample_mask_xyz(mask_img, mask_idx, n_coords, rng):
+    """Draw random coordinates uniformly from the voxels of a mask.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    mask_img : :obj:`nibabel.nifti1.Nifti1Image`
+        Mask image.
+    mask_idx : :obj:`numpy.ndarray` of shape (V,)
+        Flat indices of the voxels in the mask, from :func:`numpy.flatnonzero`.
+    n_coords : :obj:`int`
+        Number of coordinates to draw, with replacement.
+    rng : :obj:`numpy.random.Generator`
+        Random number generator.
+
+    Returns
+    -------
+    :obj:`numpy.ndarray` of shape (n_coords, 3)
+        Coordinates in mm.
+    """
+    rand_idx = mask_idx[rng.integers(mask_idx.size, size=n_coords)]
+    rand_ijk = np.column_stack(np.unravel_index(rand_idx, mask_img.shape))
+    return vox2mm(rand_ijk, mask_img.affine)
+
+
 def get_ale_kernel(img, sample_size=None, fwhm=None):
     """Estimate 3D Gaussian and sigma (in voxels) for ALE kernel given sample size or fwhm."""
     if sample_size is not None and fwhm is not None:
@@ -352,6 +531,64 @@ def get_ale_kernel(img, sample_size=None, fwhm=None):
     return sigma_vox, kernel
 
 
+@jit(nopython=True, cache=True, nogil=True)
+def _histogram_counts(values, bin_edges):
+    """Count values in bins, like :func:`numpy.histogram` with an array of bin edges.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    values : 1D numpy.ndarray
+        Values to count.
+    bin_edges : 1D numpy.ndarray
+        Monotonically increasing bin edges. The last bin includes its right edge.
+        Values outside of the edges are not counted.
+
+    Returns
+    -------
+    counts : 1D numpy.ndarray
+        Number of values in each bin.
+    """
+    n_bins = bin_edges.shape[0] - 1
+    counts = np.zeros(n_bins, dtype=np.int64)
+    for value in values:
+        if not ((value >= bin_edges[0]) and (value <= bin_edges[-1])):
+            continue
+
+        i_bin = np.searchsorted(bin_edges, value, side="right") - 1
+        counts[min(i_bin, n_bins - 1)] += 1
+
+    return counts
+
+
+def _unmask_values(values, mask_idx, shape):
+    """Place masked values in a 3D array, with zeros outside the mask.
+
+    This does the same as :meth:`~nilearn.maskers.NiftiMasker.inverse_transform` followed by
+    ``get_fdata()``, without building an image.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    values : 1D numpy.ndarray
+        Values of the voxels in the mask.
+    mask_idx : 1D numpy.ndarray
+        Flat indices of the voxels in the mask.
+    shape : :obj:`tuple`
+        Shape of the mask image.
+
+    Returns
+    -------
+    arr3d : 3D numpy.ndarray
+        The unmasked values.
+    """
+    arr3d = np.zeros(shape, dtype=np.float64)
+    arr3d.flat[mask_idx] = values
+    return arr3d
+
+
 def _get_last_bin(arr1d):
     """Index the last location in a 1D array with a non-zero value."""
     if np.any(arr1d):
@@ -368,6 +605,10 @@ def _calculate_cluster_measures(arr3d, threshold, conn, tail="upper"):
 
     This method assesses both positive and negative clusters.
 
+    .. versionchanged:: 0.5.1
+
+        Sum the cluster masses in one pass over the labeled image, instead of one per cluster.
+
     Parameters
     ----------
     arr3d : :obj:`numpy.ndarray`
@@ -399,13 +640,18 @@ def _calculate_cluster_measures(arr3d, threshold, conn, tail="upper"):
         del temp_labeled_arr3d
 
     clust_sizes = np.bincount(labeled_arr3d.flatten())
-    clust_vals = np.arange(0, clust_sizes.shape[0])
 
     # Cluster mass-based inference
+    # Group the suprathreshold voxels by cluster in a single pass over the image,
+    # keeping their order within each cluster
+    clust_idx = np.flatnonzero(labeled_arr3d)
+    clust_labels = labeled_arr3d.flat[clust_idx]
+    order = np.argsort(clust_labels, kind="stable")
+    clust_vals = np.abs(arr3d.flat[clust_idx[order]]) - threshold
+    bounds = np.cumsum(clust_sizes[1:])
     max_mass = 0
-    for unique_val in clust_vals[1:]:
-        ss_vals = np.abs(arr3d[labeled_arr3d == unique_val]) - threshold
-        max_mass = np.maximum(max_mass, np.sum(ss_vals))
+    for start, stop in zip(bounds - clust_sizes[1:], bounds):
+        max_mass = np.maximum(max_mass, np.sum(clust_vals[start:stop]))
 
     # Cluster size-based inference
     clust_sizes = clust_sizes[1:]  # First cluster is zeros in matrix
@@ -417,7 +663,7 @@ def _calculate_cluster_measures(arr3d, threshold, conn, tail="upper"):
     return max_size, max_mass
 
 
-@jit(nopython=True, cache=True)
+@jit(nopython=True, cache=True, nogil=True)
 def _apply_liberal_mask(data):
     """Separate input image data in bags of voxels that have a valid value across the same studies.
 
@@ -0,0 +1,365 @@
+"""Opt-in instrumentation of where time and memory go in NiMARE analyses."""
+
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # Not available on Windows
+    resource = None
+
+LGR = logging.getLogger(__name__)
+
+# Stack of active profilers. Only the innermost one records spans.
+_ACTIVE_PROFILERS = []
+
+
+def _peak_rss():
+    """Return the peak resident set size of the current process, in bytes, or None."""
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+class Profiler(object):
+    """Record nested spans with wall time, CPU time, peak memory, and counters.
+
+    .. versionadded:: 0.5.1
+
+    Profilers are activated with :func:`profile`. While a Profiler is active, Estimators,
+    KernelTransformers, Correctors, and Diagnostics record a span for each stage of their work
+    (e.g., collecting inputs, generating MA maps, estimating null distributions, batches of
+    Monte Carlo permutations, cluster labeling, and image I/O), and the MetaResults they return
+    reference the Profiler in their ``profile_`` attribute.
+
+    Only work done in the current process is measured. Spans cover the time spent waiting for
+    parallel workers, but the CPU time and memory of worker processes are not included.
+    Workers that run in threads (e.g., with ``backend="threads"``) record their own spans,
+    nested according to the thread that recorded them.
+
+    Attributes
+    ----------
+    spans : :obj:`list` of :obj:`dict`
+        Completed spans, in the order in which they ended. Each span is a dictionary with:
+
+        - ``"name"``: Name of the stage.
+        - ``"category"``: Kind of object that recorded the span (e.g., ``"estimator"``).
+        - ``"start"``: Start time, in seconds since the Profiler was created.
+        - ``"wall_time"``: Elapsed time, in seconds.
+        - ``"cpu_time"``: CPU time used by the current process, in seconds.
+        - ``"peak_rss"``: Peak resident set size of the process at the end of the span,
+          in bytes. None if it cannot be measured on this platform.
+        - ``"depth"``: Nesting level of the span.
+        - ``"thread"``: Identifier of the thread that recorded the span.
+        - ``"counters"``: Counters incremented during the span.
+    counters : :obj:`dict`
+        Totals of all counters incremented while the Profiler was active,
+        such as the number of MA maps computed (``"ma_maps"``) or of cache hits.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.counters = {}
+        self._t0 = time.perf_counter()
+        self._open_spans = {}
+        # Guards the spans and counters, which may be updated from worker threads
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """Drop the lock, which cannot be pickled."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the Profiler with a new lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        return self._open_spans.setdefault(threading.get_ident(), [])
+
+    @contextmanager
+    def span(self, name, category="nimare", **counters):
+        """Record the time and memory used by a block of code.
+
+        Parameters
+        ----------
+        name : :obj:`str`
+            Name of the stage.
+        category : :obj:`str`, optional
+            Kind of object that records the span. Default is "nimare".
+        **counters
+            Initial values of counters for the span.
+        """
+        stack = self._stack()
+        record = {
+            "name": name,
+            "category": category,
+            "start": time.perf_counter() - self._t0,
+            "wall_time": None,
+            "cpu_time": None,
+            "peak_rss": None,
+            "depth": len(stack),
+            "thread": threading.get_ident(),
+            "counters": {},
+        }
+        for counter, value in counters.items():
+            self.count(counter, value, _record=record)
+
+        stack.append(record)
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_time"] = time.perf_counter() - self._t0 - record["start"]
+            record["cpu_time"] = time.process_time() - cpu_start
+            record["peak_rss"] = _peak_rss()
+            stack.pop()
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name, n=1, _record=None):
+        """Increment a counter in the innermost open span and in the Profiler's totals.
+
+        Parameters
+        ----------
+        name : :obj:`str`
+            Name of the counter.
+        n : :obj:`int` or :obj:`float`, optional
+            Increment. Default is 1.
+        """
+        if _record is None:
+            stack = self._stack()
+            _record = stack[-1] if stack else None
+
+        with self._lock:
+            if _record is not None:
+                _record["counters"][name] = _record["counters"].get(name, 0) + n
+
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        """Summarize the spans by stage.
+
+        Returns
+        -------
+        summary : :obj:`pandas.DataFrame`
+            One row for each category and name, with the number of calls, the total wall and
+            CPU times, and the maximum peak resident set size.
+        """
+        columns = ["category", "name", "calls", "wall_time", "cpu_time", "peak_rss"]
+        if not self.spans:
+            return pd.DataFrame(columns=columns)
+
+        spans = pd.DataFrame(self.spans)
+        summary = spans.groupby(["category", "name"], sort=False).agg(
+            calls=("name", "size"),
+            wall_time=("wall_time", "sum"),
+            cpu_time=("cpu_time", "sum"),
+            peak_rss=("peak_rss", "max"),
+        )
+        return summary.reset_index()[columns]
+
+    def to_dict(self):
+        """Return the recorded spans and counter totals as a dictionary."""
+        return {"spans": list(self.spans), "counters": dict(self.counters)}
+
+    def to_json(self, filename=None):
+        """Export the recorded spans and counter totals as JSON.
+
+        Parameters
+        ----------
+        filename : :obj:`str` or None, optional
+            File to write. If None, the JSON string is returned. Default is None.
+
+        Returns
+        -------
+        :obj:`str` or None
+            The JSON string, if ``filename`` is None.
+        """
+        return self._dump(self.to_dict(), filename)
+
+    def to_chrome_trace(self, filename=None):
+        """Export the recorded spans in the Chrome trace event format.
+
+        The output can be opened with ``chrome://tracing`` or https://ui.perfetto.dev.
+
+        Parameters
+        ----------
+        filename : :obj:`str` or None, optional
+            File to write. If None, the JSON string is returned. Default is None.
+
+        Returns
+        -------
+        :obj:`str` or None
+            The JSON string, if ``filename`` is None.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": span["start"] * 1e6,
+                "dur": span["wall_time"] * 1e6,
+                "pid": pid,
+                "tid": span["thread"],
+                "args": {
+                    "cpu_time": span["cpu_time"],
+                    "peak_rss": span["peak_rss"],
+                    **span["counters"],
+                },
+            }
+            for span in sorted(self.spans, key=lambda span: span["start"])
+        ]
+        return self._dump({"traceEvents": events, "displayTimeUnit": "ms"}, filename)
+
+    @staticmethod
+    def _dump(obj, filename):
+        if filename is None:
+            return json.dumps(obj)
+
+        with open(filename, "w") as fo:
+            json.dump(obj, fo)
+
+
+@contextmanager
+def profile(profiler=None):
+    """Activate a :class:`Profiler` within a ``with`` block.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    profiler : :class:`Profiler` or None, optional
+        Profiler to activate. If None, a new one is created. Default is None.
+
+    Yields
+    ------
+    profiler : :class:`Profiler`
+        The active Profiler.
+
+    Examples
+    --------
+    >>> from nimare.correct import FWECorrector
+    >>> from nimare.meta.cbma import ALE
+    >>> from nimare.profiling import profile
+    >>> with profile() as prof:  # doctest: +SKIP
+    ...     result = ALE().fit(dset)
+    ...     cresult = FWECorrector(method="montecarlo", n_iters=100).transform(result)
+    >>> prof.summary()  # doctest: +SKIP
+    >>> prof.to_chrome_trace("trace.json")  # doctest: +SKIP
+    """
+    profiler = profiler or Profiler()
+    _ACTIVE_PROFILERS.append(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILERS.remove(profiler)
+
+
+def get_profiler():
+    """Return the active :class:`Profiler`, or None if profiling is off.
+
+    .. versionadded:: 0.5.1
+    """
+    return _ACTIVE_PROFILERS[-1] if _ACTIVE_PROFILERS else None
+
+
+def span(name, category="nimare", **counters):
+    """Record a span in the active :class:`Profiler`, if any.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    name : :obj:`str`
+        Name of the stage.
+    category : :obj:`str`, optional
+        Kind of object that records the span. Default is "nimare".
+    **counters
+        Initial values of counters for the span.
+
+    Returns
+    -------
+    context manager
+        A context manager that records the span, or does nothing if profiling is off.
+    """
+    profiler = get_profiler()
+    if profiler is None:
+        return nullcontext()
+
+    return profiler.span(name, category=category, **counters)
+
+
+def count(name, n=1):
+    """Increment a counter in the active :class:`Profiler`, if any.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    name : :obj:`str`
+        Name of the counter.
+    n : :obj:`int` or :obj:`float`, optional
+        Increment. Default is 1.
+    """
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def trace_batches(iterable, name, batch_size=100, category="nimare", counter="iterations"):
+    """Record a span for each batch of items consumed from an iterable.
+
+    .. versionadded:: 0.5.1
+
+    This is meant for generators of parallel results, such as Monte Carlo permutations, where
+    each span measures the time spent waiting for a batch of results, from its first result on.
+
+    Parameters
+    ----------
+    iterable : iterable
+        Items to yield.
+    name : :obj:`str`
+        Name of the batch spans.
+    batch_size : :obj:`int`, optional
+        Number of items per span. Default is 100.
+    category : :obj:`str`, optional
+        Kind of object that records the spans. Default is "nimare".
+    counter : :obj:`str`, optional
+        Counter incremented once per item. Default is "iterations".
+
+    Yields
+    ------
+    item
+        The items of ``iterable``, unchanged.
+    """
+    profiler = get_profiler()
+    if profiler is None:
+        yield from iterable
+        return
+
+    # Only open a span once the first item of its batch is available, so that no empty span is
+    # recorded after the last batch
+    iterator = iter(iterable)
+    for first_item in iterator:
+        with profiler.span(name, category=category) as record:
+            profiler.count(counter, _record=record)
+            yield first_item
+            for item in itertools.islice(iterator, batch_size - 1):
+                profiler.count(counter, _record=record)
+                yield item
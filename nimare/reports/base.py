@@ -60,11 +60,13 @@ PARAMETERS_DICT = {
     "kernel_transformer__memory": "Memory",
     "kernel_transformer__memory_level": "Memory level",
     "kernel_transformer__sum_across_studies": "Sum Across Studies",
+    "kernel_transformer__precision": "Precision",
     "memory": "Memory",
     "memory_level": "Memory level",
     "null_method": "Null method",
     "n_iters": "Number of iterations",
     "n_cores": "Number of cores",
+    "backend": "Parallel backend",
     "fwe": "Family-wise error rate (FWE) correction",
     "fdr": "False discovery rate (FDR) correction",
     "method": "Method",
@@ -74,6 +76,7 @@ PARAMETERS_DICT = {
     "use_sample_size": "Use sample size for weights",
     "normalize_contrast_weights": "Normalize by the number of contrasts",
     "two_sided": "Two-sided test",
+    "precision": "Precision",
     "beta": "Parameter estimate",
     "se": "Standard error of the parameter estimate",
     "varcope": "Variance of the parameter estimate",
@@ -1,21 +1,7 @@
 """Plot figures for report."""
 
-import matplotlib.colors as mcolors
-import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import plotly.express as px
-from nilearn import datasets
-from nilearn.plotting import (
-    plot_connectome,
-    plot_img,
-    plot_roi,
-    plot_stat_map,
-    view_connectome,
-    view_img,
-)
-from ridgeplot import ridgeplot
 from scipy import stats
 from scipy.cluster.hierarchy import leaves_list, linkage, optimal_leaf_ordering
 
@@ -129,6 +115,9 @@ def plot_static_brain(img, out_filename, threshold=1e-06):
         are plotted as transparent. If 'auto' is given, the threshold is determined
         magically by analysis of the image. Default=1e-6.
     """
+    from nilearn import datasets
+    from nilearn.plotting import plot_stat_map
+
     _check_extention(out_filename, [".png", ".pdf", ".svg"])
 
     template = datasets.load_mni152_template(resolution=1)
@@ -158,6 +147,9 @@ def plot_mask(mask, out_filename):
         The name of an image file to export the plot to.
         Valid extensions are '.png', '.pdf', '.svg'.
     """
+    from nilearn import datasets
+    from nilearn.plotting import plot_roi
+
     _check_extention(out_filename, [".png", ".pdf", ".svg"])
 
     template = datasets.load_mni152_template(resolution=1)
@@ -201,6 +193,11 @@ def plot_coordinates(
         The name of an image file to export the legend plot to.
         Valid extensions are '.png', '.pdf', '.svg'.
     """
+    import matplotlib.colors as mcolors
+    import matplotlib.patches as mpatches
+    import matplotlib.pyplot as plt
+    from nilearn.plotting import plot_connectome, view_connectome
+
     _check_extention(out_static_filename, [".png", ".pdf", ".svg"])
     _check_extention(out_interactive_filename, [".html"])
     _check_extention(out_legend_filename, [".png", ".pdf", ".svg"])
@@ -268,6 +265,9 @@ def plot_interactive_brain(img, out_filename, threshold=1e-06):
         are plotted as transparent. If 'auto' is given, the threshold is determined
         magically by analysis of the image. Default=1e-6.
     """
+    from nilearn import datasets
+    from nilearn.plotting import view_img
+
     _check_extention(out_filename, [".html"])
 
     template = datasets.load_mni152_template(resolution=1)
@@ -315,6 +315,8 @@ def plot_heatmap(
     zmax : :obj:`float`, optional
         The maximum value to use for the colormap. Default is None.
     """
+    import plotly.express as px
+
     _check_extention(out_filename, [".html"])
 
     n_studies, n_clusters = data_df.shape
@@ -387,6 +389,10 @@ def plot_clusters(img, out_filename):
         The name of an image file to export the plot to.
         Valid extensions are '.png', '.pdf', '.svg'.
     """
+    import matplotlib.pyplot as plt
+    from nilearn import datasets
+    from nilearn.plotting import plot_roi
+
     _check_extention(out_filename, [".png", ".pdf", ".svg"])
 
     template = datasets.load_mni152_template(resolution=1)
@@ -415,6 +421,8 @@ def _plot_true_voxels(maps_arr, ids_, out_filename):
     .. versionadded:: 0.2.2
 
     """
+    import plotly.express as px
+
     n_studies, n_voxels = maps_arr.shape
     mask = ~np.isnan(maps_arr) & (maps_arr != 0)
 
@@ -469,6 +477,8 @@ def _plot_ridgeplot(maps_arr, ids_, x_label, out_filename):
     .. versionadded:: 0.2.0
 
     """
+    from ridgeplot import ridgeplot
+
     n_studies = len(ids_)
     labels = [id_[:MAX_CHARS] for id_ in ids_]  # Truncate labels to MAX_CHARS characters
 
@@ -513,6 +523,8 @@ def _plot_sumstats(maps_arr, ids_, out_filename):
     .. versionadded:: 0.2.2
 
     """
+    import plotly.express as px
+
     n_studies = len(ids_)
     mask = ~np.isnan(maps_arr) & (maps_arr != 0)
     maps_lst = [maps_arr[i][mask[i]] for i in range(n_studies)]
@@ -594,6 +606,9 @@ def _plot_relcov_map(maps_arr, masker, out_filename):
     .. versionadded:: 0.2.0
 
     """
+    from nilearn import datasets
+    from nilearn.plotting import plot_img
+
     _check_extention(out_filename, [".png", ".pdf", ".svg"])
 
     epsilon = 1e-05
@@ -629,6 +644,9 @@ def _plot_dof_map(dof_map, out_filename):
     .. versionadded:: 0.2.1
 
     """
+    from nilearn import datasets
+    from nilearn.plotting import plot_img
+
     _check_extention(out_filename, [".png", ".pdf", ".svg"])
 
     epsilon = 1e-05
@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 from nibabel.funcs import squeeze_image
 
+from nimare import profiling
 from nimare.base import NiMAREBase
 from nimare.utils import get_description_references, get_masker
 
@@ -17,6 +18,10 @@ LGR = logging.getLogger(__name__)
 class MetaResult(NiMAREBase):
     """Base class for meta-analytic results.
 
+    .. versionchanged:: 0.5.1
+
+        - Added the profile_ attribute.
+
     .. versionchanged:: 0.1.0
 
         - Added corrector and diagnostics attributes.
@@ -67,6 +72,10 @@ class MetaResult(NiMAREBase):
 
         Users should be able to copy the contents of the ``bibtex`` attribute into their own
         BibTeX file without issue.
+    profile_ : :class:`~nimare.profiling.Profiler` or None
+        The Profiler that was active when the result was generated, which records the time and
+        memory used by each stage of the analysis. None if profiling was off.
+        See :func:`nimare.profiling.profile`.
     """
 
     def __init__(
@@ -104,6 +113,7 @@ class MetaResult(NiMAREBase):
         self.tables = tables
         self.metadata = {}
         self.description_ = description
+        self.profile_ = None
 
     @property
     def description_(self):
@@ -168,10 +178,11 @@ class MetaResult(NiMAREBase):
         names = names or list(self.maps.keys())
         maps = {k: self.get_map(k) for k in names if self.maps[k] is not None}
 
-        for imgtype, img in maps.items():
-            filename = prefix + imgtype + ".nii.gz"
-            outpath = os.path.join(output_dir, filename)
-            img.to_filename(outpath)
+        with profiling.span("save_maps", category="io"):
+            for imgtype, img in maps.items():
+                filename = prefix + imgtype + ".nii.gz"
+                outpath = os.path.join(output_dir, filename)
+                img.to_filename(outpath)
 
     def save_tables(self, output_dir=".", prefix="", prefix_sep="_", names=None):
         """Save result tables to TSV files.
@@ -203,13 +214,14 @@ class MetaResult(NiMAREBase):
         names = names or list(self.tables.keys())
         tables = {k: self.tables[k] for k in names}
 
-        for tabletype, table in tables.items():
-            filename = prefix + tabletype + ".tsv"
-            outpath = os.path.join(output_dir, filename)
-            if table is not None:
-                table.to_csv(outpath, sep="\t", index=False)
-            else:
-                LGR.warning(f"Table {tabletype} is None. Not saving.")
+        with profiling.span("save_tables", category="io"):
+            for tabletype, table in tables.items():
+                filename = prefix + tabletype + ".tsv"
+                outpath = os.path.join(output_dir, filename)
+                if table is not None:
+                    table.to_csv(outpath, sep="\t", index=False)
+                else:
+                    LGR.warning(f"Table {tabletype} is None. Not saving.")
 
     def copy(self):
         """Return copy of result object."""
@@ -222,4 +234,5 @@ class MetaResult(NiMAREBase):
             tables=copy.deepcopy(self.tables),
             description=self.description_,
         )
+        new.profile_ = getattr(self, "profile_", None)
         return new
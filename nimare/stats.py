@@ -4,6 +4,7 @@ import logging
 import warnings
 
 import numpy as np
+from scipy.stats import genpareto
 
 from nimare import utils
 
@@ -113,6 +114,11 @@ def pearson(x, y):
 def null_to_p(test_value, null_array, tail="two", symmetric=False):
     """Return p-value for test value(s) against null array.
 
+    .. versionchanged:: 0.5.1
+
+        * Look up p-values with a :class:`NullDistribution`. To compare many sets of test values
+          against the same null array, create the NullDistribution once and reuse it.
+
     .. versionchanged:: 0.0.7
 
         * [FIX] Add parameter *symmetric*.
@@ -152,45 +158,10 @@ def null_to_p(test_value, null_array, tail="two", symmetric=False):
     and two-tailed p-values are desired, use symmetric=True, as it is
     approximately twice as efficient computationally, and has lower variance.
     """
-    if tail not in {"two", "upper", "lower"}:
-        raise ValueError('Argument "tail" must be one of ["two", "upper", "lower"]')
-
     return_first = isinstance(test_value, (float, int))
     test_value = np.atleast_1d(test_value)
-    null_array = np.array(null_array)
-
-    # For efficiency's sake, if there are more than 1000 values, pass only the unique
-    # values through percentileofscore(), and then reconstruct.
-    if len(test_value) > 1000:
-        reconstruct = True
-        test_value, uniq_idx = np.unique(test_value, return_inverse=True)
-    else:
-        reconstruct = False
-
-    def compute_p(t, null):
-        null = np.sort(null)
-        idx = np.searchsorted(null, t, side="left").astype(float)
-        return 1 - idx / len(null)
-
-    if tail == "two":
-        if symmetric:
-            p = compute_p(np.abs(test_value), np.abs(null_array))
-        else:
-            p_l = compute_p(test_value, null_array)
-            p_r = compute_p(test_value * -1, null_array * -1)
-            p = 2 * np.minimum(p_l, p_r)
-    elif tail == "lower":
-        p = compute_p(test_value * -1, null_array * -1)
-    else:
-        p = compute_p(test_value, null_array)
-
-    # ensure p_value in the following range:
-    # smallest_value <= p_value <= (1.0 - smallest_value)
-    smallest_value = np.maximum(np.finfo(float).eps, 1.0 / len(null_array))
-    result = np.maximum(smallest_value, np.minimum(p, 1.0 - smallest_value))
-
-    if reconstruct:
-        result = result[uniq_idx]
+
+    result = NullDistribution(values=null_array).p(test_value, tail=tail, symmetric=symmetric)
 
     return result[0] if return_first else result
 
@@ -198,6 +169,11 @@ def null_to_p(test_value, null_array, tail="two", symmetric=False):
 def nullhist_to_p(test_values, histogram_weights, histogram_bins):
     """Return one-sided p-value for test value against null histogram.
 
+    .. versionchanged:: 0.5.1
+
+        Look up p-values with a :class:`NullDistribution`, which pairs test values with
+        voxel-wise null histograms without looping over voxels.
+
     .. versionadded:: 0.0.4
 
     Parameters
@@ -237,40 +213,481 @@ def nullhist_to_p(test_values, histogram_weights, histogram_bins):
     assert histogram_weights.ndim in (1, 2)
     if histogram_weights.ndim == 2:
         assert histogram_weights.shape[1] == test_values.shape[0]
-        voxelwise_null = True
-    else:
-        histogram_weights = histogram_weights[:, None]
-        voxelwise_null = False
-
-    n_bins = len(histogram_bins)
-    inv_step = 1 / (histogram_bins[1] - histogram_bins[0])  # assume equal spacing
-
-    # Convert histograms to null distributions
-    # The value in each bin represents the probability of finding a test value
-    # (stored in histogram_bins) of that value or lower.
-    null_distribution = histogram_weights / np.sum(histogram_weights, axis=0)
-    null_distribution = np.cumsum(null_distribution[::-1, :], axis=0)[::-1, :]
-    null_distribution /= np.max(null_distribution, axis=0)
-    null_distribution = np.squeeze(null_distribution)
-
-    smallest_value = np.min(null_distribution[null_distribution != 0])
-
-    p_values = np.ones(test_values.shape)
-    idx = np.where(test_values > 0)[0]
-    value_bins = utils._round2(test_values[idx] * inv_step)
-    value_bins[value_bins >= n_bins] = n_bins - 1  # limit to within null distribution
-
-    # Get p-values by getting the value_bins-th value in null_distribution
-    if voxelwise_null:
-        # Pair each test value with its associated null distribution
-        for i_voxel, voxel_idx in enumerate(idx):
-            p_values[voxel_idx] = null_distribution[value_bins[i_voxel], voxel_idx]
-    else:
-        p_values[idx] = null_distribution[value_bins]
-
-    # ensure p_value in the following range:
-    # smallest_value <= p_value <= 1.0
-    p_values = np.maximum(smallest_value, np.minimum(p_values, 1.0))
+
+    p_values = NullDistribution(
+        histogram_weights=histogram_weights,
+        histogram_bins=histogram_bins,
+    ).p(test_values)
+
     if return_value:
         p_values = p_values[0]
     return p_values
+
+
+def _searchsorted_columns(sorted_values, test_values, side="left"):
+    """Find insertion indices in each column of a column-wise sorted 2D array.
+
+    .. versionadded:: 0.5.1
+
+    This is a vectorized binary search, equivalent to calling :func:`numpy.searchsorted` on each
+    column, with the test values in the last dimension of ``test_values`` paired with columns.
+    """
+    n_values, n_columns = sorted_values.shape
+    test_values, columns = np.broadcast_arrays(test_values, np.arange(n_columns))
+    low = np.zeros(test_values.shape, dtype=np.intp)
+    high = np.full(test_values.shape, n_values, dtype=np.intp)
+    searching = low < high
+    while np.any(searching):
+        mid = (low + high) // 2
+        mid_values = sorted_values[np.minimum(mid, n_values - 1), columns]
+        if side == "left":
+            go_right = mid_values < test_values
+        else:
+            go_right = mid_values <= test_values
+
+        low = np.where(searching & go_right, mid + 1, low)
+        high = np.where(searching & ~go_right, mid, high)
+        searching = low < high
+
+    return low
+
+
+def _fit_gpd_pwm(exceedances):
+    """Fit generalized Pareto distributions to exceedances with probability-weighted moments.
+
+    .. versionadded:: 0.5.1
+
+    This uses the closed-form estimator of Hosking & Wallis (1987), vectorized
+    over all but the last dimension of ``exceedances``, which must be sorted along it.
+
+    Returns
+    -------
+    shape, scale : :obj:`numpy.ndarray`
+        Shape and scale parameters, in the convention of :obj:`scipy.stats.genpareto`.
+    """
+    n_exceedances = exceedances.shape[-1]
+    weights = (n_exceedances - np.arange(1, n_exceedances + 1)) / (n_exceedances - 1)
+    a0 = np.mean(exceedances, axis=-1)
+    a1 = np.mean(exceedances * weights, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shape = 2 - a0 / (a0 - 2 * a1)
+        scale = 2 * a0 * a1 / (a0 - 2 * a1)
+
+    return shape, scale
+
+
+def _anderson_darling_gpd(exceedances, shape, scale):
+    """Compute Anderson-Darling statistics of sorted exceedances against fitted GPDs.
+
+    .. versionadded:: 0.5.1
+    """
+    n_exceedances = exceedances.shape[-1]
+    cdf = genpareto.cdf(exceedances, np.expand_dims(shape, -1), scale=np.expand_dims(scale, -1))
+    cdf = np.clip(cdf, 1e-12, 1 - 1e-12)
+    weights = 2 * np.arange(1, n_exceedances + 1) - 1
+    return -n_exceedances - np.mean(weights * (np.log(cdf) + np.log1p(-cdf[..., ::-1])), axis=-1)
+
+
+def _fit_gpd_tail(
+    null_values,
+    quantiles=(0.75, 0.8, 0.85, 0.9, 0.95),
+    alpha=0.05,
+    n_boot=200,
+    min_exceedances=25,
+):
+    """Fit a generalized Pareto distribution to the upper tail of a null distribution.
+
+    .. versionadded:: 0.5.1
+
+    The tail threshold starts at the lowest of ``quantiles`` and is raised until the
+    generalized Pareto distribution (GPD) fits the values above it,
+    following Winkler et al. (2016).
+    The GPD is fitted to the exceedances with probability-weighted moments, and its fit is
+    checked with an Anderson-Darling test, the p-value of which is determined with a
+    parametric bootstrap.
+
+    Parameters
+    ----------
+    null_values : 1D array_like
+        Null values, such as the maximum statistic from each Monte Carlo iteration.
+    quantiles : :obj:`tuple` of :obj:`float`, optional
+        Candidate tail thresholds, as quantiles of ``null_values``, in the order in which they
+        are tried. Default is (0.75, 0.8, 0.85, 0.9, 0.95).
+    alpha : :obj:`float`, optional
+        A fit is accepted if the p-value of its goodness-of-fit test is above ``alpha``.
+        Default is 0.05.
+    n_boot : :obj:`int`, optional
+        Number of bootstrap samples for the goodness-of-fit test. Default is 200.
+    min_exceedances : :obj:`int`, optional
+        Minimum number of null values above a threshold to fit the GPD to them. Default is 25.
+
+    Returns
+    -------
+    tail_fit : :obj:`dict` or None
+        None if no threshold gave an acceptable fit. Otherwise, a dictionary with:
+
+        - ``"threshold"``: Null value above which the GPD describes the tail.
+        - ``"shape"`` and ``"scale"``: Parameters of the GPD of the exceedances over the
+          threshold, in the convention of :obj:`scipy.stats.genpareto`.
+        - ``"exceedance_rate"``: Proportion of null values above the threshold.
+        - ``"gof_p"``: P-value of the goodness-of-fit test.
+
+    Notes
+    -----
+    The bootstrap uses a fixed random seed, so fits are deterministic and do not advance the
+    global random state.
+    """
+    sorted_values = np.sort(np.asarray(null_values, dtype=float))
+    n_values = sorted_values.size
+    rng = np.random.default_rng(0)
+    for quantile in quantiles:
+        threshold = np.quantile(sorted_values, quantile)
+        exceedances = sorted_values[sorted_values > threshold] - threshold
+        # Constant tails, and tails the moments cannot describe, are skipped
+        if exceedances.size < min_exceedances or exceedances[0] == exceedances[-1]:
+            continue
+
+        shape, scale = _fit_gpd_pwm(exceedances)
+        if not np.isfinite(shape) or not scale > 0:
+            continue
+
+        statistic = _anderson_darling_gpd(exceedances, shape, scale)
+        boot_exceedances = np.sort(
+            genpareto.ppf(rng.random((n_boot, exceedances.size)), shape, scale=scale), axis=-1
+        )
+        boot_statistics = _anderson_darling_gpd(boot_exceedances, *_fit_gpd_pwm(boot_exceedances))
+        gof_p = (np.sum(boot_statistics >= statistic) + 1) / (n_boot + 1)
+        if gof_p > alpha:
+            return {
+                "threshold": threshold,
+                "shape": shape,
+                "scale": scale,
+                "exceedance_rate": exceedances.size / n_values,
+                "gof_p": gof_p,
+            }
+
+    return None
+
+
+class NullDistribution(object):
+    r"""A null distribution with precomputed lookups of p-values and thresholds.
+
+    .. versionadded:: 0.5.1
+
+    The null values are sorted, or the null histogram is converted to a survival function,
+    once when the object is created, so that any number of lookups can reuse them.
+    Lookups are vectorized over test values of any shape.
+
+    Parameters
+    ----------
+    values : (N [x V]) array_like or None, optional
+        Null values, such as the maximum statistic from each Monte Carlo iteration.
+        A 2D array defines a separate null distribution for each of its V columns (e.g., voxels).
+        Either ``values`` or ``histogram_weights`` must be provided. Default is None.
+    histogram_weights : (B [x V]) array_like or None, optional
+        Histogram weights representing the null distribution.
+        These should be raw weights or counts, not a cumulatively-summed null distribution.
+        A 2D array defines a separate null histogram for each of its V columns. Default is None.
+    histogram_bins : (B) array_like or None, optional
+        Histogram bin centers, with equal spacing. Required with ``histogram_weights``.
+        Default is None.
+    tail_approximation : {None, 'gpd'}, optional
+        If 'gpd', fit a generalized Pareto distribution to the upper tail of the null values,
+        and use it for upper-tail p-values and thresholds beyond the tail threshold.
+        Only available for 1D null values. Default is None.
+
+    Attributes
+    ----------
+    sorted_values_ : :obj:`numpy.ndarray` or None
+        Null values, sorted along the first axis. None for null histograms.
+    survival_ : :obj:`numpy.ndarray` or None
+        Probability of a value at or above each bin of the null histogram, normalized so that
+        its maximum is one. None for null values.
+    histogram_bins : :obj:`numpy.ndarray` or None
+        Histogram bin centers. None for null values.
+    voxelwise : :obj:`bool`
+        Whether there is a separate null distribution for each column.
+    tail_fit_ : :obj:`dict` or None
+        Parameters of the generalized Pareto distribution fitted to the upper tail, with the keys
+        "threshold", "shape", "scale", "exceedance_rate", and "gof_p".
+        None if ``tail_approximation`` is None or if no acceptable fit was found.
+
+    Notes
+    -----
+    P-values from null values match :func:`null_to_p`, and p-values from null histograms match
+    :func:`nullhist_to_p`, which use this class.
+    NullDistributions are stored in the ``null_distributions_`` attribute of CBMA Estimators,
+    and are saved along with them.
+
+    Empirical p-values cannot be smaller than one over the number of null values, so resolving
+    small p-values usually takes thousands of permutations.
+    With ``tail_approximation="gpd"``, the upper tail of the null values is modeled with a
+    generalized Pareto distribution (GPD), following :footcite:t:`winkler2016faster`,
+    which gives accurate small p-values from several hundred permutations.
+    The GPD is fitted with probability-weighted moments :footcite:p:`hosking1987parameter` to
+    the null values above a threshold, starting at the 75th percentile and raised in steps of
+    5 percentiles until an Anderson-Darling test no longer rejects the fit (p > 0.05).
+    For a test value :math:`t` above the threshold :math:`u`, the p-value is
+    :math:`p = r \cdot (1 - F(t - u))`, where :math:`r` is the proportion of null values above
+    :math:`u` and :math:`F` is the fitted GPD.
+    P-values that underflow are set to the smallest representable p-value (machine epsilon).
+    A GPD with a negative shape parameter has an upper bound, and is not extrapolated beyond
+    the resolution of the null values: its p-values are floored at one over the number of
+    null values, like empirical p-values.
+    Lower values, lower- and two-tailed p-values, and null distributions without an acceptable
+    fit use the empirical null.
+
+    References
+    ----------
+    .. footbibliography::
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from nimare.stats import NullDistribution
+    >>> null = NullDistribution(values=np.arange(100))
+    >>> null.p(np.array([10, 90, 99]))
+    array([0.9 , 0.1 , 0.01])
+    >>> print(null.threshold_for_p(0.05))
+    95
+    """
+
+    def __init__(
+        self, values=None, histogram_weights=None, histogram_bins=None, tail_approximation=None
+    ):
+        if (values is None) == (histogram_weights is None):
+            raise ValueError("Exactly one of 'values' and 'histogram_weights' must be provided.")
+
+        if tail_approximation not in (None, "gpd"):
+            raise ValueError(
+                f"Unsupported tail approximation '{tail_approximation}'. Must be None or 'gpd'."
+            )
+
+        self.sorted_values_ = None
+        self.survival_ = None
+        self.histogram_bins = None
+        self._sorted_abs_values = None
+        self.tail_approximation = tail_approximation
+        self.tail_fit_ = None
+
+        if values is not None:
+            values = np.asarray(values)
+            if values.ndim not in (1, 2):
+                raise ValueError(f"'values' must be a 1D or 2D array, not {values.ndim}D.")
+
+            self.sorted_values_ = np.sort(values, axis=0)
+            self.voxelwise = values.ndim == 2
+
+            if tail_approximation is not None:
+                if self.voxelwise:
+                    raise ValueError("Tail approximation is only available for 1D null values.")
+
+                self.tail_fit_ = _fit_gpd_tail(self.sorted_values_)
+                if self.tail_fit_ is None:
+                    LGR.warning(
+                        "The generalized Pareto distribution did not fit the upper tail of the "
+                        "null distribution. Using empirical p-values instead."
+                    )
+
+        else:
+            if tail_approximation is not None:
+                raise ValueError("Tail approximation is only available for null values.")
+
+            if histogram_bins is None:
+                raise ValueError("'histogram_bins' must be provided with 'histogram_weights'.")
+
+            histogram_weights = np.asarray(histogram_weights)
+            histogram_bins = np.asarray(histogram_bins)
+            if histogram_bins.ndim != 1 or histogram_weights.ndim not in (1, 2):
+                raise ValueError(
+                    "'histogram_bins' must be a 1D array and 'histogram_weights' a 1D or 2D array."
+                )
+
+            if histogram_weights.shape[0] != histogram_bins.shape[0]:
+                raise ValueError(
+                    f"'histogram_weights' has {histogram_weights.shape[0]} bins, but "
+                    f"'histogram_bins' has {histogram_bins.shape[0]}."
+                )
+
+            # Convert histograms to null distributions
+            # The value in each bin represents the probability of finding a test value
+            # (stored in histogram_bins) of that value or higher.
+            survival = histogram_weights / np.sum(histogram_weights, axis=0)
+            survival = np.cumsum(survival[::-1], axis=0)[::-1]
+            survival /= np.max(survival, axis=0)
+            self.survival_ = survival
+            self.histogram_bins = histogram_bins
+            self.voxelwise = histogram_weights.ndim == 2
+            self._smallest_value = np.min(survival[survival != 0])
+
+    def __repr__(self):
+        """Summarize the null distribution."""
+        kind = "values" if self.survival_ is None else "histogram"
+        null = self.sorted_values_ if self.survival_ is None else self.survival_
+        return f"{type(self).__name__}({kind}, shape={null.shape})"
+
+    def _n_below(self, sorted_values, test_values, side):
+        """Count null values below (or at, if ``side`` is "right") each test value."""
+        if self.voxelwise:
+            return _searchsorted_columns(sorted_values, test_values, side=side)
+
+        return np.searchsorted(sorted_values, test_values, side=side)
+
+    def p(self, test_values, tail="upper", symmetric=False):
+        """Look up p-values for test values.
+
+        Parameters
+        ----------
+        test_values : :obj:`float` or array_like
+            Values for which to determine p-values.
+            For voxel-wise nulls, the last dimension must match the number of columns,
+            and each test value is compared to the null distribution of its column.
+        tail : {'upper', 'lower', 'two'}, optional
+            Whether higher ('upper') or lower ('lower') values are more significant,
+            or whether to compare values in a two-sided manner ('two').
+            Null histograms only support 'upper'. Default is 'upper'.
+        symmetric : :obj:`bool`, optional
+            When ``tail`` is 'two', whether to assume that the null distribution is centered on
+            zero and symmetric, as in :func:`null_to_p`. Default is False.
+
+        Returns
+        -------
+        p_values : :obj:`float` or :obj:`numpy.ndarray`
+            P-values, with the same shape as ``test_values``.
+        """
+        if tail not in {"two", "upper", "lower"}:
+            raise ValueError('Argument "tail" must be one of ["two", "upper", "lower"]')
+
+        test_values = np.asarray(test_values)
+        if self.survival_ is not None:
+            if tail != "upper":
+                raise ValueError("Null histograms only support one-sided ('upper') p-values.")
+
+            return self._p_from_histogram(test_values)[()]
+
+        # For efficiency's sake, if there are more than 1000 values, look up only the sorted
+        # unique values, and then reconstruct.
+        if not self.voxelwise and test_values.size > 1000:
+            uniq_values, uniq_idx = np.unique(test_values, return_inverse=True)
+            p_values = self._p_from_values(uniq_values, tail, symmetric)
+            return p_values[uniq_idx].reshape(test_values.shape)
+
+        return self._p_from_values(test_values, tail, symmetric)[()]
+
+    def _p_from_values(self, test_values, tail, symmetric):
+        """Look up p-values in the sorted null values."""
+        sorted_values = self.sorted_values_
+        n_values = sorted_values.shape[0]
+        if tail == "two" and symmetric:
+            if self._sorted_abs_values is None:
+                self._sorted_abs_values = np.sort(np.abs(sorted_values), axis=0)
+
+            idx = self._n_below(self._sorted_abs_values, np.abs(test_values), "left")
+            p = 1 - idx / n_values
+        else:
+            if tail in ("two", "upper"):
+                p_upper = 1 - self._n_below(sorted_values, test_values, "left") / n_values
+
+            if tail in ("two", "lower"):
+                n_above = n_values - self._n_below(sorted_values, test_values, "right")
+                p_lower = 1 - n_above / n_values
+
+            if tail == "two":
+                p = 2 * np.minimum(p_upper, p_lower)
+            else:
+                p = p_upper if tail == "upper" else p_lower
+
+        # ensure p_value in the following range:
+        # smallest_value <= p_value <= (1.0 - smallest_value)
+        smallest_value = np.maximum(np.finfo(float).eps, 1.0 / n_values)
+        p = np.maximum(smallest_value, np.minimum(p, 1.0 - smallest_value))
+
+        if tail == "upper" and self.tail_fit_ is not None:
+            # Replace empirical p-values in the tail with those of the fitted GPD
+            tail_fit = self.tail_fit_
+            p = np.array(p)
+            in_tail = test_values > tail_fit["threshold"]
+            p_tail = tail_fit["exceedance_rate"] * genpareto.sf(
+                test_values[in_tail] - tail_fit["threshold"],
+                tail_fit["shape"],
+                scale=tail_fit["scale"],
+            )
+            # Bounded tails are not extrapolated past the empirical resolution
+            p_floor = smallest_value if tail_fit["shape"] < 0 else np.finfo(float).eps
+            p[in_tail] = np.maximum(p_floor, p_tail)
+
+        return p
+
+    def _p_from_histogram(self, test_values):
+        """Look up one-sided p-values in the survival function of the null histogram."""
+        histogram_bins = self.histogram_bins
+        n_bins = len(histogram_bins)
+        inv_step = 1 / (histogram_bins[1] - histogram_bins[0])  # assume equal spacing
+
+        p_values = np.ones(test_values.shape)
+        idx = test_values > 0
+        value_bins = utils._round2(test_values[idx] * inv_step)
+        value_bins[value_bins >= n_bins] = n_bins - 1  # limit to within null distribution
+
+        # Get p-values by getting the value_bins-th value in the null distribution
+        if self.voxelwise:
+            # Pair each test value with its associated null distribution
+            columns = np.broadcast_to(np.arange(self.survival_.shape[1]), test_values.shape)
+            p_values[idx] = self.survival_[value_bins, columns[idx]]
+        else:
+            p_values[idx] = self.survival_[value_bins]
+
+        # ensure p_value in the following range:
+        # smallest_value <= p_value <= 1.0
+        return np.maximum(self._smallest_value, np.minimum(p_values, 1.0))
+
+    def threshold_for_p(self, p):
+        """Look up the statistic thresholds that correspond to one-sided p-values.
+
+        Parameters
+        ----------
+        p : :obj:`float` or array_like
+            P-values.
+            For voxel-wise nulls, the last dimension must match the number of columns.
+
+        Returns
+        -------
+        thresholds : :obj:`float` or :obj:`numpy.ndarray`
+            Statistic thresholds, with the same shape as ``p``.
+            For null values, this is the null value with a proportion ``p`` of the null values
+            at or above it, or the corresponding quantile of the fitted tail distribution for
+            p-values within the tail, if there is one.
+            For null histograms, this is the center of the bin before the first bin with a
+            probability at or below ``p``.
+        """
+        p = np.asarray(p)
+        if self.survival_ is None:
+            sorted_values = self.sorted_values_
+            n_values = sorted_values.shape[0]
+            idx = np.clip(n_values - np.floor(p * n_values).astype(int), 0, n_values - 1)
+            if self.voxelwise:
+                idx, columns = np.broadcast_arrays(idx, np.arange(sorted_values.shape[1]))
+                return sorted_values[idx, columns]
+
+            thresholds = sorted_values[idx]
+            if self.tail_fit_ is not None:
+                tail_fit = self.tail_fit_
+                in_tail = p < tail_fit["exceedance_rate"]
+                p_tail = p[in_tail]
+                if tail_fit["shape"] < 0:
+                    p_tail = np.maximum(p_tail, 1 / n_values)
+
+                thresholds = np.array(thresholds, dtype=float)
+                thresholds[in_tail] = tail_fit["threshold"] + genpareto.isf(
+                    p_tail / tail_fit["exceedance_rate"],
+                    tail_fit["shape"],
+                    scale=tail_fit["scale"],
+                )
+
+            return thresholds[()]
+
+        # Desired bin is the first one _before_ the target p-value (for uniformity
+        # with the montecarlo null).
+        # The survival function is non-increasing, so its negative can be binary-searched.
+        first_bin = self._n_below(-self.survival_, -p, "left")
+        return self.histogram_bins[np.maximum(0, first_bin - 1)][()]
@@ -30,3 +30,26 @@ def test_CogAtLemmatizer():
     true_text = "trm_4aae62e4ad209 is great"
     test_text = "Cognitive control is great"
     assert lem.transform(test_text) == true_text
+
+
+def test_extract_cogat_precedence():
+    """Check that aliases are counted and replaced in order of precedence."""
+    id_df = pd.DataFrame(
+        {
+            "id": ["trm_a", "trm_b", "trm_c"],
+            "name": ["working memory", "memory", "memory task"],
+            "alias": ["working memory", "memory task", "memory"],
+        }
+    )
+    text_df = pd.DataFrame(
+        {
+            "id": ["study-1", "study-2", "study-3"],
+            "abstract": ["Working memory task and memory.", "A memory task.", None],
+        }
+    )
+    counts_df, rep_text_df = annotate.cogat.extract_cogat(text_df, id_df, n_cores=2)
+    assert counts_df.loc["study-1"].tolist() == [1, 0, 1]
+    assert counts_df.loc["study-2"].tolist() == [0, 1, 0]
+    assert counts_df.loc["study-3"].sum() == 0
+    assert rep_text_df.loc["study-1", "abstract"] == "trm_a task and trm_c."
+    assert rep_text_df.loc["study-2", "abstract"] == "A trm_b."
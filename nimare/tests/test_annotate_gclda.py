@@ -4,6 +4,7 @@ import nibabel as nib
 import numpy as np
 import pandas as pd
 import pytest
+from joblib import Parallel
 
 from nimare import annotate, decode
 
@@ -51,6 +52,24 @@ def test_gclda_symmetric(testdata_laird):
     encoded_img, _ = decode.encode.gclda_encode(model, "fmri activation")
     assert isinstance(encoded_img, nib.Nifti1Image)
 
+    # Batch encoding and decoding should match the single-input functions
+    encoded_imgs, topic_weights = decode.encode.gclda_encode_texts(
+        model, ["fmri activation", "fmri"]
+    )
+    assert encoded_imgs.shape[3] == 2
+    assert np.allclose(encoded_imgs.get_fdata()[..., 0], encoded_img.get_fdata())
+
+    batch_df, batch_weights = decode.continuous.gclda_decode_maps(model, [mask_img, mask_img])
+    assert batch_weights.shape == (2, model.params["n_topics"])
+    assert len(batch_df) == 2 * len(model.vocabulary)
+    assert np.allclose(
+        batch_df.loc[batch_df["image"] == 1, "Weight"].values,
+        decoded_df["Weight"].values,
+    )
+    top_df, _ = decode.continuous.gclda_decode_maps(model, [mask_img, mask_img], top_k=3)
+    assert top_df.shape == (6, 3)
+    assert np.isclose(top_df["Weight"].iloc[0], decoded_df["Weight"].max())
+
 
 def test_gclda_asymmetric(testdata_laird):
     """A smoke test for GCLDA with three asymmetric regions."""
@@ -84,3 +103,185 @@ def test_gclda_asymmetric(testdata_laird):
     # Encode text
     encoded_img, _ = decode.encode.gclda_encode(model, "fmri activation")
     assert isinstance(encoded_img, nib.Nifti1Image)
+
+
+def test_gclda_sampler_state(testdata_laird):
+    """Check that the compiled samplers are reproducible and keep the count matrices in sync."""
+    counts_df = annotate.text.generate_counts(
+        testdata_laird.texts,
+        text_column="abstract",
+        tfidf=False,
+        min_df=1,
+        max_df=1.0,
+    )
+    models = []
+    for _ in range(2):
+        model = annotate.gclda.GCLDAModel(
+            counts_df,
+            testdata_laird.coordinates,
+            mask=testdata_laird.masker.mask_img,
+            n_topics=10,
+            n_regions=2,
+            symmetric=True,
+        )
+        model.fit(n_iters=3, loglikely_freq=3)
+        models.append(model)
+
+    for key in ["wtoken_topic_idx", "peak_topic_idx", "peak_region_idx"]:
+        assert np.array_equal(models[0].topics[key], models[1].topics[key])
+
+    model = models[0]
+    n_topics = model.params["n_topics"]
+    assert model.topics["n_word_tokens_word_by_topic"].dtype == np.int32
+
+    wtoken_topics = model.topics["wtoken_topic_idx"]
+    assert np.array_equal(
+        model.topics["total_n_word_tokens_by_topic"][0],
+        np.bincount(wtoken_topics, minlength=n_topics),
+    )
+    n_word_tokens_doc_by_topic = np.zeros_like(model.topics["n_word_tokens_doc_by_topic"])
+    np.add.at(n_word_tokens_doc_by_topic, (model.data["wtoken_doc_idx"], wtoken_topics), 1)
+    assert np.array_equal(n_word_tokens_doc_by_topic, model.topics["n_word_tokens_doc_by_topic"])
+
+    n_peak_tokens_region_by_topic = np.zeros_like(model.topics["n_peak_tokens_region_by_topic"])
+    np.add.at(
+        n_peak_tokens_region_by_topic,
+        (model.topics["peak_region_idx"], model.topics["peak_topic_idx"]),
+        1,
+    )
+    assert np.array_equal(
+        n_peak_tokens_region_by_topic, model.topics["n_peak_tokens_region_by_topic"]
+    )
+
+
+def test_gclda_log_likelihood(testdata_laird):
+    """Compare the batched log-likelihood against a token-by-token computation."""
+    from scipy.stats import multivariate_normal
+
+    counts_df = annotate.text.generate_counts(
+        testdata_laird.texts,
+        text_column="abstract",
+        tfidf=False,
+        min_df=1,
+        max_df=1.0,
+    )
+    model = annotate.gclda.GCLDAModel(
+        counts_df,
+        testdata_laird.coordinates,
+        mask=testdata_laird.masker.mask_img,
+        n_topics=5,
+        n_regions=3,
+        symmetric=False,
+    )
+    model.fit(n_iters=2, loglikely_freq=1)
+    assert len(model.loglikelihood["total"]) == 3
+    x_loglikely, w_loglikely, tot_loglikely = model.compute_log_likelihood(update_vectors=False)
+    assert np.isclose(tot_loglikely, model.loglikelihood["total"][-1])
+
+    topics, params = model.topics, model.params
+    docprobs_y = topics["n_peak_tokens_doc_by_topic"] + params["alpha"]
+    docprobs_y = docprobs_y / docprobs_y.sum(axis=1, keepdims=True)
+    docprobs_z = topics["n_peak_tokens_doc_by_topic"] + params["gamma"]
+    docprobs_z = docprobs_z / docprobs_z.sum(axis=1, keepdims=True)
+    regionprobs = topics["n_peak_tokens_region_by_topic"] + params["delta"]
+    regionprobs = regionprobs / regionprobs.sum(axis=0)
+    wordprobs = topics["n_word_tokens_word_by_topic"] + params["beta"]
+    wordprobs = wordprobs / wordprobs.sum(axis=0)
+
+    true_x_loglikely = np.zeros(len(model.data["ptoken_doc_idx"]))
+    for i_ptoken, (doc, xyz) in enumerate(
+        zip(model.data["ptoken_doc_idx"], model.data["ptoken_coords"])
+    ):
+        p_x = 0
+        for i_topic in range(params["n_topics"]):
+            for j_region in range(params["n_regions"]):
+                p_x += (
+                    docprobs_y[doc, i_topic]
+                    * regionprobs[j_region, i_topic]
+                    * multivariate_normal.pdf(
+                        xyz,
+                        mean=topics["regions_mu"][i_topic, j_region, 0, :],
+                        cov=topics["regions_sigma"][i_topic, j_region, ...],
+                    )
+                )
+        true_x_loglikely[i_ptoken] = np.log(p_x)
+
+    p_wtoken_g_doc = docprobs_z @ wordprobs.T
+    true_w_loglikely = np.log(
+        p_wtoken_g_doc[model.data["wtoken_doc_idx"], model.data["wtoken_word_idx"]]
+    )
+    assert np.isclose(x_loglikely, true_x_loglikely.sum())
+    assert np.isclose(w_loglikely, true_w_loglikely.sum())
+
+    # A model of a subset of the documents, whose document and word indices differ from the
+    # current model's, is evaluated with the current model's probabilities for those documents
+    sliced_ids = model.ids[1::2]
+    sliced_model = annotate.gclda.GCLDAModel(
+        counts_df.loc[sliced_ids],
+        testdata_laird.coordinates.loc[testdata_laird.coordinates["id"].isin(sliced_ids)],
+        mask=testdata_laird.masker.mask_img,
+        n_topics=5,
+        n_regions=3,
+        symmetric=False,
+    )
+    assert len(sliced_model.vocabulary) < len(model.vocabulary)
+    sliced_x_loglikely, sliced_w_loglikely, _ = model.compute_log_likelihood(sliced_model)
+    in_slice = np.isin(np.array(model.ids), sliced_ids)
+    assert np.isclose(
+        sliced_x_loglikely, true_x_loglikely[in_slice[model.data["ptoken_doc_idx"]]].sum()
+    )
+    assert np.isclose(
+        sliced_w_loglikely, true_w_loglikely[in_slice[model.data["wtoken_doc_idx"]]].sum()
+    )
+
+
+def test_gclda_parallel(testdata_laird):
+    """Check that approximate distributed sampling keeps the global counts consistent."""
+    counts_df = annotate.text.generate_counts(
+        testdata_laird.texts,
+        text_column="abstract",
+        tfidf=False,
+        min_df=1,
+        max_df=1.0,
+    )
+    model = annotate.gclda.GCLDAModel(
+        counts_df,
+        testdata_laird.coordinates,
+        mask=testdata_laird.masker.mask_img,
+        n_topics=10,
+        n_regions=2,
+        symmetric=True,
+    )
+    with pytest.raises(ValueError):
+        model.fit(n_iters=3, n_cores=2, sync_freq=0)
+
+    model.fit(n_iters=3, loglikely_freq=1, n_cores=2, sync_freq=2)
+    assert model.iter == 3
+
+    # Run the parallel sampler directly, since the number of available cores may be limited
+    doc_partitions = model._partition_documents(2)
+    assert len(doc_partitions) == 2
+    assert np.array_equal(np.sort(np.concatenate(doc_partitions)), np.arange(len(model.ids)))
+    with Parallel(n_jobs=2) as parallel:
+        model._update_parallel(parallel, doc_partitions, n_sweeps=2, loglikely_freq=2)
+    assert model.iter == 5
+    assert model.loglikelihood["iter"][-1] == 4
+
+    n_topics = model.params["n_topics"]
+    wtoken_topics = model.topics["wtoken_topic_idx"]
+    n_word_tokens_word_by_topic = np.zeros_like(model.topics["n_word_tokens_word_by_topic"])
+    np.add.at(n_word_tokens_word_by_topic, (model.data["wtoken_word_idx"], wtoken_topics), 1)
+    assert np.array_equal(n_word_tokens_word_by_topic, model.topics["n_word_tokens_word_by_topic"])
+    assert np.array_equal(
+        model.topics["total_n_word_tokens_by_topic"][0],
+        np.bincount(wtoken_topics, minlength=n_topics),
+    )
+    n_peak_tokens_doc_by_topic = np.zeros_like(model.topics["n_peak_tokens_doc_by_topic"])
+    np.add.at(
+        n_peak_tokens_doc_by_topic,
+        (model.data["ptoken_doc_idx"], model.topics["peak_topic_idx"]),
+        1,
+    )
+    assert np.array_equal(n_peak_tokens_doc_by_topic, model.topics["n_peak_tokens_doc_by_topic"])
+    assert model.topics["n_peak_tokens_region_by_topic"].sum() == len(model.data["ptoken_doc_idx"])
+    assert model.p_topic_g_voxel_.shape[1] == n_topics
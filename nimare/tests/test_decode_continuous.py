@@ -30,6 +30,35 @@ def test_CorrelationDecoder_smoke(testdata_laird, tmp_path_factory):
 
     assert isinstance(decoded_df, pd.DataFrame)
 
+    # Test: batch decoding matches single-image decoding
+    batch_df = decoder.transform_batch([img, img], dtype="float32")
+    assert list(batch_df.columns) == ["image", "feature", "r"]
+    assert len(batch_df) == 2 * len(decoded_df)
+    assert np.allclose(
+        batch_df.loc[batch_df["image"] == 1, "r"].values,
+        decoded_df["r"].values,
+        atol=1e-5,
+    )
+    top_df = decoder.transform_batch([img, img], top_k=2)
+    assert len(top_df) == 4
+    assert top_df["feature"].iloc[0] == decoded_df["r"].idxmax()
+
+    # Test: standardized maps are cached for each dtype, so they are reused when alternating
+    assert set(decoder._standardized_maps) == {np.dtype("float32"), np.dtype("float64")}
+    maps_std = {dtype: cache[1] for dtype, cache in decoder._standardized_maps.items()}
+    decoder.transform(img)
+    decoder.transform_batch([img], dtype="float32")
+    for dtype, cache in decoder._standardized_maps.items():
+        assert cache[1] is maps_std[dtype]
+
+    # Test: cached standardized maps are not saved, and are recomputed after loading
+    decoder_file = os.path.join(tmp_path_factory.mktemp("test_CorrelationDecoder"), "dec.pkl.gz")
+    decoder.save(decoder_file)
+    loaded_decoder = continuous.CorrelationDecoder.load(decoder_file)
+    assert decoder._standardized_maps is not None
+    assert not hasattr(loaded_decoder, "_standardized_maps")
+    assert loaded_decoder.transform(img).equals(decoded_df)
+
     # Get features and images to compare with other methods
     features = list(decoder.results_.maps.keys())
     images = np.array(list(decoder.results_.maps.values()))
@@ -126,6 +155,22 @@ def test_CorrelationDistributionDecoder_smoke(testdata_laird, tmp_path_factory):
 
     assert isinstance(decoded_df, pd.DataFrame)
 
+    # Test: batch decoding matches single-image decoding
+    batch_df = decoder.transform_batch([img, img], top_k=2)
+    assert list(batch_df.columns) == ["image", "feature", "mean", "std"]
+    assert len(batch_df) == 4
+    assert np.allclose(
+        batch_df.loc[batch_df["image"] == 0, "mean"].values,
+        decoded_df["mean"].sort_values(ascending=False).values[:2],
+    )
+
+    # Test: single-image decoding does not evict the maps cached for another dtype
+    decoder.transform_batch([img], dtype="float32")
+    maps_std = decoder._standardized_maps[np.dtype("float32")][1]
+    assert decoder.transform(img).equals(decoded_df)
+    decoder.transform_batch([img], dtype="float32")
+    assert decoder._standardized_maps[np.dtype("float32")][1] is maps_std
+
     # Test: try transforming an image without fitting the decoder
     decoder2 = decoder = continuous.CorrelationDistributionDecoder()
     with pytest.raises(AttributeError):
@@ -3,6 +3,7 @@
 Tests for nimare.decode.discrete.gclda_decode_roi are in test_annotate_gclda.
 """
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -48,6 +49,28 @@ def test_NeurosynthDecoder(testdata_laird):
     assert decoded_df.shape == (len(labels), 6)
 
 
+def test_NeurosynthDecoder_batch(testdata_laird):
+    """Check that batch decoding matches decoding each selection separately."""
+    selections = {"first": testdata_laird.ids[:5], "second": testdata_laird.ids[5:15]}
+    labels = testdata_laird.get_labels(ids=testdata_laird.ids)
+    decoder = discrete.NeurosynthDecoder(features=labels, correction="bonferroni")
+    decoder.fit(testdata_laird)
+    batch_df = decoder.transform_batch(selections)
+    assert batch_df.shape == (2 * len(labels), 8)
+    for label, ids in selections.items():
+        decoded_df = decoder.transform(ids=ids)
+        sel_df = batch_df.loc[batch_df["selection"] == label].set_index("Term")
+        assert np.allclose(sel_df[decoded_df.columns].values, decoded_df.values, equal_nan=True)
+
+    with pytest.raises(ValueError):
+        decoder.transform_batch(list(selections.values()), selections2=[testdata_laird.ids])
+
+    # An empty batch of selections gives an empty table with the same columns
+    empty_df = decoder.transform_batch({})
+    assert empty_df.empty
+    assert list(empty_df.columns) == list(batch_df.columns)
+
+
 def test_NeurosynthDecoder_featuregroup(testdata_laird):
     """Smoke test for discrete.NeurosynthDecoder with feature group selection."""
     ids = testdata_laird.ids[:5]
@@ -75,6 +98,32 @@ def test_BrainMapDecoder(testdata_laird):
     assert decoded_df.shape == (len(labels), 6)
 
 
+def test_BrainMapDecoder_batch(testdata_laird):
+    """Check batch BrainMap decoding against decoding each selection with the function."""
+    selections = [testdata_laird.ids[:5], testdata_laird.ids[5:15]]
+    selections2 = [testdata_laird.ids[5:], testdata_laird.ids[:5]]
+    labels = testdata_laird.get_labels(ids=testdata_laird.ids)
+    decoder = discrete.BrainMapDecoder(features=labels, correction=None)
+    decoder.fit(testdata_laird)
+    batch_df = decoder.transform_batch(selections, selections2=selections2)
+    assert batch_df.shape == (2 * len(labels), 8)
+    for i_sel, (ids, ids2) in enumerate(zip(selections, selections2)):
+        decoded_df = discrete.brainmap_decode(
+            testdata_laird.coordinates,
+            testdata_laird.annotations,
+            ids=ids,
+            ids2=ids2,
+            features=labels,
+            correction=None,
+        )
+        sel_df = batch_df.loc[batch_df["selection"] == i_sel].set_index("Term")
+        assert np.allclose(sel_df[decoded_df.columns].values, decoded_df.values, equal_nan=True)
+
+    empty_df = decoder.transform_batch([], selections2=[])
+    assert empty_df.empty
+    assert list(empty_df.columns) == list(batch_df.columns)
+
+
 def test_BrainMapDecoder_failure(testdata_laird):
     """Smoke test for discrete.BrainMapDecoder where there are no features left."""
     decoder = discrete.BrainMapDecoder(features=["doggy"])
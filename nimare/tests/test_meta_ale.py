@@ -2,16 +2,21 @@
 
 import os
 import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import nibabel as nib
 import numpy as np
 import pytest
+import scipy.sparse
 from nilearn.input_data import NiftiLabelsMasker
 
 import nimare
 from nimare.correct import FDRCorrector, FWECorrector
-from nimare.meta import ale
+from nimare.meta import ale, kernel
+from nimare.meta.utils import _get_iteration_rng, _get_random_seed
 from nimare.results import MetaResult
+from nimare.stats import null_to_p, nullhist_to_p
 from nimare.tests.utils import get_test_data_path
 from nimare.utils import vox2mm
 
@@ -40,6 +45,8 @@ def test_ALE_approximate_null_unit(testdata_cbma, tmp_path_factory):
         assert os.path.isfile(est_out_file)
         meta2 = ale.ALE.load(est_out_file, compressed=compress)
         assert isinstance(meta2, ale.ALE)
+        null = meta2.null_distributions_["nulldist_corr-none_method-approximate"]
+        assert np.array_equal(null.p(results.maps["stat"]), results.maps["p"])
         if compress:
             with pytest.raises(pickle.UnpicklingError):
                 ale.ALE.load(est_out_file, compressed=(not compress))
@@ -285,6 +292,86 @@ def test_SCALE_smoke(testdata_cbma, tmp_path_factory):
     assert os.path.isfile(out_file)
 
 
+@pytest.mark.parametrize("n_iters", [10, 11])
+def test_ALESubtraction_null_counts(n_iters):
+    """Check that streamed null summaries reproduce p-values from the full null distributions."""
+    rng = np.random.default_rng(0)
+    # Round values to get ties between observed and permuted scores
+    diff_values = np.round(rng.normal(size=500), 1)
+    iter_diff_values = np.round(rng.normal(size=(n_iters, 500)), 1)
+    iter_diff_values[:, :50] = diff_values[:50]
+
+    meta = ale.ALESubtraction(n_iters=n_iters)
+    null_counts = meta._init_null_counts(diff_values, iter_diff_values.dtype)
+    for block in np.array_split(iter_diff_values, 3):
+        meta._update_null_counts(null_counts, diff_values, block)
+
+    p_values, diff_signs = meta._null_counts_to_p(null_counts, diff_values)
+    true_p_values = np.array(
+        [
+            null_to_p(diff_values[i_voxel], iter_diff_values[:, i_voxel], tail="two")
+            for i_voxel in range(500)
+        ]
+    )
+    assert np.array_equal(p_values, true_p_values)
+    assert np.array_equal(diff_signs, np.sign(diff_values - np.median(iter_diff_values, axis=0)))
+
+
+def test_ALESubtraction_run_permutations():
+    """Check the matrix-product permutations against ALE values computed directly."""
+    rng = np.random.default_rng(0)
+    n_exps, n_voxels, n_grp1 = 12, 300, 5
+    ma_values = rng.uniform(0, 0.1, size=(n_exps, n_voxels))
+
+    in_grp1 = np.zeros((21, n_exps), dtype=bool)
+    for i_row in range(in_grp1.shape[0]):
+        in_grp1[i_row, rng.permutation(n_exps)[:n_grp1]] = True
+    # A permutation that reproduces the observed groups
+    in_grp1[-1] = in_grp1[0]
+
+    meta = ale.ALESubtraction(n_iters=in_grp1.shape[0] - 1)
+    null_counts = meta._run_permutations(scipy.sparse.csc_matrix(ma_values), in_grp1)
+
+    diff_values = np.array(
+        [
+            (1 - np.prod(1 - ma_values[grp1], axis=0))
+            - (1 - np.prod(1 - ma_values[~grp1], axis=0))
+            for grp1 in in_grp1
+        ]
+    )
+    assert np.allclose(null_counts["diff_values"], diff_values[0], rtol=1e-4)
+    assert np.array_equal(null_counts["n_below"], np.sum(diff_values[1:-1] < diff_values[0], 0))
+    assert np.array_equal(null_counts["n_above"], np.sum(diff_values[1:-1] > diff_values[0], 0))
+
+
+def test_SCALE_null_counts():
+    """Check that streamed null summaries reproduce p-values from the full null histograms."""
+    rng = np.random.default_rng(0)
+    histogram_bins = np.round(np.arange(0, 0.05 + 0.001, 0.0001), 4)
+    stat_values = rng.uniform(0, 0.05, size=500)
+    stat_values[:50] = 0
+    scale_values = rng.uniform(0, 0.05, size=(20, 500))
+    scale_values[rng.random(scale_values.shape) < 0.3] = 0
+    scale_values[:, -50:] = 0
+
+    meta = ale.SCALE(np.zeros((1, 3)), n_iters=20)
+    meta.null_distributions_ = {"histogram_bins": histogram_bins}
+    null_counts = meta._init_null_counts(stat_values)
+    for iter_values in scale_values:
+        meta._update_null_counts(null_counts, iter_values)
+
+    p_values, _ = meta._scale_to_p(stat_values, null_counts)
+    true_p_values = np.zeros(500)
+    for i_voxel in range(500):
+        voxel_null = scale_values[:, i_voxel]
+        scale_hist = np.zeros(len(histogram_bins))
+        scale_hist[0] = np.sum(voxel_null == 0)
+        scale_hist[1:] = np.histogram(voxel_null[voxel_null != 0], bins=histogram_bins)[0]
+        true_p_values[i_voxel] = nullhist_to_p(stat_values[i_voxel], scale_hist, histogram_bins)
+
+    assert np.allclose(p_values, true_p_values)
+
+
 def test_ALE_non_nifti_masker(testdata_cbma):
     """Unit test for ALE with non-NiftiMasker.
 
@@ -296,3 +383,209 @@ def test_ALE_non_nifti_masker(testdata_cbma):
 
     with pytest.raises(ValueError):
         meta.fit(testdata_cbma)
+
+
+def test_ALE_precision(testdata_cbma):
+    """Single-precision MA maps should give nearly the same results as double precision."""
+    results = ale.ALE().fit(testdata_cbma)
+    meta = ale.ALE(precision="single")
+    assert meta.kernel_transformer.precision == "single"
+
+    single_results = meta.fit(testdata_cbma)
+    for map_name in ["stat", "p", "z"]:
+        assert single_results.maps[map_name].dtype == np.float64
+        assert np.allclose(single_results.maps[map_name], results.maps[map_name], atol=1e-6)
+
+
+def test_ALE_update(testdata_cbma_full):
+    """Adding and removing experiments should match refitting ALE to the updated Dataset."""
+    ids = testdata_cbma_full.ids
+    dset1, dset2 = testdata_cbma_full.slice(ids[:12]), testdata_cbma_full.slice(ids[12:])
+
+    meta = ale.ALE()
+    meta.fit(dset1)
+    results = meta.update(dset2)
+    full_results = ale.ALE().fit(testdata_cbma_full)
+    assert sorted(meta.inputs_["id"]) == sorted(full_results.estimator.inputs_["id"])
+    for map_name in ["stat", "p", "z"]:
+        assert np.allclose(results.maps[map_name], full_results.maps[map_name])
+
+    results = meta.update(remove_ids=ids[12:])
+    sub_results = ale.ALE().fit(dset1)
+    for map_name in ["stat", "p", "z"]:
+        assert np.allclose(results.maps[map_name], sub_results.maps[map_name])
+
+    with pytest.raises(ValueError):
+        meta.update(dset1)
+
+    # Nulls from an earlier Monte Carlo correction depend on the previous experiments
+    corr = FWECorrector(method="montecarlo", n_iters=5, n_cores=1)
+    estimator = corr.transform(results).estimator
+    assert "values_level-voxel_corr-fwe_method-montecarlo" in estimator.null_distributions_
+    estimator.update(remove_ids=ids[10:12])
+    assert not [key for key in estimator.null_distributions_ if "corr-fwe" in key]
+
+    with pytest.raises(ValueError):
+        ale.ALE(null_method="montecarlo", n_iters=5).fit(dset1).estimator.update(dset2)
+
+    # Kernels with MA values above one cannot be summarized with log(1 - MA) values
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        meta = ale.ALE(kernel_transformer=kernel.KDAKernel)
+        meta.fit(dset1)
+
+    assert meta.accumulators_ is None
+    with pytest.raises(ValueError):
+        meta.update(dset2)
+
+
+def test_montecarlo_iteration_streams(testdata_cbma):
+    """Check that each Monte Carlo iteration only depends on the root seed and its index."""
+    dset = testdata_cbma.slice(testdata_cbma.ids[:5])
+    meta = ale.ALE(null_method="approximate")
+    results = meta.fit(dset)
+
+    np.random.seed(0)
+    corr = FWECorrector(method="montecarlo", n_iters=3, vfwe_only=True, n_cores=1)
+    cres = corr.transform(results)
+    voxel_max = cres.estimator.null_distributions_["values_level-voxel_corr-fwe_method-montecarlo"]
+
+    # Run the last iteration alone
+    np.random.seed(0)
+    seed = _get_random_seed()
+    mask_idx = np.flatnonzero(meta.masker.mask_img.get_fdata())
+    iter_max_value, _, _ = meta._correct_fwe_montecarlo_permutation(
+        2,
+        seed,
+        mask_idx,
+        meta.inputs_["coordinates"],
+        conn=None,
+        voxel_thresh=None,
+        vfwe_only=True,
+    )
+    assert iter_max_value == voxel_max[2]
+
+    # SCALE draws from its own coordinates
+    mask_img = meta.masker.mask_img
+    xyz = vox2mm(np.vstack(np.where(mask_img.get_fdata())).T, mask_img.affine)[:20, :]
+    iter_df = meta.inputs_["coordinates"].copy()
+    scale = ale.SCALE(xyz, n_iters=3, n_cores=1)
+    scale.masker = meta.masker
+    iter_stat_values = scale._run_permutation(1, seed, iter_df)
+    # The shared coordinates are not changed, so that workers in threads can use them
+    assert iter_df.equals(meta.inputs_["coordinates"])
+
+    rng = _get_iteration_rng(seed, 1)
+    iter_df[["x", "y", "z"]] = xyz[rng.integers(xyz.shape[0], size=iter_df.shape[0])]
+    assert np.array_equal(iter_stat_values, scale._compute_summarystat_est(iter_df))
+
+
+def test_ALE_tail_approximation(testdata_cbma, caplog):
+    """Check the tail approximation option of Monte Carlo FWE correction."""
+    dset = testdata_cbma.slice(testdata_cbma.ids[:5])
+    results = ale.ALE(null_method="approximate").fit(dset)
+
+    np.random.seed(0)
+    cres = FWECorrector(method="montecarlo", n_iters=5, n_cores=1).transform(results)
+    np.random.seed(0)
+    with caplog.at_level("WARNING", logger="nimare.stats"):
+        corr = FWECorrector(method="montecarlo", n_iters=5, n_cores=1, tail_approximation="gpd")
+        cres_gpd = corr.transform(results)
+
+    nulls = cres_gpd.estimator.null_distributions_
+    for null_key in [
+        "nulldist_level-voxel_corr-fwe_method-montecarlo",
+        "nulldist_desc-size_level-cluster_corr-fwe_method-montecarlo",
+        "nulldist_desc-mass_level-cluster_corr-fwe_method-montecarlo",
+    ]:
+        assert nulls[null_key].tail_approximation == "gpd"
+        # Five iterations are too few to fit the tail, so empirical p-values are used
+        assert nulls[null_key].tail_fit_ is None
+
+    assert "did not fit" in caplog.text
+    assert "winkler2016faster" in cres_gpd.description_
+    for map_name in cres.maps:
+        assert np.array_equal(cres.maps[map_name], cres_gpd.maps[map_name])
+
+
+def test_ALE_threads_backend(testdata_cbma):
+    """Check that workers in threads give the same results as the default backend."""
+    dset = testdata_cbma.slice(testdata_cbma.ids[:5])
+
+    np.random.seed(0)
+    results = ale.ALE(null_method="montecarlo", n_iters=3).fit(dset)
+    cres = FWECorrector(method="montecarlo", n_iters=3, n_cores=1).transform(results)
+
+    np.random.seed(0)
+    meta = ale.ALE(null_method="montecarlo", n_iters=3, backend="threads")
+    assert meta.backend == "threading"
+    results_threads = meta.fit(dset)
+    corr = FWECorrector(method="montecarlo", n_iters=3, n_cores=1, backend="threads")
+    cres_threads = corr.transform(results_threads)
+
+    for null_key in [
+        "histweights_corr-none_method-montecarlo",
+        "values_level-voxel_corr-fwe_method-montecarlo",
+        "values_desc-size_level-cluster_corr-fwe_method-montecarlo",
+        "values_desc-mass_level-cluster_corr-fwe_method-montecarlo",
+    ]:
+        assert np.array_equal(
+            cres.estimator.null_distributions_[null_key],
+            cres_threads.estimator.null_distributions_[null_key],
+        )
+
+    for map_name in cres.maps:
+        assert np.array_equal(cres.maps[map_name], cres_threads.maps[map_name])
+
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        ale.ALE(backend="dask-but-not-registered")
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Thread pool that counts the tasks submitted to it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.n_submitted = 0
+
+    def submit(self, *args, **kwargs):
+        """Count and submit a task."""
+        self.n_submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_ALE_executor_backend(testdata_cbma):
+    """Check that permutations submitted to an Executor give the same results."""
+    dset = testdata_cbma.slice(testdata_cbma.ids[:5])
+    results = ale.ALE(null_method="approximate").fit(dset)
+
+    np.random.seed(0)
+    cres = FWECorrector(method="montecarlo", n_iters=3, n_cores=1).transform(results)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        np.random.seed(0)
+        corr = FWECorrector(method="montecarlo", n_iters=3, backend=executor)
+        cres_executor = corr.transform(results)
+
+        # Executors are left out of pickled objects, and shared by copies
+        meta = ale.ALE(null_method="montecarlo", n_iters=3, backend=executor)
+        assert meta.backend is executor
+        assert pickle.loads(pickle.dumps(meta)).backend is None
+        assert cres_executor.corrector.parameters["backend"] is executor
+        assert cres_executor.copy().corrector.parameters["backend"] is executor
+
+    for map_name in cres.maps:
+        assert np.array_equal(cres.maps[map_name], cres_executor.maps[map_name])
+
+    # Correcting a fitted result uses the Estimator's Executor
+    with _CountingExecutor(max_workers=2) as executor:
+        results = ale.ALE(null_method="approximate", backend=executor).fit(dset)
+        assert results.estimator.backend is executor
+
+        np.random.seed(0)
+        cres_executor = FWECorrector(method="montecarlo", n_iters=3).transform(results)
+        assert executor.n_submitted > 0
+        assert cres_executor.estimator.backend is executor
+
+    for map_name in cres.maps:
+        assert np.array_equal(cres.maps[map_name], cres_executor.maps[map_name])
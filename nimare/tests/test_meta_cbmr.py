@@ -3,6 +3,7 @@
 import logging
 import warnings
 
+import numpy as np
 import pytest
 
 try:
@@ -171,6 +172,64 @@ def test_moderators_none(testdata_cbmr_simulated):
     assert isinstance(inference_results, nimare.results.MetaResult)
 
 
+def test_cbmr_n_cores(testdata_cbmr_simulated):
+    """Test parallel group-wise CBMR fitting and a multiple-contrast GLH test."""
+    cbmr = CBMREstimator(
+        group_categories=["diagnosis", "drug_status"],
+        moderators=None,
+        spline_spacing=100,
+        model=models.PoissonEstimator,
+        lr=1,
+        tol=1e4,
+        device="cpu",
+        n_cores=2,
+    )
+    res = cbmr.fit(dataset=testdata_cbmr_simulated)
+    for group in cbmr.groups:
+        assert (
+            cbmr.inputs_["foci_per_voxel"][group].sum()
+            == cbmr.inputs_["foci_per_study"][group].sum()
+        )
+
+    inference = CBMRInference(device="cpu")
+    inference.fit(res)
+    inference_results = inference.transform(t_con_groups=[np.eye(len(cbmr.groups))])
+    chi_sq = inference_results.maps["chiSquare_GLH_groups_0"]
+    assert chi_sq.shape == (cbmr.inputs_["coef_spline_bases"].shape[0],)
+    assert np.all(chi_sq >= 0)
+
+
+def test_cbmr_n_cores_dotted_groups(testdata_cbmr_simulated):
+    """Test parallel group-wise CBMR fitting with "." in group names."""
+    dset = testdata_cbmr_simulated.copy()
+    dset.annotations["diagnosis"] = dset.annotations["diagnosis"] + ".v1"
+    cbmr = CBMREstimator(
+        group_categories="diagnosis",
+        moderators=None,
+        spline_spacing=100,
+        model=models.NegativeBinomialEstimator,
+        lr=1,
+        tol=1e4,
+        device="cpu",
+        n_cores=2,
+    )
+    res = cbmr.fit(dataset=dset)
+    assert all("." in group for group in cbmr.groups)
+    assert set(res.tables["spatial_regression_coef"].index) == set(cbmr.groups)
+
+    # Each group model is initialized with the joint model's parameters for that group
+    for group in cbmr.groups:
+        group_model = cbmr.model._group_model(group)
+        group_key = models._group_key(group)
+        assert torch.equal(
+            group_model.spatial_coef_linears[group_key].weight,
+            cbmr.model.spatial_coef_linears[group_key].weight,
+        )
+        assert torch.equal(
+            group_model.overdispersion[group_key], cbmr.model.overdispersion[group_key]
+        )
+
+
 def test_CBMREstimator_update(testdata_cbmr_simulated):
     """Unit test for CBMR estimator update function."""
     testdata_cbmr_simulated = StandardizeField(
@@ -223,7 +282,7 @@ def test_CBMREstimator_update(testdata_cbmr_simulated):
 
     cbmr.model._update(
         optimizer,
-        torch.tensor(cbmr.inputs_["coef_spline_bases"], dtype=torch.float64, device=cbmr.device),
+        cbmr.model._spline_bases_tensor(cbmr.inputs_["coef_spline_bases"]),
         moderators_by_group_tensor,
         foci_per_voxel_tensor,
         foci_per_study_tensor,
@@ -239,9 +298,7 @@ def test_CBMREstimator_update(testdata_cbmr_simulated):
     with pytest.raises(ValueError):
         cbmr.model._update(
             optimizer,
-            torch.tensor(
-                cbmr.inputs_["coef_spline_bases"], dtype=torch.float64, device=cbmr.device
-            ),
+            cbmr.model._spline_bases_tensor(cbmr.inputs_["coef_spline_bases"]),
             moderators_by_group_tensor,
             foci_per_voxel_tensor,
             foci_per_study_tensor,
@@ -249,6 +306,82 @@ def test_CBMREstimator_update(testdata_cbmr_simulated):
         )
 
 
+def test_sparse_spline_bases(testdata_cbmr_simulated, model):
+    """Check that sparse and dense B-spline designs give the same Fisher information."""
+    cbmr = CBMREstimator(
+        group_categories=["diagnosis", "drug_status"],
+        moderators=None,
+        spline_spacing=100,
+        model=model,
+        device="cpu",
+    )
+    cbmr._collect_inputs(testdata_cbmr_simulated, drop_invalid=True)
+    cbmr._preprocess_input(testdata_cbmr_simulated)
+    coef_spline_bases = cbmr.inputs_["coef_spline_bases"]
+    cbmr.model.init_weights(
+        groups=cbmr.groups,
+        moderators=None,
+        spatial_coef_dim=coef_spline_bases.shape[1],
+        moderators_coef_dim=None,
+    )
+
+    coef_spline_bases_tensor = cbmr.model._spline_bases_tensor(coef_spline_bases)
+    assert coef_spline_bases_tensor.is_sparse
+    assert cbmr.model._spline_bases_tensor(coef_spline_bases) is coef_spline_bases_tensor
+
+    fisher_info = [
+        cbmr.model.fisher_info_multiple_group_spatial(
+            cbmr.groups[:1],
+            design,
+            None,
+            cbmr.inputs_["foci_per_voxel"],
+            cbmr.inputs_["foci_per_study"],
+        )
+        for design in (coef_spline_bases, coef_spline_bases.toarray())
+    ]
+    assert np.allclose(fisher_info[0], fisher_info[1])
+
+
+def test_closed_form_fisher_info(testdata_cbmr_simulated, model, monkeypatch):
+    """Check the closed-form Fisher information of CBMR models against autograd Hessians."""
+    dset = StandardizeField(fields=["sample_sizes", "avg_age"]).transform(testdata_cbmr_simulated)
+    cbmr = CBMREstimator(
+        group_categories=["diagnosis", "drug_status"],
+        moderators=["standardized_sample_sizes", "standardized_avg_age"],
+        spline_spacing=100,
+        model=model,
+        device="cpu",
+    )
+    cbmr._collect_inputs(dset, drop_invalid=True)
+    cbmr._preprocess_input(dset)
+    inputs = (
+        cbmr.inputs_["coef_spline_bases"],
+        cbmr.inputs_["moderators_by_group"],
+        cbmr.inputs_["foci_per_voxel"],
+        cbmr.inputs_["foci_per_study"],
+    )
+    cbmr.model.init_weights(
+        groups=cbmr.groups,
+        moderators=cbmr.moderators,
+        spatial_coef_dim=inputs[0].shape[1],
+        moderators_coef_dim=len(cbmr.moderators),
+    )
+    cbmr.model.extract_optimized_params(inputs[0], inputs[1])
+
+    closed_form = (
+        cbmr.model.fisher_info_multiple_group_spatial(cbmr.groups[:2], *inputs),
+        cbmr.model.fisher_info_multiple_group_moderator(*inputs),
+    )
+    monkeypatch.setattr(cbmr.model, "_fisher_info_spatial", lambda *args, **kwargs: None)
+    monkeypatch.setattr(cbmr.model, "_fisher_info_moderators", lambda *args, **kwargs: None)
+    autograd = (
+        cbmr.model.fisher_info_multiple_group_spatial(cbmr.groups[:2], *inputs),
+        cbmr.model.fisher_info_multiple_group_moderator(*inputs),
+    )
+    for closed_form_f, autograd_f in zip(closed_form, autograd):
+        assert np.allclose(closed_form_f, autograd_f)
+
+
 def test_StandardizeField(testdata_cbmr_simulated):
     """Unit test for StandardizeField."""
     dset = StandardizeField(fields=["sample_sizes", "avg_age"]).transform(testdata_cbmr_simulated)
@@ -238,3 +238,17 @@ def test_stouffers_multiple_contrasts(testdata_ibma_multiple_contrasts, aggressi
     z_img = results.get_map("z")
     assert z_img.ndim == 3
     assert z_img.shape == (10, 10, 10)
+
+
+def test_ibma_precision(testdata_ibma):
+    """Single-precision inputs should give nearly the same results as double precision."""
+    results = ibma.WeightedLeastSquares().fit(testdata_ibma)
+    meta = ibma.WeightedLeastSquares(precision="single")
+    single_results = meta.fit(testdata_ibma)
+
+    assert meta.inputs_["beta_maps"].dtype == np.float32
+    assert single_results.maps["z"].dtype == np.float64
+    assert np.allclose(single_results.maps["z"], results.maps["z"], rtol=1e-4, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        ibma.WeightedLeastSquares(precision="half")
@@ -3,9 +3,12 @@
 import nibabel as nib
 import numpy as np
 import pytest
+from nilearn.image import resample_to_img
+from scipy import sparse
 from scipy.ndimage import center_of_mass
 
 from nimare.meta import kernel
+from nimare.meta.utils import _coo_to_csr, _csr_to_coo
 from nimare.utils import get_masker, get_template, mm2vox
 
 
@@ -207,3 +210,93 @@ def test_MKDA_kernel_sum_across(testdata_cbma):
     assert (
         np.testing.assert_array_equal(summary_map, summary_sparse_ma_map.astype(np.int32)) is None
     )
+
+
+@pytest.mark.parametrize(
+    "kern, kwargs",
+    [
+        (kernel.ALEKernel, {"sample_size": 20}),
+        (kernel.MKDAKernel, {"r": 4, "value": 1}),
+        (kernel.KDAKernel, {"r": 4, "value": 1}),
+    ],
+)
+def test_kernel_transform_roi(testdata_cbma, roi_img, kern, kwargs):
+    """ROI summaries should match summaries of the dense MA maps."""
+    kern_instance = kern(**kwargs)
+
+    ma_arr = kern_instance.transform(testdata_cbma, return_type="array")
+    # The ROI is on a different grid from the mask (its x axis is flipped)
+    mask_img = testdata_cbma.masker.mask_img
+    assert not np.allclose(roi_img.affine, mask_img.affine)
+    resampled_roi_img = resample_to_img(roi_img, mask_img, interpolation="nearest")
+    roi_idx = testdata_cbma.masker.transform(resampled_roi_img)[0].astype(bool)
+    roi_arr = ma_arr[:, roi_idx]
+
+    roi_means = kern_instance.transform_roi(testdata_cbma, roi=roi_img)
+    assert roi_means.shape == (ma_arr.shape[0],)
+    assert roi_means.shape == (testdata_cbma.coordinates["id"].nunique(),)
+    assert np.allclose(roi_means, roi_arr.mean(axis=1))
+
+    roi_sums = kern_instance.transform_roi(testdata_cbma, roi=roi_img, summary="sum")
+    assert np.allclose(roi_sums, roi_arr.sum(axis=1))
+
+    # ROIs on the mask's grid are used as they are
+    resampled_roi_means = kern_instance.transform_roi(testdata_cbma, roi=resampled_roi_img)
+    assert np.allclose(resampled_roi_means, roi_means)
+
+    # Without an ROI, the whole mask is summarized
+    assert np.allclose(kern_instance.transform_roi(testdata_cbma), ma_arr.mean(axis=1))
+
+    with pytest.raises(ValueError):
+        kern_instance.transform_roi(testdata_cbma, roi=roi_img, summary="max")
+
+
+@pytest.mark.parametrize(
+    "kern, kwargs, dtype",
+    [
+        (kernel.ALEKernel, {"sample_size": 20}, np.float32),
+        (kernel.MKDAKernel, {"r": 4, "value": 1}, np.uint8),
+        (kernel.KDAKernel, {"r": 4, "value": 1}, np.uint8),
+        (kernel.KDAKernel, {"r": 4, "value": 0.5}, np.float32),
+    ],
+)
+def test_kernel_precision(testdata_cbma, kern, kwargs, dtype):
+    """Single-precision MA maps should use compact types and match double-precision maps."""
+    ma_maps = kern(**kwargs).transform(testdata_cbma, return_type="sparse")
+    single_ma_maps = kern(precision="single", **kwargs).transform(
+        testdata_cbma, return_type="sparse"
+    )
+
+    assert single_ma_maps.dtype == dtype
+    assert np.array_equal(single_ma_maps.coords, ma_maps.coords)
+    assert np.allclose(single_ma_maps.data, ma_maps.data, rtol=1e-6)
+
+    imgs = kern(precision="single", **kwargs).transform(testdata_cbma, return_type="image")
+    assert imgs[0].get_data_dtype() == dtype
+
+    with pytest.raises(ValueError):
+        kern(precision="half", **kwargs)
+
+
+@pytest.mark.parametrize(
+    "kern, kwargs",
+    [
+        (kernel.ALEKernel, {"sample_size": 20}),
+        (kernel.MKDAKernel, {"r": 4, "value": 1}),
+        (kernel.KDAKernel, {"r": 4, "value": 1}),
+    ],
+)
+def test_kernel_csr(testdata_cbma, kern, kwargs):
+    """Masked MA maps in CSR format should match the other return types."""
+    kern_instance = kern(**kwargs)
+    csr_maps = kern_instance.transform(testdata_cbma, return_type="csr")
+    ma_arr = kern_instance.transform(testdata_cbma, return_type="array")
+    ma_maps = kern_instance.transform(testdata_cbma, return_type="sparse")
+
+    assert sparse.isspmatrix_csr(csr_maps)
+    assert np.array_equal(csr_maps.toarray(), ma_arr)
+
+    mask_data = testdata_cbma.masker.mask_img.get_fdata().astype(bool)
+    assert np.array_equal(ma_maps.todense()[:, mask_data], ma_arr)
+    assert np.array_equal(_csr_to_coo(csr_maps, mask_data).todense(), ma_maps.todense())
+    assert (_coo_to_csr(ma_maps, mask_data) != csr_maps).nnz == 0
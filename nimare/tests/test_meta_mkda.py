@@ -7,6 +7,7 @@ import numpy as np
 import nimare
 from nimare.correct import FDRCorrector, FWECorrector
 from nimare.meta import KDA, MKDAChi2, MKDADensity, MKDAKernel
+from nimare.meta.cbma.nulls import MonteCarloNullLibrary, get_design_signature
 
 
 def test_MKDADensity_kernel_instance_with_kwargs(testdata_cbma):
@@ -90,6 +91,65 @@ def test_MKDADensity_montecarlo_null(testdata_cbma):
     assert "logp_desc-size_level-cluster_corr-FWE_method-montecarlo" not in corr_results2.maps
 
 
+def test_MKDADensity_null_library(testdata_cbma, tmp_path_factory):
+    """Test reuse and extension of Monte Carlo null distributions across designs."""
+    tmpdir = tmp_path_factory.mktemp("test_MKDADensity_null_library")
+    library = MonteCarloNullLibrary(str(tmpdir))
+
+    meta = MKDADensity()
+    results = meta.fit(testdata_cbma)
+    corr = FWECorrector(method="montecarlo", n_iters=5, n_cores=1, null_library=library)
+    corr_results = corr.transform(results)
+    null_key = "values_level-voxel_corr-fwe_method-montecarlo"
+    voxel_null = corr_results.estimator.null_distributions_[null_key]
+    assert len(voxel_null) == 5
+
+    # Moving the foci does not change the design, so the stored null is extended
+    dset = testdata_cbma.copy()
+    dset.coordinates = dset.coordinates.copy()
+    dset.coordinates["x"] = dset.coordinates["x"].values[::-1]
+    results2 = MKDADensity().fit(dset)
+    signature = get_design_signature(results.estimator)
+    assert signature == get_design_signature(results2.estimator)
+
+    corr = FWECorrector(method="montecarlo", n_iters=8, n_cores=1, null_library=library)
+    corr_results2 = corr.transform(results2)
+    voxel_null2 = corr_results2.estimator.null_distributions_[null_key]
+    assert len(voxel_null2) == 8
+    assert np.array_equal(voxel_null2[:5], voxel_null)
+
+    # Null distributions are persisted on disk
+    library2 = MonteCarloNullLibrary(str(tmpdir))
+    corr = FWECorrector(method="montecarlo", n_iters=8, n_cores=1, null_library=library2)
+    random_state = np.random.get_state()[1].copy()
+    corr_results3 = corr.transform(results)
+    assert np.array_equal(corr_results3.estimator.null_distributions_[null_key], voxel_null2)
+    # No new iterations are needed, so the global random state is not advanced
+    assert np.array_equal(np.random.get_state()[1], random_state)
+
+    # Changing the kernel changes the design
+    results3 = MKDADensity(kernel__r=5).fit(testdata_cbma)
+    assert get_design_signature(results3.estimator) != signature
+
+
+def test_MKDAChi2_null_library(testdata_cbma):
+    """Test reuse of Monte Carlo null distributions with MKDAChi2."""
+    library = MonteCarloNullLibrary()
+    dset1 = testdata_cbma.slice(testdata_cbma.ids[:10])
+    dset2 = testdata_cbma.slice(testdata_cbma.ids[10:])
+    results = MKDAChi2().fit(dset1, dset2)
+
+    corr = FWECorrector(method="montecarlo", n_iters=3, n_cores=1, null_library=library)
+    null_key = "values_desc-pFgA_level-voxel_corr-fwe_method-montecarlo"
+    voxel_null = corr.transform(results).estimator.null_distributions_[null_key]
+    assert len(voxel_null) == 3
+
+    corr = FWECorrector(method="montecarlo", n_iters=5, n_cores=1, null_library=library)
+    voxel_null2 = corr.transform(results).estimator.null_distributions_[null_key]
+    assert len(voxel_null2) == 5
+    assert np.array_equal(voxel_null2[:3], voxel_null)
+
+
 def test_MKDAChi2_fdr(testdata_cbma):
     """Smoke test for MKDAChi2."""
     meta = MKDAChi2()
@@ -232,3 +292,22 @@ def test_KDA_approximate_montecarlo_convergence(testdata_cbma_full):
     # Correlation must be near unity and mean difference should be tiny
     assert np.corrcoef(p_approximate, p_montecarlo)[0, 1] > 0.98
     assert (p_approximate - p_montecarlo).mean() < 1e-3
+
+
+def test_update(testdata_cbma_full):
+    """Adding and removing experiments should match refitting MKDADensity and KDA."""
+    ids = testdata_cbma_full.ids
+    dset1, dset2 = testdata_cbma_full.slice(ids[:12]), testdata_cbma_full.slice(ids[12:])
+
+    for Estimator in [MKDADensity, KDA]:
+        meta = Estimator()
+        meta.fit(testdata_cbma_full)
+        results = meta.update(remove_ids=ids[12:])
+        sub_results = Estimator().fit(dset1)
+        for map_name in ["stat", "p", "z"]:
+            assert np.allclose(results.maps[map_name], sub_results.maps[map_name])
+
+        results = meta.update(dset2)
+        full_results = Estimator().fit(testdata_cbma_full)
+        for map_name in ["stat", "p", "z"]:
+            assert np.allclose(results.maps[map_name], full_results.maps[map_name])
@@ -0,0 +1,118 @@
+"""Tests for the nimare.profiling module."""
+
+import json
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from nimare import profiling
+from nimare.correct import FDRCorrector, FWECorrector
+from nimare.diagnostics import FocusCounter
+from nimare.meta.cbma import ALE
+
+
+def test_profile_workflow(testdata_cbma_full, tmp_path_factory):
+    """Record the stages of a fit, correction, and diagnostics run."""
+    tmpdir = tmp_path_factory.mktemp("test_profile_workflow")
+    dset = testdata_cbma_full.slice(testdata_cbma_full.ids[:10])
+
+    # Nothing is recorded when profiling is off
+    result = ALE().fit(dset)
+    assert result.profile_ is None
+
+    with profiling.profile() as prof:
+        result = ALE().fit(dset)
+        cres = FWECorrector(method="montecarlo", n_iters=5, n_cores=1).transform(result)
+        counter = FocusCounter(
+            target_image="z_desc-size_level-cluster_corr-FWE_method-montecarlo",
+            voxel_thresh=None,
+        )
+        cres = counter.transform(cres)
+        cres.save_maps(output_dir=tmpdir)
+
+    assert profiling.get_profiler() is None
+    assert result.profile_ is prof
+    assert cres.profile_ is prof
+    assert cres.copy().profile_ is prof
+
+    names = {span["name"] for span in prof.spans}
+    for name in [
+        "ALE.fit",
+        "collect_inputs",
+        "preprocess_input",
+        "ma_maps",
+        "summary_stat",
+        "null_distribution",
+        "ALEKernel.transform",
+        "FWECorrector.transform",
+        "permutations",
+        "cluster_labeling",
+        "save_maps",
+    ]:
+        assert name in names
+
+    fit_span = [span for span in prof.spans if span["name"] == "ALE.fit"][0]
+    assert fit_span["depth"] == 0
+    assert fit_span["wall_time"] >= 0
+    assert fit_span["cpu_time"] >= 0
+    assert all(span["depth"] > 0 for span in prof.spans if span["name"] == "ma_maps")
+
+    # 8 valid experiments for the fit, plus 8 for each of the 5 permutations
+    n_exps = len(result.estimator.inputs_["id"])
+    assert prof.counters["ma_maps"] == n_exps * 6
+    assert prof.counters["iterations"] == 5
+    assert prof.counters["experiments"] == n_exps
+
+    summary = prof.summary()
+    assert summary.loc[summary["name"] == "FWECorrector.transform", "calls"].item() == 1
+
+    # Exports
+    assert json.loads(prof.to_json())["counters"] == prof.counters
+    trace_file = os.path.join(tmpdir, "trace.json")
+    prof.to_chrome_trace(trace_file)
+    with open(trace_file, "r") as fo:
+        trace = json.load(fo)
+
+    assert len(trace["traceEvents"]) == len(prof.spans)
+    assert {event["ph"] for event in trace["traceEvents"]} == {"X"}
+
+    # Results saved before profiling was added have no profile_ attribute
+    del result.profile_
+    cres = FDRCorrector(method="indep", alpha=0.05).transform(result)
+    assert cres.profile_ is None
+    assert cres.copy().profile_ is None
+
+
+def test_trace_batches():
+    """Record one span per batch of consumed items."""
+    assert list(profiling.trace_batches(range(5), name="batch", batch_size=2)) == list(range(5))
+
+    with profiling.profile() as prof:
+        assert list(profiling.trace_batches(range(5), "batch", batch_size=2)) == list(range(5))
+        with profiling.span("outer", n_things=3):
+            profiling.count("n_things")
+
+    batches = [span for span in prof.spans if span["name"] == "batch"]
+    assert [span["counters"]["iterations"] for span in batches] == [2, 2, 1]
+    assert prof.counters == {"iterations": 5, "n_things": 4}
+
+    # No empty span is recorded when the last batch is full
+    with profiling.profile() as prof:
+        assert list(profiling.trace_batches(range(4), "batch", batch_size=2)) == list(range(4))
+
+    batches = [span for span in prof.spans if span["name"] == "batch"]
+    assert [span["counters"]["iterations"] for span in batches] == [2, 2]
+
+
+def test_profiler_threads():
+    """Record counters from several threads, and pickle the Profiler."""
+    with profiling.profile() as prof:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(
+                executor.map(
+                    lambda _: [profiling.count("n_things") for _ in range(1000)], range(8)
+                )
+            )
+
+    assert prof.counters == {"n_things": 8000}
+    assert pickle.loads(pickle.dumps(prof)).counters == prof.counters
@@ -3,8 +3,9 @@
 import math
 
 import numpy as np
+import pytest
 
-from nimare.stats import null_to_p, nullhist_to_p
+from nimare.stats import NullDistribution, null_to_p, nullhist_to_p
 
 
 def test_null_to_p_float():
@@ -99,3 +100,127 @@ def test_nullhist_to_p():
         nullhist_to_p([0, 1, 99, 100, 101], histogram_weights, histogram_bins),
         np.array([1.0, 0.99, 0.01, 0.01, 0.01]),
     )
+
+
+def test_NullDistribution_values():
+    """Test nimare.stats.NullDistribution with null values."""
+    rng = np.random.default_rng(0)
+    null_values = np.round(rng.normal(size=(200, 4)), 1)
+    test_values = np.round(rng.normal(size=(3, 4)) * 2, 1)
+
+    # A single null matches null_to_p, with test values of any shape
+    null = NullDistribution(values=null_values[:, 0])
+    for tail in ["two", "upper", "lower"]:
+        for symmetric in [False, True]:
+            assert np.array_equal(
+                null.p(test_values, tail=tail, symmetric=symmetric),
+                null_to_p(test_values.ravel(), null_values[:, 0], tail, symmetric).reshape(3, 4),
+            )
+
+    assert null.p(10) == null_to_p(10, null_values[:, 0], "upper")
+    assert null.threshold_for_p(0.05) == np.sort(null_values[:, 0])[-10]
+
+    # Voxel-wise nulls pair each test value with its own column
+    null = NullDistribution(values=null_values)
+    for tail in ["two", "upper", "lower"]:
+        p_values = null.p(test_values, tail=tail)
+        assert p_values.shape == test_values.shape
+        for i_voxel in range(4):
+            assert np.array_equal(
+                p_values[:, i_voxel],
+                null_to_p(test_values[:, i_voxel], null_values[:, i_voxel], tail),
+            )
+
+    assert np.array_equal(null.threshold_for_p(0.05), np.sort(null_values, axis=0)[-10])
+
+    with pytest.raises(ValueError):
+        NullDistribution()
+
+    with pytest.raises(ValueError):
+        null.p(test_values, tail="both")
+
+
+def test_NullDistribution_histogram():
+    """Test nimare.stats.NullDistribution with null histograms."""
+    rng = np.random.default_rng(0)
+    histogram_bins = np.round(np.arange(0, 1.01, 0.01), 2)
+    histogram_weights = rng.integers(0, 10, size=(histogram_bins.size, 5)).astype(float)
+    test_values = rng.uniform(-0.1, 1.1, size=5)
+
+    null = NullDistribution(histogram_weights=histogram_weights, histogram_bins=histogram_bins)
+    assert np.array_equal(
+        null.p(test_values),
+        nullhist_to_p(test_values, histogram_weights, histogram_bins),
+    )
+
+    null = NullDistribution(
+        histogram_weights=histogram_weights[:, 0],
+        histogram_bins=histogram_bins,
+    )
+    p_values = null.p(test_values)
+    assert np.array_equal(
+        p_values,
+        nullhist_to_p(test_values, histogram_weights[:, 0], histogram_bins),
+    )
+
+    # The threshold is the bin before the first one with a p-value at or below the target
+    threshold = null.threshold_for_p(0.05)
+    assert null.p(threshold) > 0.05
+    assert null.p(threshold + 0.01) <= 0.05
+
+    with pytest.raises(ValueError):
+        null.p(test_values, tail="two")
+
+
+def test_NullDistribution_tail_approximation(caplog):
+    """Test the generalized Pareto tail approximation of nimare.stats.NullDistribution."""
+    rng = np.random.default_rng(0)
+    null_values = rng.gumbel(size=1000)
+
+    null = NullDistribution(values=null_values, tail_approximation="gpd")
+    empirical_null = NullDistribution(values=null_values)
+    assert set(null.tail_fit_) == {"threshold", "shape", "scale", "exceedance_rate", "gof_p"}
+    assert null.tail_fit_["gof_p"] > 0.05
+
+    # Values below the tail threshold, and other tails, keep their empirical p-values
+    test_values = np.array([-1, 0, null.tail_fit_["threshold"]])
+    assert np.array_equal(null.p(test_values), empirical_null.p(test_values))
+    assert null.p(100, tail="two") == empirical_null.p(100, tail="two")
+
+    # Values beyond the null get p-values below 1 / n_iters, which decrease continuously
+    test_values = np.array([10, 11, 12])
+    assert np.max(null_values) < 10
+    p_values = null.p(test_values)
+    assert np.all(p_values < 1 / null_values.size)
+    assert np.all(np.diff(p_values) < 0)
+    # Within an order of magnitude of the true p-values for a Gumbel distribution
+    true_p_values = -np.expm1(-np.exp(-test_values))
+    assert np.all(np.abs(np.log10(p_values / true_p_values)) < 1)
+
+    # Thresholds invert the tail p-values
+    assert np.allclose(null.p(null.threshold_for_p(np.array([1e-3, 1e-5]))), [1e-3, 1e-5])
+
+    # Bounded tails are not extrapolated past 1 / n_iters
+    null = NullDistribution(values=rng.uniform(size=1000), tail_approximation="gpd")
+    tail_fit = null.tail_fit_
+    assert tail_fit["shape"] < 0
+    endpoint = tail_fit["threshold"] - tail_fit["scale"] / tail_fit["shape"]
+    assert np.all(null.p(np.array([endpoint, endpoint + 0.5, 2])) >= 1 / 1000)
+    assert np.all(null.p(np.array([0.9999, 2])) == 1 / 1000)
+    threshold = null.threshold_for_p(1e-5)
+    assert threshold < 1
+    assert null.p(threshold) == 1 / 1000
+
+    # Fall back to empirical p-values when the tail is not fit
+    with caplog.at_level("WARNING", logger="nimare.stats"):
+        null = NullDistribution(values=np.repeat([0, 1], 500), tail_approximation="gpd")
+
+    assert null.tail_fit_ is None
+    assert "did not fit" in caplog.text
+    assert null.p(2) == 1 / 1000
+
+    with pytest.raises(ValueError):
+        NullDistribution(values=null_values, tail_approximation="normal")
+
+    with pytest.raises(ValueError):
+        NullDistribution(values=null_values[:, None], tail_approximation="gpd")
@@ -3,13 +3,43 @@
 import logging
 import os
 import os.path as op
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import nibabel as nib
 import numpy as np
 import pytest
+from joblib import delayed
 
 from nimare import utils
-from nimare.meta.utils import _apply_liberal_mask
+from nimare.meta.utils import _apply_liberal_mask, _histogram_counts
+
+
+def test_lazy_import():
+    """Test that importing nimare does not import its subpackages or heavy dependencies."""
+    heavy_modules = [
+        "nimare.meta",
+        "nimare.reports",
+        "torch",
+        "matplotlib",
+        "nilearn.plotting",
+        "sklearn.feature_extraction.text",
+        "requests",
+    ]
+    code = f"import sys, nimare; print([m for m in {heavy_modules!r} if m in sys.modules])"
+    imported = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert imported == "[]"
+
+    # Subpackages are still available as attributes of the top-level package
+    import nimare
+
+    assert nimare.meta.ALE is not None
+    assert "workflows" in dir(nimare)
+    with pytest.raises(AttributeError):
+        nimare.not_a_subpackage
 
 
 def test_find_stem():
@@ -198,3 +228,75 @@ def test_apply_liberal_mask():
 
     for pred_val, true_val in zip(pred_data, true_data):
         assert np.array_equal(pred_val, true_val)
+
+
+def test_histogram_counts():
+    """Test _histogram_counts against numpy.histogram."""
+    rng = np.random.default_rng(0)
+    values = np.append(rng.normal(size=1000), [-10, 10, np.nan])
+    bin_edges = np.linspace(-2, 2, 41)
+    # Values equal to the edges, including the right edge of the last bin
+    values = np.append(values, bin_edges)
+
+    counts, _ = np.histogram(values[~np.isnan(values)], bins=bin_edges)
+    assert np.array_equal(_histogram_counts(values, bin_edges), counts)
+
+
+def test_check_backend():
+    """Test the validation of parallel backends."""
+    assert utils._check_backend(None) is None
+    assert utils._check_backend("threads") == "threading"
+    assert utils._check_backend("loky") == "loky"
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        utils._check_backend("pigeons")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert utils._check_backend(executor) is executor
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_run_parallel(monkeypatch, executor_class):
+    """Test that tasks submitted to an Executor are batched and return results in order."""
+    tasks = [delayed(pow)(i, 2) for i in range(10)]
+    expected = [i**2 for i in range(10)]
+    assert list(utils._run_parallel(tasks, n_cores=1, backend=None)) == expected
+
+    # Submit the 10 tasks in 4 batches
+    monkeypatch.setattr(utils, "_MAX_EXECUTOR_TASKS", 4)
+    with executor_class(max_workers=2) as executor:
+        submit = executor.submit
+        n_submitted = []
+        monkeypatch.setattr(
+            executor, "submit", lambda *args: n_submitted.append(len(args[1])) or submit(*args)
+        )
+        assert list(utils._run_parallel(tasks, backend=executor)) == expected
+
+    assert n_submitted == [3, 3, 3, 1]
+
+
+def test_b_spline_bases():
+    """Test b_spline_bases against the dense tensor product of the per-axis bases."""
+    pytest.importorskip("patsy")
+    mask = np.zeros((12, 14, 10), dtype=int)
+    mask[2:10, 3:12, 1:9] = 1
+    mask[2:5, 3:6, 1:4] = 0
+
+    X = utils.b_spline_bases(mask, spacing=4, margin=10)
+    assert X.format == "csr"
+    # Cached matrices are copied, so that callers cannot modify them
+    X.data[:] = 0
+    X = utils.b_spline_bases(mask, spacing=4, margin=10)
+    assert X.max() > 0
+    assert utils._b_spline_bases.cache_info().hits >= 1
+
+    xx, yy, zz = (np.unique(idx) for idx in np.nonzero(mask))
+    x_spline, y_spline, z_spline = (
+        utils.coef_spline_bases(axis_coords, 4, 10) for axis_coords in (xx, yy, zz)
+    )
+    dense = np.kron(np.kron(x_spline, y_spline), z_spline)
+    dense = dense.reshape((xx.size, yy.size, zz.size, -1))[mask[2:10, 3:12, 1:9] == 1]
+    dense = dense[:, dense.max(axis=0) >= 0.1]
+    assert np.allclose(X.toarray(), dense)
+
+    cov = np.cov(np.random.default_rng(0).normal(size=(X.shape[1], 50)))
+    assert np.allclose(utils._spline_bases_variance(X, cov), np.diag(dense @ cov @ dense.T))
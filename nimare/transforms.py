@@ -8,7 +8,6 @@ import warnings
 import nibabel as nib
 import numpy as np
 import pandas as pd
-from nilearn.reporting import get_clusters_table
 from scipy import stats
 
 from nimare.base import NiMAREBase
@@ -352,6 +351,8 @@ class ImagesToCoordinates(NiMAREBase):
             images and metadata indicating origin
             of coordinates ('original' or 'nimare').
         """
+        from nilearn.reporting import get_clusters_table
+
         # relevant variables from dataset
         space = dataset.space
         masker = dataset.masker
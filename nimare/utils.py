@@ -8,18 +8,21 @@ import multiprocessing as mp
 import os
 import os.path as op
 import re
-from functools import wraps
+from functools import lru_cache, wraps
 from tempfile import mkstemp
 
 import joblib
 import nibabel as nib
 import numpy as np
 import pandas as pd
-import sparse
+import scipy.sparse
 from nilearn.input_data import NiftiMasker
 
 LGR = logging.getLogger(__name__)
 
+# Maximum number of batches of tasks submitted to an Executor by _run_parallel
+_MAX_EXECUTOR_TASKS = 1000
+
 
 def _check_ncores(n_cores):
     """Check number of cores used for method.
@@ -38,6 +41,104 @@ def _check_ncores(n_cores):
     return n_cores
 
 
+def _is_executor(backend):
+    """Check whether a backend is a :class:`concurrent.futures.Executor`-compatible object.
+
+    .. versionadded:: 0.5.1
+    """
+    return not isinstance(backend, str) and callable(getattr(backend, "submit", None))
+
+
+def _check_backend(backend):
+    """Check the backend used for parallelization.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`
+        None for joblib's default (process-based) backend, "threads" for threads sharing
+        one in-memory copy of the data, the name of any registered joblib backend, or an
+        Executor-compatible object (i.e., with a ``submit`` method returning futures).
+
+    Returns
+    -------
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`
+        Backend to pass to :func:`_run_parallel`.
+    """
+    if backend is None or _is_executor(backend):
+        return backend
+
+    if backend == "threads":
+        return "threading"
+
+    if not isinstance(backend, str) or backend not in joblib.parallel.BACKENDS:
+        raise ValueError(
+            f"Unsupported backend '{backend}'. Use None, 'threads', a "
+            "concurrent.futures.Executor, or the name of a registered joblib backend "
+            f"({', '.join(sorted(joblib.parallel.BACKENDS))})."
+        )
+
+    return backend
+
+
+def _run_batch(tasks):
+    """Run a batch of tasks created with :func:`joblib.delayed`.
+
+    .. versionadded:: 0.5.1
+    """
+    return [func(*args, **kwargs) for func, args, kwargs in tasks]
+
+
+def _run_parallel(tasks, n_cores=1, backend=None):
+    """Run tasks in parallel, and yield their results in order as they become available.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    tasks : iterable of :obj:`tuple`
+        Tasks created with :func:`joblib.delayed`.
+    n_cores : :obj:`int`, optional
+        Number of joblib workers. Not used with an Executor. Default is 1.
+    backend : None, :obj:`str`, or :class:`concurrent.futures.Executor`, optional
+        Backend, as returned by :func:`_check_backend`. Default is None.
+
+    Yields
+    ------
+    result
+        The result of each task.
+
+    Notes
+    -----
+    With an Executor, the tasks are submitted in at most ``_MAX_EXECUTOR_TASKS`` batches,
+    so that the objects that the tasks share (e.g., the Estimator) are sent to the workers
+    once per batch rather than once per task. The results are returned to the calling process,
+    where they are reduced.
+    """
+    if not _is_executor(backend):
+        yield from joblib.Parallel(return_as="generator", n_jobs=n_cores, backend=backend)(tasks)
+        return
+
+    tasks = list(tasks)
+    batch_size = max(1, -(-len(tasks) // _MAX_EXECUTOR_TASKS))
+    futures = [
+        backend.submit(_run_batch, tasks[start : start + batch_size])
+        for start in range(0, len(tasks), batch_size)
+    ]
+    del tasks
+
+    try:
+        for i_future, future in enumerate(futures):
+            # Release each batch of results once it has been consumed
+            futures[i_future] = None
+            yield from future.result()
+    finally:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+
+
 def get_resource_path():
     """Return the path to general resources, terminated with separator.
 
@@ -1253,12 +1354,32 @@ def coef_spline_bases(axis_coords, spacing, margin):
     return coef_spline
 
 
-def b_spline_bases(masker_voxels, spacing, margin=10):
+def _spline_nonzeros(coef_spline):
+    """Get the column indices and values of the nonzero elements in each row of a spline basis.
+
+    Rows with fewer nonzero elements than the densest row are padded with zero-valued elements.
+    """
+    n_nonzero = max(int(np.max(np.count_nonzero(coef_spline, axis=1))), 1)
+    # Stable sort puts the nonzero columns first, in increasing order
+    cols = np.argsort(coef_spline == 0, axis=1, kind="stable")[:, :n_nonzero]
+    vals = np.take_along_axis(coef_spline, cols, axis=1)
+    return cols, vals
+
+
+def b_spline_bases(masker_voxels, spacing, margin=10, chunk_size=100000):
     """Cubic B-spline bases for spatial intensity.
 
     The whole coefficient matrix is constructed by taking tensor product of
     all B-spline bases coefficient matrix in three direction.
 
+    .. versionchanged:: 0.5.1
+
+        * Build the design matrix directly from the nonzero elements of each voxel's
+          tensor-product row, without forming the full bounding-box Kronecker product.
+        * Return a sparse matrix, and cache the most recently built matrices by mask, spacing
+          and margin.
+        * New parameter: ``chunk_size``.
+
     Parameters
     ----------
     masker_voxels : :obj:`numpy.ndarray`
@@ -1268,59 +1389,122 @@ def b_spline_bases(masker_voxels, spacing, margin=10):
     margin : :obj:`int`
         extend the region where B-splines are constructed (min-margin, max_margin)
         to avoid weakly-supported B-spline on the edge
+    chunk_size : :obj:`int`, optional
+        Number of voxels for which tensor-product rows are built at once. Default is 100000.
+
     Returns
     -------
-    X : :obj:`numpy.ndarray`
-        2-D ndarray (n_voxel x n_spline_bases) only keeps with within-brain voxels
+    X : :obj:`scipy.sparse.csr_matrix`
+        2-D sparse matrix (n_voxel x n_spline_bases) only keeps with within-brain voxels.
+        Voxels are in C order, as in ``np.nonzero(masker_voxels)``.
+        Each call returns a copy of the cached matrix, which can be modified in place.
+    """
+    masker_voxels = np.asarray(masker_voxels) == 1
+    X = _b_spline_bases(
+        masker_voxels.shape, np.packbits(masker_voxels).tobytes(), spacing, margin, chunk_size
+    )
+    return X.copy()
+
+
+@lru_cache(maxsize=4)
+def _b_spline_bases(shape, packed_mask, spacing, margin, chunk_size):
+    """Build the B-spline design matrix of a bit-packed mask, for :func:`b_spline_bases`.
+
+    .. versionadded:: 0.5.1
+
+    The arguments are hashable so that the most recent design matrices can be cached.
     """
-    # dim_mask = masker_voxels.shape
-    # n_brain_voxel = np.sum(masker_voxels)
+    masker_voxels = np.unpackbits(
+        np.frombuffer(packed_mask, dtype=np.uint8), count=int(np.prod(shape))
+    )
+    masker_voxels = masker_voxels.reshape(shape).astype(bool)
+
     # remove the blank space around the brain mask
-    xx = np.where(np.apply_over_axes(np.sum, masker_voxels, [1, 2]) > 0)[0]
-    yy = np.where(np.apply_over_axes(np.sum, masker_voxels, [0, 2]) > 0)[1]
-    zz = np.where(np.apply_over_axes(np.sum, masker_voxels, [0, 1]) > 0)[2]
+    xx = np.where(np.any(masker_voxels, axis=(1, 2)))[0]
+    yy = np.where(np.any(masker_voxels, axis=(0, 2)))[0]
+    zz = np.where(np.any(masker_voxels, axis=(0, 1)))[0]
 
     x_spline = coef_spline_bases(xx, spacing, margin)
     y_spline = coef_spline_bases(yy, spacing, margin)
     z_spline = coef_spline_bases(zz, spacing, margin)
-    x_spline_coords = x_spline.nonzero()
-    y_spline_coords = y_spline.nonzero()
-    z_spline_coords = z_spline.nonzero()
-    x_spline_sparse = sparse.COO(x_spline_coords, x_spline[x_spline_coords], shape=x_spline.shape)
-    y_spline_sparse = sparse.COO(y_spline_coords, y_spline[y_spline_coords], shape=y_spline.shape)
-    z_spline_sparse = sparse.COO(z_spline_coords, z_spline[z_spline_coords], shape=z_spline.shape)
-
-    # create spatial design matrix by tensor product of spline bases in 3 dimesion
-    # Row sums of X are all 1=> There is no need to re-normalise X
-    X = np.kron(np.kron(x_spline_sparse, y_spline_sparse), z_spline_sparse)
-    # remove the voxels outside brain mask
-    axis_dim = [xx.shape[0], yy.shape[0], zz.shape[0]]
-    brain_voxels_index = [
-        (z - np.min(zz))
-        + axis_dim[2] * (y - np.min(yy))
-        + axis_dim[1] * axis_dim[2] * (x - np.min(xx))
-        for x in xx
-        for y in yy
-        for z in zz
-        if masker_voxels[x, y, z] == 1
-    ]
-    X = X[brain_voxels_index, :].todense()
-    # remove tensor product basis that have no support in the brain
     x_df, y_df, z_df = x_spline.shape[1], y_spline.shape[1], z_spline.shape[1]
-    support_basis = []
-    # find and remove weakly supported B-spline bases
-    for bx in range(x_df):
-        for by in range(y_df):
-            for bz in range(z_df):
-                basis_index = bz + z_df * by + z_df * y_df * bx
-                basis_coef = X[:, basis_index]
-                if np.max(basis_coef) >= 0.1:
-                    support_basis.append(basis_index)
+    x_cols, x_vals = _spline_nonzeros(x_spline)
+    y_cols, y_vals = _spline_nonzeros(y_spline)
+    z_cols, z_vals = _spline_nonzeros(z_spline)
+
+    # create spatial design matrix by tensor product of spline bases in 3 dimesion,
+    # one row per within-brain voxel, with basis index bz + z_df * by + z_df * y_df * bx
+    # Row sums of X are all 1=> There is no need to re-normalise X
+    brain_voxels = np.nonzero(masker_voxels)
+    n_brain_voxels = brain_voxels[0].shape[0]
+    X = []
+    for start in range(0, n_brain_voxels, chunk_size):
+        x, y, z = (coords[start : start + chunk_size] for coords in brain_voxels)
+        x, y, z = x - xx[0], y - yy[0], z - zz[0]
+        cols = (
+            x_cols[x][:, :, None, None] * (y_df * z_df)
+            + y_cols[y][:, None, :, None] * z_df
+            + z_cols[z][:, None, None, :]
+        )
+        vals = x_vals[x][:, :, None, None] * y_vals[y][:, None, :, None]
+        vals = vals * z_vals[z][:, None, None, :]
+        cols, vals = cols.reshape(x.shape[0], -1), vals.reshape(x.shape[0], -1)
+        rows = np.broadcast_to(np.arange(x.shape[0])[:, None], cols.shape)
+        nonzero = vals != 0
+        X.append(
+            scipy.sparse.csr_matrix(
+                (vals[nonzero], (rows[nonzero], cols[nonzero])),
+                shape=(x.shape[0], x_df * y_df * z_df),
+            )
+        )
+    X = scipy.sparse.vstack(X, format="csr")
+
+    # remove tensor product basis that have no/weak support in the brain
+    support_basis = np.where(X.max(axis=0).toarray().ravel() >= 0.1)[0]
     X = X[:, support_basis]
 
     return X
 
 
+def _spline_bases_variance(coef_spline_bases, cov, chunk_size=10000):
+    """Compute the quadratic form ``x_i @ cov @ x_i`` for each row of a B-spline design matrix.
+
+    .. versionadded:: 0.5.1
+
+    Parameters
+    ----------
+    coef_spline_bases : :obj:`numpy.ndarray` or :obj:`scipy.sparse.spmatrix`
+        (n_voxel x n_spline_bases) B-spline design matrix.
+    cov : :obj:`numpy.ndarray`
+        (n_spline_bases x n_spline_bases) covariance of the B-spline coefficients.
+    chunk_size : :obj:`int`, optional
+        Number of voxels for which the quadratic form is computed at once, which bounds the
+        size of the (chunk_size x n_spline_bases) intermediate array. Default is 10000.
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        1-D array of length n_voxel.
+    """
+    is_sparse = scipy.sparse.issparse(coef_spline_bases)
+    if is_sparse:
+        coef_spline_bases = coef_spline_bases.tocsr()
+    else:
+        coef_spline_bases = np.asarray(coef_spline_bases)
+
+    n_voxels = coef_spline_bases.shape[0]
+    variance = np.empty(n_voxels)
+    for start in range(0, n_voxels, chunk_size):
+        chunk = coef_spline_bases[start : start + chunk_size]
+        if is_sparse:
+            chunk_variance = np.asarray(chunk.multiply(chunk @ cov).sum(axis=1)).ravel()
+        else:
+            chunk_variance = np.einsum("ij,ij->i", chunk @ cov, chunk)
+        variance[start : start + chunk_size] = chunk_variance
+
+    return variance
+
+
 def dummy_encoding_moderators(dataset_annotations, moderators):
     """Convert categorical moderators to dummy encoded variables.
 